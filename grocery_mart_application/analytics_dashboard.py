@@ -6,22 +6,28 @@ from tkinter import filedialog, messagebox
 
 from ttkbootstrap import Button, Combobox, Entry, Frame, Label, StringVar
 
-from .database import connect
-from .utils.app_settings import get_setting
-
-try:
-    import matplotlib.pyplot as plt  # type: ignore
-    from matplotlib.figure import Figure  # type: ignore
-    from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg  # type: ignore
-except Exception:  # pragma: no cover
-    plt = None
-    Figure = None  # type: ignore
-    FigureCanvasTkAgg = None  # type: ignore
-
-try:
-    import pandas as pd  # type: ignore
-except Exception:  # pragma: no cover
-    pd = None
+from .database import activity_watermark, connect
+from .export_service import ExportJob
+from .instrumentation import timed
+from .sales_service import sales_summary
+
+Figure = None  # type: ignore
+FigureCanvasTkAgg = None  # type: ignore
+
+
+def _load_matplotlib() -> bool:
+    """Import matplotlib on first chart build; it is the slowest import in the app."""
+    global Figure, FigureCanvasTkAgg
+    if Figure is not None and FigureCanvasTkAgg is not None:
+        return True
+    try:
+        # The object-oriented Figure API is enough for an embedded canvas; pyplot is not needed.
+        from matplotlib.figure import Figure as _Figure  # type: ignore
+        from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg as _Canvas  # type: ignore
+    except Exception:  # pragma: no cover
+        return False
+    Figure, FigureCanvasTkAgg = _Figure, _Canvas
+    return True
 
 
 class AnalyticsDashboard(Frame):
@@ -41,15 +47,24 @@ class AnalyticsDashboard(Frame):
         self.ax_top = None
         self._resize_after_id: str | None = None
         self._kpi_labels: dict[str, Label] = {}
+        self._export_job: ExportJob | None = None
+        self._activity_mark = activity_watermark()
         self.build_widgets()
 
+    def on_show(self) -> None:
+        # Keep the existing figure; redraw only when sales/stock changed while the panel was hidden.
+        mark = activity_watermark()
+        if mark != self._activity_mark:
+            self._activity_mark = mark
+            self.refresh_charts()
+
     def build_widgets(self):
         Label(self, text="Analytics", font=("Helvetica", 20, "bold")).pack(pady=(10, 2))
         Label(self, text="Stock insights and sales trends for Grocery Mart.", bootstyle="secondary").pack(
             pady=(0, 10)
         )
 
-        if plt is None or Figure is None or FigureCanvasTkAgg is None:
+        if not _load_matplotlib():
             Label(
                 self,
                 text="Analytics requires matplotlib.\nInstall dependencies with: pip install -r requirements.txt",
@@ -185,9 +200,11 @@ class AnalyticsDashboard(Frame):
         except Exception:
             return None
 
+    def _date_range(self) -> tuple[date | None, date | None]:
+        return self._parse_date(self.date_from.get()), self._parse_date(self.date_to.get())
+
     def _date_filters(self) -> tuple[str, list[object]]:
-        df = self._parse_date(self.date_from.get())
-        dt = self._parse_date(self.date_to.get())
+        df, dt = self._date_range()
         if df is None and dt is None:
             return "", []
         if df is None:
@@ -227,6 +244,7 @@ class AnalyticsDashboard(Frame):
         except Exception:
             pass
 
+    @timed("analytics.refresh_charts")
     def refresh_charts(self):
         if self.ax_pie is None or self.ax_trend is None or self.ax_top is None:
             return
@@ -235,101 +253,29 @@ class AnalyticsDashboard(Frame):
         self.ax_trend.clear()
         self.ax_top.clear()
 
-        where, params = self._date_filters()
-
-        with connect() as conn:
-            stock_data = conn.execute(
-                "SELECT category, SUM(quantity) AS qty FROM products GROUP BY category ORDER BY qty DESC"
-            ).fetchall()
-
-            kpi_row = conn.execute(
-                f"""SELECT
-                        COALESCE(SUM(COALESCE(total_price,0)),0) AS revenue,
-                        COUNT(*) AS sales,
-                        COALESCE(SUM(COALESCE(quantity,0)),0) AS items,
-                        COALESCE(SUM(COALESCE(tax_amount,0)),0) AS tax
-                    FROM sales
-                    WHERE 1=1 {where}""",
-                tuple(params),
-            ).fetchone()
-
-            threshold = int(get_setting("inventory_low_stock_threshold", 5) or 5)
-            low_stock = conn.execute(
-                "SELECT COUNT(*) AS c FROM products WHERE COALESCE(quantity,0) <= ?",
-                (threshold,),
-            ).fetchone()
-
-            if self.period.get() == "Daily":
-                sales_data = conn.execute(
-                    f"""SELECT DATE(sale_date) AS k, COALESCE(SUM(COALESCE(total_price,0)),0) AS v
-                        FROM sales
-                        WHERE 1=1 {where}
-                        GROUP BY DATE(sale_date)
-                        ORDER BY DATE(sale_date)""",
-                    tuple(params),
-                ).fetchall()
-            elif self.period.get() == "Weekly":
-                sales_data = conn.execute(
-                    f"""SELECT strftime('%Y-W%W', sale_date) AS k, COALESCE(SUM(COALESCE(total_price,0)),0) AS v
-                        FROM sales
-                        WHERE 1=1 {where}
-                        GROUP BY strftime('%Y-W%W', sale_date)
-                        ORDER BY strftime('%Y-W%W', sale_date)""",
-                    tuple(params),
-                ).fetchall()
-            else:
-                sales_data = conn.execute(
-                    f"""SELECT strftime('%Y-%m', sale_date) AS k, COALESCE(SUM(COALESCE(total_price,0)),0) AS v
-                        FROM sales
-                        WHERE 1=1 {where}
-                        GROUP BY strftime('%Y-%m', sale_date)
-                        ORDER BY strftime('%Y-%m', sale_date)""",
-                    tuple(params),
-                ).fetchall()
-
-            top_products = conn.execute(
-                f"""SELECT product_name,
-                        COALESCE(SUM(COALESCE(quantity,0)),0) AS qty,
-                        COALESCE(SUM(COALESCE(total_price,0)),0) AS revenue
-                    FROM sales
-                    WHERE 1=1 {where}
-                    GROUP BY product_name
-                    ORDER BY revenue DESC
-                    LIMIT 10""",
-                tuple(params),
-            ).fetchall()
+        date_from, date_to = self._date_range()
+        summary = sales_summary(self.period.get(), date_from=date_from, date_to=date_to)
 
         # KPIs
         try:
-            revenue = float(kpi_row["revenue"] or 0) if kpi_row else 0.0
-            sales = int(kpi_row["sales"] or 0) if kpi_row else 0
-            items = int(kpi_row["items"] or 0) if kpi_row else 0
-            tax = float(kpi_row["tax"] or 0) if kpi_row else 0.0
-            avg_sale = revenue / sales if sales else 0.0
-            low_stock_count = int(low_stock["c"] or 0) if low_stock else 0
-
-            if "revenue" in self._kpi_labels:
-                self._kpi_labels["revenue"].configure(text=self._money(revenue))
-            if "sales" in self._kpi_labels:
-                self._kpi_labels["sales"].configure(text=str(sales))
-            if "items" in self._kpi_labels:
-                self._kpi_labels["items"].configure(text=str(items))
-            if "avg_sale" in self._kpi_labels:
-                self._kpi_labels["avg_sale"].configure(text=self._money(avg_sale))
-            if "tax" in self._kpi_labels:
-                self._kpi_labels["tax"].configure(text=self._money(tax))
-            if "low_stock" in self._kpi_labels:
-                self._kpi_labels["low_stock"].configure(text=str(low_stock_count))
+            kpis = {
+                "revenue": self._money(summary.revenue),
+                "sales": str(summary.sales),
+                "items": str(summary.items),
+                "avg_sale": self._money(summary.avg_sale),
+                "tax": self._money(summary.tax),
+                "low_stock": str(summary.low_stock),
+            }
+            for key, text in kpis.items():
+                if key in self._kpi_labels:
+                    self._kpi_labels[key].configure(text=text)
         except Exception:
             pass
 
         # Stock breakdown (donut)
-        if stock_data:
-            categories = [str(row["category"]) for row in stock_data]
-            quantities = [float(row["qty"] or 0) for row in stock_data]
-
+        if summary.stock_by_category:
             # Keep the pie readable: show top 6, group the rest.
-            pairs = sorted(zip(categories, quantities), key=lambda x: x[1], reverse=True)
+            pairs = sorted(summary.stock_by_category, key=lambda x: x[1], reverse=True)
             top = pairs[:6]
             rest_sum = sum(q for _c, q in pairs[6:])
             if rest_sum > 0:
@@ -351,9 +297,9 @@ class AnalyticsDashboard(Frame):
             self.ax_pie.set_title("Stock by Category", fontsize=11)
 
         # Sales trend
-        if sales_data:
-            labels = [str(row["k"]) for row in sales_data]
-            values = [float(row["v"] or 0) for row in sales_data]
+        if summary.trend:
+            labels = [k for k, _v in summary.trend]
+            values = [v for _k, v in summary.trend]
 
             max_points = 40
             if len(labels) > max_points:
@@ -381,10 +327,10 @@ class AnalyticsDashboard(Frame):
             self.ax_trend.set_title(f"{self.period.get()} Sales (Revenue)", fontsize=11)
 
         # Top products
-        if top_products:
-            names = [str(r["product_name"] or "") for r in top_products][::-1]
-            revs = [float(r["revenue"] or 0) for r in top_products][::-1]
-            qtys = [int(r["qty"] or 0) for r in top_products][::-1]
+        if summary.top_products:
+            names = [name for name, _q, _r in summary.top_products][::-1]
+            revs = [rev for _n, _q, rev in summary.top_products][::-1]
+            qtys = [qty for _n, qty, _r in summary.top_products][::-1]
 
             y = list(range(len(names)))
             self.ax_top.barh(y, revs, color="#7ec8e3", edgecolor="#5aa8c6", linewidth=0.8)
@@ -422,26 +368,17 @@ class AnalyticsDashboard(Frame):
             return False
 
     def export_report(self):
-        if pd is None:
-            messagebox.showerror("Export", "Missing dependency: pandas. Install with `pip install -r requirements.txt`.")
+        if self._export_job is not None and not self._export_job.done:
+            messagebox.showinfo("Export", "A report export is already running.")
             return
 
         where, params = self._date_filters()
         with connect() as conn:
-            rows = conn.execute(
-                f"""SELECT id, product_name, quantity, unit_price, subtotal, gst_percent, tax_percent, tax_amount, total_price,
-                          buyer_name, buyer_mobile, sale_date, invoice_path
-                   FROM sales
-                   WHERE 1=1 {where}
-                   ORDER BY sale_date DESC""",
-                tuple(params),
-            ).fetchall()
-
-        if not rows:
+            has_rows = conn.execute(f"SELECT EXISTS(SELECT 1 FROM sales WHERE 1=1 {where})", tuple(params)).fetchone()[0]
+        if not has_rows:
             messagebox.showwarning("No data", "No sales data found to export.")
             return
 
-        df = pd.DataFrame([dict(r) for r in rows])
         out = filedialog.asksaveasfilename(
             defaultextension=".xlsx",
             initialfile=f"Sales_Report_{datetime.now().strftime('%Y%m%d_%H%M%S')}.xlsx",
@@ -449,11 +386,26 @@ class AnalyticsDashboard(Frame):
         )
         if not out:
             return
-        try:
-            if out.lower().endswith(".csv"):
-                df.to_csv(out, index=False)
-            else:
-                df.to_excel(out, index=False)
-            messagebox.showinfo("Exported", f"Saved: {out}")
-        except Exception as e:
-            messagebox.showerror("Export failed", str(e))
+
+        def on_progress(written: int, total: int) -> None:
+            if total:
+                self.status.set(f"Exporting report: {written:,} / {total:,} rows")
+
+        def on_done(job: ExportJob) -> None:
+            if job.error is not None:
+                self.status.set("Report export failed.")
+                messagebox.showerror("Export failed", str(job.error))
+                return
+            self.status.set(f"Report exported ({job.written:,} rows): {job.path}")
+            messagebox.showinfo("Exported", f"Saved: {job.path}")
+
+        self._export_job = ExportJob(
+            f"""SELECT id, product_name, quantity, unit_price, subtotal, gst_percent, tax_percent, tax_amount, total_price,
+                      buyer_name, buyer_mobile, sale_date, invoice_path
+               FROM sales
+               WHERE 1=1 {where}
+               ORDER BY sale_date DESC""",
+            tuple(params),
+            path=out,
+        ).start()
+        self._export_job.watch(self, on_progress=on_progress, on_done=on_done)
@@ -3,31 +3,115 @@ from __future__ import annotations
 import hashlib
 import hmac
 import os
+import threading
+import time
+from collections.abc import Callable
+from concurrent.futures import Future, ThreadPoolExecutor
 from dataclasses import dataclass
 
-from .database import connect, setup_database
+from . import database
+from .database import connect, log_event, setup_database
 
 PBKDF2_ITERS = 210_000
+# Rows written before hash schemes were recorded are PBKDF2-SHA256 with PBKDF2_ITERS.
+LEGACY_SCHEME = f"pbkdf2_sha256$i={PBKDF2_ITERS}"
 
+# Key for the in-memory unlock cache below; never stored, so cached entries die with the process.
+_SESSION_KEY = os.urandom(32)
 
-def _hash_password(password: str, salt: bytes) -> bytes:
-    return hashlib.pbkdf2_hmac("sha256", password.encode("utf-8"), salt, PBKDF2_ITERS)
+
+class Pbkdf2Hasher:
+    algorithm = "pbkdf2_sha256"
+
+    def __init__(self, i: int = PBKDF2_ITERS) -> None:
+        self.params = {"i": int(i)}
+
+    def hash(self, password: str, salt: bytes) -> bytes:
+        return hashlib.pbkdf2_hmac("sha256", password.encode("utf-8"), salt, self.params["i"])
+
+
+class ScryptHasher:
+    algorithm = "scrypt"
+
+    def __init__(self, n: int = 2**15, r: int = 8, p: int = 1) -> None:
+        self.params = {"n": int(n), "r": int(r), "p": int(p)}
+
+    def hash(self, password: str, salt: bytes) -> bytes:
+        n, r, p = self.params["n"], self.params["r"], self.params["p"]
+        # scrypt needs 128 * n * r bytes; allow that plus headroom instead of hashlib's 32 MB cap.
+        return hashlib.scrypt(
+            password.encode("utf-8"), salt=salt, n=n, r=r, p=p, maxmem=256 * n * r + (1 << 20), dklen=32
+        )
+
+
+HASHERS: dict[str, type] = {Pbkdf2Hasher.algorithm: Pbkdf2Hasher, ScryptHasher.algorithm: ScryptHasher}
+
+
+def scheme_of(hasher) -> str:  # type: ignore[no-untyped-def]
+    """Versioned description stored next to each hash, e.g. "scrypt$n=32768,r=8,p=1"."""
+    return hasher.algorithm + "$" + ",".join(f"{k}={v}" for k, v in hasher.params.items())
+
+
+def hasher_for(scheme: str | None):  # type: ignore[no-untyped-def]
+    """Hasher that reproduces hashes stored under `scheme` (None = legacy rows)."""
+    algorithm, _, raw = (scheme or LEGACY_SCHEME).partition("$")
+    cls = HASHERS.get(algorithm)
+    if cls is None:
+        raise ValueError(f"Unknown password hash algorithm: {algorithm}")
+    params = dict(item.split("=", 1) for item in raw.split(",") if "=" in item)
+    return cls(**{k: int(v) for k, v in params.items()})
+
+
+def current_hasher():  # type: ignore[no-untyped-def]
+    """Hasher for new and upgraded hashes, from the `password_*` settings (ValueError if unknown)."""
+    from .utils.app_settings import get_setting
+
+    algorithm = str(get_setting("password_algorithm", ScryptHasher.algorithm) or ScryptHasher.algorithm)
+    if algorithm not in HASHERS:
+        raise ValueError(f"Unknown password_algorithm setting {algorithm!r}; use one of: {', '.join(HASHERS)}")
+    if algorithm == Pbkdf2Hasher.algorithm:
+        return Pbkdf2Hasher(int(get_setting("password_pbkdf2_iterations", PBKDF2_ITERS) or PBKDF2_ITERS))
+    return ScryptHasher(
+        int(get_setting("password_scrypt_n", 2**15) or 2**15),
+        int(get_setting("password_scrypt_r", 8) or 8),
+        int(get_setting("password_scrypt_p", 1) or 1),
+    )
+
+
+def _hash_password(password: str, salt: bytes, hasher=None) -> bytes:  # type: ignore[no-untyped-def]
+    return (hasher or current_hasher()).hash(password, salt)
+
+
+def _new_hash(password: str) -> tuple[bytes, bytes, str]:
+    hasher = current_hasher()
+    salt = os.urandom(16)
+    return _hash_password(password, salt, hasher), salt, scheme_of(hasher)
+
+
+_bootstrapped_for: object = None
+_bootstrap_lock = threading.Lock()
 
 
 def ensure_default_admin() -> None:
-    setup_database()
-    with connect() as conn:
-        cur = conn.cursor()
-        cur.execute("SELECT COUNT(*) AS c FROM users")
-        if int(cur.fetchone()["c"]) > 0:
+    """Create the schema and the default admin account, once per database per process."""
+    global _bootstrapped_for
+    if _bootstrapped_for == database.DB_PATH:
+        return
+    with _bootstrap_lock:
+        if _bootstrapped_for == database.DB_PATH:
             return
-        salt = os.urandom(16)
-        pw_hash = _hash_password("admin", salt)
-        cur.execute(
-            "INSERT INTO users (username, password_hash, salt, role) VALUES (?, ?, ?, ?)",
-            ("admin", pw_hash, salt, "admin"),
-        )
-        conn.commit()
+        setup_database()
+        with connect() as conn:
+            cur = conn.cursor()
+            cur.execute("SELECT COUNT(*) AS c FROM users")
+            if int(cur.fetchone()["c"]) == 0:
+                pw_hash, salt, scheme = _new_hash("admin")
+                cur.execute(
+                    "INSERT INTO users (username, password_hash, salt, hash_scheme, role) VALUES (?, ?, ?, ?, ?)",
+                    ("admin", pw_hash, salt, scheme, "admin"),
+                )
+                conn.commit()
+        _bootstrapped_for = database.DB_PATH
 
 
 @dataclass(frozen=True)
@@ -36,31 +120,151 @@ class AuthUser:
     role: str
 
 
+@dataclass(frozen=True)
+class _Session:
+    user: AuthUser
+    proof: bytes
+    expires_at: float
+
+
+_sessions: dict[str, _Session] = {}
+_sessions_lock = threading.Lock()
+
+
+def _session_window_s() -> float:
+    from .utils.app_settings import get_setting
+
+    try:
+        return max(0.0, float(get_setting("auth_session_minutes", 15) or 0)) * 60
+    except (TypeError, ValueError):
+        return 0.0
+
+
+def _proof(username: str, password: str) -> bytes:
+    return hmac.new(_SESSION_KEY, f"{username}\0{password}".encode(), hashlib.sha256).digest()
+
+
+def _start_session(user: AuthUser, password: str) -> None:
+    window = _session_window_s()
+    if window <= 0:
+        return
+    with _sessions_lock:
+        _sessions[user.username] = _Session(user, _proof(user.username, password), time.monotonic() + window)
+
+
+def verify_cached(username: str, password: str) -> AuthUser | None:
+    """
+    Check `password` against the session opened by the last successful full check, if still fresh.
+
+    This is a single HMAC, so re-unlocking the app within `auth_session_minutes` costs nothing.
+    Returns None (not a failure) when there is no usable session; fall back to the full check.
+    """
+    with _sessions_lock:
+        session = _sessions.get(username)
+        if session is None:
+            return None
+        if time.monotonic() >= session.expires_at:
+            del _sessions[username]
+            return None
+    if hmac.compare_digest(session.proof, _proof(username, password)):
+        return session.user
+    return None
+
+
+def end_session(username: str | None = None) -> None:
+    """Forget the cached session for `username` (all sessions if None)."""
+    with _sessions_lock:
+        if username is None:
+            _sessions.clear()
+        else:
+            _sessions.pop(username, None)
+
+
 def verify_credentials(username: str, password: str) -> AuthUser | None:
+    """
+    Full password check (KDF, ~0.1-0.3 s); blocks, so call it off the Tk thread.
+
+    Each hash is checked with the scheme it was stored under. If that differs from the current
+    `password_*` settings, the password is rehashed with the current scheme after it verifies,
+    so cost changes roll out as users sign in without locking anyone out.
+    """
+    cached = verify_cached(username, password)
+    if cached is not None:
+        return cached
     ensure_default_admin()
     with connect() as conn:
         cur = conn.cursor()
         cur.execute(
-            "SELECT username, password_hash, salt, role FROM users WHERE username = ?",
+            "SELECT username, password_hash, salt, hash_scheme, role FROM users WHERE username = ?",
             (username,),
         )
         row = cur.fetchone()
-        if not row:
-            return None
-        expected = row["password_hash"]
-        actual = _hash_password(password, row["salt"])
-        if not hmac.compare_digest(expected, actual):
-            return None
-        return AuthUser(username=row["username"], role=row["role"])
+    if not row:
+        return None
+    try:
+        hasher = hasher_for(row["hash_scheme"])
+    except (TypeError, ValueError) as e:
+        # Stored by a newer version or damaged: refuse this account, don't take the login worker down.
+        log_event("auth", f"Sign-in refused for {row['username']}: cannot check hash ({e})", row["username"])
+        return None
+    expected = row["password_hash"]
+    actual = _hash_password(password, row["salt"], hasher)
+    if not hmac.compare_digest(expected, actual):
+        return None
+    try:
+        if (row["hash_scheme"] or LEGACY_SCHEME) != scheme_of(current_hasher()):
+            _store_password(row["username"], password)
+    except ValueError as e:
+        log_event("auth", f"Password hash not upgraded for {row['username']}: {e}", row["username"])
+    except Exception:
+        # Keep the old, still valid hash; try again next sign-in.
+        pass
+    user = AuthUser(username=row["username"], role=row["role"])
+    _start_session(user, password)
+    return user
 
 
-def change_password(username: str, new_password: str) -> None:
-    salt = os.urandom(16)
-    pw_hash = _hash_password(new_password, salt)
+# One worker: logins are rare and serialising them also rate-limits password guessing.
+_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="auth")
+
+
+def verify_credentials_async(username: str, password: str) -> Future[AuthUser | None]:
+    """Run `verify_credentials` on the auth worker; the future resolves to the user or None."""
+    return _executor.submit(verify_credentials, username, password)
+
+
+def when_done(
+    widget,  # type: ignore[no-untyped-def]
+    future: Future,
+    callback: Callable[[Future], None],
+    *,
+    interval_ms: int = 30,
+) -> None:
+    """Call `callback(future)` on the Tk thread of `widget` once `future` finishes."""
+
+    def poll() -> None:
+        if future.done():
+            callback(future)
+            return
+        try:
+            widget.after(interval_ms, poll)
+        except Exception:
+            # Widget destroyed while waiting; nobody is left to notify.
+            pass
+
+    poll()
+
+
+def _store_password(username: str, password: str) -> None:
+    pw_hash, salt, scheme = _new_hash(password)
     with connect() as conn:
         conn.execute(
-            "UPDATE users SET password_hash = ?, salt = ? WHERE username = ?",
-            (pw_hash, salt, username),
+            "UPDATE users SET password_hash = ?, salt = ?, hash_scheme = ? WHERE username = ?",
+            (pw_hash, salt, scheme, username),
         )
         conn.commit()
 
+
+def change_password(username: str, new_password: str) -> None:
+    _store_password(username, new_password)
+    end_session(username)
@@ -0,0 +1,294 @@
+"""
+Blurred window backgrounds for the login page and the dashboard, rendered off the Tk thread.
+
+Rendering happens in two stages:
+
+- The *base*: the source image scaled down to `BASE_LONG_SIDE`, blurred and colour-graded.
+  It does not depend on the window size, so it is computed once and saved under
+  `cache/` next to the database; restarts load it instead of blurring again.
+- One *composite* per size bucket: the base cover-fitted to the window size rounded up to
+  `BUCKET_PX`, with the overlay on top. The canvas shows it centred, so every window size
+  inside a bucket reuses the same image.
+
+Composites are rendered on one worker thread and kept in a small LRU cache. While a new
+size is rendering, `CanvasBackground` shows the nearest cached composite, so drag-resizing
+never waits for PIL.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import os
+import threading
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path
+
+from . import database
+
+CACHE_DIRNAME = "cache"
+BASE_LONG_SIDE = 640
+BUCKET_PX = 64
+MAX_COMPOSITES = 6
+MAX_PHOTOS = 4
+
+_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="background")
+
+
+@dataclass(frozen=True)
+class BackgroundStyle:
+    blur_radius: float
+    brightness: float
+    contrast: float
+    overlay: tuple[int, int, int, int]
+    # Extra darkening towards the bottom edge (alpha at the bottom row, 0 = none).
+    bottom_shade: int = 0
+    fallback: str = "#0b1b2b"
+
+
+DASHBOARD_STYLE = BackgroundStyle(3, 0.78, 1.08, (6, 20, 35, 140))
+LOGIN_STYLE = BackgroundStyle(4, 0.72, 1.05, (6, 20, 35, 165), bottom_shade=55, fallback="#061423")
+
+
+def cache_folder() -> Path:
+    return database.DB_PATH.parent / CACHE_DIRNAME
+
+
+def bucket(size: tuple[int, int]) -> tuple[int, int]:
+    """`size` rounded up to whole buckets, so the composite always covers the window."""
+    w, h = (max(1, int(v)) for v in size)
+    return (-(-w // BUCKET_PX) * BUCKET_PX, -(-h // BUCKET_PX) * BUCKET_PX)
+
+
+class BackgroundRenderer:
+    def __init__(self, source: Path | None, style: BackgroundStyle, *, cache_dir: Path | None = None) -> None:
+        self.source = source
+        self.style = style
+        self.cache_dir = cache_dir
+        self.base_from_disk = False
+        self._base = None
+        self._base_lock = threading.Lock()
+        self._lock = threading.Lock()
+        self._composites: OrderedDict[tuple[int, int], object] = OrderedDict()
+        self._pending: dict[tuple[int, int], Future] = {}
+
+    # Base ---------------------------------------------------------------------------------
+
+    def base_path(self) -> Path | None:
+        """Disk cache file for the base; the name changes whenever the source or style does."""
+        if self.source is None or not self.source.exists():
+            return None
+        st = self.source.stat()
+        s = self.style
+        key = f"{self.source.resolve()}|{st.st_mtime_ns}|{st.st_size}|{BASE_LONG_SIDE}|{s.blur_radius}|{s.brightness}|{s.contrast}"
+        digest = hashlib.sha1(key.encode("utf-8")).hexdigest()[:16]
+        return (self.cache_dir or cache_folder()) / f"background-{digest}.png"
+
+    def base(self):  # type: ignore[no-untyped-def]
+        """The blurred, graded base image (PIL, RGB), or None without a source image."""
+        with self._base_lock:
+            if self._base is None:
+                self._base = self._load_or_build_base()
+            return self._base
+
+    def _load_or_build_base(self):  # type: ignore[no-untyped-def]
+        from PIL import Image, ImageEnhance, ImageFilter  # type: ignore
+
+        path = self.base_path()
+        if path is None:
+            return None
+        if path.exists():
+            try:
+                with Image.open(path) as cached:
+                    img = cached.convert("RGB")
+                self.base_from_disk = True
+                return img
+            except Exception:
+                pass
+
+        with Image.open(self.source) as src:
+            img = src.convert("RGB")
+        img.thumbnail((BASE_LONG_SIDE, BASE_LONG_SIDE), Image.Resampling.BILINEAR)
+        img = img.filter(ImageFilter.GaussianBlur(radius=self.style.blur_radius))
+        img = ImageEnhance.Brightness(img).enhance(self.style.brightness)
+        img = ImageEnhance.Contrast(img).enhance(self.style.contrast)
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            tmp = path.with_suffix(".tmp")
+            img.save(tmp, format="PNG")
+            os.replace(tmp, path)
+        except OSError:
+            # A read-only data folder only costs the blur on the next start.
+            pass
+        return img
+
+    # Composites -------------------------------------------------------------------------
+
+    def _overlay(self, size: tuple[int, int]):  # type: ignore[no-untyped-def]
+        from PIL import Image  # type: ignore
+
+        overlay = Image.new("RGBA", size, self.style.overlay)
+        if self.style.bottom_shade:
+            shade = self.style.bottom_shade
+            mask = Image.linear_gradient("L").resize(size).point(lambda v: v * shade // 255)
+            grad = Image.new("RGBA", size, (0, 0, 0, 0))
+            grad.putalpha(mask)
+            overlay = Image.alpha_composite(overlay, grad)
+        return overlay
+
+    def render(self, size: tuple[int, int]):  # type: ignore[no-untyped-def]
+        """Composite for the bucket of `size` (PIL, RGB), from the cache when possible."""
+        from PIL import Image  # type: ignore
+
+        key = bucket(size)
+        cached = self.cached(size)
+        if cached is not None:
+            return cached
+
+        base = self.base()
+        if base is None:
+            img = Image.new("RGB", key, self.style.overlay[:3])
+        else:
+            bw, bh = key
+            scale = max(bw / base.width, bh / base.height)
+            nw, nh = max(bw, round(base.width * scale)), max(bh, round(base.height * scale))
+            left, top = (nw - bw) // 2, (nh - bh) // 2
+            # The base is already blurred; bilinear upscaling keeps it smooth.
+            img = base.resize((nw, nh), Image.Resampling.BILINEAR).crop((left, top, left + bw, top + bh))
+        img = Image.alpha_composite(img.convert("RGBA"), self._overlay(key)).convert("RGB")
+
+        with self._lock:
+            self._composites[key] = img
+            self._composites.move_to_end(key)
+            while len(self._composites) > MAX_COMPOSITES:
+                self._composites.popitem(last=False)
+        return img
+
+    def render_async(self, size: tuple[int, int]) -> Future:
+        """`render(size)` on the worker thread; concurrent requests for one bucket share a future."""
+        key = bucket(size)
+        with self._lock:
+            future = self._pending.get(key)
+            if future is not None and not future.done():
+                return future
+            future = _executor.submit(self.render, key)
+            self._pending[key] = future
+        future.add_done_callback(lambda f: self._forget(key, f))
+        return future
+
+    def _forget(self, key: tuple[int, int], future: Future) -> None:
+        with self._lock:
+            if self._pending.get(key) is future:
+                del self._pending[key]
+
+    def cached(self, size: tuple[int, int]):  # type: ignore[no-untyped-def]
+        key = bucket(size)
+        with self._lock:
+            img = self._composites.get(key)
+            if img is not None:
+                self._composites.move_to_end(key)
+            return img
+
+    def nearest(self, size: tuple[int, int]):  # type: ignore[no-untyped-def]
+        """(bucket, image) of the cached composite closest to `size`, preferring ones that cover it."""
+        w, h = size
+        with self._lock:
+            if not self._composites:
+                return None
+
+            def rank(key: tuple[int, int]) -> tuple[bool, int]:
+                covers = key[0] >= w and key[1] >= h
+                return (not covers, abs(key[0] - w) + abs(key[1] - h))
+
+            key = min(self._composites, key=rank)
+            return key, self._composites[key]
+
+
+_renderers: dict[tuple[Path | None, BackgroundStyle], BackgroundRenderer] = {}
+
+
+def renderer_for(source: Path | None, style: BackgroundStyle) -> BackgroundRenderer:
+    """Shared renderer per source and style, so composites survive logout/login."""
+    key = (source, style)
+    if key not in _renderers:
+        _renderers[key] = BackgroundRenderer(source, style)
+    return _renderers[key]
+
+
+class CanvasBackground:
+    """
+    Keeps a canvas image item filled with the renderer's composite for the canvas size.
+
+    Call `refresh()` on `<Configure>`: cached sizes are shown at once, other sizes show the
+    nearest cached composite until the exact one arrives from the worker.
+    """
+
+    def __init__(self, canvas, renderer: BackgroundRenderer) -> None:  # type: ignore[no-untyped-def]
+        self.canvas = canvas
+        self.renderer = renderer
+        self.image_id = canvas.create_image(0, 0, anchor="center")
+        self._photos: OrderedDict[tuple[int, int], object] = OrderedDict()
+        self._shown: tuple[int, int] | None = None
+        self._size: tuple[int, int] | None = None
+        self._future: Future | None = None
+        canvas.configure(bg=renderer.style.fallback)
+
+    def refresh(self) -> None:
+        try:
+            w = max(1, int(self.canvas.winfo_width()))
+            h = max(1, int(self.canvas.winfo_height()))
+        except Exception:
+            return
+        if self._size == (w, h):
+            return
+        self._size = (w, h)
+        self.canvas.coords(self.image_id, w // 2, h // 2)
+
+        key = bucket((w, h))
+        if key == self._shown:
+            return
+        img = self.renderer.cached((w, h))
+        if img is not None:
+            self._show(key, img)
+            return
+        near = self.renderer.nearest((w, h))
+        if near is not None:
+            self._show(*near)
+
+        from .auth_service import when_done
+
+        if self._future is not None:
+            # Not started yet: a drag has moved past that size.
+            self._future.cancel()
+        future = self._future = self.renderer.render_async((w, h))
+        when_done(self.canvas, future, lambda f: self._on_rendered(f, key))
+
+    def _on_rendered(self, future: Future, key: tuple[int, int]) -> None:
+        if future is self._future:
+            self._future = None
+        if future.cancelled() or self._size is None or bucket(self._size) != key:
+            return
+        if future.exception() is not None:
+            # PIL missing or unreadable image: keep the solid fallback colour.
+            return
+        self._show(key, future.result())
+
+    def _show(self, key: tuple[int, int], img) -> None:  # type: ignore[no-untyped-def]
+        photo = self._photos.get(key)
+        if photo is None:
+            try:
+                from PIL import ImageTk  # type: ignore
+
+                photo = ImageTk.PhotoImage(img)
+            except Exception:
+                return
+            self._photos[key] = photo
+            while len(self._photos) > MAX_PHOTOS:
+                self._photos.popitem(last=False)
+        self._photos.move_to_end(key)
+        try:
+            self.canvas.itemconfigure(self.image_id, image=photo)
+        except Exception:
+            return
+        self._shown = key
@@ -0,0 +1,268 @@
+from __future__ import annotations
+
+import gzip
+import os
+import shutil
+import sqlite3
+import threading
+import time
+from datetime import datetime
+from pathlib import Path
+from threading import Event
+
+from . import database
+from .change_journal import get_journal
+from .export_service import ExportCancelled, ProgressCallback
+
+# Pages copied per backup step (4 KiB pages -> 4 MB). Between steps the source DB is unlocked, so
+# the app keeps writing while a large backup runs.
+BACKUP_PAGES_PER_STEP = 1024
+BACKUP_STEP_SLEEP_S = 0.005
+AUTO_BACKUP_CHECK_S = 300.0
+
+
+class BackupError(RuntimeError):
+    pass
+
+
+def backup_folder(folder: str | Path | None = None) -> Path:
+    if folder:
+        return Path(folder)
+    from .utils.app_settings import get_setting
+
+    configured = str(get_setting("backup_dir", "") or "").strip()
+    return Path(configured) if configured else database.DB_PATH.parent
+
+
+def _backup_glob() -> str:
+    return f"{database.DB_PATH.stem}_backup_*"
+
+
+def list_backups(folder: str | Path | None = None) -> list[Path]:
+    """Backups in `folder` (plain and .gz), newest first."""
+    folder = backup_folder(folder)
+    if not folder.exists():
+        return []
+    found = [p for p in folder.glob(_backup_glob()) if p.is_file() and ".part" not in p.name]
+    return sorted(found, key=lambda p: p.stat().st_mtime, reverse=True)
+
+
+def _claim_name(folder: Path, stem: str, suffix: str, *, part: str = "") -> Path:
+    """
+    `folder/<stem><suffix>`, or `<stem>-2<suffix>`, `-3`... if that is taken (two backups in one second).
+
+    The file `<name><part>` is created empty, so a concurrent caller cannot claim the same name.
+    """
+    n = 1
+    while True:
+        path = folder / (f"{stem}{suffix}" if n == 1 else f"{stem}-{n}{suffix}")
+        n += 1
+        if path.exists():
+            continue
+        try:
+            open(path.with_name(path.name + part), "x").close()
+        except FileExistsError:
+            continue
+        return path
+
+
+def _copy_pages(
+    src: sqlite3.Connection,
+    dst: sqlite3.Connection,
+    *,
+    progress: ProgressCallback | None = None,
+    cancel: Event | None = None,
+) -> None:
+    def on_step(_status: int, remaining: int, total: int) -> None:
+        if progress is not None:
+            progress(total - remaining, total)
+        if cancel is not None and cancel.is_set():
+            # Raising from the callback aborts the backup.
+            raise ExportCancelled()
+        time.sleep(BACKUP_STEP_SLEEP_S)
+
+    src.backup(dst, pages=BACKUP_PAGES_PER_STEP, progress=on_step)
+
+
+def _gzip_file(src: Path, dst: Path) -> None:
+    with open(src, "rb") as f_in, gzip.open(dst, "wb", compresslevel=6) as f_out:
+        shutil.copyfileobj(f_in, f_out, 1024 * 1024)
+
+
+def create_backup(
+    folder: str | Path | None = None,
+    *,
+    compress: bool = False,
+    progress: ProgressCallback | None = None,
+    cancel: Event | None = None,
+) -> Path:
+    """
+    Write a consistent copy of the live database into `folder` (default: the configured backup folder).
+
+    Uses SQLite's online backup API rather than a file copy, so a backup taken while the app is
+    writing is never torn. Pages are copied BACKUP_PAGES_PER_STEP at a time, reporting
+    `progress(pages_done, pages_total)` and honouring `cancel` between steps; run it on a worker
+    thread (e.g. a `BackgroundJob`). With `compress`, the result is gzipped (`.db.gz`).
+    """
+    db_path = database.DB_PATH
+    folder = backup_folder(folder)
+    folder.mkdir(parents=True, exist_ok=True)
+    ts = datetime.now().strftime("%Y%m%d_%H%M%S")
+    suffix = db_path.suffix + (".gz" if compress else "")
+    dst = _claim_name(folder, f"{db_path.stem}_backup_{ts}", suffix, part=".part")
+    tmp = dst.with_name(dst.name + ".part")
+    raw = tmp.with_name(tmp.name + ".db") if compress else tmp
+
+    # Marks this backup's place in the journal. Entries are written before their COMMIT, so one
+    # just ahead of the checkpoint may still be missing from the copy: recovery replays from the
+    # previous checkpoint, which is safe because entries are idempotent row images.
+    try:
+        get_journal().checkpoint(backup=dst.name)
+    except Exception:
+        pass
+
+    src = sqlite3.connect(db_path)
+    try:
+        out = sqlite3.connect(raw)
+        try:
+            _copy_pages(src, out, progress=progress, cancel=cancel)
+        finally:
+            out.close()
+        if compress:
+            _gzip_file(raw, tmp)
+        os.replace(tmp, dst)
+    except BaseException:
+        tmp.unlink(missing_ok=True)
+        raise
+    finally:
+        src.close()
+        if compress:
+            raw.unlink(missing_ok=True)
+    return dst
+
+
+def rotate_backups(folder: str | Path | None = None, *, keep: int) -> list[Path]:
+    """Delete all but the newest `keep` backups in `folder`; returns the deleted paths."""
+    if keep <= 0:
+        return []
+    removed = []
+    for old in list_backups(folder)[keep:]:
+        try:
+            old.unlink()
+            removed.append(old)
+        except OSError:
+            pass
+    return removed
+
+
+def check_integrity(path: str | Path) -> str:
+    """Run `PRAGMA integrity_check` on a database file; returns "ok" or the first problem found."""
+    conn = sqlite3.connect(f"file:{Path(path).as_posix()}?mode=ro", uri=True)
+    try:
+        row = conn.execute("PRAGMA integrity_check").fetchone()
+        return str(row[0]) if row else "no result"
+    except sqlite3.DatabaseError as e:
+        return str(e)
+    finally:
+        conn.close()
+
+
+def restore_backup(
+    path: str | Path,
+    *,
+    progress: ProgressCallback | None = None,
+    cancel: Event | None = None,
+) -> Path:
+    """
+    Replace the live database with the backup at `path` (plain or `.gz`); returns the safety copy.
+
+    The candidate is unpacked next to the live DB and must pass `PRAGMA integrity_check` before
+    anything is touched. The current database is then saved as a `_pre_restore_` backup, and the
+    candidate's pages are copied into the live file through the backup API, which takes SQLite's
+    locks, so other open connections see either the old or the new database, never a half-copied
+    file. Raises BackupError if the backup is unreadable or corrupt.
+    """
+    path = Path(path)
+    db_path = database.DB_PATH
+    candidate = db_path.with_name(f"{db_path.name}.restore")
+    try:
+        if path.suffix == ".gz":
+            with gzip.open(path, "rb") as f_in, open(candidate, "wb") as f_out:
+                shutil.copyfileobj(f_in, f_out, 1024 * 1024)
+        else:
+            shutil.copyfile(path, candidate)
+
+        result = check_integrity(candidate)
+        if result != "ok":
+            raise BackupError(f"{path.name} failed the integrity check: {result}")
+
+        ts = datetime.now().strftime("%Y%m%d_%H%M%S")
+        safety = _claim_name(db_path.parent, f"{db_path.stem}_pre_restore_{ts}", db_path.suffix)
+        live = sqlite3.connect(db_path)
+        try:
+            saved = sqlite3.connect(safety)
+            try:
+                live.backup(saved)
+            finally:
+                saved.close()
+            src = sqlite3.connect(candidate)
+            try:
+                _copy_pages(src, live, progress=progress, cancel=cancel)
+            finally:
+                src.close()
+        finally:
+            live.close()
+        return safety
+    finally:
+        candidate.unlink(missing_ok=True)
+
+
+def auto_backup_due(folder: str | Path | None = None, *, interval_hours: float) -> bool:
+    if interval_hours <= 0:
+        return False
+    backups = list_backups(folder)
+    if not backups:
+        return True
+    age_s = time.time() - backups[0].stat().st_mtime
+    return age_s >= interval_hours * 3600
+
+
+def run_auto_backup() -> Path | None:
+    """Take a backup if the newest one is older than the configured interval, then rotate."""
+    from .utils.app_settings import get_setting
+
+    interval = float(get_setting("auto_backup_interval_hours", 0) or 0)
+    if not auto_backup_due(interval_hours=interval):
+        return None
+    dst = create_backup(compress=bool(get_setting("auto_backup_compress", True)))
+    rotate_backups(keep=int(get_setting("auto_backup_keep", 7) or 0))
+    database.log_event("backup", f"Automatic backup created: {dst.name}", None, payload={"path": str(dst)})
+    return dst
+
+
+_scheduler: threading.Thread | None = None
+_stop = threading.Event()
+
+
+def start_auto_backup(check_s: float = AUTO_BACKUP_CHECK_S) -> None:
+    """Check every `check_s` on a daemon thread whether an automatic backup is due (idempotent)."""
+    global _scheduler
+    if _scheduler is not None and _scheduler.is_alive():
+        return
+
+    def loop() -> None:
+        while True:
+            try:
+                run_auto_backup()
+            except Exception:
+                pass
+            if _stop.wait(check_s):
+                return
+
+    _stop.clear()
+    _scheduler = threading.Thread(target=loop, name="auto-backup", daemon=True)
+    _scheduler.start()
+
+
+def stop_auto_backup() -> None:
+    _stop.set()
@@ -0,0 +1,25 @@
+"""Product listing and search without the UI, shared by the Inventory panel and the benchmarks."""
+
+from __future__ import annotations
+
+import sqlite3
+
+from .database import connect
+
+
+def search_products(keyword: str = "") -> list[sqlite3.Row]:
+    """
+    Inventory rows (newest first) whose name or category contains `keyword`, case-insensitively.
+
+    Rows have `id, name, category, supplier, unit, price, gst_percent, tax_percent, quantity, expiry`.
+    """
+    keyword = keyword.strip().lower()
+    with connect() as conn:
+        rows = conn.execute("""SELECT p.id, p.name, p.category, COALESCE(s.name, '') AS supplier,
+                      p.unit, p.price, p.gst_percent, p.tax_percent, p.quantity, p.expiry
+               FROM products p
+               LEFT JOIN suppliers s ON s.id = p.supplier_id
+               ORDER BY p.id DESC""").fetchall()
+    if not keyword:
+        return rows
+    return [r for r in rows if keyword in r["name"].lower() or keyword in r["category"].lower()]
@@ -0,0 +1,404 @@
+"""
+Append-only journal of product, stock and sale changes, for point-in-time recovery.
+
+Each committed transaction that changes `products` or `sales` appends one JSON line to
+`journal/changes-YYYY-MM.ndjson` next to the database:
+
+    {"seq": 812, "ts": "2026-05-01 14:30:12.345", "user": "admin",
+     "changes": [{"table": "products", "op": "upsert", "row": {...}}, ...]}
+
+Changes are full row images (or deletes by id), so replaying an entry twice is harmless and
+entries can be replayed on top of any backup taken before them. `create_backup` writes a
+checkpoint entry first; `recover` replays from the checkpoint before it, since an entry written
+just ahead of the checkpoint may only have been committed after the backup was taken.
+
+The journal is written ahead: callers record the change inside their transaction and then
+`commit_journaled()`, so a crash can never leave a committed change without its entry. If the
+journal cannot be written the error propagates and the transaction is not committed; if the
+commit fails after the entry was written, an abort marker tells `recover` to skip it.
+
+Writing is cheap enough for checkout: the rows are re-read from the connection that just
+changed them (already in SQLite's page cache), and the line is written to a file kept open in
+append mode and flushed to the OS, without an fsync, unless `journal_fsync` is enabled. Appends
+from several processes (the app and CLI jobs) are serialised by an OS lock on `journal/.lock`, so
+sequence numbers stay unique and an abort marker only ever names its own entry.
+"""
+
+from __future__ import annotations
+
+import gzip
+import json
+import os
+import shutil
+import sqlite3
+import threading
+from collections.abc import Iterable, Iterator
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from datetime import datetime
+from pathlib import Path
+
+from . import database
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
+
+JOURNAL_DIRNAME = "journal"
+JOURNAL_PATTERN = "changes-*.ndjson"
+JOURNALED_TABLES = ("products", "sales")
+TS_FORMAT = "%Y-%m-%d %H:%M:%S.%f"
+
+
+def journal_folder() -> Path:
+    return database.DB_PATH.parent / JOURNAL_DIRNAME
+
+
+def _now() -> str:
+    return datetime.now().strftime(TS_FORMAT)[:-3]
+
+
+def parse_ts(value: str | datetime) -> datetime:
+    if isinstance(value, datetime):
+        return value
+    return datetime.fromisoformat(str(value).strip().replace("T", " "))
+
+
+class ChangeJournal:
+    def __init__(self, folder: Path) -> None:
+        self.folder = folder
+        self._lock = threading.Lock()
+        self._seq: int | None = None
+        self._file = None
+        self._file_path: Path | None = None
+        self._size = -1
+        self._lock_file = None
+
+    def _last_seq(self) -> int:
+        # Only the tail of the newest file is read, however long the journal is.
+        for path in sorted(self.folder.glob(JOURNAL_PATTERN), reverse=True):
+            with open(path, "rb") as f:
+                f.seek(0, os.SEEK_END)
+                f.seek(max(0, f.tell() - 65536))
+                lines = f.read().splitlines()
+            for line in reversed(lines):
+                try:
+                    return int(json.loads(line)["seq"])
+                except (ValueError, KeyError):
+                    continue
+        return 0
+
+    def _open_for(self, ts: str) -> object:
+        path = self.folder / f"changes-{ts[:7]}.ndjson"
+        if self._file is None or self._file_path != path:
+            if self._file is not None:
+                self._file.close()
+            self.folder.mkdir(parents=True, exist_ok=True)
+            self._file = open(path, "a", encoding="utf-8")
+            self._file_path = path
+            self._size = -1
+        return self._file
+
+    @contextmanager
+    def _process_lock(self) -> Iterator[None]:
+        # The GUI and CLI jobs append to the same journal; without an OS lock two processes could
+        # read the same last seq and both write the next one.
+        if self._lock_file is None:
+            self.folder.mkdir(parents=True, exist_ok=True)
+            self._lock_file = open(self.folder / ".lock", "a+b")
+        fd = self._lock_file.fileno()
+        if fcntl is not None:
+            fcntl.flock(fd, fcntl.LOCK_EX)
+        else:
+            self._lock_file.seek(0)
+            while True:
+                try:
+                    msvcrt.locking(fd, msvcrt.LK_LOCK, 1)
+                    break
+                except OSError:  # LK_LOCK gives up after ~10 s
+                    continue
+        try:
+            yield
+        finally:
+            if fcntl is not None:
+                fcntl.flock(fd, fcntl.LOCK_UN)
+            else:
+                self._lock_file.seek(0)
+                msvcrt.locking(fd, msvcrt.LK_UNLCK, 1)
+
+    def append(self, changes: list[dict[str, object]], *, user: str | None = None, **extra: object) -> int:
+        """Write one entry; returns its sequence number."""
+        from .utils.app_settings import get_setting
+
+        with self._lock, self._process_lock():
+            ts = _now()
+            f = self._open_for(ts)
+            # Another process (e.g. a CLI job) appended since our last write: pick up its numbering.
+            if self._seq is None or os.fstat(f.fileno()).st_size != self._size:
+                self._seq = self._last_seq()
+            self._seq += 1
+            entry = {"seq": self._seq, "ts": ts, "user": user, **extra, "changes": changes}
+            f.write(json.dumps(entry, ensure_ascii=False, default=str, separators=(",", ":")) + "\n")
+            f.flush()
+            self._size = os.fstat(f.fileno()).st_size
+            if get_setting("journal_fsync", False):
+                os.fsync(f.fileno())
+            return self._seq
+
+    def checkpoint(self, **info: object) -> int:
+        return self.append([], checkpoint=info)
+
+    def close(self) -> None:
+        with self._lock:
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+            if self._lock_file is not None:
+                self._lock_file.close()
+                self._lock_file = None
+
+
+_journal: ChangeJournal | None = None
+_journal_lock = threading.Lock()
+
+
+def get_journal() -> ChangeJournal:
+    global _journal
+    folder = journal_folder()
+    with _journal_lock:
+        # DB_PATH can be switched (CLI --db, tests); follow it.
+        if _journal is None or _journal.folder != folder:
+            if _journal is not None:
+                _journal.close()
+            _journal = ChangeJournal(folder)
+        return _journal
+
+
+class JournalError(RuntimeError):
+    pass
+
+
+def record_rows(
+    conn: sqlite3.Connection,
+    tables: dict[str, Iterable[int]],
+    *,
+    user: str | None = None,
+) -> int | None:
+    """
+    Journal the current image of the given rows, e.g. `{"products": [3], "sales": [41, 42]}`.
+
+    Call it after making the change and before committing it, with the same connection, so the
+    rows are read from the page cache; then commit with `commit_journaled`. Returns the entry's
+    sequence number, or None when nothing matched. Raises JournalError when the entry cannot be
+    written, so the caller's transaction is rolled back rather than committed unjournaled.
+    """
+    changes: list[dict[str, object]] = []
+    for table, ids in tables.items():
+        id_list = sorted({int(i) for i in ids})
+        if id_list:
+            changes += _upserts(conn, table, f"id IN ({', '.join('?' * len(id_list))})", id_list)
+    return _append(changes, user=user)
+
+
+def record_where(
+    conn: sqlite3.Connection,
+    table: str,
+    where: str,
+    params: Iterable[object] = (),
+    *,
+    user: str | None = None,
+) -> int | None:
+    """Like `record_rows`, for bulk changes whose rows are easier to select with a WHERE clause."""
+    return _append(_upserts(conn, table, where, list(params)), user=user)
+
+
+def _upserts(
+    conn: sqlite3.Connection, table: str, where: str, params: list[object]
+) -> list[dict[str, object]]:
+    try:
+        cur = conn.execute(f"SELECT * FROM {table} WHERE {where}", params)
+        names = [d[0] for d in cur.description]
+        return [{"table": table, "op": "upsert", "row": dict(zip(names, r, strict=True))} for r in cur]
+    except sqlite3.Error as e:
+        raise JournalError(f"Could not read {table} rows for the change journal: {e}") from e
+
+
+def record_delete(table: str, ids: Iterable[int], *, user: str | None = None) -> int | None:
+    """Journal deleted rows by id; like `record_rows`, call it before committing the delete."""
+    return _append([{"table": table, "op": "delete", "id": int(i)} for i in ids], user=user)
+
+
+def _append(changes: list[dict[str, object]], *, user: str | None) -> int | None:
+    if not changes:
+        return None
+    try:
+        return get_journal().append(changes, user=user)
+    except OSError as e:
+        raise JournalError(f"Could not write the change journal ({journal_folder()}): {e}") from e
+
+
+def commit_journaled(conn: sqlite3.Connection, seq: int | None) -> None:
+    """Commit a transaction journaled as entry `seq`; if the commit fails, mark the entry aborted."""
+    try:
+        conn.commit()
+    except BaseException:
+        if seq is not None:
+            try:
+                get_journal().append([], aborted=seq)
+            except OSError:
+                # Recovery may then replay the lost change; the commit error below is what matters.
+                pass
+        raise
+
+
+def iter_entries(folder: str | Path | None = None) -> Iterator[dict[str, object]]:
+    """Journal entries in sequence order."""
+    folder = Path(folder) if folder else journal_folder()
+    for path in sorted(folder.glob(JOURNAL_PATTERN)):
+        with open(path, encoding="utf-8") as f:
+            for line in f:
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    yield json.loads(line)
+                except ValueError:
+                    # A torn last line from a crash mid-write; everything before it is intact.
+                    continue
+
+
+@dataclass
+class RecoveryResult:
+    path: Path
+    backup: Path
+    applied: int
+    last_seq: int
+    last_ts: str | None
+    # Changes that could not be replayed, e.g. a barcode that another row holds by then.
+    conflicts: list[str] = field(default_factory=list)
+
+
+def _table_columns(conn: sqlite3.Connection, table: str) -> list[str]:
+    return [r[1] for r in conn.execute(f"PRAGMA table_info({table})")]
+
+
+def _apply(conn: sqlite3.Connection, change: dict[str, object], columns: dict[str, list[str]]) -> None:
+    table = str(change.get("table"))
+    if table not in JOURNALED_TABLES:
+        return
+    if change.get("op") == "delete":
+        conn.execute(f"DELETE FROM {table} WHERE id = ?", (change["id"],))
+        return
+    row = change.get("row") or {}
+    # Backups can predate a schema migration; only write the columns they have.
+    cols = [c for c in columns[table] if c in row]  # type: ignore[operator]
+    # Upsert by primary key only: INSERT OR REPLACE would also delete whatever row clashes on
+    # another unique column (a barcode), silently dropping it from the recovered database.
+    updates = ", ".join(f"{c} = excluded.{c}" for c in cols if c != "id")
+    conn.execute(
+        f"INSERT INTO {table} ({', '.join(cols)}) VALUES ({', '.join('?' * len(cols))}) "
+        f"ON CONFLICT(id) DO UPDATE SET {updates}",
+        [row[c] for c in cols],  # type: ignore[index]
+    )
+
+
+def _replay_window(backup: Path, folder: Path | None) -> tuple[int, int]:
+    """
+    `(start, checkpoint)`: replay entries after `start`, the checkpoint before the backup's own.
+
+    Entries are written before their COMMIT, so one appended just ahead of the backup's
+    checkpoint may only have committed after the snapshot was taken. Replaying from the previous
+    checkpoint covers it; re-applying entries the backup already holds is harmless.
+    """
+    previous = 0
+    for entry in iter_entries(folder):
+        info = entry.get("checkpoint")
+        if isinstance(info, dict):
+            if info.get("backup") == backup.name:
+                return previous, int(entry["seq"])
+            previous = int(entry["seq"])
+    return 0, 0
+
+
+def recover(
+    target: str | datetime,
+    *,
+    backup: str | Path | None = None,
+    out: str | Path | None = None,
+    journal: str | Path | None = None,
+) -> RecoveryResult:
+    """
+    Rebuild the database as it was at `target` into a new file; returns where it was written.
+
+    Starts from `backup` (default: the newest backup taken before `target`) and replays journal
+    entries from the checkpoint before that backup's own up to and including `target`, skipping
+    aborted ones. A change after the backup's checkpoint that breaks another unique constraint
+    (e.g. a barcode) is not replayed and is listed in `conflicts`; before it, such a clash only
+    means the backup already holds a later state. The live database is not touched; check the result, then swap it in with
+    `restore_backup`.
+    """
+    from .backup_service import BackupError, check_integrity, list_backups
+
+    target_dt = parse_ts(target)
+    folder = Path(journal) if journal else None
+    if backup is None:
+        candidates = [p for p in list_backups() if datetime.fromtimestamp(p.stat().st_mtime) <= target_dt]
+        if not candidates:
+            raise BackupError(f"No backup taken before {target_dt:%Y-%m-%d %H:%M:%S}.")
+        backup = candidates[0]
+    backup = Path(backup)
+
+    db_path = database.DB_PATH
+    out = (
+        Path(out)
+        if out
+        else db_path.with_name(f"{db_path.stem}_recovered_{target_dt:%Y%m%d_%H%M%S}{db_path.suffix}")
+    )
+    tmp = out.with_name(out.name + ".part")
+    if backup.suffix == ".gz":
+        with gzip.open(backup, "rb") as f_in, open(tmp, "wb") as f_out:
+            shutil.copyfileobj(f_in, f_out, 1024 * 1024)
+    else:
+        shutil.copyfile(backup, tmp)
+
+    start_seq, checkpoint_seq = _replay_window(backup, folder)
+    aborted = {int(e["aborted"]) for e in iter_entries(folder) if e.get("aborted") is not None}
+    applied = 0
+    last_seq = checkpoint_seq
+    last_ts: str | None = None
+    conflicts: list[str] = []
+    try:
+        conn = sqlite3.connect(tmp)
+        try:
+            columns = {t: _table_columns(conn, t) for t in JOURNALED_TABLES}
+            for entry in iter_entries(folder):
+                seq = int(entry["seq"])
+                if seq <= start_seq or seq in aborted or "aborted" in entry or "checkpoint" in entry:
+                    continue
+                if parse_ts(str(entry["ts"])) > target_dt:
+                    continue
+                for change in entry.get("changes") or []:  # type: ignore[union-attr]
+                    try:
+                        _apply(conn, change, columns)
+                    except sqlite3.IntegrityError as e:
+                        if seq < checkpoint_seq:
+                            continue
+                        row_id = change.get("id") or (change.get("row") or {}).get("id")  # type: ignore[union-attr]
+                        conflicts.append(f"seq {seq}: {change.get('table')} id {row_id} not replayed ({e})")
+                applied += 1
+                last_seq, last_ts = seq, str(entry["ts"])
+            conn.commit()
+        finally:
+            conn.close()
+        result = check_integrity(tmp)
+        if result != "ok":
+            raise BackupError(f"Recovered database failed the integrity check: {result}")
+        os.replace(tmp, out)
+    except BaseException:
+        tmp.unlink(missing_ok=True)
+        raise
+    return RecoveryResult(
+        path=out, backup=backup, applied=applied, last_seq=last_seq, last_ts=last_ts, conflicts=conflicts
+    )
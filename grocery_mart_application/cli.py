@@ -0,0 +1,411 @@
+"""
+Headless `grocery-mart <command>` entry point for scripts and scheduled jobs.
+
+Only stdlib and the service modules are imported here: no tkinter, ttkbootstrap or matplotlib, so
+commands start instantly on machines without a display. Run `grocery-mart` with no arguments to
+start the desktop app instead.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import sys
+from datetime import date
+from pathlib import Path
+
+from . import __version__, database
+
+CLI_USER = "cli"
+
+
+def _log(event_type: str, message: str) -> None:
+    database.log_event(event_type, message, CLI_USER)
+
+
+def cmd_init_db(_args: argparse.Namespace) -> int:
+    database.setup_database()
+    print(f"Database ready: {database.DB_PATH}")
+    return 0
+
+
+def cmd_import_catalog(args: argparse.Namespace) -> int:
+    from .import_service import import_catalog, write_error_report
+
+    result = import_catalog(args.file, create_suppliers=not args.no_create_suppliers)
+    _log(
+        "product",
+        f"Imported catalog {Path(args.file).name}: {result.inserted} added, {result.updated} updated, "
+        f"{len(result.errors)} rejected",
+    )
+    print(
+        f"rows={result.rows} added={result.inserted} updated={result.updated} "
+        f"duplicates={result.duplicates} new_suppliers={result.suppliers_created} rejected={len(result.errors)}"
+    )
+    if result.errors:
+        if args.errors:
+            write_error_report(result.errors, args.errors)
+            print(f"Rejected rows written to {args.errors}")
+        else:
+            for e in result.errors[:20]:
+                print(f"  row {e.row}: {e.message}", file=sys.stderr)
+            if len(result.errors) > 20:
+                print(
+                    f"  ... {len(result.errors) - 20} more (use --errors FILE for the full report)",
+                    file=sys.stderr,
+                )
+    return 0
+
+
+def cmd_import_sales(args: argparse.Namespace) -> int:
+    from .columnar_export import import_sales_columnar
+
+    inserted = import_sales_columnar(args.src)
+    _log("import", f"Sales history imported from {Path(args.src).name} ({inserted} rows)")
+    print(f"imported={inserted}")
+    return 0
+
+
+def cmd_export_table(args: argparse.Namespace) -> int:
+    from .export_service import export_query, stream_query_to_file
+
+    sql, params = export_query(args.table, date_from=args.date_from or "", date_to=args.date_to or "")
+    written = stream_query_to_file(sql, params, path=args.out)
+    _log("export", f"{args.table.title()} exported to {Path(args.out).name}")
+    print(f"exported={written} path={args.out}")
+    return 0
+
+
+def cmd_export_history(args: argparse.Namespace) -> int:
+    from .columnar_export import export_sales_columnar
+
+    written = export_sales_columnar(
+        args.dest, fmt=args.format, partition=args.partition, incremental=not args.full
+    )
+    _log("export", f"Sales history exported to {Path(args.dest).name} ({written} rows)")
+    print(f"exported={written} path={args.dest}")
+    return 0
+
+
+def cmd_backup(args: argparse.Namespace) -> int:
+    from .backup_service import create_backup, rotate_backups
+
+    dst = create_backup(args.dir, compress=args.compress)
+    if args.keep:
+        rotate_backups(args.dir, keep=args.keep)
+    _log("backup", f"Database backup created: {dst.name}")
+    print(dst)
+    return 0
+
+
+def cmd_restore(args: argparse.Namespace) -> int:
+    from .backup_service import restore_backup
+
+    safety = restore_backup(args.file)
+    _log("backup", f"Database restored from {Path(args.file).name}")
+    print(f"restored={args.file} previous={safety}")
+    return 0
+
+
+def cmd_reindex(args: argparse.Namespace) -> int:
+    # main() has already run setup_database, which creates any index added since the DB was created.
+    with database.connect() as conn:
+        conn.execute("REINDEX")
+        conn.execute("ANALYZE")
+        conn.execute("PRAGMA optimize")
+        conn.commit()
+        if args.vacuum:
+            # Switch older databases to incremental auto-vacuum (takes effect with this VACUUM).
+            conn.execute("PRAGMA auto_vacuum = INCREMENTAL")
+            conn.execute("VACUUM")
+        ok = conn.execute("PRAGMA quick_check").fetchone()[0]
+    _log("maintenance", "Reindexed database" + (" and vacuumed" if args.vacuum else ""))
+    print(f"reindexed vacuum={'yes' if args.vacuum else 'no'} check={ok}")
+    return 0 if ok == "ok" else 1
+
+
+def cmd_recover(args: argparse.Namespace) -> int:
+    from .change_journal import recover
+
+    result = recover(args.to, backup=args.backup, out=args.out)
+    _log(
+        "backup",
+        f"Recovered database to {args.to} from {result.backup.name} ({result.applied} journal entries)",
+    )
+    print(
+        f"recovered={result.path} backup={result.backup} applied={result.applied} "
+        f"last_seq={result.last_seq} last_change={result.last_ts or '-'}"
+    )
+    for conflict in result.conflicts:
+        print(f"conflict: {conflict}")
+    print(f"Check it, then run: grocery-mart restore {result.path}")
+    return 1 if result.conflicts else 0
+
+
+def cmd_prune_activity(args: argparse.Namespace) -> int:
+    from .retention_service import apply_retention
+
+    result = apply_retention(
+        days=args.days, max_rows=args.max_rows, folder=args.archive_dir, dry_run=args.dry_run
+    )
+    if args.dry_run:
+        print(f"would_archive={result.archived}")
+        return 0
+    if result.archived:
+        _log("maintenance", f"Archived {result.archived} activity events")
+    print(f"archived={result.archived} files={len(result.files)} vacuumed_pages={result.vacuumed_pages}")
+    return 0
+
+
+def cmd_invoice(args: argparse.Namespace) -> int:
+    from .invoice_generator import missing_invoice_sale_ids, regenerate_invoice
+
+    sale_ids = list(args.sale_ids)
+    if args.missing:
+        sale_ids += missing_invoice_sale_ids()
+    if not sale_ids:
+        print("No invoices to regenerate.")
+        return 0
+
+    failed = 0
+    for sale_id in sale_ids:
+        try:
+            print(regenerate_invoice(sale_id, folder=args.folder))
+        except Exception as e:
+            failed += 1
+            print(f"Sale {sale_id}: {e}", file=sys.stderr)
+    _log("invoice", f"Regenerated {len(sale_ids) - failed} invoice(s)")
+    return 1 if failed else 0
+
+
+def collect_stats() -> dict[str, object]:
+    from .utils.app_settings import get_setting
+
+    threshold = int(get_setting("inventory_low_stock_threshold", 5) or 5)
+    today = date.today().isoformat()
+    with database.connect() as conn:
+        products = conn.execute(
+            """SELECT COUNT(*) AS n, COALESCE(SUM(quantity), 0) AS units,
+                      COALESCE(SUM(price * quantity), 0) AS value,
+                      COALESCE(SUM(quantity <= ?), 0) AS low
+               FROM products""",
+            (threshold,),
+        ).fetchone()
+        sales = conn.execute(
+            """SELECT COUNT(*) AS n, COALESCE(SUM(total_price), 0) AS revenue, MAX(sale_date) AS last
+               FROM sales"""
+        ).fetchone()
+        today_row = conn.execute(
+            "SELECT COUNT(*) AS n, COALESCE(SUM(total_price), 0) AS revenue FROM sales WHERE sale_date >= ?",
+            (today,),
+        ).fetchone()
+        suppliers = conn.execute("SELECT COUNT(*) FROM suppliers").fetchone()[0]
+        events = conn.execute("SELECT COUNT(*) FROM activity_log").fetchone()[0]
+
+    db_path = database.DB_PATH
+    return {
+        "database": str(db_path),
+        "database_bytes": db_path.stat().st_size if db_path.exists() else 0,
+        "products": int(products["n"]),
+        "stock_units": int(products["units"]),
+        "stock_value": round(float(products["value"]), 2),
+        "low_stock": int(products["low"]),
+        "suppliers": int(suppliers),
+        "sale_lines": int(sales["n"]),
+        "revenue_total": round(float(sales["revenue"]), 2),
+        "sale_lines_today": int(today_row["n"]),
+        "revenue_today": round(float(today_row["revenue"]), 2),
+        "last_sale": sales["last"],
+        "activity_events": int(events),
+    }
+
+
+def cmd_seed(args: argparse.Namespace) -> int:
+    from .demo_data import generate
+    from .perf_bench import parse_size
+
+    products = parse_size(args.products)
+    sales = parse_size(args.sales) if args.sales else products
+    # Without an explicit --db this is the live database: relax fsync only if it is still empty.
+    counts = generate(
+        products=products,
+        sales=sales,
+        seed=args.seed,
+        days=args.days,
+        activity=not args.no_activity,
+        relaxed=True if args.db else None,
+    )
+    _log(
+        "maintenance",
+        f"Seeded {counts.products} synthetic products and {counts.sales} sales (seed {args.seed})",
+    )
+    print(
+        f"suppliers={counts.suppliers} products={counts.products} invoices={counts.invoices} "
+        f"sales={counts.sales} events={counts.events}"
+    )
+    return 0
+
+
+def cmd_slow_queries(args: argparse.Namespace) -> int:
+    from dataclasses import asdict
+
+    from . import slow_query_log
+
+    if args.clear:
+        print(f"cleared={slow_query_log.clear()}")
+        return 0
+    rows = slow_query_log.report(limit=args.limit, since=args.since)
+    if args.json:
+        print(json.dumps([asdict(r) for r in rows], indent=2))
+        return 0
+    if not rows:
+        print(f"No statements slower than {slow_query_log.threshold_ms():g} ms recorded.")
+        return 0
+    for r in rows:
+        flag = "  FULL SCAN" if r.full_scan else ""
+        print(f"{r.count:>5}x  avg {r.avg_ms:9.1f} ms  max {r.max_ms:9.1f} ms  last {r.last_seen}{flag}")
+        print("       " + " ".join(r.sql.split()))
+        if r.params:
+            print(f"       params: {r.params}")
+        for line in (r.plan or "").splitlines():
+            print(f"       | {line}")
+        print()
+    return 0
+
+
+def cmd_stats(args: argparse.Namespace) -> int:
+    stats = collect_stats()
+    if args.json:
+        print(json.dumps(stats, indent=2))
+    else:
+        width = max(len(k) for k in stats)
+        for key, value in stats.items():
+            print(f"{key.ljust(width)}  {value}")
+    return 0
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        prog="grocery-mart",
+        description="Grocery Mart batch commands. Run without arguments to start the desktop app.",
+    )
+    parser.add_argument("--version", action="version", version=f"%(prog)s {__version__}")
+    parser.add_argument(
+        "--db", help="Database file (default: $GROCERY_MART_DB_PATH or ./grocery_inventory.db)"
+    )
+    sub = parser.add_subparsers(dest="command", required=True, metavar="COMMAND")
+
+    p = sub.add_parser("init-db", help="Create/migrate the database schema")
+    p.set_defaults(func=cmd_init_db)
+
+    p = sub.add_parser("import", help="Bulk import a product catalog or a sales history dataset")
+    kinds = p.add_subparsers(dest="kind", required=True, metavar="KIND")
+    c = kinds.add_parser("catalog", help="Upsert products from a CSV/XLSX file")
+    c.add_argument("file")
+    c.add_argument("--errors", metavar="CSV", help="Write rejected rows to this CSV file")
+    c.add_argument("--no-create-suppliers", action="store_true", help="Leave unknown supplier names unlinked")
+    c.set_defaults(func=cmd_import_catalog)
+    c = kinds.add_parser("sales", help="Load a sales history dataset written by `export sales-history`")
+    c.add_argument("src")
+    c.set_defaults(func=cmd_import_sales)
+
+    p = sub.add_parser("export", help="Export a table to CSV/XLSX, or sales history to a columnar dataset")
+    kinds = p.add_subparsers(dest="kind", required=True, metavar="KIND")
+    for table in ("products", "inventory", "sales", "suppliers"):
+        c = kinds.add_parser(table, help=f"Export {table} (format from the file suffix: .csv or .xlsx)")
+        c.add_argument("out")
+        if table == "sales":
+            c.add_argument("--from", dest="date_from", metavar="YYYY-MM-DD")
+            c.add_argument("--to", dest="date_to", metavar="YYYY-MM-DD")
+        c.set_defaults(func=cmd_export_table, table=table, date_from=None, date_to=None)
+    c = kinds.add_parser("sales-history", help="Partitioned Parquet/Arrow/NDJSON dataset (incremental)")
+    c.add_argument("dest")
+    c.add_argument("--format", choices=["parquet", "arrow", "ndjson"], default="parquet")
+    c.add_argument("--partition", choices=["month", "day", "none"], default="month")
+    c.add_argument("--full", action="store_true", help="Export every sale instead of only new ones")
+    c.set_defaults(func=cmd_export_history)
+
+    p = sub.add_parser("backup", help="Write a consistent database backup")
+    p.add_argument("--dir", help="Backup folder (default: the folder set in Settings, else next to the DB)")
+    p.add_argument("--compress", action="store_true", help="Write a gzip-compressed backup (.db.gz)")
+    p.add_argument(
+        "--keep", type=int, metavar="N", help="Then delete all but the newest N backups in the folder"
+    )
+    p.set_defaults(func=cmd_backup)
+
+    p = sub.add_parser("restore", help="Replace the database with a verified backup (.db or .db.gz)")
+    p.add_argument("file")
+    p.set_defaults(func=cmd_restore)
+
+    p = sub.add_parser("reindex", help="Create missing indexes, rebuild indexes and refresh planner stats")
+    p.add_argument("--vacuum", action="store_true", help="Also VACUUM to reclaim free space")
+    p.set_defaults(func=cmd_reindex)
+
+    p = sub.add_parser("recover", help="Rebuild the database as of a point in time (backup + change journal)")
+    p.add_argument("--to", required=True, metavar="'YYYY-MM-DD HH:MM[:SS]'", help="Local time to recover to")
+    p.add_argument("--backup", help="Start from this backup (default: newest backup taken before --to)")
+    p.add_argument("--out", help="Write the recovered database here (default: next to the live DB)")
+    p.set_defaults(func=cmd_recover)
+
+    p = sub.add_parser("prune-activity", help="Move old activity log events into monthly .ndjson.gz archives")
+    p.add_argument(
+        "--days", type=int, help="Keep events newer than this many days (default: setting, 0 = no limit)"
+    )
+    p.add_argument(
+        "--max-rows", type=int, help="Keep at most this many events (default: setting, 0 = no limit)"
+    )
+    p.add_argument(
+        "--archive-dir", help="Archive folder (default: setting, else activity_archive/ next to the DB)"
+    )
+    p.add_argument("--dry-run", action="store_true", help="Only count the events that would be archived")
+    p.set_defaults(func=cmd_prune_activity)
+
+    p = sub.add_parser("invoice", help="Regenerate invoice PDFs from recorded sales")
+    p.add_argument("sale_ids", nargs="*", type=int, metavar="SALE_ID", help="Any sale id on the invoice")
+    p.add_argument("--missing", action="store_true", help="Regenerate every invoice whose PDF is missing")
+    p.add_argument("--folder", default="invoices", help="Folder for invoices without a recorded path")
+    p.set_defaults(func=cmd_invoice)
+
+    p = sub.add_parser("seed", help="Append a seeded synthetic store history (load tests, demos)")
+    p.add_argument("--products", default="1000", help="Products to generate: 500, 10k, 1m... (default 1000)")
+    p.add_argument(
+        "--sales", help="Sale lines to generate, grouped into invoices (default: same as --products)"
+    )
+    p.add_argument(
+        "--seed", type=int, default=0, help="Random seed; the same seed gives the same data (default 0)"
+    )
+    p.add_argument("--days", type=int, default=365, help="Days of sales history ending today (default 365)")
+    p.add_argument("--no-activity", action="store_true", help="Do not generate activity log events")
+    p.set_defaults(func=cmd_seed)
+
+    p = sub.add_parser(
+        "slow-queries", help="Report statements slower than slow_query_threshold_ms, with plans"
+    )
+    p.add_argument("--limit", type=int, default=20, help="Show this many statements (default 20)")
+    p.add_argument("--since", metavar="'YYYY-MM-DD[ HH:MM:SS]'", help="Only occurrences since then (UTC)")
+    p.add_argument("--json", action="store_true", help="Machine-readable output")
+    p.add_argument("--clear", action="store_true", help="Empty the slow-query log instead")
+    p.set_defaults(func=cmd_slow_queries)
+
+    p = sub.add_parser("stats", help="Print catalog, stock and sales totals")
+    p.add_argument("--json", action="store_true", help="Machine-readable output")
+    p.set_defaults(func=cmd_stats)
+
+    return parser
+
+
+def main(argv: list[str] | None = None) -> int:
+    args = build_parser().parse_args(argv)
+    if args.db:
+        database.DB_PATH = Path(args.db).expanduser().resolve()
+    if args.command != "init-db":
+        database.setup_database()
+    try:
+        return int(args.func(args))
+    except Exception as e:
+        print(f"Error: {e}", file=sys.stderr)
+        return 1
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
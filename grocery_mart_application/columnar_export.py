@@ -0,0 +1,376 @@
+from __future__ import annotations
+
+import gzip
+import json
+import os
+from collections.abc import Iterator
+from datetime import datetime
+from pathlib import Path
+from threading import Event
+
+from .change_journal import commit_journaled, record_where
+from .database import connect
+from .export_service import DEFAULT_CHUNK_SIZE, ExportCancelled, ProgressCallback
+
+# Column name -> logical type. Arrow formats map these to typed columns; NDJSON records them in the manifest.
+SALES_SCHEMA: list[tuple[str, str]] = [
+    ("id", "int64"),
+    ("product_name", "string"),
+    ("quantity", "int64"),
+    ("unit_price", "float64"),
+    ("subtotal", "float64"),
+    ("gst_percent", "float64"),
+    ("tax_percent", "float64"),
+    ("tax_amount", "float64"),
+    ("total_price", "float64"),
+    ("buyer_name", "string"),
+    ("buyer_mobile", "string"),
+    ("sale_date", "timestamp"),
+    ("invoice_path", "string"),
+]
+SALES_COLUMNS = [name for name, _t in SALES_SCHEMA]
+
+FORMATS = {
+    "parquet": ".parquet",
+    "arrow": ".arrow",
+    "ndjson": ".ndjson.gz",
+}
+PARTITIONS = ("month", "day", "none")
+
+MANIFEST_NAME = "_manifest.json"
+_DATE_FMT = "%Y-%m-%d %H:%M:%S"
+
+
+def _pyarrow():  # type: ignore[no-untyped-def]
+    try:
+        import pyarrow as pa  # type: ignore
+
+        return pa
+    except Exception as e:
+        raise RuntimeError(
+            "Missing dependency: pyarrow. Install with `pip install pyarrow`, or use the NDJSON format."
+        ) from e
+
+
+def available_formats() -> list[str]:
+    try:
+        _pyarrow()
+    except RuntimeError:
+        return ["ndjson"]
+    return list(FORMATS)
+
+
+def _arrow_schema(pa):  # type: ignore[no-untyped-def]
+    types = {
+        "int64": pa.int64(),
+        "float64": pa.float64(),
+        "string": pa.string(),
+        "timestamp": pa.timestamp("s"),
+    }
+    return pa.schema([pa.field(name, types[t]) for name, t in SALES_SCHEMA])
+
+
+def _parse_ts(raw: object) -> datetime | None:
+    if raw is None or raw == "":
+        return None
+    try:
+        return datetime.strptime(str(raw)[:19], _DATE_FMT)
+    except ValueError:
+        try:
+            return datetime.fromisoformat(str(raw))
+        except ValueError:
+            return None
+
+
+def _partition_key(sale_date: datetime | None, partition: str) -> str:
+    if partition == "none":
+        return ""
+    if sale_date is None:
+        return "sale_month=unknown" if partition == "month" else "sale_day=unknown"
+    if partition == "day":
+        return f"sale_day={sale_date:%Y-%m-%d}"
+    return f"sale_month={sale_date:%Y-%m}"
+
+
+class _PartWriter:
+    """One output file inside one partition directory; written as `.part` and renamed on commit."""
+
+    def __init__(self, final: Path, fmt: str):
+        self.final = final
+        self.tmp = final.with_name(final.name + ".part")
+        self.fmt = fmt
+        self.rows = 0
+        final.parent.mkdir(parents=True, exist_ok=True)
+        if fmt == "ndjson":
+            self._f = gzip.open(self.tmp, "wt", encoding="utf-8")
+        else:
+            pa = _pyarrow()
+            self._pa = pa
+            self._schema = _arrow_schema(pa)
+            if fmt == "parquet":
+                import pyarrow.parquet as pq  # type: ignore
+
+                self._writer = pq.ParquetWriter(str(self.tmp), self._schema, compression="zstd")
+            else:
+                self._sink = pa.OSFile(str(self.tmp), "wb")
+                self._writer = pa.ipc.new_file(self._sink, self._schema)
+
+    def write(self, records: list[dict[str, object]]) -> None:
+        if self.fmt == "ndjson":
+            for rec in records:
+                out = dict(rec)
+                ts = out.get("sale_date")
+                out["sale_date"] = ts.strftime(_DATE_FMT) if isinstance(ts, datetime) else None
+                self._f.write(json.dumps(out, separators=(",", ":")) + "\n")
+        else:
+            columns = {name: [r.get(name) for r in records] for name in SALES_COLUMNS}
+            self._writer.write_batch(self._pa.RecordBatch.from_pydict(columns, schema=self._schema))
+        self.rows += len(records)
+
+    def close(self) -> None:
+        if self.fmt == "ndjson":
+            self._f.close()
+        else:
+            self._writer.close()
+            if self.fmt == "arrow":
+                self._sink.close()
+
+    def commit(self) -> None:
+        os.replace(self.tmp, self.final)
+
+    def discard(self) -> None:
+        try:
+            self.close()
+        except Exception:
+            pass
+        try:
+            self.tmp.unlink(missing_ok=True)
+        except Exception:
+            pass
+
+
+def read_manifest(dest: str | Path) -> dict[str, object]:
+    path = Path(dest) / MANIFEST_NAME
+    try:
+        data = json.loads(path.read_text(encoding="utf-8"))
+        return data if isinstance(data, dict) else {}
+    except Exception:
+        return {}
+
+
+def _write_manifest(dest: Path, data: dict[str, object]) -> None:
+    path = dest / MANIFEST_NAME
+    tmp = path.with_name(path.name + ".tmp")
+    tmp.write_text(json.dumps(data, indent=2), encoding="utf-8")
+    os.replace(tmp, path)
+
+
+def export_sales_columnar(
+    dest: str | Path,
+    *,
+    fmt: str = "parquet",
+    partition: str = "month",
+    incremental: bool = True,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    progress: ProgressCallback | None = None,
+    cancel: Event | None = None,
+) -> int:
+    """
+    Export the sales history into a partitioned dataset directory and return the number of rows written.
+
+    Layout (hive-style, readable by pandas/pyarrow/DuckDB/Spark):
+        dest/_manifest.json
+        dest/sale_month=2026-01/part-<first id>.parquet
+
+    With `incremental=True` only sales with `id` above the manifest's `last_sale_id` are written, so a
+    nightly run appends new part files instead of rewriting history; it raises ValueError if `fmt` or
+    `partition` differ from the existing dataset's. A full export (`incremental=False`) replaces the
+    dataset: once its parts are committed, the previous part files are deleted. The watermark only
+    moves after every part file has been committed.
+    """
+    if fmt not in FORMATS:
+        raise ValueError(f"Unknown format: {fmt}")
+    if partition not in PARTITIONS:
+        raise ValueError(f"Unknown partitioning: {partition}")
+    if fmt != "ndjson":
+        _pyarrow()
+
+    dest = Path(dest)
+    dest.mkdir(parents=True, exist_ok=True)
+    manifest = read_manifest(dest)
+    if incremental and manifest:
+        # Mixing layouts in one dataset would break readers that expect one format and partitioning.
+        old_fmt, old_partition = manifest.get("format"), manifest.get("partition")
+        if (old_fmt, old_partition) != (fmt, partition):
+            raise ValueError(
+                f"{dest} holds a {old_fmt} dataset partitioned by {old_partition}; "
+                f"run a full export to switch to {fmt} by {partition}."
+            )
+    since_id = int(manifest.get("last_sale_id", 0) or 0) if incremental else 0
+
+    writers: dict[str, _PartWriter] = {}
+    written = 0
+    last_id = since_id
+    try:
+        with connect() as conn:
+            total = int(conn.execute("SELECT COUNT(*) FROM sales WHERE id > ?", (since_id,)).fetchone()[0])
+            if progress is not None:
+                progress(0, total)
+            cur = conn.execute(
+                f"SELECT {', '.join(SALES_COLUMNS)} FROM sales WHERE id > ? ORDER BY id",
+                (since_id,),
+            )
+            while True:
+                if cancel is not None and cancel.is_set():
+                    raise ExportCancelled()
+                rows = cur.fetchmany(chunk_size)
+                if not rows:
+                    break
+
+                batches: dict[str, list[dict[str, object]]] = {}
+                for row in rows:
+                    rec = dict(zip(SALES_COLUMNS, tuple(row), strict=True))
+                    rec["sale_date"] = _parse_ts(rec["sale_date"])
+                    batches.setdefault(_partition_key(rec["sale_date"], partition), []).append(rec)
+
+                for key, records in batches.items():
+                    writer = writers.get(key)
+                    if writer is None:
+                        name = f"part-{int(records[0]['id']):010d}{FORMATS[fmt]}"
+                        writer = _PartWriter(dest / key / name if key else dest / name, fmt)
+                        writers[key] = writer
+                    writer.write(records)
+
+                written += len(rows)
+                last_id = int(rows[-1]["id"])
+                if progress is not None:
+                    progress(written, total)
+
+        for writer in writers.values():
+            writer.close()
+        for writer in writers.values():
+            writer.commit()
+    except BaseException:
+        for writer in writers.values():
+            writer.discard()
+        raise
+
+    new_parts = [w.final for w in writers.values()]
+    if incremental:
+        files = list(manifest.get("files", []) or [])
+    else:
+        files = []
+        _remove_parts(dest, keep=set(new_parts))
+    files.extend(str(p.relative_to(dest).as_posix()) for p in new_parts)
+    _write_manifest(
+        dest,
+        {
+            "table": "sales",
+            "format": fmt,
+            "partition": partition,
+            "schema": dict(SALES_SCHEMA),
+            "last_sale_id": last_id,
+            "exported_at": datetime.now().strftime(_DATE_FMT),
+            "files": files,
+        },
+    )
+    return written
+
+
+def _remove_parts(dest: Path, *, keep: set[Path]) -> None:
+    """Delete the dataset's part files other than `keep`, and partition folders left empty."""
+    for path in list(_iter_part_files(dest)):
+        if path.name.startswith("part-") and path not in keep:
+            path.unlink()
+    for folder in sorted((p for p in dest.iterdir() if p.is_dir()), reverse=True):
+        if "=" in folder.name and not any(folder.iterdir()):
+            folder.rmdir()
+
+
+def _iter_part_files(src: Path) -> Iterator[Path]:
+    if src.is_file():
+        yield src
+        return
+    suffixes = tuple(FORMATS.values())
+    for path in sorted(src.rglob("*")):
+        if path.is_file() and path.name.endswith(suffixes):
+            yield path
+
+
+def _iter_records(path: Path, chunk_size: int) -> Iterator[list[dict[str, object]]]:
+    if path.name.endswith(FORMATS["ndjson"]):
+        batch: list[dict[str, object]] = []
+        with gzip.open(path, "rt", encoding="utf-8") as f:
+            for line in f:
+                if line.strip():
+                    batch.append(json.loads(line))
+                if len(batch) >= chunk_size:
+                    yield batch
+                    batch = []
+        if batch:
+            yield batch
+        return
+
+    pa = _pyarrow()
+    if path.name.endswith(FORMATS["parquet"]):
+        import pyarrow.parquet as pq  # type: ignore
+
+        for rb in pq.ParquetFile(str(path)).iter_batches(batch_size=chunk_size):
+            yield rb.to_pylist()
+    else:
+        with pa.memory_map(str(path), "r") as source:
+            reader = pa.ipc.open_file(source)
+            for i in range(reader.num_record_batches):
+                yield reader.get_batch(i).to_pylist()
+
+
+def import_sales_columnar(
+    src: str | Path,
+    *,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    progress: ProgressCallback | None = None,
+    cancel: Event | None = None,
+) -> int:
+    """
+    Load sales rows from a dataset directory (or a single part file) written by `export_sales_columnar`.
+
+    Rows keep their original `id`; rows whose id already exists are skipped, so re-importing the same
+    dataset is a no-op. Runs in one transaction, journals the inserted rows and returns how many there were.
+    """
+    src = Path(src)
+    files = list(_iter_part_files(src))
+    placeholders = ", ".join("?" for _c in SALES_COLUMNS)
+    sql = f"INSERT OR IGNORE INTO sales ({', '.join(SALES_COLUMNS)}) VALUES ({placeholders})"
+
+    with connect() as conn:
+        before = conn.total_changes
+        new_ids: set[int] = set()
+        try:
+            for i, path in enumerate(files):
+                for records in _iter_records(path, chunk_size):
+                    if cancel is not None and cancel.is_set():
+                        raise ExportCancelled()
+                    params = []
+                    for rec in records:
+                        ts = rec.get("sale_date")
+                        if isinstance(ts, datetime):
+                            rec["sale_date"] = ts.strftime(_DATE_FMT)
+                        params.append(tuple(rec.get(c) for c in SALES_COLUMNS))
+                    # Ids not in the table yet are the ones INSERT OR IGNORE will add; journal those.
+                    ids = {int(rec["id"]) for rec in records}
+                    existing = conn.execute(
+                        "SELECT id FROM sales WHERE id IN (SELECT value FROM json_each(?))",
+                        (json.dumps(list(ids)),),
+                    )
+                    new_ids |= ids - {r[0] for r in existing}
+                    conn.executemany(sql, params)
+                if progress is not None:
+                    progress(i + 1, len(files))
+            seq = record_where(
+                conn, "sales", "id IN (SELECT value FROM json_each(?))", (json.dumps(sorted(new_ids)),)
+            )
+            commit_journaled(conn, seq)
+        except BaseException:
+            conn.rollback()
+            raise
+        return conn.total_changes - before
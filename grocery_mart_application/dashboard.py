@@ -1,28 +1,48 @@
 from __future__ import annotations
 
+import importlib
+import time
 import tkinter as tk
+from collections import OrderedDict
 from tkinter import messagebox
 from pathlib import Path
 
 from ttkbootstrap import Button, Frame, Label, Separator
 
-from .analytics_dashboard import AnalyticsDashboard
-from .extra_panel import (
-    ExportDataPanel,
-    InvoiceManagerPanel,
-    LockSessionPanel,
-    MonitorPanel,
-    SearchProductPanel,
-)
-from .home_panel import HomePanel
-from .inventory_manager import InventoryManager
-from .sales_manager import SalesManager
-from .settings_manager import SettingsManager
-from .supplier_manager import SupplierManager
+from . import startup_timing
+from .background_renderer import DASHBOARD_STYLE, CanvasBackground, renderer_for
+from .utils.app_settings import get_setting
 
 
 APP_BG_PATH = Path(__file__).resolve().parent / "logo" / "background_image.png"
 
+# Panel name -> (module, class). Modules are imported on first navigation so startup doesn't pay for
+# panels (and their dependencies, e.g. matplotlib for Analytics) the user never opens.
+PANEL_REGISTRY: dict[str, tuple[str, str]] = {
+    "Home": ("home_panel", "HomePanel"),
+    "Inventory": ("inventory_manager", "InventoryManager"),
+    "Sales": ("sales_manager", "SalesManager"),
+    "Suppliers": ("supplier_manager", "SupplierManager"),
+    "Analytics": ("analytics_dashboard", "AnalyticsDashboard"),
+    "Export": ("extra_panel", "ExportDataPanel"),
+    "Invoices": ("extra_panel", "InvoiceManagerPanel"),
+    "Search": ("extra_panel", "SearchProductPanel"),
+    "Monitor": ("extra_panel", "MonitorPanel"),
+    "Settings": ("settings_manager", "SettingsManager"),
+    "Lock": ("extra_panel", "LockSessionPanel"),
+}
+
+
+# Panels that are rebuilt every time instead of being kept alive while hidden.
+UNCACHED_PANELS = {"Lock"}
+DEFAULT_PANEL_CACHE_SIZE = 4
+
+
+def panel_class(name: str) -> type:
+    module_name, class_name = PANEL_REGISTRY[name]
+    module = importlib.import_module(f".{module_name}", __package__)
+    return getattr(module, class_name)
+
 
 class Dashboard(Frame):
     def __init__(self, master, *, style, current_user: str, on_logout):
@@ -40,17 +60,14 @@ class Dashboard(Frame):
 
         # Background image (subtle) for a more realistic app feel.
         self._bg_canvas: tk.Canvas | None = None
-        self._bg_photo = None
-        self._bg_src = None
-        self._bg_image_id: int | None = None
+        self._background: CanvasBackground | None = None
         self._bg_after_id: str | None = None
         self._bg_last_size: tuple[int, int] | None = None
         self._main_window_id: int | None = None
 
         self._bg_canvas = tk.Canvas(self, highlightthickness=0, bd=0)
         self._bg_canvas.pack(fill=tk.BOTH, expand=True)
-        self._bg_canvas.configure(bg="#0b1b2b")
-        self._bg_image_id = self._bg_canvas.create_image(0, 0, anchor="nw")
+        self._background = CanvasBackground(self._bg_canvas, renderer_for(APP_BG_PATH, DASHBOARD_STYLE))
 
         self._main = Frame(self._bg_canvas, padding=0)
         self._main_window_id = self._bg_canvas.create_window(15, 15, anchor="nw", window=self._main)
@@ -62,24 +79,27 @@ class Dashboard(Frame):
         self.content_area = Frame(self._main, padding=15, bootstyle="light")
         self.content_area.pack(side=tk.RIGHT, expand=True, fill=tk.BOTH, pady=0)
 
-        self._load_background_source()
         self._render_background()
 
         self._panels = {
-            "Home": lambda: HomePanel(self.content_area, self.load_panel),
-            "Inventory": lambda: InventoryManager(self.content_area, current_user=self.current_user),
-            "Sales": lambda: SalesManager(self.content_area, current_user=self.current_user),
-            "Suppliers": lambda: SupplierManager(self.content_area, current_user=self.current_user),
-            "Analytics": lambda: AnalyticsDashboard(self.content_area),
-            "Export": lambda: ExportDataPanel(self.content_area, current_user=self.current_user),
-            "Invoices": lambda: InvoiceManagerPanel(self.content_area),
-            "Search": lambda: SearchProductPanel(self.content_area),
-            "Monitor": lambda: MonitorPanel(self.content_area),
-            "Settings": lambda: SettingsManager(
+            "Home": lambda: panel_class("Home")(self.content_area, self.load_panel),
+            "Inventory": lambda: panel_class("Inventory")(self.content_area, current_user=self.current_user),
+            "Sales": lambda: panel_class("Sales")(self.content_area, current_user=self.current_user),
+            "Suppliers": lambda: panel_class("Suppliers")(self.content_area, current_user=self.current_user),
+            "Analytics": lambda: panel_class("Analytics")(self.content_area),
+            "Export": lambda: panel_class("Export")(self.content_area, current_user=self.current_user),
+            "Invoices": lambda: panel_class("Invoices")(self.content_area),
+            "Search": lambda: panel_class("Search")(self.content_area),
+            "Monitor": lambda: panel_class("Monitor")(self.content_area),
+            "Settings": lambda: panel_class("Settings")(
                 self.content_area, style=self.style, current_user=self.current_user, on_logout=self.on_logout
             ),
             "Lock": self._lock_session,
         }
+        self._opened_panels: set[str] = set()
+        # Hidden panels kept alive (least recently shown first). Panels may define `on_show()` /
+        # `on_hide()`; they are called when a cached panel is re-shown or navigated away from.
+        self._panel_cache: OrderedDict[str, tk.Widget] = OrderedDict()
 
         self.init_sidebar()
         self._bind_shortcuts()
@@ -111,6 +131,7 @@ class Dashboard(Frame):
 
         bind("<F1>", lambda e=None: self._show_shortcuts() or "break")
         bind("<F5>", lambda e=None: self._dispatch_shortcut("refresh") or "break")
+        bind("<F12>", lambda e=None: self._toggle_performance() or "break")
         bind("<Control-f>", lambda e=None: self._dispatch_shortcut("focus_search") or "break")
 
         # Navigation (Ctrl + number)
@@ -153,12 +174,18 @@ class Dashboard(Frame):
                 return False
         return False
 
+    def _toggle_performance(self) -> None:
+        from .performance_panel import toggle_overlay
+
+        toggle_overlay(self.master)
+
     def _show_shortcuts(self) -> None:
         # Keep it simple: a help dialog with global + current page shortcuts.
         lines: list[str] = []
         lines.append("Global")
         lines.append("  F1                 Shortcut help")
         lines.append("  F5                 Refresh current page")
+        lines.append("  F12                Performance: timings, slow queries, profiler")
         lines.append("  Ctrl+1..0           Navigate (Home..Settings)")
         lines.append("  Ctrl+L             Lock session")
         lines.append("  Ctrl+Shift+Q        Logout")
@@ -200,15 +227,6 @@ class Dashboard(Frame):
         except Exception:
             pass
 
-    def _load_background_source(self) -> None:
-        try:
-            from PIL import Image  # type: ignore
-
-            if APP_BG_PATH.exists():
-                self._bg_src = Image.open(APP_BG_PATH).convert("RGB")
-        except Exception:
-            self._bg_src = None
-
     def _on_configure(self, _e=None) -> None:
         if self._bg_after_id is not None:
             try:
@@ -216,7 +234,7 @@ class Dashboard(Frame):
             except Exception:
                 pass
             self._bg_after_id = None
-        self._bg_after_id = self.after(120, self._render_background)
+        self._bg_after_id = self.after(30, self._render_background)
 
     def _render_background(self) -> None:
         if self._bg_canvas is None:
@@ -239,44 +257,8 @@ class Dashboard(Frame):
             except Exception:
                 pass
 
-        try:
-            from PIL import Image, ImageEnhance, ImageFilter, ImageTk  # type: ignore
-
-            if self._bg_src is None:
-                img = Image.new("RGB", (w, h), (11, 27, 43))
-            else:
-                src = self._bg_src
-                scale = max(w / src.width, h / src.height)
-                nw, nh = int(src.width * scale), int(src.height * scale)
-                img = src.resize((nw, nh), Image.Resampling.BILINEAR)
-                left = (nw - w) // 2
-                top = (nh - h) // 2
-                img = img.crop((left, top, left + w, top + h))
-
-                # Performance: blur at a lower resolution.
-                sw, sh = max(1, w // 3), max(1, h // 3)
-                small = img.resize((sw, sh), Image.Resampling.BILINEAR)
-                small = small.filter(ImageFilter.GaussianBlur(radius=3))
-                img = small.resize((w, h), Image.Resampling.LANCZOS)
-                img = ImageEnhance.Brightness(img).enhance(0.78)
-                img = ImageEnhance.Contrast(img).enhance(1.08)
-
-            img_rgba = img.convert("RGBA")
-            # Dark overlay for legibility.
-            overlay = Image.new("RGBA", (w, h), (6, 20, 35, 140))
-            img_rgba = Image.alpha_composite(img_rgba, overlay)
-
-            self._bg_photo = ImageTk.PhotoImage(img_rgba)
-            if self._bg_image_id is None:
-                self._bg_image_id = self._bg_canvas.create_image(0, 0, anchor="nw", image=self._bg_photo)
-            else:
-                self._bg_canvas.itemconfigure(self._bg_image_id, image=self._bg_photo)
-        except Exception:
-            # Fallback: solid dark background if PIL is missing.
-            try:
-                self._bg_canvas.configure(bg="#0b1b2b")
-            except Exception:
-                pass
+        if self._background is not None:
+            self._background.refresh()
 
     def init_sidebar(self):
         Label(self.sidebar, text="Grocery Mart", font=("Helvetica", 18, "bold")).pack(pady=(10, 3))
@@ -315,33 +297,86 @@ class Dashboard(Frame):
         if messagebox.askyesno("Logout", "Logout now?"):
             self.on_logout()
 
-    def _lock_session(self) -> None:
+    def _lock_session(self):  # type: ignore[no-untyped-def]
+        # load_panel has already hidden the current page; cached pages stay hidden until unlock.
         self._set_locked(True)
-        for widget in self.content_area.winfo_children():
-            widget.destroy()
 
         def _on_unlock() -> None:
             self._set_locked(False)
             self.load_panel("Home")
 
-        self._active_panel = LockSessionPanel(self.content_area, current_user=self.current_user, on_unlock=_on_unlock)
-        self._active_panel_name = "Lock"
-        return self._active_panel
+        return panel_class("Lock")(self.content_area, current_user=self.current_user, on_unlock=_on_unlock)
+
+    def _panel_cache_size(self) -> int:
+        try:
+            return max(1, int(get_setting("panel_cache_size", DEFAULT_PANEL_CACHE_SIZE)))
+        except Exception:
+            return DEFAULT_PANEL_CACHE_SIZE
+
+    def _call_hook(self, panel, hook: str) -> None:  # type: ignore[no-untyped-def]
+        fn = getattr(panel, hook, None)
+        if callable(fn):
+            try:
+                fn()
+            except Exception:
+                pass
+
+    def _hide_active(self) -> None:
+        panel = self._active_panel
+        if panel is not None:
+            self._call_hook(panel, "on_hide")
+        cached = set(self._panel_cache.values())
+        for widget in self.content_area.winfo_children():
+            if widget in cached:
+                widget.pack_forget()
+            else:
+                widget.destroy()
+        self._active_panel = None
+        self._active_panel_name = None
+
+    def _evict_panels(self) -> None:
+        limit = self._panel_cache_size()
+        while len(self._panel_cache) > limit:
+            _name, panel = self._panel_cache.popitem(last=False)
+            try:
+                panel.destroy()
+            except Exception:
+                pass
 
     def load_panel(self, name):
         if self._locked and name != "Lock":
             return
-        for widget in self.content_area.winfo_children():
-            widget.destroy()
+        if name == self._active_panel_name and name not in UNCACHED_PANELS:
+            # Re-selecting the current page acts as a refresh.
+            self._call_hook(self._active_panel, "on_show")
+            return
+
+        self._hide_active()
+
+        panel = self._panel_cache.get(name)
+        if panel is not None and panel.winfo_exists():
+            self._panel_cache.move_to_end(name)
+            panel.pack(fill=tk.BOTH, expand=True)
+            self._active_panel_name = name
+            self._active_panel = panel
+            self._call_hook(panel, "on_show")
+            return
+        self._panel_cache.pop(name, None)
+
         panel_factory = self._panels.get(name)
         if panel_factory:
-            self._active_panel_name = name
+            started = time.perf_counter()
             panel = panel_factory()
+            self._active_panel_name = name
             self._active_panel = panel
+            if name not in self._opened_panels:
+                self._opened_panels.add(name)
+                startup_timing.timed_first_use(f"{name} panel (first open)", time.perf_counter() - started)
+            if name not in UNCACHED_PANELS:
+                self._panel_cache[name] = panel
+                self._evict_panels()
         else:
             Label(self.content_area, text=f"Unknown panel: {name}").pack()
-            self._active_panel_name = None
-            self._active_panel = None
 
     def _on_destroy(self, event) -> None:
         if event.widget is not self:
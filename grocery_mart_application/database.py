@@ -1,21 +1,99 @@
 from __future__ import annotations
 
+import functools
+import json
 import sqlite3
+import threading
+import time
+from collections.abc import Callable
 from contextlib import contextmanager
 import os
 from pathlib import Path
 from typing import Iterable
 
+from . import instrumentation, slow_query_log
+from .instrumentation import timed, timer
+
 _DEFAULT_DB_PATH = Path.cwd() / "grocery_inventory.db"
 DB_PATH = Path(os.environ.get("GROCERY_MART_DB_PATH", str(_DEFAULT_DB_PATH))).expanduser().resolve()
 
 
+@functools.lru_cache(maxsize=512)
+def _sql_op(sql: str) -> str:
+    """Histogram name for a statement: "sql." + its first keyword ("sql.select", "sql.pragma"...)."""
+    words = sql.split(None, 1)
+    return f"sql.{words[0].lower()}" if words else "sql.empty"
+
+
+class TimedCursor(sqlite3.Cursor):
+    """
+    Records every statement in the instrumentation histograms (execute time, not fetches) and
+    hands statements slower than the threshold to the slow-query log.
+    """
+
+    def _observe(self, sql: str, params: object, seconds: float, kind: str, rows: int | None = None) -> None:
+        if instrumentation.ENABLED:
+            instrumentation.record(_sql_op(sql), seconds)
+        threshold = slow_query_log.threshold_ms()
+        conn = self.connection
+        if 0 < threshold <= seconds * 1000 and getattr(conn, "log_slow", False):
+            slow_query_log.observe(conn.path, sql, params, seconds, kind=kind, rows=rows)
+
+    def execute(self, sql, parameters=(), /):  # type: ignore[no-untyped-def, override]
+        t0 = time.perf_counter()
+        try:
+            return super().execute(sql, parameters)
+        finally:
+            self._observe(sql, parameters, time.perf_counter() - t0, "execute")
+
+    def executemany(self, sql, seq_of_parameters, /):  # type: ignore[no-untyped-def, override]
+        # Only a list/tuple can be looked at again afterwards; generators are consumed.
+        sized = isinstance(seq_of_parameters, (list, tuple))
+        t0 = time.perf_counter()
+        try:
+            return super().executemany(sql, seq_of_parameters)
+        finally:
+            first = seq_of_parameters[0] if sized and seq_of_parameters else None
+            rows = len(seq_of_parameters) if sized else None
+            self._observe(sql, first, time.perf_counter() - t0, "executemany", rows)
+
+    def executescript(self, sql_script, /):  # type: ignore[no-untyped-def, override]
+        with timer("sql.script"):
+            return super().executescript(sql_script)
+
+
+class TimedConnection(sqlite3.Connection):
+    path: Path
+    # Bulk loads turn this off for their connection: their big batches are slow on purpose.
+    log_slow = True
+
+    # sqlite3.Connection.execute() runs statements in C; route it through TimedCursor.
+    def cursor(self, factory=TimedCursor):  # type: ignore[no-untyped-def, override]
+        return super().cursor(factory)
+
+    def execute(self, sql, parameters=(), /):  # type: ignore[no-untyped-def, override]
+        return self.cursor().execute(sql, parameters)
+
+    def executemany(self, sql, seq_of_parameters, /):  # type: ignore[no-untyped-def, override]
+        return self.cursor().executemany(sql, seq_of_parameters)
+
+    def executescript(self, sql_script, /):  # type: ignore[no-untyped-def, override]
+        return self.cursor().executescript(sql_script)
+
+
+def _open() -> sqlite3.Connection:
+    with timer("db.connect"):
+        conn = sqlite3.connect(DB_PATH, factory=TimedConnection)
+        conn.path = DB_PATH
+        conn.row_factory = sqlite3.Row
+        conn.execute("PRAGMA foreign_keys = ON;")
+    return conn
+
+
 @contextmanager
 def connect():
-    conn = sqlite3.connect(DB_PATH)
+    conn = _open()
     try:
-        conn.row_factory = sqlite3.Row
-        conn.execute("PRAGMA foreign_keys = ON;")
         yield conn
     finally:
         conn.close()
@@ -27,10 +105,7 @@ def get_connection() -> sqlite3.Connection:
 
     Prefer `connect()` to ensure connections are always closed.
     """
-    conn = sqlite3.connect(DB_PATH)
-    conn.row_factory = sqlite3.Row
-    conn.execute("PRAGMA foreign_keys = ON;")
-    return conn
+    return _open()
 
 
 def _table_columns(conn: sqlite3.Connection, table: str) -> set[str]:
@@ -52,6 +127,11 @@ def setup_database() -> None:
     with connect() as conn:
         cursor = conn.cursor()
 
+        # auto_vacuum can only be chosen before the first table exists; incremental mode lets
+        # activity retention hand freed pages back in small steps instead of a full VACUUM.
+        if not conn.execute("SELECT COUNT(*) FROM sqlite_master").fetchone()[0]:
+            conn.execute("PRAGMA auto_vacuum = INCREMENTAL")
+
         cursor.execute(
             """CREATE TABLE IF NOT EXISTS products (
                 id INTEGER PRIMARY KEY AUTOINCREMENT,
@@ -106,6 +186,21 @@ def setup_database() -> None:
             )"""
         )
 
+        # Statements slower than `slow_query_threshold_ms`, see slow_query_log.
+        cursor.execute(
+            """CREATE TABLE IF NOT EXISTS slow_queries (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                duration_ms REAL NOT NULL,
+                kind TEXT NOT NULL,
+                sql TEXT NOT NULL,
+                params TEXT,
+                rows INTEGER,
+                plan TEXT,
+                full_scan INTEGER NOT NULL DEFAULT 0
+            )"""
+        )
+
         # Lightweight migrations for older DBs.
         _add_columns_if_missing(
             conn,
@@ -122,6 +217,18 @@ def setup_database() -> None:
                 "invoice_path TEXT",
             ],
         )
+        # NULL = legacy PBKDF2 hash (see auth_service.LEGACY_SCHEME).
+        _add_columns_if_missing(conn, "users", ["hash_scheme TEXT"])
+        _add_columns_if_missing(
+            conn,
+            "activity_log",
+            [
+                "entity_type TEXT",
+                "entity_id INTEGER",
+                "qty_delta INTEGER",
+                "payload TEXT",
+            ],
+        )
         _add_columns_if_missing(
             conn,
             "products",
@@ -144,17 +251,232 @@ def setup_database() -> None:
         except Exception:
             pass
 
+        # Velocity/reorder and date-range reports filter sales by date.
+        conn.execute("CREATE INDEX IF NOT EXISTS idx_sales_sale_date ON sales(sale_date)")
+        # Sales and bulk catalog import look products up by name.
+        conn.execute("CREATE INDEX IF NOT EXISTS idx_products_name ON products(name)")
+        # Activity queries: "all exports this week", "every change to product 42".
+        conn.execute("CREATE INDEX IF NOT EXISTS idx_activity_type_created ON activity_log(event_type, created_at)")
+        conn.execute(
+            """CREATE INDEX IF NOT EXISTS idx_activity_entity
+               ON activity_log(entity_type, entity_id)
+               WHERE entity_id IS NOT NULL"""
+        )
+
         conn.commit()
 
 
-def log_event(event_type: str, message: str, username: str | None = None) -> None:
+def activity_watermark() -> int:
+    """
+    Id of the newest activity_log row.
+
+    Every data change made through the app or the CLI is logged, so cached views compare this
+    single indexed lookup against the value they last loaded at to decide whether to reload.
+    """
+    try:
+        with connect() as conn:
+            return int(conn.execute("SELECT COALESCE(MAX(id), 0) FROM activity_log").fetchone()[0])
+    except Exception:
+        return 0
+
+
+EventListener = Callable[[dict[str, object]], None]
+
+_listeners: list[EventListener] = []
+_listeners_lock = threading.Lock()
+
+
+def subscribe_events(listener: EventListener) -> Callable[[], None]:
+    """
+    Call `listener(row)` for every event logged by this process; returns an unsubscribe function.
+
+    `row` has the activity_log columns (`id`, `event_type`, `message`, `username`, `created_at`,
+    `entity_type`, `entity_id`, `qty_delta`, `payload`), with `payload` already decoded.
+    Listeners run on the logging thread, so they must be quick and must not touch Tk widgets
+    (append to a queue and drain it from the UI loop instead).
+    """
+    with _listeners_lock:
+        _listeners.append(listener)
+
+    def unsubscribe() -> None:
+        with _listeners_lock:
+            if listener in _listeners:
+                _listeners.remove(listener)
+
+    return unsubscribe
+
+
+def _publish(row: dict[str, object]) -> None:
+    with _listeners_lock:
+        listeners = list(_listeners)
+    for listener in listeners:
+        try:
+            listener(row)
+        except Exception:
+            pass
+
+
+ACTIVITY_COLUMNS = (
+    "id",
+    "event_type",
+    "message",
+    "username",
+    "created_at",
+    "entity_type",
+    "entity_id",
+    "qty_delta",
+    "payload",
+)
+
+
+def add_event(
+    conn: sqlite3.Connection,
+    event_type: str,
+    message: str,
+    username: str | None = None,
+    *,
+    entity_type: str | None = None,
+    entity_id: int | None = None,
+    qty_delta: int | None = None,
+    payload: dict[str, object] | None = None,
+) -> dict[str, object]:
+    """
+    Insert an activity_log row on `conn`, inside the caller's transaction (see `log_event` for the
+    fields). Pass the returned rows to `publish_events` once the transaction is committed.
+    """
+    cur = conn.execute(
+        """INSERT INTO activity_log
+           (event_type, message, username, entity_type, entity_id, qty_delta, payload)
+           VALUES (?, ?, ?, ?, ?, ?, ?)""",
+        (
+            event_type,
+            message,
+            username,
+            entity_type,
+            entity_id,
+            qty_delta,
+            json.dumps(payload, default=str) if payload else None,
+        ),
+    )
+    return {
+        "id": int(cur.lastrowid),
+        "event_type": event_type,
+        "message": message,
+        "username": username,
+        "created_at": None,
+        "entity_type": entity_type,
+        "entity_id": entity_id,
+        "qty_delta": qty_delta,
+        "payload": payload,
+    }
+
+
+def publish_events(conn: sqlite3.Connection, rows: list[dict[str, object]]) -> None:
+    """Hand committed `add_event` rows to the `subscribe_events` listeners."""
+    if not _listeners or not rows:
+        return
+    marks = ", ".join("?" * len(rows))
+    created = dict(
+        conn.execute(f"SELECT id, created_at FROM activity_log WHERE id IN ({marks})", [r["id"] for r in rows])
+    )
+    for row in rows:
+        _publish({**row, "created_at": created.get(row["id"])})
+
+
+@timed("db.log_event")
+def log_event(
+    event_type: str,
+    message: str,
+    username: str | None = None,
+    *,
+    entity_type: str | None = None,
+    entity_id: int | None = None,
+    qty_delta: int | None = None,
+    payload: dict[str, object] | None = None,
+) -> None:
+    """
+    Append an activity_log row.
+
+    `message` is the human-readable line shown in the monitor; the keyword fields make the event
+    queryable without parsing it: `entity_type`/`entity_id` name the affected record (e.g.
+    "product", 42), `qty_delta` is the stock change it caused and `payload` holds any other
+    details (stored as JSON).
+    """
     try:
         with connect() as conn:
-            conn.execute(
-                "INSERT INTO activity_log (event_type, message, username) VALUES (?, ?, ?)",
-                (event_type, message, username),
+            row = add_event(
+                conn,
+                event_type,
+                message,
+                username,
+                entity_type=entity_type,
+                entity_id=entity_id,
+                qty_delta=qty_delta,
+                payload=payload,
             )
             conn.commit()
+            publish_events(conn, [row])
     except Exception:
         # Logging must never crash the UI.
         return
+
+
+def query_events(
+    *,
+    event_type: str | None = None,
+    entity_type: str | None = None,
+    entity_id: int | None = None,
+    since: str | None = None,
+    until: str | None = None,
+    after_id: int = 0,
+    limit: int | None = 500,
+) -> list[dict[str, object]]:
+    """
+    Newest-first activity rows matching every given filter, with `payload` decoded.
+
+    `since`/`until` compare against `created_at` ("YYYY-MM-DD[ HH:MM:SS]", UTC); `until` is
+    exclusive. Type + date filters use idx_activity_type_created and entity filters use
+    idx_activity_entity, so these stay index lookups however large the log grows.
+    """
+    clauses: list[str] = []
+    params: list[object] = []
+    if event_type:
+        clauses.append("event_type = ?")
+        params.append(event_type)
+    if entity_type:
+        clauses.append("entity_type = ?")
+        params.append(entity_type)
+    if entity_id is not None:
+        clauses.append("entity_id = ?")
+        params.append(int(entity_id))
+    if since:
+        clauses.append("created_at >= ?")
+        params.append(since)
+    if until:
+        clauses.append("created_at < ?")
+        params.append(until)
+    if after_id:
+        clauses.append("id > ?")
+        params.append(int(after_id))
+
+    sql = f"SELECT {', '.join(ACTIVITY_COLUMNS)} FROM activity_log"
+    if clauses:
+        sql += " WHERE " + " AND ".join(clauses)
+    # With a type filter, walk idx_activity_type_created backwards instead of sorting every match.
+    sql += " ORDER BY created_at DESC, id DESC" if event_type and not entity_type else " ORDER BY id DESC"
+    if limit is not None:
+        sql += " LIMIT ?"
+        params.append(int(limit))
+
+    with connect() as conn:
+        rows = conn.execute(sql, params).fetchall()
+    out = []
+    for r in rows:
+        row = dict(r)
+        if row["payload"]:
+            try:
+                row["payload"] = json.loads(row["payload"])
+            except ValueError:
+                pass
+        out.append(row)
+    return out
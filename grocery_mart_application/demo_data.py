@@ -0,0 +1,526 @@
+"""
+Seeded synthetic store data for demos, load tests and benchmarks, from hundreds to millions of rows.
+
+What gets generated, all from one `random.Random(seed)`, so the same seed and end date always
+produce the same database:
+
+- suppliers: a few large distributors supply most of the catalog (Zipf-like shares)
+- products: brand + item + pack size names per category, with category-typical prices, tax
+  rates, units, shelf life and stock levels (some of it low)
+- sales: multi-line invoices (mostly small baskets, up to 8 lines) over `days` days, with a
+  yearly season, weekend and festive-month peaks, slow growth, shop-hour timestamps, category
+  seasons (drinks in summer...), best sellers far ahead of the long tail, and repeat customers
+- activity log: product additions, staff logins/logouts, one stock event per sale line and one
+  event per invoice, in the shape checkout writes them
+
+The load runs in one transaction and inserts in `executemany` batches. Secondary indexes on the
+loaded tables are dropped for the load and rebuilt once at the end. Generated rows bypass the
+change journal. Into a new or empty database (or with `relaxed=True`) the load also turns off
+fsync and keeps the rollback journal in memory; a crash can then corrupt the file, which only
+costs a regeneration there, so a database that already holds products or sales keeps its
+normal pragmas.
+"""
+
+from __future__ import annotations
+
+import bisect
+import functools
+import itertools
+import json
+import math
+import random
+import sqlite3
+from collections.abc import Iterable, Iterator
+from dataclasses import dataclass
+from datetime import date, datetime, timedelta
+
+from .database import connect
+
+BATCH_SIZE = 20_000
+LOADED_TABLES = ("suppliers", "products", "sales", "activity_log")
+CASHIERS = ("cashier1", "cashier2", "manager")
+
+
+@dataclass(frozen=True)
+class Category:
+    name: str
+    items: tuple[str, ...]
+    sizes: tuple[str, ...]
+    unit: str
+    # Typical price range for the smallest pack.
+    price: tuple[float, float]
+    gst_rates: tuple[float, ...]
+    # Shelf life in days (None = does not expire).
+    shelf_life: tuple[int, int] | None
+    # Sales multiplier per month, January first.
+    season: tuple[float, ...] = (1.0,) * 12
+
+
+CATEGORIES = (
+    Category(
+        "Dairy",
+        ("Milk", "Curd", "Paneer", "Butter", "Cheese Slices", "Ghee", "Lassi", "Cream"),
+        ("200 ml", "500 ml", "1 l"),
+        "pcs",
+        (12, 60),
+        (0.0, 5.0),
+        (3, 30),
+        (0.95, 0.95, 1.0, 1.1, 1.2, 1.15, 1.0, 0.95, 0.95, 1.0, 1.0, 0.95),
+    ),
+    Category(
+        "Grains",
+        ("Basmati Rice", "Sona Masoori Rice", "Wheat Flour", "Poha", "Rava", "Oats", "Millet Flour"),
+        ("500 g", "1 kg", "5 kg"),
+        "kg",
+        (35, 120),
+        (0.0, 5.0),
+        (180, 540),
+    ),
+    Category(
+        "Pulses",
+        ("Toor Dal", "Moong Dal", "Chana Dal", "Masoor Dal", "Rajma", "Kabuli Chana", "Urad Dal"),
+        ("500 g", "1 kg"),
+        "kg",
+        (60, 160),
+        (0.0, 5.0),
+        (180, 540),
+    ),
+    Category(
+        "Snacks",
+        ("Potato Chips", "Namkeen Mix", "Cream Biscuits", "Glucose Biscuits", "Cookies", "Popcorn", "Nachos"),
+        ("50 g", "150 g", "400 g"),
+        "pcs",
+        (10, 40),
+        (12.0, 18.0),
+        (60, 240),
+        (1.0, 0.95, 1.0, 1.0, 1.05, 1.05, 1.1, 1.05, 1.0, 1.25, 1.3, 1.2),
+    ),
+    Category(
+        "Drinks",
+        ("Cola", "Lemon Soda", "Mango Drink", "Orange Juice", "Iced Tea", "Mineral Water", "Energy Drink"),
+        ("250 ml", "600 ml", "1.25 l", "2 l"),
+        "ltr",
+        (15, 45),
+        (12.0, 18.0, 28.0),
+        (90, 365),
+        (0.7, 0.75, 0.95, 1.3, 1.6, 1.5, 1.1, 1.0, 0.95, 0.9, 0.8, 0.75),
+    ),
+    Category(
+        "Produce",
+        ("Onions", "Potatoes", "Tomatoes", "Bananas", "Apples", "Spinach", "Green Chillies", "Lemons"),
+        ("250 g", "500 g", "1 kg"),
+        "kg",
+        (15, 90),
+        (0.0,),
+        (2, 14),
+        (1.1, 1.05, 1.0, 0.95, 0.9, 0.9, 1.0, 1.05, 1.05, 1.1, 1.1, 1.1),
+    ),
+    Category(
+        "Bakery",
+        ("White Bread", "Brown Bread", "Pav", "Rusk", "Fruit Cake", "Buns"),
+        ("200 g", "400 g"),
+        "pcs",
+        (20, 60),
+        (0.0, 5.0, 18.0),
+        (3, 20),
+        (1.0, 1.0, 1.0, 1.0, 1.0, 1.0, 1.0, 1.0, 1.0, 1.0, 1.05, 1.4),
+    ),
+    Category(
+        "Spices",
+        ("Turmeric", "Red Chilli Powder", "Garam Masala", "Cumin Seeds", "Coriander Powder", "Black Pepper"),
+        ("50 g", "100 g", "200 g"),
+        "pcs",
+        (25, 110),
+        (5.0,),
+        (270, 720),
+        (1.0, 1.0, 1.05, 1.0, 1.0, 1.0, 1.0, 1.0, 1.05, 1.2, 1.25, 1.0),
+    ),
+    Category(
+        "Toiletries",
+        ("Bath Soap", "Shampoo", "Toothpaste", "Hand Wash", "Face Wash", "Hair Oil", "Deodorant"),
+        ("75 ml", "180 ml", "400 ml"),
+        "pcs",
+        (30, 180),
+        (18.0,),
+        (365, 1095),
+    ),
+    Category(
+        "Household",
+        ("Detergent Powder", "Dishwash Liquid", "Floor Cleaner", "Garbage Bags", "Matchbox", "Candles"),
+        ("1 pc", "500 g", "1 kg"),
+        "pcs",
+        (10, 220),
+        (18.0,),
+        None,
+        (1.0, 1.0, 1.0, 1.0, 1.0, 1.0, 1.0, 1.0, 1.0, 1.35, 1.3, 1.0),
+    ),
+    Category(
+        "Stationery",
+        ("Notebook", "Ball Pen", "Pencil Box", "Eraser", "Glue Stick", "Drawing Book"),
+        ("1 pc", "5 pcs"),
+        "pcs",
+        (5, 80),
+        (12.0, 18.0),
+        None,
+        (0.9, 0.8, 0.9, 1.1, 1.5, 1.6, 1.2, 0.9, 0.85, 0.85, 0.85, 0.8),
+    ),
+)
+BRANDS = (
+    "Amul", "Tata", "Fortune", "Aashirvaad", "Haldiram", "Britannia", "Parle", "Nestle", "Dabur", "Patanjali",
+    "Mother Dairy", "MDH", "Everest", "Godrej", "Himalaya", "Surf", "Classmate", "Local Farm", "Store Brand",
+    "Organic Valley",
+)  # fmt: skip
+SUPPLIER_WORDS = (
+    ("Fresh", "Daily", "Metro", "Green", "Royal", "Sunrise", "Krishna", "Apex", "Golden", "City"),
+    ("Farms", "Foods", "Distributors", "Traders", "Wholesale", "Agencies", "Supplies", "Provisions"),
+)
+FIRST_NAMES = (
+    "Aarav", "Vivaan", "Aditya", "Ananya", "Diya", "Ishaan", "Kavya", "Meera", "Rohan", "Saanvi", "Arjun",
+    "Priya", "Rahul", "Sneha", "Vikram", "Neha", "Karan", "Pooja", "Amit", "Fatima", "Imran", "Joseph",
+)  # fmt: skip
+LAST_NAMES = (
+    "Sharma", "Verma", "Patel", "Reddy", "Iyer", "Khan", "Singh", "Gupta", "Das", "Nair", "Mehta", "Joshi",
+    "Fernandes", "Ali", "Bose", "Kulkarni",
+)  # fmt: skip
+WALK_IN_SHARE = 0.3
+# Monday..Sunday sales multipliers, and shop-hour weights from 07:00 to 21:00.
+WEEKDAY_FACTOR = (0.9, 0.85, 0.9, 0.95, 1.1, 1.35, 1.3)
+HOUR_WEIGHTS = (2, 5, 6, 5, 4, 4, 5, 4, 4, 5, 7, 9, 10, 8, 4)
+# Lines per invoice: mostly small baskets, occasionally a big weekly shop.
+LINE_COUNT_WEIGHTS = (30, 24, 17, 11, 8, 5, 3, 2)
+# Season multipliers are at most this; a line of a category is kept with probability season/this.
+MAX_SEASON = 1.6
+
+
+@dataclass
+class GeneratedCounts:
+    suppliers: int = 0
+    products: int = 0
+    invoices: int = 0
+    sales: int = 0
+    events: int = 0
+
+
+def _weighted_digit_sums(weights: tuple[int, int, int]) -> list[int]:
+    return [sum(int(d) * w for d, w in zip(f"{k:03d}", weights, strict=True)) for k in range(1000)]
+
+
+# EAN-13 weights digits 1,3,1,3...; "890" + 9 digits is the prefix and three 3-digit chunks.
+_EAN_PREFIX_SUM = 8 * 1 + 9 * 3 + 0 * 1
+_EAN_ODD = _weighted_digit_sums((3, 1, 3))
+_EAN_EVEN = _weighted_digit_sums((1, 3, 1))
+
+
+def _ean13(n: int) -> str:
+    total = _EAN_PREFIX_SUM + _EAN_ODD[n // 1_000_000] + _EAN_EVEN[n // 1000 % 1000] + _EAN_ODD[n % 1000]
+    return f"890{n:09d}{(10 - total % 10) % 10}"
+
+
+@functools.lru_cache(maxsize=4096)
+def _day(midnight: datetime, days: int) -> str:
+    return (midnight + timedelta(days=days)).strftime("%Y-%m-%d")
+
+
+def _timestamp(midnight: datetime, seconds: int) -> str:
+    """`midnight` + `seconds` as "YYYY-MM-DD HH:MM:SS" (much cheaper than timedelta + strftime in bulk)."""
+    days, rest = divmod(seconds, 86400)
+    return f"{_day(midnight, days)} {rest // 3600:02d}:{rest // 60 % 60:02d}:{rest % 60:02d}"
+
+
+def _batches(rows: Iterable[tuple], size: int) -> Iterator[list[tuple]]:
+    it = iter(rows)
+    while batch := list(itertools.islice(it, size)):
+        yield batch
+
+
+def _zipf_cum_weights(n: int, s: float) -> list[float]:
+    return list(itertools.accumulate(1.0 / (rank**s) for rank in range(1, n + 1)))
+
+
+def _pick(rng: random.Random, cum_weights: list[float]) -> int:
+    """Index drawn with the given cumulative weights (like `rng.choices`, without the list)."""
+    return bisect.bisect(cum_weights, rng.random() * cum_weights[-1])
+
+
+def _day_weights(start: date, days: int) -> list[float]:
+    weights = []
+    for i in range(days):
+        d = start + timedelta(days=i)
+        yearly = 1.0 + 0.15 * math.sin(2 * math.pi * (d.timetuple().tm_yday - 100) / 365.25)
+        festive = 1.3 if d.month in (10, 11) else 1.15 if d.month == 12 else 1.0
+        growth = 1.0 + 0.2 * i / days
+        weights.append(yearly * festive * growth * WEEKDAY_FACTOR[d.weekday()])
+    return weights
+
+
+def _has_store_data(conn: sqlite3.Connection) -> bool:
+    return bool(
+        conn.execute("SELECT EXISTS(SELECT 1 FROM products) OR EXISTS(SELECT 1 FROM sales)").fetchone()[0]
+    )
+
+
+class _BulkLoad:
+    """
+    One transaction; indexes on the loaded tables are rebuilt at the end.
+
+    `relaxed` also turns off fsync and the on-disk rollback journal; None means only when the
+    database holds no products or sales yet.
+    """
+
+    def __init__(self, conn: sqlite3.Connection, batch_size: int, *, relaxed: bool | None = None) -> None:
+        self.conn = conn
+        self.batch_size = batch_size
+        self.relaxed = relaxed
+        self._indexes: list[str] = []
+
+    def __enter__(self) -> _BulkLoad:
+        conn = self.conn
+        # Big batches are slow by design; keep them out of the slow-query log.
+        conn.log_slow = False  # type: ignore[attr-defined]
+        if self.relaxed is None:
+            self.relaxed = not _has_store_data(conn)
+        if self.relaxed:
+            # For this connection only; a failed load into a scratch database is generated again.
+            conn.execute("PRAGMA synchronous = OFF")
+            if str(conn.execute("PRAGMA journal_mode").fetchone()[0]).lower() != "wal":
+                conn.execute("PRAGMA journal_mode = MEMORY")
+        conn.execute("PRAGMA cache_size = -262144")  # 256 MiB
+        conn.execute("PRAGMA temp_store = MEMORY")
+        conn.execute("PRAGMA foreign_keys = OFF")
+        placeholders = ", ".join("?" * len(LOADED_TABLES))
+        indexes = conn.execute(
+            f"""SELECT name, sql FROM sqlite_master
+                WHERE type = 'index' AND sql IS NOT NULL AND tbl_name IN ({placeholders})""",
+            LOADED_TABLES,
+        ).fetchall()
+        conn.execute("BEGIN")
+        # Building an index once over the loaded rows beats updating it row by row.
+        for name, sql in indexes:
+            conn.execute(f'DROP INDEX "{name}"')
+            self._indexes.append(sql)
+        return self
+
+    def insert(self, sql: str, rows: Iterable[tuple]) -> int:
+        count = 0
+        for batch in _batches(rows, self.batch_size):
+            self.conn.executemany(sql, batch)
+            count += len(batch)
+        return count
+
+    def __exit__(self, exc_type, exc, tb) -> None:  # type: ignore[no-untyped-def]
+        if exc_type is not None:
+            # Also brings the dropped indexes back.
+            self.conn.rollback()
+            return
+        for sql in self._indexes:
+            self.conn.execute(sql)
+        self.conn.commit()
+        self.conn.execute("ANALYZE")
+
+
+def generate(
+    *,
+    products: int,
+    sales: int,
+    seed: int = 0,
+    days: int = 365,
+    end: datetime | None = None,
+    suppliers: int | None = None,
+    activity: bool = True,
+    batch_size: int = BATCH_SIZE,
+    relaxed: bool | None = None,
+) -> GeneratedCounts:
+    """
+    Append a generated store history to the database (see the module docstring).
+
+    `products` products and `sales` sale lines, grouped into invoices, over the `days` days
+    before `end` (default: today). `suppliers` defaults to one per 400 products, at least 5.
+    Ids continue after the existing rows, so it can also top up a database; product names skip
+    the ones already taken. `relaxed` forces the no-fsync pragmas on (True) or off (False); by
+    default they are used only for a database without products or sales.
+    """
+    rng = random.Random(seed)
+    days = max(1, int(days))
+    end = end or datetime.combine(date.today(), datetime.min.time())
+    start = (end - timedelta(days=days)).date()
+    counts = GeneratedCounts()
+    n_suppliers = suppliers if suppliers is not None else max(5, products // 400)
+    events: list[tuple] = []
+
+    with connect() as conn, _BulkLoad(conn, batch_size, relaxed=relaxed) as load:
+
+        def next_id(table: str) -> int:
+            return int(conn.execute(f"SELECT COALESCE(MAX(id), 0) FROM {table}").fetchone()[0]) + 1
+
+        # Suppliers ------------------------------------------------------------------------
+        first_supplier = next_id("suppliers")
+        supplier_ids = list(range(first_supplier, first_supplier + n_suppliers))
+
+        def supplier_rows() -> Iterator[tuple]:
+            first, second = SUPPLIER_WORDS
+            combos = len(first) * len(second)
+            for n, sid in enumerate(supplier_ids):
+                name = f"{first[n % len(first)]} {second[(n // len(first)) % len(second)]}"
+                if n >= combos:
+                    name += f" {n // combos + 1}"
+                contact = f"{name.lower().replace(' ', '-')}@example.com, +91 9{rng.randrange(10**9):09d}"
+                yield sid, name, contact
+
+        counts.suppliers = load.insert(
+            "INSERT INTO suppliers (id, name, contact) VALUES (?, ?, ?)", supplier_rows()
+        )
+        supplier_cw = _zipf_cum_weights(n_suppliers, 1.1) if n_suppliers else []
+
+        # Products -------------------------------------------------------------------------
+        first_product = next_id("products")
+        taken = {str(r[0]) for r in conn.execute("SELECT name FROM products")}
+        # (name, category index, price, gst) by position; product id = first_product + position.
+        catalog: list[tuple[str, int, float, float]] = []
+        variants = [
+            (ci, item, size_i, brand)
+            for ci, cat in enumerate(CATEGORIES)
+            for item in cat.items
+            for size_i in range(len(cat.sizes))
+            for brand in BRANDS
+        ]
+        rng.shuffle(variants)
+
+        def product_rows() -> Iterator[tuple]:
+            # A top-up with the same seed carries on where the earlier run stopped.
+            k = len(taken)
+            for n in range(products):
+                pid = first_product + n
+                while True:
+                    ci, item, size_i, brand = variants[k % len(variants)]
+                    cat = CATEGORIES[ci]
+                    name = f"{brand} {item} {cat.sizes[size_i]}"
+                    if k >= len(variants):
+                        name += f" #{k // len(variants) + 1}"
+                    k += 1
+                    if name not in taken:
+                        break
+                price = round(rng.uniform(*cat.price) * (1 + 0.9 * size_i) * rng.uniform(0.85, 1.2), 2)
+                gst = rng.choice(cat.gst_rates)
+                catalog.append((name, ci, price, gst))
+                expiry = None
+                if cat.shelf_life is not None:
+                    expiry = (end + timedelta(days=rng.randint(*cat.shelf_life) - 5)).strftime("%Y-%m-%d")
+                quantity = rng.randint(0, 6) if rng.random() < 0.08 else rng.randint(10, 400)
+                supplier = supplier_ids[_pick(rng, supplier_cw)] if supplier_ids else None
+                yield pid, name, cat.name, cat.unit, price, quantity, expiry, supplier, _ean13(pid), gst, 0.0
+
+        counts.products = load.insert(
+            """INSERT INTO products
+               (id, name, category, unit, price, quantity, expiry, supplier_id, barcode, gst_percent, tax_percent)
+               VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)""",
+            product_rows(),
+        )
+
+        if activity:
+            # The catalog was entered in the month before the sales history starts.
+            added = datetime.combine(start, datetime.min.time()) - timedelta(days=30)
+            for n, (name, _ci, _price, _gst) in enumerate(catalog):
+                ts = _timestamp(added, rng.randrange(30 * 86400))
+                pid = first_product + n
+                events.append((ts, "product", f"Added product {name}", "admin", "product", pid, None, None))
+
+        # Sales ----------------------------------------------------------------------------
+        line_cw = list(itertools.accumulate(LINE_COUNT_WEIGHTS))
+        line_counts: list[int] = []
+        remaining = sales if catalog else 0
+        while remaining > 0:
+            line_counts.append(min(remaining, _pick(rng, line_cw) + 1))
+            remaining -= line_counts[-1]
+
+        day_cw = list(itertools.accumulate(_day_weights(start, days)))
+        hour_cw = list(itertools.accumulate(HOUR_WEIGHTS))
+        midnight = datetime.combine(start, datetime.min.time())
+        # Seconds after `midnight` of the first day.
+        stamps = sorted(
+            _pick(rng, day_cw) * 86400 + (7 + _pick(rng, hour_cw)) * 3600 + rng.randrange(3600)
+            for _ in line_counts
+        )
+
+        # Best sellers sell far more than the long tail; which products those are is random.
+        popular = list(range(len(catalog)))
+        rng.shuffle(popular)
+        popular_cw = _zipf_cum_weights(len(popular), 0.9)
+        customers = [
+            (f"{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)}", f"9{rng.randrange(10**9):09d}")
+            for _ in range(max(50, sales // 25))
+        ]
+        customer_cw = _zipf_cum_weights(len(customers), 0.6)
+        first_sale = next_id("sales")
+
+        def sale_rows() -> Iterator[tuple]:
+            sale_id = first_sale
+            day = None
+            cashier = CASHIERS[0]
+            for n_lines, stamp in zip(line_counts, stamps, strict=True):
+                ts = _timestamp(midnight, stamp)
+                if ts[:10] != day:
+                    if activity and day is not None:
+                        events.append((f"{day} 22:05:00", "auth", "Logout", cashier, None, None, None, None))
+                    day = ts[:10]
+                    cashier = rng.choice(CASHIERS)
+                    if activity:
+                        events.append((f"{day} 06:55:00", "auth", "Login", cashier, None, None, None, None))
+                if rng.random() < WALK_IN_SHARE:
+                    buyer, mobile = "Walk-in Customer", ""
+                else:
+                    buyer, mobile = customers[_pick(rng, customer_cw)]
+
+                month = int(ts[5:7]) - 1
+                basket: set[int] = set()
+                ids: list[int] = []
+                stock: list[dict[str, int]] = []
+                total = 0.0
+                while len(ids) < n_lines:
+                    pos = popular[_pick(rng, popular_cw)]
+                    name, ci, price, gst = catalog[pos]
+                    # One line per product per invoice (unless the catalog is tiny); out-of-season
+                    # categories are picked less often.
+                    if len(basket) < len(catalog) and (
+                        pos in basket or rng.random() * MAX_SEASON > CATEGORIES[ci].season[month]
+                    ):
+                        continue
+                    basket.add(pos)
+                    qty = 1 + int(rng.expovariate(0.9))
+                    subtotal = round(qty * price, 2)
+                    tax = round(subtotal * gst / 100.0, 2)
+                    yield sale_id, name, qty, ts, buyer, mobile, price, subtotal, gst, 0.0, tax, subtotal + tax
+                    if activity:
+                        pid = first_product + pos
+                        message = f"Sold {qty} x {name} (sale {sale_id})"
+                        events.append(
+                            (ts, "sale", message, cashier, "product", pid, -qty, f'{{"sale_id": {sale_id}}}')
+                        )
+                        stock.append({"product_id": pid, "qty": -qty})
+                    ids.append(sale_id)
+                    total += subtotal + tax
+                    sale_id += 1
+                if activity:
+                    message = f"Recorded invoice: {len(ids)} item(s) (total {total:.2f})"
+                    payload = json.dumps({"sale_ids": ids, "total": round(total, 2), "stock": stock})
+                    events.append((ts, "sale", message, cashier, "sale", ids[0], None, payload))
+            if activity and day is not None:
+                events.append((f"{day} 22:05:00", "auth", "Logout", cashier, None, None, None, None))
+
+        counts.invoices = len(line_counts)
+        counts.sales = load.insert(
+            """INSERT INTO sales
+               (id, product_name, quantity, sale_date, buyer_name, buyer_mobile, unit_price, subtotal,
+                gst_percent, tax_percent, tax_amount, total_price)
+               VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)""",
+            sale_rows(),
+        )
+
+        # Activity log, in time order like the app writes it -----------------------------------
+        events.sort(key=lambda e: e[0])
+        counts.events = load.insert(
+            """INSERT INTO activity_log
+               (created_at, event_type, message, username, entity_type, entity_id, qty_delta, payload)
+               VALUES (?, ?, ?, ?, ?, ?, ?, ?)""",
+            events,
+        )
+    return counts
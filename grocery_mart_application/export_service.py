@@ -0,0 +1,279 @@
+from __future__ import annotations
+
+import csv
+import os
+from collections.abc import Callable, Sequence
+from pathlib import Path
+from threading import Event, Thread
+
+from .database import connect
+
+DEFAULT_CHUNK_SIZE = 2000
+
+ProgressCallback = Callable[[int, int], None]
+
+
+class ExportCancelled(Exception):
+    pass
+
+
+class _CsvSink:
+    def __init__(self, path: Path, columns: Sequence[str]):
+        self._f = open(path, "w", newline="", encoding="utf-8")
+        self._writer = csv.writer(self._f)
+        self._writer.writerow(columns)
+
+    def write_rows(self, rows) -> None:  # type: ignore[no-untyped-def]
+        self._writer.writerows(rows)
+
+    def close(self) -> None:
+        self._f.close()
+
+
+class _XlsxSink:
+    def __init__(self, path: Path, columns: Sequence[str]):
+        try:
+            from openpyxl import Workbook  # type: ignore
+        except Exception as e:  # pragma: no cover
+            raise RuntimeError(
+                "Missing dependency: openpyxl. Install with `pip install -r requirements.txt`."
+            ) from e
+
+        # Write-only mode streams rows to disk instead of building the sheet in memory.
+        self._path = path
+        self._wb = Workbook(write_only=True)
+        self._ws = self._wb.create_sheet("Export")
+        self._ws.append(list(columns))
+
+    def write_rows(self, rows) -> None:  # type: ignore[no-untyped-def]
+        for row in rows:
+            self._ws.append(tuple(row))
+
+    def close(self) -> None:
+        self._wb.save(self._path)
+
+
+EXPORT_TABLES = ("products", "inventory", "sales", "suppliers")
+
+
+def export_query(
+    table: str,
+    *,
+    include_barcodes: bool = True,
+    include_taxes: bool = True,
+    date_from: str = "",
+    date_to: str = "",
+) -> tuple[str, tuple[object, ...]]:
+    """SQL + params for the standard exports (shared by the Export screen and the CLI)."""
+    if table == "products":
+        cols = ["id", "name"]
+        if include_barcodes:
+            cols.append("barcode")
+        cols += ["category", "unit", "price"]
+        if include_taxes:
+            cols += ["gst_percent", "tax_percent"]
+        cols += ["quantity", "expiry", "supplier_id"]
+        return f"SELECT {', '.join(cols)} FROM products ORDER BY id DESC", ()
+
+    if table == "inventory":
+        return (
+            """SELECT p.id, p.name, p.barcode, p.category, COALESCE(s.name, '') AS supplier,
+                      p.unit, p.price, p.gst_percent, p.tax_percent, p.quantity, p.expiry
+               FROM products p
+               LEFT JOIN suppliers s ON s.id = p.supplier_id
+               ORDER BY p.id DESC""",
+            (),
+        )
+
+    if table == "sales":
+        where = ""
+        params: list[object] = []
+        if date_from:
+            where += " AND DATE(sale_date) >= DATE(?)"
+            params.append(date_from)
+        if date_to:
+            where += " AND DATE(sale_date) <= DATE(?)"
+            params.append(date_to)
+        cols = ["id", "product_name", "quantity", "unit_price", "subtotal"]
+        if include_taxes:
+            cols += ["gst_percent", "tax_percent", "tax_amount"]
+        cols += ["total_price", "buyer_name", "buyer_mobile", "sale_date", "invoice_path"]
+        return (
+            f"""SELECT {', '.join(cols)}
+                FROM sales
+                WHERE 1=1 {where}
+                ORDER BY sale_date DESC""",
+            tuple(params),
+        )
+
+    if table == "suppliers":
+        return "SELECT id, name, contact FROM suppliers ORDER BY id DESC", ()
+
+    raise ValueError(f"Unknown export table: {table}")
+
+
+def _open_sink(path: Path, tmp: Path, columns: Sequence[str]):  # type: ignore[no-untyped-def]
+    if path.suffix.lower() == ".csv":
+        return _CsvSink(tmp, columns)
+    return _XlsxSink(tmp, columns)
+
+
+def stream_query_to_file(
+    sql: str,
+    params: Sequence[object] = (),
+    *,
+    path: str | Path,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    progress: ProgressCallback | None = None,
+    cancel: Event | None = None,
+) -> int:
+    """
+    Export the rows of `sql` to CSV or XLSX (chosen by suffix) and return the row count.
+
+    Rows are pulled from the cursor with `fetchmany(chunk_size)` and written immediately, so memory
+    stays flat regardless of table size. Output goes to a `.part` file that is renamed on success;
+    a cancelled or failed export leaves no partial file behind.
+    """
+    path = Path(path)
+    tmp = path.with_name(path.name + ".part")
+    written = 0
+    sink = None
+    try:
+        with connect() as conn:
+            total = int(conn.execute(f"SELECT COUNT(*) FROM ({sql})", tuple(params)).fetchone()[0])
+            if progress is not None:
+                progress(0, total)
+            cur = conn.execute(sql, tuple(params))
+            columns = [d[0] for d in cur.description or ()]
+            sink = _open_sink(path, tmp, columns)
+            while True:
+                if cancel is not None and cancel.is_set():
+                    raise ExportCancelled()
+                rows = cur.fetchmany(chunk_size)
+                if not rows:
+                    break
+                sink.write_rows(rows)
+                written += len(rows)
+                if progress is not None:
+                    progress(written, total)
+        sink.close()
+        sink = None
+        os.replace(tmp, path)
+        return written
+    except BaseException:
+        if sink is not None:
+            try:
+                sink.close()
+            except Exception:
+                pass
+        try:
+            tmp.unlink(missing_ok=True)
+        except Exception:
+            pass
+        raise
+
+
+class BackgroundJob:
+    """
+    Runs `work(progress, cancel)` on a worker thread.
+
+    The UI polls `written`/`total` (see `watch`) instead of being called back from the worker, since
+    Tk widgets must only be touched from the main thread.
+    """
+
+    def __init__(self, work: Callable[[ProgressCallback, Event], object]):
+        self._work = work
+        self.written = 0
+        self.total = 0
+        self.result: object = None
+        self.error: BaseException | None = None
+        self._cancel = Event()
+        self._done = Event()
+        self._thread: Thread | None = None
+
+    @property
+    def done(self) -> bool:
+        return self._done.is_set()
+
+    @property
+    def cancelled(self) -> bool:
+        return isinstance(self.error, ExportCancelled)
+
+    def start(self):  # type: ignore[no-untyped-def]
+        self._thread = Thread(target=self._run, daemon=True)
+        self._thread.start()
+        return self
+
+    def cancel(self) -> None:
+        self._cancel.set()
+
+    def wait(self, timeout: float | None = None) -> bool:
+        return self._done.wait(timeout)
+
+    def _progress(self, written: int, total: int) -> None:
+        self.written = written
+        self.total = total
+
+    def _run(self) -> None:
+        try:
+            self.result = self._work(self._progress, self._cancel)
+        except BaseException as e:
+            self.error = e
+        finally:
+            self._done.set()
+
+    def watch(
+        self,
+        widget,  # type: ignore[no-untyped-def]
+        *,
+        on_progress: ProgressCallback | None = None,
+        on_done: Callable[..., None] | None = None,
+        interval_ms: int = 100,
+    ) -> None:
+        """Poll the job from the Tk event loop of `widget` until it finishes."""
+
+        def tick() -> None:
+            if on_progress is not None:
+                try:
+                    on_progress(self.written, self.total)
+                except Exception:
+                    pass
+            if self.done:
+                if on_done is not None:
+                    on_done(self)
+                return
+            try:
+                widget.after(interval_ms, tick)
+            except Exception:
+                # Widget destroyed: stop the job instead of writing output nobody is waiting for.
+                self.cancel()
+
+        tick()
+
+
+class ExportJob(BackgroundJob):
+    """`stream_query_to_file` as a `BackgroundJob`."""
+
+    def __init__(
+        self,
+        sql: str,
+        params: Sequence[object] = (),
+        *,
+        path: str | Path,
+        chunk_size: int = DEFAULT_CHUNK_SIZE,
+    ):
+        self.sql = sql
+        self.params = tuple(params)
+        self.path = Path(path)
+        self.chunk_size = chunk_size
+        super().__init__(self._export)
+
+    def _export(self, progress: ProgressCallback, cancel: Event) -> int:
+        return stream_query_to_file(
+            self.sql,
+            self.params,
+            path=self.path,
+            chunk_size=self.chunk_size,
+            progress=progress,
+            cancel=cancel,
+        )
@@ -1,22 +1,32 @@
 from __future__ import annotations
 
 import csv
+import time
 import tkinter as tk
+from collections import deque
 from datetime import datetime
 from pathlib import Path
 from tkinter import filedialog, messagebox
 
-from ttkbootstrap import Button, Checkbutton, Combobox, Entry, Frame, Label, Scrollbar, StringVar, Treeview
-
-from .database import connect, log_event
-from .auth_service import verify_credentials
+from ttkbootstrap import (
+    Button,
+    Checkbutton,
+    Combobox,
+    Entry,
+    Frame,
+    Label,
+    Progressbar,
+    Scrollbar,
+    StringVar,
+    Treeview,
+)
+
+from .database import activity_watermark, connect, log_event, query_events, subscribe_events
+from .auth_service import verify_cached, verify_credentials_async, when_done
+from .columnar_export import available_formats, export_sales_columnar, import_sales_columnar
+from .export_service import BackgroundJob, ExportJob, export_query
 from .utils.app_settings import get_setting, update_settings
 
-try:
-    import pandas as pd  # type: ignore
-except Exception:  # pragma: no cover
-    pd = None
-
 
 class ExportDataPanel(Frame):
     def __init__(self, master, current_user: str | None = None):
@@ -30,6 +40,11 @@ class ExportDataPanel(Frame):
         self.date_from = StringVar(value="")
         self.date_to = StringVar(value="")
         self.status = StringVar(value="")
+        self._job: BackgroundJob | None = None
+        self._job_label = ""
+        self.columnar_format = StringVar(value=available_formats()[0])
+        self.columnar_incremental = tk.BooleanVar(value=True)
+        self._export_buttons: list[Button] = []
 
         Label(self, text="Export Center", font=("Helvetica", 20, "bold")).pack(pady=(10, 2))
         Label(
@@ -85,18 +100,50 @@ class ExportDataPanel(Frame):
         actions = tk.LabelFrame(self, text="Quick Exports", padx=10, pady=10)
         actions.pack(padx=6, pady=(0, 10))
 
-        Button(actions, text="Products (Catalog)", bootstyle="success", width=20, command=self.export_products).grid(
-            row=0, column=0, padx=8, pady=6
-        )
-        Button(actions, text="Inventory (Stock)", bootstyle="success-outline", width=20, command=self.export_inventory).grid(
-            row=0, column=1, padx=8, pady=6
-        )
-        Button(actions, text="Sales (Invoices)", bootstyle="info", width=20, command=self.export_sales).grid(
-            row=0, column=2, padx=8, pady=6
+        for col, (text, style, command) in enumerate(
+            [
+                ("Products (Catalog)", "success", self.export_products),
+                ("Inventory (Stock)", "success-outline", self.export_inventory),
+                ("Sales (Invoices)", "info", self.export_sales),
+                ("Suppliers", "secondary", self.export_suppliers),
+            ]
+        ):
+            btn = Button(actions, text=text, bootstyle=style, width=20, command=command)
+            btn.grid(row=0, column=col, padx=8, pady=6)
+            self._export_buttons.append(btn)
+
+        history = tk.LabelFrame(self, text="Sales History (Columnar)", padx=10, pady=8)
+        history.pack(padx=6, pady=(0, 10))
+        Label(history, text="Format:").grid(row=0, column=0, sticky="w", padx=(0, 6))
+        Combobox(
+            history,
+            textvariable=self.columnar_format,
+            values=available_formats(),
+            state="readonly",
+            width=10,
+        ).grid(row=0, column=1, sticky="w")
+        Checkbutton(history, text="Only new sales since last export", variable=self.columnar_incremental).grid(
+            row=0, column=2, sticky="w", padx=12
         )
-        Button(actions, text="Suppliers", bootstyle="secondary", width=20, command=self.export_suppliers).grid(
-            row=0, column=3, padx=8, pady=6
+        for col, (text, style, command) in enumerate(
+            [
+                ("Export to Folder", "info-outline", self.export_sales_history),
+                ("Import from Folder", "secondary-outline", self.import_sales_history),
+            ],
+            start=3,
+        ):
+            btn = Button(history, text=text, bootstyle=style, width=18, command=command)
+            btn.grid(row=0, column=col, padx=6, pady=4)
+            self._export_buttons.append(btn)
+
+        progress_row = tk.Frame(self)
+        progress_row.pack(fill=tk.X, padx=10, pady=(0, 6))
+        self.progress = Progressbar(progress_row, mode="determinate", maximum=100, bootstyle="success-striped")
+        self.progress.pack(side=tk.LEFT, fill=tk.X, expand=True, padx=(0, 10))
+        self.cancel_btn = Button(
+            progress_row, text="Cancel", bootstyle="danger-outline", state="disabled", command=self.cancel_export
         )
+        self.cancel_btn.pack(side=tk.RIGHT)
 
         Label(self, textvariable=self.status, bootstyle="secondary").pack(anchor="w", padx=10, pady=(0, 6))
         Label(
@@ -123,82 +170,151 @@ class ExportDataPanel(Frame):
             )
         return Path(path) if path else None
 
-    def _export_df(self, df: pd.DataFrame, default_name: str, event_label: str) -> None:
-        if pd is None:
-            messagebox.showerror("Export", "Missing dependency: pandas. Install with `pip install -r requirements.txt`.")
+    def _busy(self) -> bool:
+        if self._job is not None and not self._job.done:
+            messagebox.showinfo("Export", "An export is already running.")
+            return True
+        return False
+
+    def _start_export(self, sql: str, params: tuple[object, ...], default_name: str, event_label: str) -> None:
+        if self._busy():
             return
         out = self._save_path(default_name)
         if not out:
             return
+
+        self._job_label = event_label
+        self._job = ExportJob(sql, params, path=out).start()
+        self._set_running(True)
+        self.status.set(f"Exporting {event_label}...")
+        self._job.watch(self, on_progress=self._on_export_progress, on_done=self._on_export_done)
+
+    def _set_running(self, running: bool) -> None:
+        for btn in self._export_buttons:
+            try:
+                btn.configure(state="disabled" if running else "normal")
+            except Exception:
+                pass
         try:
-            if out.suffix.lower() == ".csv":
-                df.to_csv(out, index=False)
-            else:
-                df.to_excel(out, index=False)
-            log_event("export", f"{event_label} exported to {out.name}", self.current_user)
-            messagebox.showinfo("Exported", f"Saved: {out}")
-            self.status.set(f"Exported {event_label}: {out}")
-        except Exception as e:
-            messagebox.showerror("Export failed", str(e))
+            self.cancel_btn.configure(state="normal" if running else "disabled")
+        except Exception:
+            pass
 
-    def export_products(self) -> None:
-        if pd is None:
-            messagebox.showerror("Export", "Missing dependency: pandas. Install with `pip install -r requirements.txt`.")
+    def _on_export_progress(self, written: int, total: int) -> None:
+        self.progress.configure(value=(written * 100 / total) if total else 0)
+        if total:
+            self.status.set(f"Exporting {self._job_label}: {written:,} / {total:,} rows")
+
+    def _on_export_done(self, job: ExportJob) -> None:
+        self._set_running(False)
+        if job.cancelled:
+            self.progress.configure(value=0)
+            self.status.set(f"Export cancelled: {self._job_label}")
             return
-        cols = ["id", "name"]
-        if self.include_barcodes.get():
-            cols.append("barcode")
-        cols += ["category", "unit", "price"]
-        if self.include_taxes.get():
-            cols += ["gst_percent", "tax_percent"]
-        cols += ["quantity", "expiry", "supplier_id"]
-        with connect() as conn:
-            rows = conn.execute(f"SELECT {', '.join(cols)} FROM products ORDER BY id DESC").fetchall()
-        df = pd.DataFrame([dict(r) for r in rows])
-        self._export_df(df, f"Products_{datetime.now().strftime('%Y%m%d_%H%M%S')}.xlsx", "Products")
+        if job.error is not None:
+            self.status.set(f"Export failed: {self._job_label}")
+            messagebox.showerror("Export failed", str(job.error))
+            return
+        self.progress.configure(value=100)
+        log_event(
+            "export",
+            f"{self._job_label} exported to {job.path.name}",
+            self.current_user,
+            payload={"path": str(job.path), "rows": job.written},
+        )
+        self.status.set(f"Exported {self._job_label} ({job.written:,} rows): {job.path}")
+        messagebox.showinfo("Exported", f"Saved: {job.path}")
+
+    def cancel_export(self) -> None:
+        if self._job is not None and not self._job.done:
+            self._job.cancel()
+            self.status.set("Cancelling...")
+
+    def _stamp(self, prefix: str) -> str:
+        return f"{prefix}_{datetime.now().strftime('%Y%m%d_%H%M%S')}.xlsx"
+
+    def export_products(self) -> None:
+        sql, params = export_query(
+            "products", include_barcodes=self.include_barcodes.get(), include_taxes=self.include_taxes.get()
+        )
+        self._start_export(sql, params, self._stamp("Products"), "Products")
 
     def export_inventory(self) -> None:
         self.export_products()
 
     def export_sales(self) -> None:
-        if pd is None:
-            messagebox.showerror("Export", "Missing dependency: pandas. Install with `pip install -r requirements.txt`.")
-            return
-        where = ""
-        params: list[object] = []
-        df_raw = self.date_from.get().strip()
-        dt_raw = self.date_to.get().strip()
-        if df_raw:
-            where += " AND DATE(sale_date) >= DATE(?)"
-            params.append(df_raw)
-        if dt_raw:
-            where += " AND DATE(sale_date) <= DATE(?)"
-            params.append(dt_raw)
+        sql, params = export_query(
+            "sales",
+            include_taxes=self.include_taxes.get(),
+            date_from=self.date_from.get().strip(),
+            date_to=self.date_to.get().strip(),
+        )
+        self._start_export(sql, params, self._stamp("Sales"), "Sales")
 
-        cols = ["id", "product_name", "quantity", "unit_price", "subtotal"]
-        if self.include_taxes.get():
-            cols += ["gst_percent", "tax_percent", "tax_amount"]
-        cols += ["total_price", "buyer_name", "buyer_mobile", "sale_date", "invoice_path"]
+    def export_suppliers(self) -> None:
+        sql, params = export_query("suppliers")
+        self._start_export(sql, params, self._stamp("Suppliers"), "Suppliers")
 
-        with connect() as conn:
-            rows = conn.execute(
-                f"""SELECT {', '.join(cols)}
-                    FROM sales
-                    WHERE 1=1 {where}
-                    ORDER BY sale_date DESC""",
-                tuple(params),
-            ).fetchall()
-        df = pd.DataFrame([dict(r) for r in rows])
-        self._export_df(df, f"Sales_{datetime.now().strftime('%Y%m%d_%H%M%S')}.xlsx", "Sales")
+    def export_sales_history(self) -> None:
+        if self._busy():
+            return
+        folder = filedialog.askdirectory(title="Choose a folder for the sales dataset")
+        if not folder:
+            return
+        dest = Path(folder)
+        fmt = self.columnar_format.get()
+        incremental = bool(self.columnar_incremental.get())
+
+        self._job_label = "Sales history"
+        self._job = BackgroundJob(
+            lambda progress, cancel: export_sales_columnar(
+                dest, fmt=fmt, incremental=incremental, progress=progress, cancel=cancel
+            )
+        ).start()
+        self._set_running(True)
+        self.status.set("Exporting sales history...")
+        self._job.watch(
+            self,
+            on_progress=self._on_export_progress,
+            on_done=lambda job: self._on_columnar_done(job, dest, "exported to"),
+        )
 
-    def export_suppliers(self) -> None:
-        if pd is None:
-            messagebox.showerror("Export", "Missing dependency: pandas. Install with `pip install -r requirements.txt`.")
+    def import_sales_history(self) -> None:
+        if self._busy():
             return
-        with connect() as conn:
-            rows = conn.execute("SELECT id, name, contact FROM suppliers ORDER BY id DESC").fetchall()
-        df = pd.DataFrame([dict(r) for r in rows])
-        self._export_df(df, f"Suppliers_{datetime.now().strftime('%Y%m%d_%H%M%S')}.xlsx", "Suppliers")
+        folder = filedialog.askdirectory(title="Choose a sales dataset folder to import")
+        if not folder:
+            return
+        src = Path(folder)
+
+        self._job_label = "Sales history"
+        self._job = BackgroundJob(
+            lambda progress, cancel: import_sales_columnar(src, progress=progress, cancel=cancel)
+        ).start()
+        self._set_running(True)
+        self.status.set("Importing sales history...")
+        self._job.watch(self, on_done=lambda job: self._on_columnar_done(job, src, "imported from"))
+
+    def _on_columnar_done(self, job: BackgroundJob, folder: Path, verb: str) -> None:
+        self._set_running(False)
+        if job.cancelled:
+            self.progress.configure(value=0)
+            self.status.set("Sales history transfer cancelled.")
+            return
+        if job.error is not None:
+            self.status.set("Sales history transfer failed.")
+            messagebox.showerror("Sales history", str(job.error))
+            return
+        self.progress.configure(value=100)
+        rows = int(job.result or 0)
+        log_event(
+            "export",
+            f"Sales history {verb} {folder.name} ({rows} rows)",
+            self.current_user,
+            payload={"path": str(folder), "rows": rows},
+        )
+        self.status.set(f"Sales history {verb} {folder} ({rows:,} rows)")
+        messagebox.showinfo("Sales history", f"{rows:,} rows {verb} {folder}")
 
 
 class InvoiceManagerPanel(Frame):
@@ -281,8 +397,15 @@ class InvoiceManagerPanel(Frame):
         self.date_from.trace_add("write", lambda *_: self.refresh())
         self.date_to.trace_add("write", lambda *_: self.refresh())
 
+        self._activity_mark = activity_watermark()
         self.refresh()
 
+    def on_show(self) -> None:
+        mark = activity_watermark()
+        if mark != self._activity_mark:
+            self._activity_mark = mark
+            self.refresh()
+
     def handle_shortcut(self, action: str) -> bool:
         action = (action or "").strip().lower()
         try:
@@ -506,6 +629,11 @@ class SearchProductPanel(Frame):
 
 
 class MonitorPanel(Frame):
+    MAX_ROWS = 500
+    # Events written by other processes (e.g. CLI jobs) never reach the in-process bus; poll the DB
+    # for those at this slower pace.
+    EXTERNAL_POLL_MS = 10_000
+
     def __init__(self, master):
         super().__init__(master, padding=10)
         self.pack(fill=tk.BOTH, expand=True)
@@ -516,7 +644,13 @@ class MonitorPanel(Frame):
         self.interval_var = StringVar(value=f"{max(1, int(round(interval_ms / 1000)))}s")
         self._after_id: str | None = None
         self._all_rows_count = 0
+        self._shown = 0
+        self._last_id = 0
+        self._last_db_poll = 0.0
         self._query_entry: Entry | None = None
+        # Filled by log_event on any thread; drained on the Tk thread by _tick.
+        self._inbox: deque[dict[str, object]] = deque(maxlen=self.MAX_ROWS)
+        self._unsubscribe = subscribe_events(self._inbox.append)
 
         Label(self, text="Activity Monitor", font=("Helvetica", 18, "bold")).pack(pady=(10, 2))
         Label(self, text="Recent actions in the system (auto-refresh).", bootstyle="secondary").pack(pady=(0, 10))
@@ -594,12 +728,20 @@ class MonitorPanel(Frame):
 
         self.query.trace_add("write", lambda *_: self.refresh())
         self.type_filter.trace_add("write", lambda *_: self.refresh())
-        self.auto_refresh.trace_add("write", lambda *_: self.refresh())
-        self.interval_var.trace_add("write", lambda *_: self.refresh())
+        self.auto_refresh.trace_add("write", lambda *_: self._on_refresh_prefs_changed())
+        self.interval_var.trace_add("write", lambda *_: self._on_refresh_prefs_changed())
         self.bind("<Destroy>", self._on_destroy, add=True)
 
         self.refresh()
 
+    def on_show(self) -> None:
+        # Catch up on anything logged while hidden (the inbox may have overflowed).
+        self._tick(force_db=True)
+
+    def on_hide(self) -> None:
+        # Stop ticking while hidden; on_show restarts it.
+        self._cancel_tick()
+
     def handle_shortcut(self, action: str) -> bool:
         action = (action or "").strip().lower()
         try:
@@ -621,7 +763,7 @@ class MonitorPanel(Frame):
             return False
         return False
 
-    def refresh(self) -> None:
+    def _cancel_tick(self) -> None:
         if self._after_id is not None:
             try:
                 self.after_cancel(self._after_id)
@@ -629,52 +771,127 @@ class MonitorPanel(Frame):
                 pass
             self._after_id = None
 
-        with connect() as conn:
-            rows = conn.execute(
-                "SELECT event_type, message, username, created_at FROM activity_log ORDER BY id DESC LIMIT 500"
-            ).fetchall()
+    def _schedule_tick(self) -> None:
+        self._cancel_tick()
+        if bool(self.auto_refresh.get()):
+            self._after_id = self.after(self._interval_ms(), self._tick)
 
-        self._all_rows_count = len(rows)
+    def _row_display(self, r) -> tuple[tuple[str, str, str, str], str] | None:  # type: ignore[no-untyped-def]
+        """Treeview values + tag for an activity row, or None if the current filters hide it."""
+        event_type = str(r["event_type"] or "").lower().strip()
+        username = str(r["username"] or "")
+        message = str(r["message"] or "")
+        created_at = str(r["created_at"] or "")
+
+        t = self.type_filter.get().strip().lower()
+        if t != "all" and event_type != t:
+            return None
         q = self.query.get().strip().lower()
+        if q:
+            hay = f"{event_type} {username} {message} {created_at}".lower()
+            if q not in hay:
+                return None
+
+        tag = event_type if event_type in ("auth", "product", "sale", "export", "settings") else ""
+        return (created_at, event_type.upper(), username or "-", message), tag
+
+    def _set_status(self) -> None:
+        self.status.set(
+            f"Last refresh: {datetime.now().strftime('%H:%M:%S')}  |  Showing {self._shown} of {self._all_rows_count}"
+        )
+
+    def refresh(self) -> None:
+        """Full reload of the newest rows (filters changed / manual refresh)."""
+        self._cancel_tick()
+        self._inbox.clear()
+
+        # The type filter is an indexed lookup; the free-text filter is applied to the result.
         t = self.type_filter.get().strip().lower()
+        rows = query_events(event_type=None if t == "all" else t, limit=self.MAX_ROWS)
+        self._last_db_poll = time.monotonic()
+
+        self._all_rows_count = len(rows)
+        self._last_id = max(activity_watermark(), int(rows[0]["id"]) if rows else 0)
 
         self.tree.delete(*self.tree.get_children())
         shown = 0
         for r in rows:
-            event_type = str(r["event_type"] or "").lower().strip()
-            username = str(r["username"] or "")
-            message = str(r["message"] or "")
-            created_at = str(r["created_at"] or "")
-
-            if t != "all" and event_type != t:
+            display = self._row_display(r)
+            if display is None:
                 continue
-            if q:
-                hay = f"{event_type} {username} {message} {created_at}".lower()
-                if q not in hay:
-                    continue
-
-            tag = event_type if event_type in ("auth", "product", "sale", "export", "settings") else ""
-            self.tree.insert("", tk.END, values=(created_at, event_type.upper(), username or "-", message), tags=(tag,))
+            values, tag = display
+            self.tree.insert("", tk.END, values=values, tags=(tag,))
             shown += 1
+        self._shown = shown
+
+        self._set_status()
+        self._schedule_tick()
+
+    def _tick(self, *, force_db: bool = False) -> None:
+        """
+        Tail-follow: add only rows newer than the last one shown.
+
+        Rows logged by this process arrive through the event bus without touching the DB. The DB
+        is only polled (`id > last_id`, a primary-key range scan) every EXTERNAL_POLL_MS, for rows
+        written by other processes. An idle tick does no I/O.
+        """
+        self._after_id = None
+        new_rows: dict[int, object] = {}
+        while self._inbox:
+            r = self._inbox.popleft()
+            row_id = int(r["id"])  # type: ignore[arg-type]
+            if row_id > self._last_id:
+                new_rows[row_id] = r
+
+        now = time.monotonic()
+        if force_db or (now - self._last_db_poll) * 1000 >= max(self.EXTERNAL_POLL_MS, self._interval_ms()):
+            self._last_db_poll = now
+            with connect() as conn:
+                for r in conn.execute(
+                    """SELECT id, event_type, message, username, created_at FROM activity_log
+                       WHERE id > ? ORDER BY id DESC LIMIT ?""",
+                    (self._last_id, self.MAX_ROWS),
+                ).fetchall():
+                    new_rows[int(r["id"])] = r
+
+        if new_rows:
+            self._prepend(sorted(new_rows.items()))
+        self._set_status()
+        self._schedule_tick()
+
+    def _prepend(self, rows: list[tuple[int, object]]) -> None:
+        # Oldest first, each inserted at the top, so the newest ends up first.
+        for row_id, r in rows:
+            self._last_id = max(self._last_id, row_id)
+            self._all_rows_count = min(self.MAX_ROWS, self._all_rows_count + 1)
+            display = self._row_display(r)
+            if display is None:
+                continue
+            values, tag = display
+            self.tree.insert("", 0, values=values, tags=(tag,))
+            self._shown += 1
 
-        self.status.set(
-            f"Last refresh: {datetime.now().strftime('%H:%M:%S')}  |  Showing {shown} of {self._all_rows_count}"
-        )
-
-        if bool(self.auto_refresh.get()):
-            self._after_id = self.after(self._interval_ms(), self.refresh)
+        children = self.tree.get_children()
+        if len(children) > self.MAX_ROWS:
+            self.tree.delete(*children[self.MAX_ROWS :])
+            self._shown = self.MAX_ROWS
 
     def _interval_ms(self) -> int:
         raw = str(self.interval_var.get()).strip().lower().replace(" ", "")
         try:
             if raw.endswith("s"):
-                ms = max(500, int(float(raw[:-1]) * 1000))
-                update_settings({"monitor_refresh_interval_ms": ms, "monitor_auto_refresh": bool(self.auto_refresh.get())})
-                return ms
+                return max(500, int(float(raw[:-1]) * 1000))
         except Exception:
             pass
         return 2000
 
+    def _on_refresh_prefs_changed(self) -> None:
+        # Persist only when the user changes the controls, not on every refresh tick.
+        update_settings(
+            {"monitor_refresh_interval_ms": self._interval_ms(), "monitor_auto_refresh": bool(self.auto_refresh.get())}
+        )
+        self.refresh()
+
     def _selected_row_text(self) -> str | None:
         sel = self.tree.selection()
         if not sel:
@@ -707,26 +924,38 @@ class MonitorPanel(Frame):
 
         with connect() as conn:
             rows = conn.execute(
-                "SELECT event_type, message, username, created_at FROM activity_log ORDER BY id DESC LIMIT 5000"
+                """SELECT event_type, message, username, created_at, entity_type, entity_id, qty_delta, payload
+                   FROM activity_log ORDER BY id DESC LIMIT 5000"""
             ).fetchall()
 
         try:
             with open(out, "w", newline="", encoding="utf-8") as f:
                 writer = csv.writer(f)
-                writer.writerow(["created_at", "event_type", "username", "message"])
+                writer.writerow(
+                    ["created_at", "event_type", "username", "message", "entity_type", "entity_id", "qty_delta", "payload"]
+                )
                 for r in rows[::-1]:
-                    writer.writerow([r["created_at"], r["event_type"], r["username"], r["message"]])
+                    writer.writerow(
+                        [
+                            r["created_at"],
+                            r["event_type"],
+                            r["username"],
+                            r["message"],
+                            r["entity_type"],
+                            r["entity_id"],
+                            r["qty_delta"],
+                            r["payload"],
+                        ]
+                    )
             messagebox.showinfo("Exported", f"Saved: {out}")
         except Exception as e:
             messagebox.showerror("Export failed", str(e))
 
     def _on_destroy(self, event) -> None:
-        if event.widget is self and self._after_id is not None:
-            try:
-                self.after_cancel(self._after_id)
-            except Exception:
-                pass
-            self._after_id = None
+        if event.widget is not self:
+            return
+        self._unsubscribe()
+        self._cancel_tick()
 
 
 class LockSessionPanel(Frame):
@@ -750,12 +979,38 @@ class LockSessionPanel(Frame):
         Label(card, text=f"User: {current_user}", font=("Helvetica", 10, "italic")).pack(pady=(0, 10))
         entry = Entry(card, show="*", textvariable=self.password, width=34)
         entry.pack(pady=(0, 12), ipady=5)
-        Button(card, text="Unlock", bootstyle="success", width=18, command=self.unlock_session).pack(pady=(0, 8))
+        self.unlock_btn = Button(card, text="Unlock", bootstyle="success", width=18, command=self.unlock_session)
+        self.unlock_btn.pack(pady=(0, 8))
         entry.focus_set()
+        self._checking = False
 
     def unlock_session(self) -> None:
-        if verify_credentials(self.current_user, self.password.get()):
-            log_event("auth", "Session unlocked", self.current_user)
-            self.on_unlock()
+        if self._checking:
+            return
+        password = self.password.get()
+        # Within the session window this is a single HMAC; otherwise hash on the auth worker.
+        if verify_cached(self.current_user, password):
+            self._unlocked()
+            return
+        self._checking = True
+        self.unlock_btn.configure(state="disabled", text="Checking…")
+        when_done(self, verify_credentials_async(self.current_user, password), self._on_checked)
+
+    def _on_checked(self, future) -> None:  # type: ignore[no-untyped-def]
+        self._checking = False
+        try:
+            self.unlock_btn.configure(state="normal", text="Unlock")
+        except Exception:
+            pass
+        try:
+            ok = future.result() is not None
+        except Exception:
+            ok = False
+        if ok:
+            self._unlocked()
             return
         messagebox.showerror("Error", "Invalid password.")
+
+    def _unlocked(self) -> None:
+        log_event("auth", "Session unlocked", self.current_user)
+        self.on_unlock()
@@ -0,0 +1,139 @@
+"""
+Frame sources for camera scanning: a live camera, a recorded video, or a folder of images.
+
+All of them look like `cv2.VideoCapture` to the scan pipeline (`isOpened()`, `read()` ->
+(ok, frame), `release()`), plus `live`: False for recordings, so the pipeline stops at the
+end of the file instead of waiting for the camera to come back.
+"""
+
+from __future__ import annotations
+
+import time
+from pathlib import Path
+
+IMAGE_SUFFIXES = (".png", ".jpg", ".jpeg", ".bmp", ".tif", ".tiff")
+
+
+def _cv2():  # type: ignore[no-untyped-def]
+    import cv2  # type: ignore
+
+    return cv2
+
+
+class CameraSource:
+    live = True
+
+    def __init__(self, index: int = 0, *, width: int = 1280, height: int = 720) -> None:
+        cv2 = _cv2()
+        self.name = f"camera {index}"
+        self._cap = cv2.VideoCapture(index)
+        # Request a higher resolution if supported (helps 1D barcodes).
+        try:
+            self._cap.set(cv2.CAP_PROP_FRAME_WIDTH, width)
+            self._cap.set(cv2.CAP_PROP_FRAME_HEIGHT, height)
+        except Exception:
+            pass
+
+    def isOpened(self) -> bool:
+        return bool(self._cap is not None and self._cap.isOpened())
+
+    def read(self):  # type: ignore[no-untyped-def]
+        return self._cap.read()
+
+    def release(self) -> None:
+        self._cap.release()
+
+
+class _Paced:
+    """Optionally deliver frames no faster than `fps`, like a camera would."""
+
+    def __init__(self, fps: float | None) -> None:
+        self._interval = 1.0 / fps if fps else 0.0
+        self._next = 0.0
+
+    def _pace(self) -> None:
+        if not self._interval:
+            return
+        now = time.perf_counter()
+        if now < self._next:
+            time.sleep(self._next - now)
+        self._next = max(now, self._next) + self._interval
+
+
+class VideoFileSource(_Paced):
+    live = False
+
+    def __init__(self, path: str | Path, *, loop: bool = False, fps: float | None = None) -> None:
+        super().__init__(fps)
+        cv2 = _cv2()
+        self.name = str(path)
+        self.loop = loop
+        self._cap = cv2.VideoCapture(str(path))
+        self._rewind = lambda: self._cap.set(cv2.CAP_PROP_POS_FRAMES, 0)
+
+    def isOpened(self) -> bool:
+        return bool(self._cap.isOpened())
+
+    def read(self):  # type: ignore[no-untyped-def]
+        self._pace()
+        ok, frame = self._cap.read()
+        if not ok and self.loop:
+            self._rewind()
+            ok, frame = self._cap.read()
+        return ok, frame
+
+    def release(self) -> None:
+        self._cap.release()
+
+
+class ImageDirSource(_Paced):
+    """Images in a folder, in name order; `current` is the file behind the last frame read."""
+
+    live = False
+
+    def __init__(self, folder: str | Path, *, loop: bool = False, fps: float | None = None) -> None:
+        super().__init__(fps)
+        self.name = str(folder)
+        self.loop = loop
+        self.paths = sorted(p for p in Path(folder).iterdir() if p.suffix.lower() in IMAGE_SUFFIXES)
+        self.current: Path | None = None
+        self._index = 0
+        self._imread = _cv2().imread
+
+    def isOpened(self) -> bool:
+        return bool(self.paths)
+
+    def read(self):  # type: ignore[no-untyped-def]
+        self._pace()
+        # An unreadable image (corrupt, half-copied) is skipped: (False, None) means the end.
+        for _ in range(len(self.paths)):
+            if self._index >= len(self.paths):
+                if not self.loop:
+                    break
+                self._index = 0
+            self.current = self.paths[self._index]
+            self._index += 1
+            frame = self._imread(str(self.current))
+            if frame is not None:
+                return True, frame
+        return False, None
+
+    def release(self) -> None:
+        self._index = len(self.paths)
+
+
+def open_source(spec: str | int | Path | None = None, *, fps: float | None = None):  # type: ignore[no-untyped-def]
+    """
+    Frame source for `spec`: a camera index ("0", the default), an image folder or a video file.
+
+    `fps` paces recordings to a camera-like rate; by default they are read as fast as possible.
+    """
+    text = str(spec if spec is not None else "").strip() or "0"
+    if text.isdigit():
+        return CameraSource(int(text))
+    path = Path(text)
+    if path.is_dir():
+        return ImageDirSource(path, fps=fps)
+    if not path.exists():
+        raise FileNotFoundError(f"Frame source not found: {path}")
+    return VideoFileSource(path, fps=fps)
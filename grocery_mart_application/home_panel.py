@@ -18,6 +18,7 @@ class HomePanel(Frame):
         self.switch_panel_callback = switch_panel_callback
         self.pack(fill=tk.BOTH, expand=True)
         self.stats: dict[str, Label] = {}
+        self._time_after_id: str | None = None
         self.create_widgets()
         self.update_time()
         self.refresh_stats()
@@ -56,9 +57,26 @@ class HomePanel(Frame):
         ).pack(side=tk.LEFT, padx=10)
 
     def update_time(self):
+        # on_show() also calls this (e.g. re-selecting Home); keep a single 1-second chain.
+        self._cancel_clock()
         now = datetime.now().strftime("%A, %d %B %Y | %H:%M:%S")
         self.time_label.config(text=now)
-        self.after(1000, self.update_time)
+        self._time_after_id = self.after(1000, self.update_time)
+
+    def on_show(self) -> None:
+        self.update_time()
+        self.refresh_stats()
+
+    def on_hide(self) -> None:
+        self._cancel_clock()
+
+    def _cancel_clock(self) -> None:
+        if self._time_after_id is not None:
+            try:
+                self.after_cancel(self._time_after_id)
+            except Exception:
+                pass
+            self._time_after_id = None
 
     def refresh_stats(self):
         threshold = int(get_setting("inventory_low_stock_threshold", DEFAULT_LOW_STOCK_THRESHOLD) or DEFAULT_LOW_STOCK_THRESHOLD)
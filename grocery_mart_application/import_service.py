@@ -0,0 +1,361 @@
+from __future__ import annotations
+
+import csv
+from collections.abc import Iterator
+from dataclasses import dataclass, field
+from pathlib import Path
+from threading import Event
+
+from .change_journal import commit_journaled, record_where
+from .database import connect
+from .export_service import DEFAULT_CHUNK_SIZE, ExportCancelled, ProgressCallback
+from .utils.helpers import validate_product_data
+
+CATALOG_FIELDS = [
+    "name",
+    "barcode",
+    "category",
+    "unit",
+    "price",
+    "gst_percent",
+    "tax_percent",
+    "quantity",
+    "expiry",
+    "supplier",
+]
+REQUIRED_FIELDS = ["name", "category", "unit", "price", "quantity"]
+
+# Accepted header spellings (lower-cased, spaces/dashes -> underscores) for each catalog field.
+# Includes the column names written by the inventory export so an export can be edited and re-imported.
+HEADER_ALIASES = {
+    "product": "name",
+    "product_name": "name",
+    "item": "name",
+    "sku_name": "name",
+    "ean": "barcode",
+    "upc": "barcode",
+    "gst": "gst_percent",
+    "gst%": "gst_percent",
+    "tax": "tax_percent",
+    "tax%": "tax_percent",
+    "qty": "quantity",
+    "stock": "quantity",
+    "mrp": "price",
+    "unit_price": "price",
+    "expiry_date": "expiry",
+    "supplier_name": "supplier",
+    "vendor": "supplier",
+}
+
+
+@dataclass(frozen=True)
+class ImportRowError:
+    row: int
+    message: str
+    name: str = ""
+    barcode: str = ""
+
+
+@dataclass
+class ImportResult:
+    rows: int = 0
+    inserted: int = 0
+    updated: int = 0
+    duplicates: int = 0
+    suppliers_created: int = 0
+    errors: list[ImportRowError] = field(default_factory=list)
+
+    @property
+    def imported(self) -> int:
+        return self.inserted + self.updated
+
+
+def _normalize_header(raw: object) -> str:
+    key = str(raw or "").strip().lower().replace(" ", "_").replace("-", "_")
+    return HEADER_ALIASES.get(key, key)
+
+
+def _cell(value: object) -> str:
+    if value is None:
+        return ""
+    # Spreadsheet barcodes/quantities often come back as floats (e.g. 8901234567890.0).
+    if isinstance(value, float) and value.is_integer():
+        return str(int(value))
+    if hasattr(value, "strftime"):
+        return value.strftime("%Y-%m-%d")  # type: ignore[union-attr]
+    return str(value).strip()
+
+
+def _iter_csv(path: Path) -> Iterator[list[object]]:
+    with open(path, newline="", encoding="utf-8-sig") as f:
+        yield from csv.reader(f)
+
+
+def _iter_xlsx(path: Path) -> Iterator[list[object]]:
+    try:
+        from openpyxl import load_workbook  # type: ignore
+    except Exception as e:  # pragma: no cover
+        raise RuntimeError(
+            "Missing dependency: openpyxl. Install with `pip install -r requirements.txt`."
+        ) from e
+
+    # Read-only mode streams rows from the sheet XML instead of loading the whole workbook.
+    wb = load_workbook(path, read_only=True, data_only=True)
+    try:
+        for row in wb.active.iter_rows(values_only=True):
+            yield list(row)
+    finally:
+        wb.close()
+
+
+def iter_catalog_rows(path: str | Path) -> Iterator[tuple[int, dict[str, str]]]:
+    """
+    Yield `(sheet row number, {catalog field: text})` for each data row of a CSV or XLSX file.
+
+    Unknown columns are ignored. Raises `ValueError` when a required column is missing.
+    """
+    path = Path(path)
+    rows = _iter_csv(path) if path.suffix.lower() == ".csv" else _iter_xlsx(path)
+    header: list[str] | None = None
+    for row_no, raw in enumerate(rows, start=1):
+        if header is None:
+            header = [_normalize_header(h) for h in raw]
+            missing = [f for f in REQUIRED_FIELDS if f not in header]
+            if missing:
+                raise ValueError(f"Missing required column(s): {', '.join(missing)}")
+            continue
+        values = [_cell(v) for v in raw]
+        if not any(values):
+            continue
+        # Short rows leave trailing columns empty; cells past the header are ignored.
+        data = {key: value for key, value in zip(header, values, strict=False) if key in CATALOG_FIELDS}
+        yield row_no, data
+
+
+def _parse_row(row_no: int, data: dict[str, str]) -> tuple[tuple[object, ...] | None, ImportRowError | None]:
+    name = data.get("name", "")
+    barcode = data.get("barcode", "")
+
+    def error(message: str) -> tuple[None, ImportRowError]:
+        return None, ImportRowError(row=row_no, message=message, name=name, barcode=barcode)
+
+    if not validate_product_data(data):
+        missing = [f for f in REQUIRED_FIELDS if not data.get(f)]
+        return error(f"Missing required value(s): {', '.join(missing)}")
+    try:
+        price = float(data["price"])
+    except ValueError:
+        return error(f"Price is not a number: {data['price']!r}")
+    try:
+        qty = int(float(data["quantity"]))
+    except ValueError:
+        return error(f"Quantity is not a number: {data['quantity']!r}")
+    if price < 0 or qty < 0:
+        return error("Price and quantity must not be negative.")
+
+    taxes: list[float | None] = []
+    for key in ("gst_percent", "tax_percent"):
+        raw = data.get(key, "")
+        if raw == "":
+            taxes.append(None)
+            continue
+        try:
+            value = float(raw.rstrip("%"))
+        except ValueError:
+            return error(f"{key} is not a number: {raw!r}")
+        if not 0 <= value <= 100:
+            return error(f"{key} must be between 0 and 100.")
+        taxes.append(value)
+
+    return (
+        row_no,
+        name,
+        barcode or None,
+        data["category"],
+        data["unit"],
+        price,
+        taxes[0],
+        taxes[1],
+        qty,
+        data.get("expiry") or None,
+        data.get("supplier") or None,
+    ), None
+
+
+_STAGE_SQL = """CREATE TEMP TABLE import_stage (
+    row_no INTEGER PRIMARY KEY,
+    name TEXT NOT NULL,
+    barcode TEXT,
+    category TEXT NOT NULL,
+    unit TEXT NOT NULL,
+    price REAL NOT NULL,
+    gst_percent REAL,
+    tax_percent REAL,
+    quantity INTEGER NOT NULL,
+    expiry TEXT,
+    supplier TEXT,
+    supplier_id INTEGER,
+    product_id INTEGER
+)"""
+
+
+def import_catalog(
+    path: str | Path,
+    *,
+    create_suppliers: bool = True,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    progress: ProgressCallback | None = None,
+    cancel: Event | None = None,
+) -> ImportResult:
+    """
+    Bulk insert/update products from a CSV or XLSX catalog.
+
+    Rows are parsed and validated as they stream in and staged into a temp table with `executemany`.
+    The staged rows are then matched to existing products by barcode, falling back to an exact name
+    match, and applied with set-based UPDATE/INSERT statements in a single transaction. When the same
+    product appears more than once in the file, the last row wins. Blank optional cells keep the
+    existing value on update. Invalid rows, and rows whose barcode would end up on two products, are
+    skipped and reported in `ImportResult.errors`.
+    """
+    result = ImportResult()
+    with connect() as conn:
+        conn.execute("PRAGMA temp_store = MEMORY")
+        conn.execute("DROP TABLE IF EXISTS temp.import_stage")
+        conn.execute(_STAGE_SQL)
+        try:
+            columns = ["row_no", *CATALOG_FIELDS]
+            stage_sql = (
+                f"INSERT INTO import_stage ({', '.join(columns)}) VALUES ({', '.join('?' * len(columns))})"
+            )
+            batch: list[tuple[object, ...]] = []
+            for row_no, data in iter_catalog_rows(path):
+                result.rows += 1
+                parsed, err = _parse_row(row_no, data)
+                if err is not None:
+                    result.errors.append(err)
+                else:
+                    batch.append(parsed)  # type: ignore[arg-type]
+                if len(batch) >= chunk_size:
+                    if cancel is not None and cancel.is_set():
+                        raise ExportCancelled()
+                    conn.executemany(stage_sql, batch)
+                    batch = []
+                    if progress is not None:
+                        progress(result.rows, 0)
+            if batch:
+                conn.executemany(stage_sql, batch)
+            if cancel is not None and cancel.is_set():
+                raise ExportCancelled()
+            if progress is not None:
+                progress(result.rows, result.rows)
+
+            staged = conn.execute("SELECT COUNT(*) FROM import_stage").fetchone()[0]
+            if create_suppliers:
+                before = conn.total_changes
+                conn.execute("""INSERT INTO suppliers (name)
+                       SELECT DISTINCT s.supplier FROM import_stage s
+                       WHERE s.supplier IS NOT NULL
+                         AND NOT EXISTS (SELECT 1 FROM suppliers x WHERE x.name = s.supplier)""")
+                result.suppliers_created = conn.total_changes - before
+            conn.execute("""UPDATE import_stage
+                   SET supplier_id = (SELECT MIN(x.id) FROM suppliers x WHERE x.name = import_stage.supplier)
+                   WHERE supplier IS NOT NULL""")
+
+            # Resolve targets: barcode first, then exact name.
+            conn.execute("""UPDATE import_stage
+                   SET product_id = (
+                       SELECT p.id FROM products p
+                       WHERE p.barcode = import_stage.barcode AND p.barcode IS NOT NULL AND p.barcode <> ''
+                   )
+                   WHERE barcode IS NOT NULL""")
+            conn.execute("""UPDATE import_stage
+                   SET product_id = (SELECT MIN(p.id) FROM products p WHERE p.name = import_stage.name)
+                   WHERE product_id IS NULL""")
+
+            # Last row wins for repeated products (same target, or same barcode/name among new rows).
+            conn.execute("""DELETE FROM import_stage
+                   WHERE row_no NOT IN (
+                       SELECT MAX(row_no) FROM import_stage
+                       GROUP BY COALESCE('id:' || product_id, 'bc:' || barcode, 'nm:' || name)
+                   )""")
+            result.duplicates = staged - int(conn.execute("SELECT COUNT(*) FROM import_stage").fetchone()[0])
+
+            # A barcode may end up on one product only: reject rows whose barcode is also staged for
+            # another product, or already belongs to a product other than the row's target.
+            conn.execute("CREATE INDEX temp.import_stage_barcode ON import_stage(barcode)")
+            clashes = conn.execute(
+                """SELECT s.row_no, s.name, s.barcode,
+                          (SELECT GROUP_CONCAT(o.row_no, ', ') FROM import_stage o
+                           WHERE o.barcode = s.barcode AND o.row_no <> s.row_no) AS other_rows,
+                          (SELECT p.name FROM products p
+                           WHERE p.barcode = s.barcode AND p.barcode <> '' AND p.id IS NOT s.product_id
+                           LIMIT 1) AS owner
+                   FROM import_stage s
+                   WHERE s.barcode IS NOT NULL AND (other_rows IS NOT NULL OR owner IS NOT NULL)"""
+            ).fetchall()
+            for c in clashes:
+                if c["other_rows"] is not None:
+                    message = f"Barcode {c['barcode']} is also used by row(s) {c['other_rows']}."
+                else:
+                    message = f"Barcode {c['barcode']} already belongs to {c['owner']!r}."
+                result.errors.append(
+                    ImportRowError(row=c["row_no"], message=message, name=c["name"], barcode=c["barcode"])
+                )
+            if clashes:
+                conn.executemany(
+                    "DELETE FROM import_stage WHERE row_no = ?", [(c["row_no"],) for c in clashes]
+                )
+                result.errors.sort(key=lambda e: e.row)
+
+            before = conn.total_changes
+            conn.execute("""UPDATE products
+                   SET name = s.name,
+                       barcode = COALESCE(s.barcode, products.barcode),
+                       category = s.category,
+                       unit = s.unit,
+                       price = s.price,
+                       gst_percent = COALESCE(s.gst_percent, products.gst_percent),
+                       tax_percent = COALESCE(s.tax_percent, products.tax_percent),
+                       quantity = s.quantity,
+                       expiry = COALESCE(s.expiry, products.expiry),
+                       supplier_id = COALESCE(s.supplier_id, products.supplier_id)
+                   FROM import_stage s
+                   WHERE s.product_id = products.id""")
+            result.updated = conn.total_changes - before
+
+            first_new_id = int(conn.execute("SELECT COALESCE(MAX(id), 0) FROM products").fetchone()[0]) + 1
+            before = conn.total_changes
+            conn.execute("""INSERT INTO products
+                       (name, barcode, category, unit, price, gst_percent, tax_percent, quantity, expiry, supplier_id)
+                   SELECT name, barcode, category, unit, price,
+                          COALESCE(gst_percent, 0), COALESCE(tax_percent, 0), quantity, expiry, supplier_id
+                   FROM import_stage
+                   WHERE product_id IS NULL
+                   ORDER BY row_no""")
+            result.inserted = conn.total_changes - before
+
+            if cancel is not None and cancel.is_set():
+                raise ExportCancelled()
+            seq = record_where(
+                conn,
+                "products",
+                "id >= ? OR id IN (SELECT product_id FROM import_stage WHERE product_id IS NOT NULL)",
+                (first_new_id,),
+            )
+            commit_journaled(conn, seq)
+        except BaseException:
+            conn.rollback()
+            raise
+        finally:
+            try:
+                conn.execute("DROP TABLE IF EXISTS temp.import_stage")
+            except Exception:
+                pass
+    return result
+
+
+def write_error_report(errors: list[ImportRowError], path: str | Path) -> None:
+    with open(path, "w", newline="", encoding="utf-8") as f:
+        writer = csv.writer(f)
+        writer.writerow(["row", "name", "barcode", "error"])
+        writer.writerows((e.row, e.name, e.barcode, e.message) for e in errors)
@@ -0,0 +1,195 @@
+"""
+Latency instrumentation for the hot paths: opening connections, SQL statements, panel loads,
+checkout, invoices and the activity log.
+
+`timer(name)` and `@timed(name)` add one sample to the rolling histogram of `name`; `stats()`
+summarises them (count, p50, p95, max) for the Performance overlay (F12 in the dashboard).
+Only the last `WINDOW` samples per operation are kept, so the percentiles follow what the
+till is doing now rather than since startup. Set GROCERY_MART_INSTRUMENTATION=0 to turn the
+timers off.
+
+`start_profile()` / `stop_profile()` wrap cProfile for on-demand captures, saved as .prof files
+under `profiles/` next to the database (`python -m pstats FILE`, or snakeviz). cProfile only
+sees the thread that starts it: the Tk thread when toggled from the overlay.
+GROCERY_MART_PROFILE=1 profiles the whole session from startup to exit.
+"""
+
+from __future__ import annotations
+
+import cProfile
+import functools
+import os
+import threading
+import time
+from collections import deque
+from collections.abc import Callable, Iterator
+from contextlib import contextmanager
+from dataclasses import dataclass
+from datetime import datetime
+from pathlib import Path
+from typing import TypeVar
+
+ENV_FLAG = "GROCERY_MART_INSTRUMENTATION"
+PROFILE_ENV_FLAG = "GROCERY_MART_PROFILE"
+PROFILES_DIRNAME = "profiles"
+# Samples kept per operation.
+WINDOW = 500
+
+F = TypeVar("F", bound=Callable[..., object])
+
+
+def _flag(name: str, default: bool) -> bool:
+    value = os.environ.get(name, "").strip().lower()
+    if not value:
+        return default
+    return value in ("1", "true", "yes", "on")
+
+
+ENABLED = _flag(ENV_FLAG, True)
+
+
+class RollingHistogram:
+    """The last `window` durations (seconds) of one operation, plus lifetime count and total."""
+
+    def __init__(self, window: int = WINDOW) -> None:
+        self.samples: deque[float] = deque(maxlen=window)
+        self.count = 0
+        self.total = 0.0
+
+    def add(self, seconds: float) -> None:
+        self.samples.append(seconds)
+        self.count += 1
+        self.total += seconds
+
+    def percentile(self, p: float) -> float:
+        return _percentile(sorted(self.samples), p)
+
+
+def _percentile(ordered: list[float], p: float) -> float:
+    """Nearest-rank percentile (0-100) of sorted samples, 0.0 when empty."""
+    if not ordered:
+        return 0.0
+    rank = max(1, -(-len(ordered) * p // 100))
+    return ordered[min(len(ordered), int(rank)) - 1]
+
+
+@dataclass
+class OpStats:
+    name: str
+    count: int
+    p50_ms: float
+    p95_ms: float
+    max_ms: float
+    total_s: float
+
+
+_lock = threading.Lock()
+_histograms: dict[str, RollingHistogram] = {}
+
+
+def record(name: str, seconds: float) -> None:
+    with _lock:
+        hist = _histograms.get(name)
+        if hist is None:
+            hist = _histograms[name] = RollingHistogram()
+        hist.add(seconds)
+
+
+@contextmanager
+def timer(name: str) -> Iterator[None]:
+    """Time the block as one sample of `name` (also when it raises)."""
+    if not ENABLED:
+        yield
+        return
+    t0 = time.perf_counter()
+    try:
+        yield
+    finally:
+        record(name, time.perf_counter() - t0)
+
+
+def timed(name: str) -> Callable[[F], F]:
+    """Decorator form of `timer`."""
+
+    def decorate(fn: F) -> F:
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):  # type: ignore[no-untyped-def]
+            if not ENABLED:
+                return fn(*args, **kwargs)
+            t0 = time.perf_counter()
+            try:
+                return fn(*args, **kwargs)
+            finally:
+                record(name, time.perf_counter() - t0)
+
+        return wrapper  # type: ignore[return-value]
+
+    return decorate
+
+
+def stats() -> list[OpStats]:
+    """One summary per operation, slowest p95 first."""
+    with _lock:
+        snapshot = [(name, hist.count, hist.total, list(hist.samples)) for name, hist in _histograms.items()]
+    out = []
+    for name, count, total, samples in snapshot:
+        ordered = sorted(samples)
+        p50, p95 = _percentile(ordered, 50), _percentile(ordered, 95)
+        out.append(
+            OpStats(name, count, p50 * 1000, p95 * 1000, (ordered[-1] if ordered else 0.0) * 1000, total)
+        )
+    out.sort(key=lambda s: s.p95_ms, reverse=True)
+    return out
+
+
+def reset() -> None:
+    with _lock:
+        _histograms.clear()
+
+
+# cProfile captures ------------------------------------------------------------------------
+
+_profiler: cProfile.Profile | None = None
+
+
+def profile_folder() -> Path:
+    # Imported here: database imports this module for its timers.
+    from . import database
+
+    return database.DB_PATH.parent / PROFILES_DIRNAME
+
+
+def profiling() -> bool:
+    return _profiler is not None
+
+
+def start_profile() -> None:
+    global _profiler
+    if _profiler is not None:
+        raise RuntimeError("A profile capture is already running.")
+    profiler = cProfile.Profile()
+    profiler.enable()
+    _profiler = profiler
+
+
+def stop_profile(folder: Path | None = None) -> Path:
+    """Stop the capture and write it as `profile-YYYYmmdd-HHMMSS.prof`; returns the file."""
+    global _profiler
+    profiler, _profiler = _profiler, None
+    if profiler is None:
+        raise RuntimeError("No profile capture is running.")
+    profiler.disable()
+    folder = folder or profile_folder()
+    folder.mkdir(parents=True, exist_ok=True)
+    stamp = f"{datetime.now():%Y%m%d-%H%M%S}"
+    path = folder / f"profile-{stamp}.prof"
+    n = 1
+    while path.exists():
+        n += 1
+        path = folder / f"profile-{stamp}-{n}.prof"
+    profiler.dump_stats(path)
+    return path
+
+
+def profile_session_requested() -> bool:
+    return _flag(PROFILE_ENV_FLAG, False)
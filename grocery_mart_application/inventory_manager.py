@@ -3,19 +3,19 @@ from __future__ import annotations
 import tkinter as tk
 from datetime import datetime
 from tkinter import filedialog, messagebox
-from threading import Event, Lock, Thread
 
 from ttkbootstrap import Button, Combobox, Entry, Frame, Label, Scrollbar, StringVar, Treeview
 
-from .database import connect, log_event
-from .utils.app_settings import get_setting
+from .catalog_service import search_products
+from .change_journal import commit_journaled, record_delete, record_rows
+from .database import activity_watermark, connect, log_event
+from .export_service import BackgroundJob, ExportJob, export_query
+from .instrumentation import timed
+from .reorder_service import get_reorder_engine
+from .scan_service import MAX_GAP_MS, ScanRequest, ScanWorker, WedgeBuffer
+from .utils.app_settings import get_setting, update_settings
 from .utils.helpers import validate_product_data
 
-try:
-    import pandas as pd  # type: ignore
-except Exception:  # pragma: no cover
-    pd = None
-
 
 DEFAULT_LOW_STOCK_THRESHOLD = 5
 
@@ -41,22 +41,23 @@ class InventoryManager(Frame):
         self.scan_qty_var = StringVar(value=str(get_setting("scan_default_qty", 1) or 1))
         self.scan_status_var = StringVar(value="Scan Mode: OFF")
         self.scan_mode = tk.BooleanVar(value=False)
-        self._camera_stop = Event()
-        self._camera_thread: Thread | None = None
+        self._camera_pipeline = None
         self._camera_ui_after_id: str | None = None
-        self._camera_lock = Lock()
-        self._latest_frame = None
         self._camera_photo = None
         self._camera_panel: tk.LabelFrame | None = None
         self._camera_image: tk.Label | None = None
         self._camera_debug_var = StringVar(value="")
-        self._camera_stats: dict[str, object] = {
-            "frames": 0,
-            "decode_attempts": 0,
-            "last_code": "",
-            "decoder": "",
-            "size": "",
-        }
+        self._camera_last_code = ""
+        self._camera_hit_chain = ""
+        self._camera_debouncer = None
+        self._camera_count = 0
+        self.camera_continuous = tk.BooleanVar(value=bool(get_setting("scan_camera_continuous", False)))
+        # Scans are applied in arrival order on a worker; keyboard-wedge input is assembled here.
+        self._scan_worker = ScanWorker(user=current_user)
+        self._scan_poll_after_id: str | None = None
+        self._wedge = WedgeBuffer(max_gap_ms=float(get_setting("scan_wedge_max_gap_ms", MAX_GAP_MS) or MAX_GAP_MS))
+        self._wedge_idle_ms = int(get_setting("scan_wedge_idle_ms", 150) or 0)
+        self._wedge_idle_after_id: str | None = None
         self.fields: dict[str, StringVar] = {}
         self.selected_id: int | None = None
         self._supplier_name_to_id: dict[str, int] = {}
@@ -73,11 +74,23 @@ class InventoryManager(Frame):
         self._build_search_bar()
         self._build_table()
 
+        self._activity_mark = activity_watermark()
         self.refresh_suppliers()
         self.load_data()
         self.smart_alerts()
         self.bind("<Destroy>", self._on_destroy, add=True)
 
+    def on_show(self) -> None:
+        # Only reload the table when something was changed elsewhere since it was last loaded.
+        mark = activity_watermark()
+        if mark != self._activity_mark:
+            self._activity_mark = mark
+            self.refresh_suppliers()
+            self.load_data()
+
+    def on_hide(self) -> None:
+        self.stop_camera_scan()
+
     def _build_header(self) -> None:
         Label(self, text="Inventory", font=("Helvetica", 20, "bold")).pack(pady=(5, 10))
 
@@ -95,6 +108,11 @@ class InventoryManager(Frame):
         Button(top_frame, text="Export", bootstyle="success-outline", command=self.export_inventory).pack(
             side=tk.RIGHT, padx=10
         )
+        self.import_btn = Button(top_frame, text="Import", bootstyle="info-outline", command=self.import_catalog)
+        self.import_btn.pack(side=tk.RIGHT, padx=(0, 10))
+        Button(top_frame, text="Reorder", bootstyle="warning-outline", command=self.show_reorder_suggestions).pack(
+            side=tk.RIGHT
+        )
 
         scan_frame = tk.Frame(self)
         scan_frame.pack(fill=tk.X, padx=10, pady=(0, 10))
@@ -110,7 +128,7 @@ class InventoryManager(Frame):
         Label(scan_frame, text="Barcode:").pack(side=tk.LEFT)
         self.scan_entry = Entry(scan_frame, textvariable=self.scan_var, width=28)
         self.scan_entry.pack(side=tk.LEFT, padx=(8, 12))
-        self.scan_entry.bind("<Return>", lambda _e: self.handle_barcode_scan())
+        self.scan_entry.bind("<KeyPress>", self._on_scan_key)
 
         self.camera_btn = Button(
             scan_frame,
@@ -118,7 +136,13 @@ class InventoryManager(Frame):
             bootstyle="info-outline",
             command=self.toggle_camera_scan,
         )
-        self.camera_btn.pack(side=tk.LEFT, padx=(0, 12))
+        self.camera_btn.pack(side=tk.LEFT, padx=(0, 6))
+        tk.Checkbutton(
+            scan_frame,
+            text="Continuous",
+            variable=self.camera_continuous,
+            command=lambda: update_settings({"scan_camera_continuous": bool(self.camera_continuous.get())}),
+        ).pack(side=tk.LEFT, padx=(0, 12))
 
         Label(scan_frame, text="Action:").pack(side=tk.LEFT)
         action = Combobox(
@@ -309,13 +333,13 @@ class InventoryManager(Frame):
                 pass
 
     def toggle_camera_scan(self) -> None:
-        if self._camera_thread is not None and self._camera_thread.is_alive():
+        if self._camera_pipeline is not None:
             self.stop_camera_scan()
             return
         self.start_camera_scan()
 
     def start_camera_scan(self) -> None:
-        if self._camera_thread is not None and self._camera_thread.is_alive():
+        if self._camera_pipeline is not None:
             return
 
         if not bool(self.scan_mode.get()):
@@ -337,43 +361,33 @@ class InventoryManager(Frame):
             )
             return
 
-        decode = None
-        decoder_name = "opencv"
+        from .frame_sources import open_source
+        from .scan_pipeline import ScanPipeline
+        from .scanner_engine import create_engine
+
+        # Camera index, or a recording (video file / image folder) to replay at camera speed.
+        source = str(get_setting("scan_camera_source", "") or "")
+
+        pipeline = ScanPipeline(
+            # Runs on the capture thread: opening a camera can take a second or more.
+            lambda: open_source(source, fps=30),
+            lambda: create_engine(cv2),
+            preview=lambda frame: self._camera_preview_image(cv2, frame),
+        )
         try:
-            from pyzbar.pyzbar import ZBarSymbol, decode as _decode  # type: ignore
-
-            # Limit symbologies for stability/perf. This also avoids rare decoder assertions
-            # from unrelated formats (e.g. PDF417) on noisy frames.
-            allowed = [
-                ZBarSymbol.EAN13,
-                ZBarSymbol.EAN8,
-                ZBarSymbol.UPCA,
-                ZBarSymbol.UPCE,
-                ZBarSymbol.CODE128,
-                ZBarSymbol.CODE39,
-                ZBarSymbol.CODE93,
-                ZBarSymbol.I25,
-                ZBarSymbol.QRCODE,
-            ]
-
-            def decode(img):  # type: ignore[no-redef]
-                return _decode(img, symbols=allowed)
-
-            decoder_name = "pyzbar+opencv"
-        except Exception:
-            decode = None
-            decoder_name = "opencv"
-
-        self.scan_status_var.set("Camera scanning...")
-        with self._camera_lock:
-            self._camera_stats = {
-                "frames": 0,
-                "decode_attempts": 0,
-                "last_code": "",
-                "decoder": decoder_name,
-                "size": "",
-            }
-        self._camera_stop.clear()
+            pipeline.start()
+        except ValueError as e:
+            messagebox.showerror("Camera Scan", f"{e}\n\nInstall: pip install opencv-contrib-python pyzbar")
+            return
+
+        from .scan_pipeline import CodeDebouncer
+
+        self._camera_pipeline = pipeline
+        self._camera_last_code = ""
+        self._camera_hit_chain = ""
+        self._camera_count = 0
+        self._camera_debouncer = CodeDebouncer(float(get_setting("scan_camera_cooldown_s", 2.0) or 0))
+        self.scan_status_var.set("Camera scanning..." + (" (continuous)" if self.camera_continuous.get() else ""))
         if self.camera_btn is not None:
             try:
                 self.camera_btn.config(text="Stop Camera", bootstyle="danger-outline")
@@ -386,12 +400,12 @@ class InventoryManager(Frame):
             except Exception:
                 pass
 
-        self._camera_thread = Thread(target=self._camera_capture_loop, args=(cv2, decode), daemon=True)
-        self._camera_thread.start()
-        self._schedule_camera_ui_update(cv2)
+        self._schedule_camera_ui_update()
 
     def stop_camera_scan(self) -> None:
-        self._camera_stop.set()
+        pipeline, self._camera_pipeline = self._camera_pipeline, None
+        if pipeline is not None:
+            pipeline.stop()
         if self.camera_btn is not None:
             try:
                 self.camera_btn.config(text="Camera Scan", bootstyle="info-outline")
@@ -408,8 +422,6 @@ class InventoryManager(Frame):
                 self._camera_panel.pack_forget()
             except Exception:
                 pass
-        with self._camera_lock:
-            self._latest_frame = None
         self._camera_photo = None
         if bool(self.scan_mode.get()):
             self.scan_status_var.set("Ready to scan...")
@@ -417,8 +429,9 @@ class InventoryManager(Frame):
     def _on_destroy(self, event) -> None:
         if event.widget is self:
             self.stop_camera_scan()
+            self._scan_worker.stop()
 
-    def _schedule_camera_ui_update(self, cv2) -> None:  # type: ignore[no-untyped-def]
+    def _schedule_camera_ui_update(self) -> None:
         if self._camera_ui_after_id is not None:
             try:
                 self.after_cancel(self._camera_ui_after_id)
@@ -427,172 +440,80 @@ class InventoryManager(Frame):
             self._camera_ui_after_id = None
 
         def tick() -> None:
-            if self._camera_stop.is_set():
-                self._camera_ui_after_id = None
+            self._camera_ui_after_id = None
+            if self._camera_pipeline is None:
                 return
-            self._update_camera_preview(cv2)
-            self._camera_ui_after_id = self.after(66, tick)  # ~15 FPS (lighter on CPU)
+            self._poll_camera(self._camera_pipeline)
+            if self._camera_pipeline is not None:
+                self._camera_ui_after_id = self.after(66, tick)  # ~15 FPS (lighter on CPU)
 
         self._camera_ui_after_id = self.after(0, tick)
 
-    def _update_camera_preview(self, cv2) -> None:  # type: ignore[no-untyped-def]
-        if self._camera_image is None:
-            return
-        with self._camera_lock:
-            frame = self._latest_frame
-            stats = dict(self._camera_stats)
-        if frame is None:
-            self._camera_debug_var.set(
-                f"Decoder: {stats.get('decoder','')}\nStatus: waiting for camera frame…"
-            )
-            return
-        try:
-            from PIL import Image, ImageTk  # type: ignore
-
-            # Downscale using OpenCV first (faster than PIL on large frames).
-            h, w = frame.shape[:2]
-            target_w, target_h = 520, 320
-            scale = min(target_w / max(w, 1), target_h / max(h, 1))
-            if scale < 1.0:
-                frame_small = cv2.resize(frame, (int(w * scale), int(h * scale)), interpolation=cv2.INTER_AREA)
-            else:
-                frame_small = frame
-
-            rgb = cv2.cvtColor(frame_small, cv2.COLOR_BGR2RGB)
-            img = Image.fromarray(rgb)
-            self._camera_photo = ImageTk.PhotoImage(img)
-            self._camera_image.configure(image=self._camera_photo)
-            self._camera_debug_var.set(
-                f"Decoder: {stats.get('decoder','')}\n"
-                f"Frame: {stats.get('size','')}\n"
-                f"Seen: {stats.get('frames',0)}  Attempts: {stats.get('decode_attempts',0)}\n"
-                f"Last: {stats.get('last_code','') or '-'}"
-            )
-        except Exception:
-            return
-
-    def _camera_capture_loop(self, cv2, decode) -> None:  # type: ignore[no-untyped-def]
-        cap = None
-        try:
-            cap = cv2.VideoCapture(0)
-            if not cap or not cap.isOpened():
-                self.after(0, lambda: messagebox.showerror("Camera Scan", "Could not open the camera."))
-                self.after(0, lambda: self.scan_status_var.set("Camera unavailable."))
-                return
-
-            # Request a higher resolution if supported (helps 1D barcodes).
+    @staticmethod
+    def _camera_preview_image(cv2, frame):  # type: ignore[no-untyped-def]
+        """Resize + convert a BGR frame to a PIL image; runs on the pipeline's preview thread."""
+        from PIL import Image  # type: ignore
+
+        # Downscale using OpenCV first (faster than PIL on large frames).
+        h, w = frame.shape[:2]
+        target_w, target_h = 520, 320
+        scale = min(target_w / max(w, 1), target_h / max(h, 1))
+        if scale < 1.0:
+            frame = cv2.resize(frame, (int(w * scale), int(h * scale)), interpolation=cv2.INTER_AREA)
+        return Image.fromarray(cv2.cvtColor(frame, cv2.COLOR_BGR2RGB))
+
+    def _poll_camera(self, pipeline) -> None:  # type: ignore[no-untyped-def]
+        """Tk side of the pipeline: show the newest preview, act on decoded codes, update debug text."""
+        image = pipeline.take_preview()
+        if image is not None and self._camera_image is not None:
             try:
-                cap.set(cv2.CAP_PROP_FRAME_WIDTH, 1280)
-                cap.set(cv2.CAP_PROP_FRAME_HEIGHT, 720)
+                from PIL import ImageTk  # type: ignore
+
+                self._camera_photo = ImageTk.PhotoImage(image)
+                self._camera_image.configure(image=self._camera_photo)
             except Exception:
                 pass
 
-            def opencv_detect(frame) -> list[str]:
-                # OpenCV contrib exposes barcode APIs inconsistently across builds; try a few.
-                candidates = []
-                try:
-                    if hasattr(cv2, "barcode") and hasattr(cv2.barcode, "BarcodeDetector"):
-                        det = cv2.barcode.BarcodeDetector()
-                        ok, decoded_info, _decoded_type, _points = det.detectAndDecode(frame)
-                        if ok and decoded_info:
-                            candidates.extend([s for s in decoded_info if s])
-                except Exception:
-                    pass
-                try:
-                    if hasattr(cv2, "barcode_BarcodeDetector"):
-                        det = cv2.barcode_BarcodeDetector()
-                        ok, decoded_info, _decoded_type, _points = det.detectAndDecode(frame)
-                        if ok and decoded_info:
-                            candidates.extend([s for s in decoded_info if s])
-                except Exception:
-                    pass
-                return [c.strip() for c in candidates if c and str(c).strip()]
+        continuous = bool(self.camera_continuous.get())
+        for decoded in pipeline.drain_results():
+            if not decoded.result.code:
+                continue
+            self._camera_hit_chain = f"{decoded.result.chain} in {decoded.latency_ms:.0f} ms"
+            if not continuous:
+                self._camera_last_code = decoded.result.code
+                self.stop_camera_scan()
+                self.scan_var.set(decoded.result.code)
+                self.handle_barcode_scan()
+                return
+            # Keep the camera open; every code in view goes to the scan queue once.
+            for code in decoded.result.codes:
+                if self._camera_debouncer is None or self._camera_debouncer.accept(code):
+                    self._camera_last_code = code
+                    self._camera_count += 1
+                    self.queue_scan(code, interactive=False)
+
+        if not pipeline.running:
+            error = pipeline.error
+            self.stop_camera_scan()
+            if error:
+                messagebox.showerror("Camera Scan", error)
+                self.scan_status_var.set("Camera unavailable.")
+            return
 
-            def pyzbar_detect(frame) -> list[str]:
-                if decode is None:
-                    return []
-                try:
-                    codes = decode(frame) or []
-                except Exception:
-                    codes = []
-                out = []
-                for c in codes:
-                    try:
-                        out.append(c.data.decode("utf-8").strip())
-                    except Exception:
-                        continue
-                return [s for s in out if s]
-
-            frame_idx = 0
-            while not self._camera_stop.is_set():
-                ok, frame = cap.read()
-                if not ok:
-                    continue
-
-                h, w = frame.shape[:2]
-                with self._camera_lock:
-                    self._latest_frame = frame
-                    self._camera_stats["frames"] = int(self._camera_stats.get("frames", 0) or 0) + 1
-                    if not self._camera_stats.get("size"):
-                        self._camera_stats["size"] = f"{w}x{h}"
-
-                frame_idx += 1
-                # Decode every other frame to keep UI responsive.
-                if frame_idx % 2 == 0:
-                    data = ""
-                    with self._camera_lock:
-                        self._camera_stats["decode_attempts"] = int(self._camera_stats.get("decode_attempts", 0) or 0) + 1
-
-                    # Center ROI (helps reduce noise and speeds decode).
-                    try:
-                        x0 = int(w * 0.1)
-                        y0 = int(h * 0.2)
-                        x1 = int(w * 0.9)
-                        y1 = int(h * 0.8)
-                        roi = frame[y0:y1, x0:x1]
-                    except Exception:
-                        roi = frame
-
-                    # Preprocess (helps 1D barcodes with low contrast).
-                    try:
-                        gray = cv2.cvtColor(roi, cv2.COLOR_BGR2GRAY)
-                        gray = cv2.GaussianBlur(gray, (3, 3), 0)
-                        gray = cv2.equalizeHist(gray)
-                        _t, bw = cv2.threshold(gray, 0, 255, cv2.THRESH_BINARY + cv2.THRESH_OTSU)
-                    except Exception:
-                        gray = roi
-                        bw = roi
-
-                    # Prefer OpenCV's detector if present; otherwise fall back to pyzbar.
-                    found = opencv_detect(roi)
-                    if not found:
-                        found = opencv_detect(gray)
-                    if not found:
-                        found = pyzbar_detect(bw)
-                    if not found:
-                        found = pyzbar_detect(gray)
-
-                    if found:
-                        data = found[0].strip()
-
-                    if data:
-                        self._camera_stop.set()
-                        with self._camera_lock:
-                            self._camera_stats["last_code"] = data
-
-                        def on_scan() -> None:
-                            self.scan_var.set(data)
-                            self.handle_barcode_scan()
-
-                        self.after(0, on_scan)
-                        break
-        finally:
-            try:
-                if cap is not None:
-                    cap.release()
-            except Exception:
-                pass
-            self.after(0, self.stop_camera_scan)
+        stats = pipeline.stats()
+        decoder = pipeline.engines[0].decoder_name if pipeline.engines else ""
+        if not stats["frames"]:
+            self._camera_debug_var.set(f"Decoder: {decoder}\nStatus: waiting for camera frame…")
+            return
+        self._camera_debug_var.set(
+            f"Decoder: {decoder}  Workers: {pipeline.workers}\n"
+            f"Frame: {stats['size']}  {stats['fps']:.0f} fps\n"
+            f"Seen: {stats['frames']}  Decoded: {stats['decoded']}  Skipped: {stats['dropped']}\n"
+            f"Last: {self._camera_last_code or '-'}"
+            + (f"  Count: {self._camera_count}" if continuous else "")
+            + (f" ({self._camera_hit_chain})" if self._camera_hit_chain else "")
+            + f"\nTiming: {stats['timings'] or '-'}"
+        )
 
     def _parse_scan_qty(self) -> int | None:
         try:
@@ -630,90 +551,168 @@ class InventoryManager(Frame):
         except Exception:
             return
 
-    def handle_barcode_scan(self) -> None:
+    def _on_scan_key(self, event) -> str | None:  # type: ignore[no-untyped-def]
+        """
+        Feed barcode-field keystrokes to the wedge buffer rather than the widget.
+
+        Scanner bursts become complete codes however fast they arrive; the field just mirrors
+        the buffer. With Scan Mode off the field behaves like a normal entry.
+        """
         if not bool(self.scan_mode.get()):
-            self.scan_status_var.set("Scan Mode: OFF")
-            return
+            if event.keysym in ("Return", "KP_Enter"):
+                self.handle_barcode_scan()
+                return "break"
+            return None
+        # Leave shortcuts (Ctrl/Alt combinations, e.g. paste) to the entry.
+        if int(getattr(event, "state", 0) or 0) & 0x000C:
+            return None
+        if event.keysym in ("Return", "KP_Enter", "Tab"):
+            done = self._wedge.feed("\n", float(event.time))
+            if done is None and self.scan_var.get().strip():
+                # Text that reached the field another way (paste).
+                self.handle_barcode_scan()
+            elif done is not None:
+                self.queue_scan(done.code)
+                self.scan_var.set("")
+            return "break"
+        if event.keysym == "BackSpace":
+            self._wedge.backspace()
+            self.scan_var.set(self._wedge.text)
+            return "break"
+        char = event.char
+        if not char or not char.isprintable():
+            return None
+        self._wedge.feed(char, float(event.time))
+        self.scan_var.set(self._wedge.text)
+        try:
+            self.scan_entry.icursor(tk.END)  # type: ignore[union-attr]
+        except Exception:
+            pass
+        if self._wedge_idle_ms > 0:
+            # Scanners configured without an Enter suffix: a burst followed by silence is a code.
+            if self._wedge_idle_after_id is not None:
+                self.after_cancel(self._wedge_idle_after_id)
+            self._wedge_idle_after_id = self.after(self._wedge_idle_ms, self._on_wedge_idle)
+        return "break"
+
+    def _on_wedge_idle(self) -> None:
+        self._wedge_idle_after_id = None
+        done = self._wedge.flush_idle()
+        if done is not None:
+            self.scan_var.set("")
+            self.queue_scan(done.code)
 
-        barcode = str(self.scan_var.get()).strip()
-        if not barcode:
-            return
+    def queue_scan(self, barcode: str, *, interactive: bool = True) -> bool:
+        """
+        Queue the current scan action for `barcode`; scans are applied in order on a worker.
 
+        Non-interactive scans (continuous camera mode) report problems in the status line instead
+        of dialogs, and skip unknown barcodes rather than offering to assign them.
+        """
+        barcode = barcode.strip()
+        if not barcode:
+            return False
         qty = self._parse_scan_qty()
         if qty is None:
-            messagebox.showerror("Scan Qty", "Qty must be a positive integer.")
-            return
-
+            if interactive:
+                messagebox.showerror("Scan Qty", "Qty must be a positive integer.")
+            else:
+                self.scan_status_var.set(f"{barcode}: Qty must be a positive integer.")
+            return False
         action = str(self.scan_action_var.get()).strip()
+        self._scan_worker.submit(ScanRequest(barcode, action, qty, interactive))
+        if self._scan_poll_after_id is None:
+            self._scan_poll_after_id = self.after(15, self._poll_scan_outcomes)
+        return True
+
+    def _poll_scan_outcomes(self) -> None:
+        self._scan_poll_after_id = None
+        outcomes = self._scan_worker.drain()
+        applied = [o for o in outcomes if o.status == "ok"]
+        pending = self._scan_worker.pending
+        if applied:
+            # One table refresh per batch, however many scans it held.
+            self.load_data()
+            last = applied[-1]
+            if last.product_id is not None:
+                self._select_tree_row(last.product_id)
+            self.scan_status_var.set(
+                f"{last.name}: {last.before} → {last.after}"
+                + (f"  (+{len(applied) - 1} more)" if len(applied) > 1 else "")
+                + (f"  [{pending} queued]" if pending else "")
+            )
+        if pending:
+            self._scan_poll_after_id = self.after(30, self._poll_scan_outcomes)
 
-        with connect() as conn:
-            row = conn.execute(
-                "SELECT id, name, quantity FROM products WHERE barcode = ?",
-                (barcode,),
-            ).fetchone()
-
-        if not row:
-            if self.selected_id and messagebox.askyesno(
-                "Unknown Barcode",
-                "Barcode not found. Assign this barcode to the currently selected product?",
-            ):
-                if not self._validate_barcode_unique(barcode):
-                    return
-                try:
-                    with connect() as conn:
-                        conn.execute("UPDATE products SET barcode = ? WHERE id = ?", (barcode, self.selected_id))
-                        conn.commit()
-                    log_event("product", f"Assigned barcode {barcode} to product ID {self.selected_id}", self.current_user)
-                    self.load_data()
-                    self._select_tree_row(self.selected_id)
-                    self.scan_status_var.set("Barcode assigned.")
-                except Exception as e:
-                    messagebox.showerror("Barcode", str(e))
+        for out in outcomes:
+            if out.status == "ok":
+                continue
+            if not out.request.interactive:
+                self.scan_status_var.set(
+                    f"Unknown barcode {out.request.barcode} (skipped)" if out.status == "unknown" else out.message
+                )
+            elif out.status == "unknown":
+                self._offer_assign_barcode(out.request.barcode)
+            elif out.status == "rejected":
+                messagebox.showerror("Stock", out.message)
             else:
-                messagebox.showwarning(
-                    "Unknown Barcode",
-                    "Barcode not found. Select a product and scan again to assign, or add a new product first.",
+                messagebox.showerror("Update failed", out.message)
+
+    def _offer_assign_barcode(self, barcode: str) -> None:
+        if self.selected_id and messagebox.askyesno(
+            "Unknown Barcode",
+            f"Barcode {barcode} not found. Assign this barcode to the currently selected product?",
+        ):
+            if not self._validate_barcode_unique(barcode):
+                return
+            try:
+                with connect() as conn:
+                    conn.execute("UPDATE products SET barcode = ? WHERE id = ?", (barcode, self.selected_id))
+                    seq = record_rows(conn, {"products": [self.selected_id]}, user=self.current_user)
+                    commit_journaled(conn, seq)
+                log_event(
+                    "product",
+                    f"Assigned barcode {barcode} to product ID {self.selected_id}",
+                    self.current_user,
+                    entity_type="product",
+                    entity_id=int(self.selected_id),
+                    payload={"barcode": barcode},
                 )
-            self.scan_var.set("")
-            if self.scan_entry is not None:
-                try:
-                    self.scan_entry.focus_set()
-                except Exception:
-                    pass
-            return
-
-        product_id = int(row["id"])
-        name = str(row["name"])
-        current_qty = int(row["quantity"])
-
-        if action == "Set Qty":
-            new_qty = qty
-        elif action == "Dispatch (-)":
-            new_qty = current_qty - qty
+                self.load_data()
+                self._select_tree_row(self.selected_id)
+                self.scan_status_var.set("Barcode assigned.")
+            except Exception as e:
+                messagebox.showerror("Barcode", str(e))
         else:
-            new_qty = current_qty + qty
+            messagebox.showwarning(
+                "Unknown Barcode",
+                f"Barcode {barcode} not found. Select a product and scan again to assign, or add a new product first.",
+            )
+        if self.scan_entry is not None:
+            try:
+                self.scan_entry.focus_set()
+            except Exception:
+                pass
 
-        if new_qty < 0:
-            messagebox.showerror("Stock", f"Cannot dispatch {qty}. Current stock for {name} is {current_qty}.")
+    def handle_barcode_scan(self, barcode: str | None = None, *, interactive: bool = True) -> None:
+        """Apply the selected scan action to `barcode` (default: the barcode field)."""
+        if not bool(self.scan_mode.get()):
+            self.scan_status_var.set("Scan Mode: OFF")
             return
 
-        try:
-            with connect() as conn:
-                conn.execute("UPDATE products SET quantity = ? WHERE id = ?", (new_qty, product_id))
-                conn.commit()
-            log_event("product", f"Barcode {barcode}: {action} {qty} on {name} (qty {current_qty} -> {new_qty})", self.current_user)
-            self.load_data()
-            self._select_tree_row(product_id)
-            self.scan_status_var.set(f"{name}: {current_qty} → {new_qty}")
-        except Exception as e:
-            messagebox.showerror("Update failed", str(e))
-        finally:
+        from_entry = barcode is None
+        barcode = str(self.scan_var.get() if barcode is None else barcode).strip()
+        if from_entry:
+            self._wedge.clear()
+        if not barcode:
+            return
+        if self.queue_scan(barcode, interactive=interactive) and from_entry:
             self.scan_var.set("")
-            if self.scan_entry is not None:
-                try:
-                    self.scan_entry.focus_set()
-                except Exception:
-                    pass
+        if self.scan_entry is not None:
+            try:
+                self.scan_entry.focus_set()
+            except Exception:
+                pass
 
     def toggle_form(self) -> None:
         self._form_visible = not self._form_visible
@@ -794,24 +793,18 @@ class InventoryManager(Frame):
     def _read_form(self) -> dict[str, str]:
         return {k: v.get().strip() for k, v in self.fields.items()}
 
+    def _reorder_points(self) -> tuple[dict[str, int], int]:
+        try:
+            return get_reorder_engine().reorder_points()
+        except Exception:
+            return {}, self.low_stock_threshold
+
+    @timed("inventory.load_data")
     def load_data(self):
-        keyword = self.search_var.get().strip().lower()
         self.tree.delete(*self.tree.get_children())
+        reorder_points, default_point = self._reorder_points()
 
-        with connect() as conn:
-            rows = conn.execute(
-                """SELECT p.id, p.name, p.category, COALESCE(s.name, '') AS supplier,
-                          p.unit, p.price, p.gst_percent, p.tax_percent, p.quantity, p.expiry
-                   FROM products p
-                   LEFT JOIN suppliers s ON s.id = p.supplier_id
-                   ORDER BY p.id DESC"""
-            ).fetchall()
-
-        for row in rows:
-            if keyword:
-                if keyword not in row["name"].lower() and keyword not in row["category"].lower():
-                    continue
-
+        for row in search_products(self.search_var.get()):
             tags: tuple[str, ...] = ()
             expiry = row["expiry"]
             if expiry:
@@ -821,7 +814,7 @@ class InventoryManager(Frame):
                         tags = ("expiring",)
                 except Exception:
                     pass
-            if int(row["quantity"]) <= self.low_stock_threshold:
+            if int(row["quantity"]) <= reorder_points.get(row["name"], default_point):
                 tags = ("lowstock",)
 
             self.tree.insert(
@@ -891,7 +884,7 @@ class InventoryManager(Frame):
 
         try:
             with connect() as conn:
-                conn.execute(
+                cur = conn.execute(
                     """INSERT INTO products (name, barcode, category, unit, price, gst_percent, tax_percent, quantity, expiry, supplier_id)
                        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)""",
                     (
@@ -907,8 +900,17 @@ class InventoryManager(Frame):
                         supplier_id,
                     ),
                 )
-                conn.commit()
-            log_event("product", f"Added product: {data['name']}", self.current_user)
+                product_id = int(cur.lastrowid)
+                seq = record_rows(conn, {"products": [product_id]}, user=self.current_user)
+                commit_journaled(conn, seq)
+            log_event(
+                "product",
+                f"Added product: {data['name']}",
+                self.current_user,
+                entity_type="product",
+                entity_id=product_id,
+                qty_delta=qty,
+            )
             self.load_data()
             self.clear_form()
             messagebox.showinfo("Saved", "Product added.")
@@ -946,6 +948,7 @@ class InventoryManager(Frame):
 
         try:
             with connect() as conn:
+                old = conn.execute("SELECT quantity FROM products WHERE id=?", (self.selected_id,)).fetchone()
                 conn.execute(
                     """UPDATE products
                        SET name=?, barcode=?, category=?, unit=?, price=?, gst_percent=?, tax_percent=?, quantity=?, expiry=?, supplier_id=?
@@ -964,8 +967,16 @@ class InventoryManager(Frame):
                         self.selected_id,
                     ),
                 )
-                conn.commit()
-            log_event("product", f"Updated product: {data['name']} (ID {self.selected_id})", self.current_user)
+                seq = record_rows(conn, {"products": [self.selected_id]}, user=self.current_user)
+                commit_journaled(conn, seq)
+            log_event(
+                "product",
+                f"Updated product: {data['name']} (ID {self.selected_id})",
+                self.current_user,
+                entity_type="product",
+                entity_id=int(self.selected_id),
+                qty_delta=(qty - int(old["quantity"])) if old else None,
+            )
             self.load_data()
             self.clear_form()
             messagebox.showinfo("Updated", "Product updated.")
@@ -980,13 +991,17 @@ class InventoryManager(Frame):
             return
         try:
             with connect() as conn:
-                row = conn.execute("SELECT name FROM products WHERE id=?", (self.selected_id,)).fetchone()
+                row = conn.execute("SELECT name, quantity FROM products WHERE id=?", (self.selected_id,)).fetchone()
                 conn.execute("DELETE FROM products WHERE id=?", (self.selected_id,))
-                conn.commit()
+                seq = record_delete("products", [self.selected_id], user=self.current_user)
+                commit_journaled(conn, seq)
             log_event(
                 "product",
                 f"Deleted product: {(row['name'] if row else 'ID')} {self.selected_id}",
                 self.current_user,
+                entity_type="product",
+                entity_id=int(self.selected_id),
+                qty_delta=-int(row["quantity"]) if row else None,
             )
             self.load_data()
             self.clear_form()
@@ -1000,24 +1015,12 @@ class InventoryManager(Frame):
         self.selected_id = None
 
     def export_inventory(self):
-        if pd is None:
-            messagebox.showerror("Export", "Missing dependency: pandas. Install with `pip install -r requirements.txt`.")
-            return
-
         with connect() as conn:
-            rows = conn.execute(
-                """SELECT p.id, p.name, p.barcode, p.category, COALESCE(s.name, '') AS supplier,
-                          p.unit, p.price, p.gst_percent, p.tax_percent, p.quantity, p.expiry
-                   FROM products p
-                   LEFT JOIN suppliers s ON s.id = p.supplier_id
-                   ORDER BY p.id DESC"""
-            ).fetchall()
-
-        if not rows:
+            has_rows = conn.execute("SELECT EXISTS(SELECT 1 FROM products)").fetchone()[0]
+        if not has_rows:
             messagebox.showwarning("No Data", "No inventory records to export.")
             return
 
-        df = pd.DataFrame([dict(r) for r in rows])
         out = filedialog.asksaveasfilename(
             defaultextension=".xlsx",
             initialfile=f"Inventory_{datetime.now().strftime('%Y%m%d_%H%M%S')}.xlsx",
@@ -1025,24 +1028,96 @@ class InventoryManager(Frame):
         )
         if not out:
             return
-        try:
-            if out.lower().endswith(".csv"):
-                df.to_csv(out, index=False)
-            else:
-                df.to_excel(out, index=False)
-            log_event("export", f"Inventory exported to {out}", self.current_user)
+
+        def on_done(job: ExportJob) -> None:
+            if job.error is not None:
+                messagebox.showerror("Export failed", str(job.error))
+                return
+            log_event("export", f"Inventory exported to {out}", self.current_user, payload={"table": "inventory", "path": out})
             messagebox.showinfo("Exported", f"Saved: {out}")
-        except Exception as e:
-            messagebox.showerror("Export failed", str(e))
+
+        sql, params = export_query("inventory")
+        ExportJob(sql, params, path=out).start().watch(self, on_done=on_done)
+
+    def import_catalog(self) -> None:
+        from .import_service import import_catalog, write_error_report
+
+        path = filedialog.askopenfilename(
+            title="Import product catalog",
+            filetypes=[("Catalog files", "*.csv *.xlsx"), ("CSV", "*.csv"), ("Excel Workbook", "*.xlsx")],
+        )
+        if not path:
+            return
+
+        def on_done(job: BackgroundJob) -> None:
+            try:
+                self.import_btn.configure(state="normal", text="Import")
+            except Exception:
+                pass
+            if job.error is not None:
+                messagebox.showerror("Import failed", str(job.error))
+                return
+            result = job.result
+            log_event(
+                "product",
+                f"Imported catalog {path}: {result.inserted} added, {result.updated} updated, "
+                f"{len(result.errors)} rejected",
+                self.current_user,
+                payload={
+                    "path": path,
+                    "inserted": result.inserted,
+                    "updated": result.updated,
+                    "rejected": len(result.errors),
+                },
+            )
+            self.refresh_suppliers()
+            self.load_data()
+            summary = (
+                f"Rows read: {result.rows}\n"
+                f"Added: {result.inserted}\n"
+                f"Updated: {result.updated}\n"
+                f"Duplicates (last row kept): {result.duplicates}\n"
+                f"New suppliers: {result.suppliers_created}\n"
+                f"Rejected: {len(result.errors)}"
+            )
+            if not result.errors:
+                messagebox.showinfo("Import complete", summary)
+                return
+            if not messagebox.askyesno("Import complete", f"{summary}\n\nSave the rejected rows report?"):
+                return
+            out = filedialog.asksaveasfilename(
+                defaultextension=".csv",
+                initialfile=f"Import_errors_{datetime.now().strftime('%Y%m%d_%H%M%S')}.csv",
+                filetypes=[("CSV", "*.csv")],
+            )
+            if out:
+                write_error_report(result.errors, out)
+
+        def on_progress(rows: int, _total: int) -> None:
+            self.import_btn.configure(text=f"Importing {rows:,}...")
+
+        self.import_btn.configure(state="disabled")
+        BackgroundJob(
+            lambda progress, cancel: import_catalog(path, progress=progress, cancel=cancel)
+        ).start().watch(self, on_progress=on_progress, on_done=on_done)
+
+    def show_reorder_suggestions(self) -> None:
+        from .supplier_manager import PurchaseSuggestionsView
+
+        win = tk.Toplevel(self)
+        win.title("Purchase Suggestions")
+        win.geometry("760x420")
+        PurchaseSuggestionsView(win).pack(fill=tk.BOTH, expand=True, padx=10, pady=10)
 
     def smart_alerts(self):
         with connect() as conn:
             rows = conn.execute("SELECT name, quantity, expiry FROM products").fetchall()
+        reorder_points, default_point = self._reorder_points()
 
         low = []
         expiring = []
         for r in rows:
-            if int(r["quantity"]) <= self.low_stock_threshold:
+            if int(r["quantity"]) <= reorder_points.get(r["name"], default_point):
                 low.append(r["name"])
             expiry = r["expiry"]
             if not expiry:
@@ -1060,4 +1135,5 @@ class InventoryManager(Frame):
                 msg.append("Low stock: " + ", ".join(low[:15]) + (" ..." if len(low) > 15 else ""))
             if expiring:
                 msg.append("Expiring soon: " + ", ".join(expiring[:15]) + (" ..." if len(expiring) > 15 else ""))
+            msg.append("Use Reorder for suggested purchase quantities by supplier.")
             messagebox.showwarning("Smart Alerts", "\n".join(msg))
@@ -3,6 +3,8 @@ from __future__ import annotations
 from datetime import datetime
 from pathlib import Path
 
+from .instrumentation import timed
+
 try:
     from fpdf import FPDF  # type: ignore
 except Exception:  # pragma: no cover
@@ -32,6 +34,7 @@ class InvoiceGenerator:
         except Exception:
             return "".join(ch if ord(ch) < 128 else "?" for ch in s)
 
+    @timed("invoice.generate")
     def generate_invoice(
         self,
         filepath: str,
@@ -43,11 +46,12 @@ class InvoiceGenerator:
         buyer_mobile: str = "",
         items: list[dict[str, object]] | None = None,
         invoice_no: str | None = None,
+        invoice_date: datetime | None = None,
     ):
         if FPDF is None:
             raise RuntimeError("Missing dependency: fpdf2. Install with `pip install -r requirements.txt`.")
 
-        now = datetime.now()
+        now = invoice_date or datetime.now()
         pdf = FPDF()
         pdf.add_page()
         pdf.set_auto_page_break(auto=True, margin=16)
@@ -268,3 +272,95 @@ class InvoiceGenerator:
         )
 
         pdf.output(filepath)
+
+
+INVOICE_FOLDER = "invoices"
+
+
+def _invoice_rows(conn, sale_id: int):  # type: ignore[no-untyped-def]
+    """All sale lines recorded on the same invoice as `sale_id`, in insertion order."""
+    row = conn.execute(
+        "SELECT sale_date, buyer_name, buyer_mobile, invoice_path FROM sales WHERE id = ?", (sale_id,)
+    ).fetchone()
+    if row is None:
+        return []
+    if row["invoice_path"]:
+        return conn.execute("SELECT * FROM sales WHERE invoice_path = ? ORDER BY id", (row["invoice_path"],)).fetchall()
+    # Lines of one checkout share the timestamp and buyer; used when the original PDF was never written.
+    return conn.execute(
+        """SELECT * FROM sales
+           WHERE sale_date = ? AND COALESCE(buyer_name, '') = ? AND COALESCE(buyer_mobile, '') = ?
+           ORDER BY id""",
+        (row["sale_date"], row["buyer_name"] or "", row["buyer_mobile"] or ""),
+    ).fetchall()
+
+
+def regenerate_invoice(sale_id: int, *, folder: str | Path = INVOICE_FOLDER) -> str:
+    """
+    Re-render the PDF for the invoice containing `sale_id` from the stored sale lines.
+
+    Overwrites the recorded `invoice_path` when there is one; otherwise writes a new file and
+    records its path on every line of the invoice. Returns the PDF path.
+    """
+    from .change_journal import commit_journaled, record_rows
+    from .database import connect
+
+    with connect() as conn:
+        rows = _invoice_rows(conn, sale_id)
+        if not rows:
+            raise ValueError(f"Sale not found: {sale_id}")
+
+        first_id = int(rows[0]["id"])
+        try:
+            sale_dt = datetime.strptime(str(rows[0]["sale_date"])[:19], "%Y-%m-%d %H:%M:%S")
+        except ValueError:
+            sale_dt = None
+        items = [
+            {
+                "product": r["product_name"],
+                "qty": int(r["quantity"] or 0),
+                "unit_price": float(r["unit_price"] or 0),
+                "gst_percent": float(r["gst_percent"] or 0),
+                "tax_percent": float(r["tax_percent"] or 0),
+                "subtotal": float(r["subtotal"] or 0),
+                "tax_amount": float(r["tax_amount"] or 0),
+                "total": float(r["total_price"] or 0),
+            }
+            for r in rows
+        ]
+
+        path = rows[0]["invoice_path"]
+        if not path:
+            Path(folder).mkdir(parents=True, exist_ok=True)
+            stamp = (sale_dt or datetime.now()).strftime("%Y%m%d_%H%M%S")
+            path = str(Path(folder) / f"Invoice_{first_id}_{stamp}.pdf")
+        else:
+            Path(path).parent.mkdir(parents=True, exist_ok=True)
+
+        InvoiceGenerator().generate_invoice(
+            filepath=path,
+            invoice_no=str(first_id),
+            items=items,
+            total=sum(float(i["total"]) for i in items),
+            buyer_name=rows[0]["buyer_name"] or "",
+            buyer_mobile=rows[0]["buyer_mobile"] or "",
+            invoice_date=sale_dt,
+        )
+        if not rows[0]["invoice_path"]:
+            conn.executemany("UPDATE sales SET invoice_path = ? WHERE id = ?", [(path, int(r["id"])) for r in rows])
+            commit_journaled(conn, record_rows(conn, {"sales": [int(r["id"]) for r in rows]}))
+    return path
+
+
+def missing_invoice_sale_ids() -> list[int]:
+    """First sale id of every invoice whose PDF is not on disk (or was never written)."""
+    from .database import connect
+
+    with connect() as conn:
+        rows = conn.execute(
+            """SELECT MIN(id) AS id, invoice_path
+               FROM sales
+               GROUP BY COALESCE(invoice_path, sale_date || '|' || COALESCE(buyer_name, '') || '|' || COALESCE(buyer_mobile, ''))
+               ORDER BY id"""
+        ).fetchall()
+    return [int(r["id"]) for r in rows if not r["invoice_path"] or not Path(r["invoice_path"]).exists()]
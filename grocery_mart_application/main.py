@@ -4,6 +4,8 @@ import json
 import sys
 from pathlib import Path
 
+from . import instrumentation, startup_timing
+
 
 DEFAULT_THEME_PATH = Path(__file__).resolve().parent / "styles" / "theme.json"
 THEME_PATH = Path.cwd() / "styles" / "theme.json"
@@ -18,7 +20,17 @@ def _load_theme() -> str:
         return "flatly"
 
 
-def main() -> int:
+def main(argv: list[str] | None = None) -> int:
+    argv = sys.argv[1:] if argv is None else argv
+    if argv:
+        # Batch commands never touch the UI stack.
+        from .cli import main as cli_main
+
+        return cli_main(argv)
+
+    if instrumentation.profile_session_requested():
+        instrumentation.start_profile()
+
     try:
         import tkinter as tk
         from ttkbootstrap import Style
@@ -26,6 +38,7 @@ def main() -> int:
         print("Missing UI dependency. Install with: pip install -r requirements.txt", file=sys.stderr)
         print(f"Error: {e}", file=sys.stderr)
         return 1
+    startup_timing.mark("tkinter + ttkbootstrap imported")
 
     try:
         from .database import setup_database
@@ -35,11 +48,7 @@ def main() -> int:
         print("App import failed.", file=sys.stderr)
         print(f"Error: {e}", file=sys.stderr)
         return 1
-
-    try:
-        import matplotlib.pyplot as plt  # type: ignore
-    except Exception:
-        plt = None
+    startup_timing.mark("app modules imported")
 
     class GroceryInventoryApp(tk.Tk):
         def __init__(self):
@@ -48,9 +57,12 @@ def main() -> int:
             self.geometry("1200x700")
             self.minsize(1000, 600)
 
+            startup_timing.mark("Tk root created")
             setup_database()
+            startup_timing.mark("database ready")
 
             self.style = Style(_load_theme())
+            startup_timing.mark("theme applied")
             try:
                 from .utils.app_settings import get_setting
 
@@ -63,7 +75,19 @@ def main() -> int:
             self._active_frame = None
 
             self.show_login()
+            startup_timing.mark("login screen built")
             self.protocol("WM_DELETE_WINDOW", self.safe_exit)
+            self.after_idle(self._on_first_idle)
+
+        def _on_first_idle(self) -> None:
+            startup_timing.mark("login screen drawn")
+            startup_timing.emit()
+            # Housekeeping starts only once the first screen is up, off the Tk thread.
+            from .backup_service import start_auto_backup
+            from .retention_service import start_periodic_retention
+
+            start_periodic_retention()
+            start_auto_backup()
 
         def _set_root_content(self, widget: tk.Widget) -> None:
             if self._active_frame is not None:
@@ -102,10 +126,17 @@ def main() -> int:
                     db_log("auth", "Logout", self._current_user.username)
                 except Exception:
                     pass
+                from .auth_service import end_session
+
+                end_session(self._current_user.username)
             self._current_user = None
             self.show_login()
 
         def safe_exit(self):
+            if instrumentation.profile_session_requested() and instrumentation.profiling():
+                print(f"Profile saved: {instrumentation.stop_profile()}", file=sys.stderr, flush=True)
+            # Only if a panel actually loaded pyplot; never import it just to close it.
+            plt = sys.modules.get("matplotlib.pyplot")
             if plt is not None:
                 try:
                     plt.close("all")
@@ -0,0 +1,360 @@
+"""
+Headless performance benchmarks on synthetic databases: no Tk or display, so it runs in CI.
+
+    python -m grocery_mart_application.perf_bench                          # 10k products/sales
+    python -m grocery_mart_application.perf_bench --sizes 10k,100k,1m --json perf.json
+    python -m grocery_mart_application.perf_bench --compare perf.json      # exit 1 on regressions
+
+Each size gets a database with that many products and sale lines, generated by `demo_data` with
+a fixed seed and kept in `--data-dir`, so later runs reuse it instead of generating it again.
+The timed operations call the same service functions the app uses:
+
+- startup: a fresh interpreter opening the database the way the app does before the first
+  screen (schema check, settings, activity watermark, reorder points), without Tk
+- search: inventory listing and keyword search (`catalog_service.search_products`)
+- checkout: a three-line invoice (`sales_service.checkout`)
+- analytics: KPIs, trend and top products over all sales (`sales_service.sales_summary`)
+- export: every sale line to CSV (`export_service.stream_query_to_file`)
+- invoice: PDF rendering for a recorded sale (`invoice_generator.regenerate_invoice`)
+
+The JSON output keeps min/median/p95/mean per benchmark and size; `--compare` checks medians
+against an earlier run.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import platform
+import random
+import sqlite3
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from collections.abc import Callable, Iterator
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass, field
+from datetime import datetime
+from pathlib import Path
+
+from . import database
+
+BENCHMARKS = ("startup", "search", "checkout", "analytics", "export", "invoice")
+DEFAULT_REPEATS = {"startup": 3, "search": 10, "checkout": 20, "analytics": 5, "export": 2, "invoice": 5}
+SEARCH_TERMS = ("", "dairy", "item 1", "snacks item", "no such product")
+ANALYTICS_PERIODS = ("Daily", "Weekly", "Monthly")
+# Differences below this are timer noise, whatever the percentage.
+NOISE_FLOOR_MS = 1.0
+
+
+class BenchmarkSkipped(Exception):
+    pass
+
+
+@dataclass
+class Timing:
+    name: str
+    runs: int = 0
+    min_ms: float = 0.0
+    median_ms: float = 0.0
+    p95_ms: float = 0.0
+    mean_ms: float = 0.0
+    skipped: str = ""
+
+
+@dataclass
+class DatasetReport:
+    size: str
+    products: int
+    sales: int
+    db_bytes: int
+    generate_s: float
+    timings: list[Timing] = field(default_factory=list)
+
+
+def parse_size(text: str) -> int:
+    text = text.strip().lower().replace("_", "")
+    for suffix, factor in (("k", 1_000), ("m", 1_000_000)):
+        if text.endswith(suffix):
+            return int(float(text[:-1]) * factor)
+    return int(text)
+
+
+def size_label(n: int) -> str:
+    if n >= 1_000_000 and n % 1_000_000 == 0:
+        return f"{n // 1_000_000}m"
+    if n >= 1_000 and n % 1_000 == 0:
+        return f"{n // 1_000}k"
+    return str(n)
+
+
+@contextmanager
+def use_database(path: Path) -> Iterator[None]:
+    """Point the app's `database.DB_PATH` at `path` for the duration of the block."""
+    previous = database.DB_PATH
+    database.DB_PATH = Path(path)
+    try:
+        yield
+    finally:
+        database.DB_PATH = previous
+
+
+def prepare_database(products: int, sales: int, *, folder: Path, seed: int) -> tuple[Path, float]:
+    """Benchmark database for this size and seed, generated on first use; returns (path, seconds spent)."""
+    from .demo_data import generate
+
+    folder.mkdir(parents=True, exist_ok=True)
+    path = folder / f"bench-{size_label(products)}-{size_label(sales)}-s{seed}.db"
+    if path.exists():
+        return path, 0.0
+
+    tmp = path.with_suffix(".part")
+    tmp.unlink(missing_ok=True)
+    t0 = time.perf_counter()
+    with use_database(tmp):
+        database.setup_database()
+        generate(products=products, sales=sales, seed=seed)
+        with database.connect() as conn:
+            conn.execute("ANALYZE")
+            conn.commit()
+    os.replace(tmp, path)
+    return path, time.perf_counter() - t0
+
+
+def _p95(values: list[float]) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(round(0.95 * (len(ordered) - 1))))]
+
+
+def time_calls(name: str, fn: Callable[[int], object], runs: int) -> Timing:
+    """Call `fn(i)` for i in range(runs) and summarise the wall times."""
+    samples = []
+    for i in range(runs):
+        t0 = time.perf_counter()
+        fn(i)
+        samples.append((time.perf_counter() - t0) * 1000)
+    return Timing(
+        name=name,
+        runs=runs,
+        min_ms=min(samples),
+        median_ms=statistics.median(samples),
+        p95_ms=_p95(samples),
+        mean_ms=statistics.fmean(samples),
+    )
+
+
+def _startup_probe() -> None:
+    """What the app does with the database before its first screen, minus Tk (run in a subprocess)."""
+    from .database import activity_watermark, setup_database
+    from .reorder_service import get_reorder_engine
+    from .utils.app_settings import get_setting
+
+    setup_database()
+    get_setting("theme", "flatly")
+    activity_watermark()
+    get_reorder_engine().reorder_points()
+
+
+def _bench_startup(_work: Path, _rng: random.Random) -> Callable[[int], object]:
+    package_root = str(Path(__file__).resolve().parent.parent)
+    env = dict(os.environ, GROCERY_MART_DB_PATH=str(database.DB_PATH))
+    env["PYTHONPATH"] = os.pathsep.join(p for p in (package_root, env.get("PYTHONPATH", "")) if p)
+    cmd = [sys.executable, "-c", f"from {__package__}.perf_bench import _startup_probe; _startup_probe()"]
+    return lambda _i: subprocess.run(cmd, env=env, check=True, capture_output=True)
+
+
+def _bench_search(_work: Path, _rng: random.Random) -> Callable[[int], object]:
+    from .catalog_service import search_products
+
+    return lambda i: search_products(SEARCH_TERMS[i % len(SEARCH_TERMS)])
+
+
+def _bench_checkout(_work: Path, rng: random.Random) -> Callable[[int], object]:
+    from .sales_service import checkout
+
+    with database.connect() as conn:
+        names = [r[0] for r in conn.execute("SELECT name FROM products WHERE quantity >= 50 LIMIT 1000")]
+    if len(names) < 3:
+        raise BenchmarkSkipped("not enough stocked products")
+    carts = [dict.fromkeys(rng.sample(names, 3), 1) for _ in range(64)]
+    return lambda i: checkout(
+        carts[i % len(carts)], buyer_name="Bench", buyer_mobile="9000000000", user="bench"
+    )
+
+
+def _bench_analytics(_work: Path, _rng: random.Random) -> Callable[[int], object]:
+    from .sales_service import sales_summary
+
+    return lambda i: sales_summary(ANALYTICS_PERIODS[i % len(ANALYTICS_PERIODS)])
+
+
+def _bench_export(work: Path, _rng: random.Random) -> Callable[[int], object]:
+    from .export_service import export_query, stream_query_to_file
+
+    sql, params = export_query("sales")
+    return lambda _i: stream_query_to_file(sql, params, path=work / "sales.csv")
+
+
+def _bench_invoice(work: Path, rng: random.Random) -> Callable[[int], object]:
+    from . import invoice_generator
+
+    if invoice_generator.FPDF is None:
+        raise BenchmarkSkipped("fpdf2 not installed")
+    with database.connect() as conn:
+        max_id = int(conn.execute("SELECT COALESCE(MAX(id), 0) FROM sales").fetchone()[0])
+    if not max_id:
+        raise BenchmarkSkipped("no sales")
+    sale_ids = [rng.randint(1, max_id) for _ in range(16)]
+    return lambda i: invoice_generator.regenerate_invoice(
+        sale_ids[i % len(sale_ids)], folder=work / "invoices"
+    )
+
+
+_BENCHES: dict[str, Callable[[Path, random.Random], Callable[[int], object]]] = {
+    "startup": _bench_startup,
+    "search": _bench_search,
+    "checkout": _bench_checkout,
+    "analytics": _bench_analytics,
+    "export": _bench_export,
+    "invoice": _bench_invoice,
+}
+
+
+def run_dataset(
+    products: int,
+    sales: int,
+    *,
+    folder: Path,
+    seed: int = 42,
+    names: tuple[str, ...] = BENCHMARKS,
+    repeats: dict[str, int] | None = None,
+) -> DatasetReport:
+    """Generate (or reuse) the database for one size and run the selected benchmarks on it."""
+    path, generate_s = prepare_database(products, sales, folder=folder, seed=seed)
+    report = DatasetReport(size_label(products), products, sales, path.stat().st_size, round(generate_s, 3))
+    repeats = {**DEFAULT_REPEATS, **(repeats or {})}
+    rng = random.Random(seed)
+    with use_database(path), tempfile.TemporaryDirectory(prefix="perf-bench-") as work:
+        for name in names:
+            try:
+                fn = _BENCHES[name](Path(work), rng)
+            except BenchmarkSkipped as e:
+                report.timings.append(Timing(name, skipped=str(e)))
+                continue
+            report.timings.append(time_calls(name, fn, max(1, repeats[name])))
+    return report
+
+
+def compare_reports(
+    current: list[DatasetReport], baseline: dict[str, object], *, tolerance: float = 0.25
+) -> list[str]:
+    """One line per benchmark whose median got slower than `tolerance` (0.25 = 25%) over the baseline."""
+    before = {
+        (d["size"], t["name"]): float(t["median_ms"])
+        for d in baseline.get("datasets", [])  # type: ignore[union-attr]
+        for t in d["timings"]
+        if not t.get("skipped")
+    }
+    regressions = []
+    for dataset in current:
+        for t in dataset.timings:
+            old = before.get((dataset.size, t.name))
+            if t.skipped or old is None:
+                continue
+            if t.median_ms > old * (1 + tolerance) and t.median_ms - old > NOISE_FLOOR_MS:
+                regressions.append(
+                    f"{dataset.size} {t.name}: median {t.median_ms:.1f} ms vs {old:.1f} ms "
+                    f"(+{(t.median_ms / old - 1) * 100:.0f}%)"
+                )
+    return regressions
+
+
+def format_reports(reports: list[DatasetReport]) -> str:
+    header = (
+        f"{'size':<6} {'benchmark':<10} {'runs':>5} {'min ms':>9} {'median':>9} {'p95 ms':>9} {'mean ms':>9}"
+    )
+    lines = [header, "-" * len(header)]
+    for d in reports:
+        for t in d.timings:
+            if t.skipped:
+                lines.append(f"{d.size:<6} {t.name:<10} skipped: {t.skipped}")
+                continue
+            lines.append(
+                f"{d.size:<6} {t.name:<10} {t.runs:>5} {t.min_ms:>9.2f} {t.median_ms:>9.2f} "
+                f"{t.p95_ms:>9.2f} {t.mean_ms:>9.2f}"
+            )
+    return "\n".join(lines)
+
+
+def results_payload(reports: list[DatasetReport], *, seed: int) -> dict[str, object]:
+    return {
+        "created": datetime.now().isoformat(timespec="seconds"),
+        "seed": seed,
+        "python": platform.python_version(),
+        "sqlite": sqlite3.sqlite_version,
+        "platform": platform.platform(),
+        "datasets": [asdict(d) for d in reports],
+    }
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(
+        prog="perf_bench", description="Benchmark checkout, search, analytics, export, invoices and startup."
+    )
+    parser.add_argument("--sizes", default="10k", help="comma-separated product counts, e.g. 10k,100k,1m")
+    parser.add_argument(
+        "--sales-ratio", type=float, default=1.0, help="sale lines per product in each database (default 1)"
+    )
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument(
+        "--data-dir",
+        default=str(Path(tempfile.gettempdir()) / "grocery-mart-bench"),
+        help="where generated databases are kept between runs",
+    )
+    parser.add_argument("--only", help=f"comma-separated subset of: {', '.join(BENCHMARKS)}")
+    parser.add_argument("--repeat", type=int, help="runs per benchmark (default: per-benchmark)")
+    parser.add_argument("--json", metavar="FILE", help="also write the results as JSON")
+    parser.add_argument("--compare", metavar="FILE", help="earlier --json results; exit 1 on regressions")
+    parser.add_argument(
+        "--tolerance", type=float, default=0.25, help="allowed median slowdown (default 0.25)"
+    )
+    args = parser.parse_args(argv)
+
+    names = tuple(n.strip() for n in args.only.split(",")) if args.only else BENCHMARKS
+    unknown = [n for n in names if n not in _BENCHES]
+    if unknown:
+        print(f"Unknown benchmark(s): {', '.join(unknown)}", file=sys.stderr)
+        return 2
+    repeats = dict.fromkeys(names, args.repeat) if args.repeat else None
+
+    reports = []
+    for size in (parse_size(s) for s in args.sizes.split(",") if s.strip()):
+        sales = int(size * args.sales_ratio)
+        report = run_dataset(
+            size, sales, folder=Path(args.data_dir), seed=args.seed, names=names, repeats=repeats
+        )
+        if report.generate_s:
+            print(f"Generated {report.size} database in {report.generate_s:.1f} s")
+        reports.append(report)
+
+    print(format_reports(reports))
+    # Read the baseline first: --json may overwrite the same file.
+    baseline = json.loads(Path(args.compare).read_text(encoding="utf-8")) if args.compare else None
+    if args.json:
+        payload = results_payload(reports, seed=args.seed)
+        Path(args.json).write_text(json.dumps(payload, indent=2), encoding="utf-8")
+    if baseline is not None:
+        regressions = compare_reports(reports, baseline, tolerance=args.tolerance)
+        for line in regressions:
+            print(f"REGRESSION {line}", file=sys.stderr)
+        return 1 if regressions else 0
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,238 @@
+from __future__ import annotations
+
+import tkinter as tk
+
+from ttkbootstrap import Button, Frame, Label, Notebook, Scrollbar, StringVar, Treeview
+
+from . import instrumentation, slow_query_log
+
+REFRESH_MS = 1000
+
+
+class PerformanceView(Frame):
+    """Live p50/p95 per instrumented operation, plus the cProfile capture toggle."""
+
+    def __init__(self, master):
+        super().__init__(master, padding=0)
+        self.status = StringVar(value="")
+        self._after_id = None
+
+        box = tk.LabelFrame(
+            self, text=f"Performance (last {instrumentation.WINDOW} calls per operation)", padx=10, pady=8
+        )
+        box.pack(fill=tk.BOTH, expand=True)
+
+        top = tk.Frame(box)
+        top.pack(fill=tk.X, pady=(0, 6))
+        Label(top, textvariable=self.status, bootstyle="secondary").pack(side=tk.LEFT)
+        self.profile_btn = Button(top, bootstyle="danger-outline", command=self.toggle_profile)
+        self.profile_btn.pack(side=tk.RIGHT)
+        Button(top, text="Reset", bootstyle="secondary-outline", command=self.reset).pack(
+            side=tk.RIGHT, padx=6
+        )
+
+        table_frame = tk.Frame(box)
+        table_frame.pack(fill=tk.BOTH, expand=True)
+        self.tree = Treeview(
+            table_frame,
+            columns=("count", "p50", "p95", "max", "total"),
+            show="tree headings",
+            height=14,
+        )
+        self.tree.heading("#0", text="Operation")
+        self.tree.column("#0", anchor="w", width=220)
+        for col, text, width in [
+            ("count", "Calls", 80),
+            ("p50", "p50 ms", 90),
+            ("p95", "p95 ms", 90),
+            ("max", "Max ms", 90),
+            ("total", "Total s", 90),
+        ]:
+            self.tree.heading(col, text=text)
+            self.tree.column(col, anchor="e", width=width)
+        self.tree.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
+
+        scroll = Scrollbar(table_frame, command=self.tree.yview)
+        scroll.pack(side=tk.RIGHT, fill=tk.Y)
+        self.tree.configure(yscrollcommand=scroll.set)
+
+        self._sync_profile_button()
+        self.refresh()
+        self.bind("<Destroy>", self._on_destroy, add=True)
+
+    def refresh(self) -> None:
+        self._after_id = None
+        rows = instrumentation.stats()
+        self.tree.delete(*self.tree.get_children())
+        for s in rows:
+            self.tree.insert(
+                "",
+                tk.END,
+                text=s.name,
+                values=(s.count, f"{s.p50_ms:.2f}", f"{s.p95_ms:.2f}", f"{s.max_ms:.2f}", f"{s.total_s:.2f}"),
+            )
+        if not instrumentation.ENABLED:
+            self.status.set(f"Timers are off ({instrumentation.ENV_FLAG}=0).")
+        elif instrumentation.profiling():
+            self.status.set("Profiling the UI thread... stop to save the capture.")
+        elif not rows:
+            self.status.set("No timings yet.")
+        self._after_id = self.after(REFRESH_MS, self.refresh)
+
+    def reset(self) -> None:
+        instrumentation.reset()
+        self.status.set("Timings cleared.")
+
+    def toggle_profile(self) -> None:
+        try:
+            if instrumentation.profiling():
+                path = instrumentation.stop_profile()
+                self.status.set(f"Profile saved: {path}")
+            else:
+                instrumentation.start_profile()
+        except Exception as e:
+            self.status.set(f"Profiling failed: {e}")
+        self._sync_profile_button()
+
+    def _sync_profile_button(self) -> None:
+        self.profile_btn.configure(
+            text="Stop & Save Profile" if instrumentation.profiling() else "Start Profile"
+        )
+
+    def _on_destroy(self, event=None) -> None:
+        if event is not None and event.widget is not self:
+            return
+        if self._after_id is not None:
+            try:
+                self.after_cancel(self._after_id)
+            except Exception:
+                pass
+            self._after_id = None
+
+
+class SlowQueryView(Frame):
+    """Statements slower than `slow_query_threshold_ms`, grouped, with the plan of the selected one."""
+
+    def __init__(self, master):
+        super().__init__(master, padding=0)
+        self.status = StringVar(value="")
+        self._rows: dict[str, slow_query_log.SlowQuery] = {}
+
+        box = tk.LabelFrame(self, text="Slow queries", padx=10, pady=8)
+        box.pack(fill=tk.BOTH, expand=True)
+
+        top = tk.Frame(box)
+        top.pack(fill=tk.X, pady=(0, 6))
+        Label(top, textvariable=self.status, bootstyle="secondary").pack(side=tk.LEFT)
+        Button(top, text="Clear", bootstyle="danger-outline", command=self.clear).pack(side=tk.RIGHT)
+        Button(top, text="Refresh", bootstyle="primary-outline", command=self.refresh).pack(
+            side=tk.RIGHT, padx=6
+        )
+
+        table_frame = tk.Frame(box)
+        table_frame.pack(fill=tk.BOTH, expand=True)
+        self.tree = Treeview(
+            table_frame,
+            columns=("count", "avg", "max", "last", "scan"),
+            show="tree headings",
+            height=8,
+        )
+        self.tree.heading("#0", text="Statement")
+        self.tree.column("#0", anchor="w", width=300)
+        for col, text, width in [
+            ("count", "Calls", 60),
+            ("avg", "Avg ms", 80),
+            ("max", "Max ms", 80),
+            ("last", "Last (UTC)", 140),
+            ("scan", "Full Scan", 80),
+        ]:
+            self.tree.heading(col, text=text)
+            self.tree.column(col, anchor="e" if col in ("count", "avg", "max") else "center", width=width)
+        self.tree.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
+        self.tree.bind("<<TreeviewSelect>>", self._on_select)
+
+        scroll = Scrollbar(table_frame, command=self.tree.yview)
+        scroll.pack(side=tk.RIGHT, fill=tk.Y)
+        self.tree.configure(yscrollcommand=scroll.set)
+
+        self.detail = tk.Text(box, height=8, wrap="word", font=("Consolas", 9))
+        self.detail.pack(fill=tk.BOTH, expand=False, pady=(6, 0))
+        self.detail.configure(state="disabled")
+
+        self.refresh()
+
+    def refresh(self) -> None:
+        self.tree.delete(*self.tree.get_children())
+        self._rows.clear()
+        self._show_detail("")
+        try:
+            rows = slow_query_log.report()
+        except Exception as e:
+            self.status.set(f"Could not read the slow-query log: {e}")
+            return
+        for r in rows:
+            iid = self.tree.insert(
+                "",
+                tk.END,
+                text=" ".join(r.sql.split()),
+                values=(
+                    r.count,
+                    f"{r.avg_ms:.1f}",
+                    f"{r.max_ms:.1f}",
+                    r.last_seen,
+                    "yes" if r.full_scan else "",
+                ),
+            )
+            self._rows[iid] = r
+        threshold = slow_query_log.threshold_ms()
+        if threshold <= 0:
+            self.status.set("Slow-query log is off (slow_query_threshold_ms = 0).")
+        else:
+            self.status.set(f"{len(rows)} statement(s) slower than {threshold:g} ms.")
+
+    def clear(self) -> None:
+        try:
+            slow_query_log.clear()
+        except Exception as e:
+            self.status.set(f"Could not clear the slow-query log: {e}")
+            return
+        self.refresh()
+
+    def _on_select(self, _e=None) -> None:
+        sel = self.tree.selection()
+        r = self._rows.get(sel[0]) if sel else None
+        if r is None:
+            return
+        lines = [r.sql.strip(), ""]
+        if r.params:
+            lines.append(f"Parameters (slowest run): {r.params}")
+        lines.append("Query plan:")
+        lines.extend(f"  {line}" for line in (r.plan or "(not explained)").splitlines())
+        self._show_detail("\n".join(lines))
+
+    def _show_detail(self, text: str) -> None:
+        self.detail.configure(state="normal")
+        self.detail.delete("1.0", tk.END)
+        self.detail.insert("1.0", text)
+        self.detail.configure(state="disabled")
+
+
+_overlay: tk.Toplevel | None = None
+
+
+def toggle_overlay(master) -> None:
+    """Show the Performance window (F12: timings and slow queries), or close it if it is already open."""
+    global _overlay
+    if _overlay is not None and _overlay.winfo_exists():
+        _overlay.destroy()
+        _overlay = None
+        return
+    win = tk.Toplevel(master)
+    win.title("Performance")
+    win.geometry("760x520")
+    tabs = Notebook(win)
+    tabs.pack(fill=tk.BOTH, expand=True, padx=10, pady=10)
+    tabs.add(PerformanceView(tabs), text="Timings")
+    tabs.add(SlowQueryView(tabs), text="Slow Queries")
+    win.bind("<F12>", lambda e=None: toggle_overlay(master) or "break")
+    _overlay = win
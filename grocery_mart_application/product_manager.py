@@ -5,6 +5,7 @@ from tkinter import messagebox
 
 from ttkbootstrap import Button, Combobox, Entry, Frame, Label, Scrollbar, StringVar, Treeview
 
+from .change_journal import commit_journaled, record_delete, record_rows
 from .database import connect, log_event
 from .utils.helpers import validate_product_data
 
@@ -120,13 +121,22 @@ class ProductManager(Frame):
 
         try:
             with connect() as conn:
-                conn.execute(
+                cur = conn.execute(
                     """INSERT INTO products (name, category, unit, price, quantity, expiry, supplier_id)
                        VALUES (?, ?, ?, ?, ?, ?, ?)""",
                     (data["name"], data["category"], data["unit"], price, qty, data.get("expiry") or None, supplier_id),
                 )
-                conn.commit()
-            log_event("product", f"Added product: {data['name']}", self.current_user)
+                product_id = int(cur.lastrowid)
+                seq = record_rows(conn, {"products": [product_id]}, user=self.current_user)
+                commit_journaled(conn, seq)
+            log_event(
+                "product",
+                f"Added product: {data['name']}",
+                self.current_user,
+                entity_type="product",
+                entity_id=product_id,
+                qty_delta=qty,
+            )
             self.load_products()
             self.clear_form()
             messagebox.showinfo("Success", "Product added successfully.")
@@ -193,6 +203,7 @@ class ProductManager(Frame):
 
         try:
             with connect() as conn:
+                old = conn.execute("SELECT quantity FROM products WHERE id=?", (self.selected_id,)).fetchone()
                 conn.execute(
                     """UPDATE products
                        SET name=?, category=?, unit=?, price=?, quantity=?, expiry=?, supplier_id=?
@@ -208,8 +219,16 @@ class ProductManager(Frame):
                         self.selected_id,
                     ),
                 )
-                conn.commit()
-            log_event("product", f"Updated product: {data['name']} (ID {self.selected_id})", self.current_user)
+                seq = record_rows(conn, {"products": [self.selected_id]}, user=self.current_user)
+                commit_journaled(conn, seq)
+            log_event(
+                "product",
+                f"Updated product: {data['name']} (ID {self.selected_id})",
+                self.current_user,
+                entity_type="product",
+                entity_id=int(self.selected_id),
+                qty_delta=(qty - int(old["quantity"])) if old else None,
+            )
             self.load_products()
             self.clear_form()
             messagebox.showinfo("Updated", "Product updated successfully.")
@@ -224,10 +243,18 @@ class ProductManager(Frame):
             return
         try:
             with connect() as conn:
-                row = conn.execute("SELECT name FROM products WHERE id=?", (self.selected_id,)).fetchone()
+                row = conn.execute("SELECT name, quantity FROM products WHERE id=?", (self.selected_id,)).fetchone()
                 conn.execute("DELETE FROM products WHERE id=?", (self.selected_id,))
-                conn.commit()
-            log_event("product", f"Deleted product: {(row['name'] if row else 'ID')} {self.selected_id}", self.current_user)
+                seq = record_delete("products", [self.selected_id], user=self.current_user)
+                commit_journaled(conn, seq)
+            log_event(
+                "product",
+                f"Deleted product: {(row['name'] if row else 'ID')} {self.selected_id}",
+                self.current_user,
+                entity_type="product",
+                entity_id=int(self.selected_id),
+                qty_delta=-int(row["quantity"]) if row else None,
+            )
             self.load_products()
             self.clear_form()
             messagebox.showinfo("Deleted", "Product deleted.")
@@ -0,0 +1,205 @@
+from __future__ import annotations
+
+import math
+from dataclasses import dataclass
+from datetime import date, datetime, timedelta
+from threading import Lock
+
+from . import database
+from .database import connect
+from .utils.app_settings import get_setting
+
+DEFAULT_LOW_STOCK_THRESHOLD = 5
+DEFAULT_LOOKBACK_DAYS = 30
+DEFAULT_LEAD_TIME_DAYS = 3
+DEFAULT_SAFETY_DAYS = 2
+DEFAULT_COVER_DAYS = 14
+
+
+@dataclass(frozen=True)
+class ReorderSuggestion:
+    product_id: int
+    name: str
+    supplier_id: int | None
+    supplier: str
+    on_hand: int
+    daily_velocity: float
+    reorder_point: int
+    suggested_qty: int
+
+    @property
+    def needs_reorder(self) -> bool:
+        return self.on_hand <= self.reorder_point
+
+
+def _int_setting(key: str, default: int, *, min_v: int = 0) -> int:
+    try:
+        return max(min_v, int(get_setting(key, default)))
+    except Exception:
+        return default
+
+
+class ReorderEngine:
+    """
+    Per-product sales velocity over a rolling lookback window.
+
+    Velocity is built with one aggregated query over `sales` and then kept up to date incrementally:
+    `refresh()` only folds in rows with `id > last seen id`. A full rebuild happens when the window
+    start moves (new day), the lookback setting changes or sale ids go backwards (a restored backup).
+    """
+
+    def __init__(self) -> None:
+        self._lock = Lock()
+        self._sold: dict[str, int] = {}
+        self._last_sale_id = 0
+        self._window_start: str | None = None
+        self._first_sale_day: date | None = None
+        self._lookback_days = 0
+
+    def refresh(self) -> None:
+        lookback = _int_setting("reorder_lookback_days", DEFAULT_LOOKBACK_DAYS, min_v=1)
+        window_start = (date.today() - timedelta(days=lookback - 1)).isoformat()
+        with self._lock, connect() as conn:
+            last_id = int(conn.execute("SELECT COALESCE(MAX(id), 0) AS m FROM sales").fetchone()["m"])
+            if (
+                window_start != self._window_start
+                or lookback != self._lookback_days
+                or last_id < self._last_sale_id
+            ):
+                sold: dict[str, int] = {}
+                lower_id = 0
+                first = conn.execute("SELECT MIN(sale_date) AS d FROM sales").fetchone()["d"]
+                self._first_sale_day = self._parse_day(first)
+            elif last_id > self._last_sale_id:
+                sold = self._sold
+                lower_id = self._last_sale_id
+            else:
+                return
+
+            rows = conn.execute(
+                """SELECT product_name, COALESCE(SUM(quantity), 0) AS qty
+                   FROM sales
+                   WHERE id > ? AND id <= ? AND sale_date >= ?
+                   GROUP BY product_name""",
+                (lower_id, last_id, window_start),
+            ).fetchall()
+            for r in rows:
+                name = str(r["product_name"])
+                sold[name] = sold.get(name, 0) + int(r["qty"] or 0)
+            if self._first_sale_day is None and rows:
+                self._first_sale_day = date.today()
+
+            self._sold = sold
+            self._last_sale_id = last_id
+            self._window_start = window_start
+            self._lookback_days = lookback
+
+    def _parse_day(self, raw: object) -> date | None:
+        if not raw:
+            return None
+        try:
+            return datetime.strptime(str(raw)[:10], "%Y-%m-%d").date()
+        except Exception:
+            return None
+
+    def _window_days(self) -> int:
+        # A young shop has less history than the lookback window; don't dilute its velocity.
+        days = self._lookback_days or DEFAULT_LOOKBACK_DAYS
+        if self._first_sale_day is not None:
+            days = min(days, max(1, (date.today() - self._first_sale_day).days + 1))
+        return days
+
+    def velocity(self, product_name: str) -> float:
+        with self._lock:
+            return self._sold.get(product_name, 0) / self._window_days()
+
+    def _policy(self) -> tuple[int, int, int, int]:
+        return (
+            _int_setting("reorder_lead_time_days", DEFAULT_LEAD_TIME_DAYS),
+            _int_setting("reorder_safety_days", DEFAULT_SAFETY_DAYS),
+            _int_setting("reorder_cover_days", DEFAULT_COVER_DAYS, min_v=1),
+            _int_setting("inventory_low_stock_threshold", DEFAULT_LOW_STOCK_THRESHOLD),
+        )
+
+    def reorder_points(self) -> tuple[dict[str, int], int]:
+        """Reorder point per product name with sales in the window, plus the fallback for the rest."""
+        self.refresh()
+        lead, safety, _cover, threshold = self._policy()
+        with self._lock:
+            days = self._window_days()
+            points = {
+                name: math.ceil(qty / days * (lead + safety)) for name, qty in self._sold.items() if qty > 0
+            }
+        return points, threshold
+
+    def suggestions(self) -> list[ReorderSuggestion]:
+        """
+        Reorder point = velocity * (lead time + safety days).
+        Suggested qty tops stock up to `cover_days` of demand on top of the reorder point.
+        Products without sales in the window fall back to the global low-stock threshold.
+        """
+        self.refresh()
+        lead, safety, cover, threshold = self._policy()
+
+        with connect() as conn:
+            rows = conn.execute(
+                """SELECT p.id, p.name, p.quantity, p.supplier_id, COALESCE(s.name, '') AS supplier
+                   FROM products p
+                   LEFT JOIN suppliers s ON s.id = p.supplier_id"""
+            ).fetchall()
+
+        with self._lock:
+            sold = dict(self._sold)
+            days = self._window_days()
+
+        out: list[ReorderSuggestion] = []
+        for r in rows:
+            name = str(r["name"])
+            on_hand = int(r["quantity"] or 0)
+            v = sold.get(name, 0) / days
+            if v > 0:
+                reorder_point = math.ceil(v * (lead + safety))
+                target = math.ceil(v * (lead + safety + cover))
+            else:
+                reorder_point = threshold
+                target = threshold * 2
+            suggested = max(0, target - on_hand) if on_hand <= reorder_point else 0
+            out.append(
+                ReorderSuggestion(
+                    product_id=int(r["id"]),
+                    name=name,
+                    supplier_id=int(r["supplier_id"]) if r["supplier_id"] is not None else None,
+                    supplier=str(r["supplier"] or ""),
+                    on_hand=on_hand,
+                    daily_velocity=v,
+                    reorder_point=reorder_point,
+                    suggested_qty=suggested,
+                )
+            )
+        return out
+
+    def suggestions_by_supplier(self) -> dict[str, list[ReorderSuggestion]]:
+        grouped: dict[str, list[ReorderSuggestion]] = {}
+        for s in self.suggestions():
+            if not s.needs_reorder or s.suggested_qty <= 0:
+                continue
+            grouped.setdefault(s.supplier or "(No supplier)", []).append(s)
+        for items in grouped.values():
+            items.sort(key=lambda s: (-s.suggested_qty, s.name))
+        return dict(sorted(grouped.items()))
+
+
+_engine: ReorderEngine | None = None
+_engine_db: object = None
+_engine_lock = Lock()
+
+
+def get_reorder_engine() -> ReorderEngine:
+    """The shared engine for the current database; a new one after DB_PATH changes."""
+    global _engine, _engine_db
+    with _engine_lock:
+        # DB_PATH can be switched (CLI --db, tests, benchmarks); the running totals belong to one file.
+        if _engine is None or _engine_db != database.DB_PATH:
+            _engine = ReorderEngine()
+            _engine_db = database.DB_PATH
+        return _engine
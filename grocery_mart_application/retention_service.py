@@ -0,0 +1,197 @@
+from __future__ import annotations
+
+import gzip
+import json
+import os
+import threading
+from collections.abc import Iterator
+from dataclasses import dataclass, field
+from pathlib import Path
+
+from . import database
+
+ARCHIVE_DIRNAME = "activity_archive"
+ARCHIVE_PATTERN = "activity-*.ndjson.gz"
+ARCHIVE_COLUMNS = database.ACTIVITY_COLUMNS
+# Rows moved per transaction, so the app can keep logging while a large backlog is rolled off.
+BATCH_SIZE = 5000
+# Free pages returned to the OS per run (4 KiB pages -> ~32 MB); the rest waits for the next run.
+VACUUM_PAGES_PER_RUN = 8192
+RUN_INTERVAL_S = 24 * 3600
+
+
+@dataclass
+class RetentionResult:
+    archived: int = 0
+    files: list[Path] = field(default_factory=list)
+    vacuumed_pages: int = 0
+
+
+def _settings() -> tuple[int, int, Path]:
+    from .utils.app_settings import get_setting
+
+    days = int(get_setting("activity_retention_days", 365) or 0)
+    max_rows = int(get_setting("activity_max_rows", 200_000) or 0)
+    configured = str(get_setting("activity_archive_dir", "") or "").strip()
+    return days, max_rows, archive_folder(configured or None)
+
+
+def archive_folder(folder: str | Path | None = None) -> Path:
+    return Path(folder) if folder else database.DB_PATH.parent / ARCHIVE_DIRNAME
+
+
+def _archive_path(folder: Path, created_at: object) -> Path:
+    month = str(created_at or "")[:7] or "unknown"
+    return folder / f"activity-{month}.ndjson.gz"
+
+
+def _write_archive(folder: Path, rows: list[dict[str, object]]) -> list[Path]:
+    by_file: dict[Path, list[dict[str, object]]] = {}
+    for row in rows:
+        by_file.setdefault(_archive_path(folder, row["created_at"]), []).append(row)
+
+    folder.mkdir(parents=True, exist_ok=True)
+    for path, items in by_file.items():
+        # Each run appends one gzip member; gzip readers treat concatenated members as one stream.
+        with open(path, "ab") as raw:
+            with gzip.GzipFile(fileobj=raw, mode="wb") as gz:
+                for item in items:
+                    gz.write((json.dumps(item, ensure_ascii=False) + "\n").encode("utf-8"))
+            raw.flush()
+            os.fsync(raw.fileno())
+    return sorted(by_file)
+
+
+def iter_archived_events(
+    folder: str | Path | None = None, *, month: str | None = None
+) -> Iterator[dict[str, object]]:
+    """Yield archived events (oldest file first); `month` is "YYYY-MM" to read a single file."""
+    folder = archive_folder(folder)
+    paths = [folder / f"activity-{month}.ndjson.gz"] if month else sorted(folder.glob(ARCHIVE_PATTERN))
+    for path in paths:
+        if not path.exists():
+            continue
+        with gzip.open(path, "rt", encoding="utf-8") as f:
+            for line in f:
+                if line.strip():
+                    yield json.loads(line)
+
+
+def _expiry_filter(conn, days: int, max_rows: int) -> tuple[str, list[object]]:  # type: ignore[no-untyped-def]
+    clauses: list[str] = []
+    params: list[object] = []
+    if days > 0:
+        clauses.append("created_at < datetime('now', ?)")
+        params.append(f"-{days} days")
+    if max_rows > 0:
+        row = conn.execute(
+            "SELECT id FROM activity_log ORDER BY id DESC LIMIT 1 OFFSET ?", (max_rows,)
+        ).fetchone()
+        if row is not None:
+            clauses.append("id <= ?")
+            params.append(int(row[0]))
+    return " OR ".join(clauses), params
+
+
+def incremental_vacuum(conn, max_pages: int = VACUUM_PAGES_PER_RUN) -> int:  # type: ignore[no-untyped-def]
+    """
+    Return up to `max_pages` free pages to the filesystem; returns the number released.
+
+    Only works on databases in auto_vacuum=INCREMENTAL mode (new databases are created that way;
+    `grocery-mart reindex --vacuum` converts older ones). Otherwise this is a no-op.
+    """
+    if int(conn.execute("PRAGMA auto_vacuum").fetchone()[0]) != 2:
+        return 0
+    before = int(conn.execute("PRAGMA freelist_count").fetchone()[0])
+    if not before:
+        return 0
+    conn.execute(f"PRAGMA incremental_vacuum({int(max_pages)})").fetchall()
+    conn.commit()
+    return before - int(conn.execute("PRAGMA freelist_count").fetchone()[0])
+
+
+def apply_retention(
+    *,
+    days: int | None = None,
+    max_rows: int | None = None,
+    folder: str | Path | None = None,
+    dry_run: bool = False,
+) -> RetentionResult:
+    """
+    Move activity_log rows older than `days` or beyond the newest `max_rows` into monthly archives.
+
+    Limits default to the `activity_retention_days` / `activity_max_rows` settings (0 disables a
+    limit). Rows are written to `activity-YYYY-MM.ndjson.gz` (fsynced) before being deleted, in
+    batches of BATCH_SIZE, so the hot table and its indexes stay small. Finishes with a bounded
+    incremental vacuum. With `dry_run`, only counts what would be archived.
+    """
+    cfg_days, cfg_rows, cfg_folder = _settings()
+    days = cfg_days if days is None else int(days)
+    max_rows = cfg_rows if max_rows is None else int(max_rows)
+    out = archive_folder(folder) if folder else cfg_folder
+    result = RetentionResult()
+
+    with database.connect() as conn:
+        where, params = _expiry_filter(conn, days, max_rows)
+        if not where:
+            return result
+        if dry_run:
+            result.archived = int(
+                conn.execute(f"SELECT COUNT(*) FROM activity_log WHERE {where}", params).fetchone()[0]
+            )
+            return result
+
+        files: set[Path] = set()
+        last_id = 0
+        while True:
+            rows = conn.execute(
+                f"""SELECT {', '.join(ARCHIVE_COLUMNS)} FROM activity_log
+                    WHERE id > ? AND ({where}) ORDER BY id LIMIT ?""",
+                [last_id, *params, BATCH_SIZE],
+            ).fetchall()
+            if not rows:
+                break
+            batch = [{k: r[k] for k in ARCHIVE_COLUMNS} for r in rows]
+            files.update(_write_archive(out, batch))
+            lo, hi = int(rows[0]["id"]), int(rows[-1]["id"])
+            conn.execute(
+                f"DELETE FROM activity_log WHERE id BETWEEN ? AND ? AND ({where})", [lo, hi, *params]
+            )
+            conn.commit()
+            result.archived += len(rows)
+            last_id = hi
+
+        result.files = sorted(files)
+        result.vacuumed_pages = incremental_vacuum(conn)
+    return result
+
+
+_worker: threading.Thread | None = None
+_stop = threading.Event()
+
+
+def start_periodic_retention(interval_s: float = RUN_INTERVAL_S) -> None:
+    """Run `apply_retention` now and then every `interval_s` on a daemon thread (idempotent)."""
+    global _worker
+    if _worker is not None and _worker.is_alive():
+        return
+
+    def loop() -> None:
+        while True:
+            try:
+                result = apply_retention()
+                if result.archived:
+                    database.log_event("maintenance", f"Archived {result.archived} activity events", None)
+            except Exception:
+                # Retention is housekeeping; never let it take the app down.
+                pass
+            if _stop.wait(interval_s):
+                return
+
+    _stop.clear()
+    _worker = threading.Thread(target=loop, name="activity-retention", daemon=True)
+    _worker.start()
+
+
+def stop_periodic_retention() -> None:
+    _stop.set()
@@ -7,8 +7,11 @@ from tkinter import messagebox
 
 from ttkbootstrap import Button, Combobox, Entry, Frame, Label, Scrollbar, StringVar, Treeview
 
-from .database import connect, log_event
+from .database import activity_watermark, connect, log_event
+from .instrumentation import timed
 from .invoice_generator import InvoiceGenerator
+from .reorder_service import get_reorder_engine
+from .sales_service import attach_invoice, checkout
 
 
 class SalesManager(Frame):
@@ -34,6 +37,7 @@ class SalesManager(Frame):
         self._entries: dict[str, Entry] = {}
 
         self.invoice_maker = InvoiceGenerator("Grocery Mart")
+        self._activity_mark = activity_watermark()
         self.create_form()
         self.load_products()
         self._setup_live_preview()
@@ -190,6 +194,15 @@ class SalesManager(Frame):
             return False
         return False
 
+    def on_show(self) -> None:
+        # The cart and buyer fields are kept; only the product list and stock figures are refreshed.
+        mark = activity_watermark()
+        if mark != self._activity_mark:
+            self._activity_mark = mark
+            self.load_products()
+            if self.product_var.get():
+                self.display_available_stock()
+
     def load_products(self):
         with connect() as conn:
             rows = conn.execute("SELECT name FROM products ORDER BY name ASC").fetchall()
@@ -520,6 +533,7 @@ class SalesManager(Frame):
         self.display_available_stock()
         self._update_preview()
 
+    @timed("sales.record_sale")
     def record_sale(self):
         buyer_name = self.buyer_name_var.get().strip()
         buyer_mobile = self.buyer_mobile_var.get().strip()
@@ -539,85 +553,28 @@ class SalesManager(Frame):
                 messagebox.showerror("No items", "Add at least one item to the invoice first.")
                 return
 
-        sale_dt = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-        sale_ids: list[int] = []
-        invoice_items: list[dict[str, object]] = []
-        grand_total = 0.0
-
         try:
-            with connect() as conn:
-                cur = conn.cursor()
-                for name, item in self.cart.items():
-                    qty = int(item.get("qty", 0) or 0)
-                    if qty <= 0:
-                        continue
-
-                    cur.execute(
-                        "SELECT id, quantity, price, gst_percent, tax_percent FROM products WHERE name = ?",
-                        (name,),
-                    )
-                    row = cur.fetchone()
-                    if not row:
-                        raise RuntimeError(f"Product not found: {name}")
-
-                    product_id = int(row["id"])
-                    current_qty = int(row["quantity"])
-                    unit_price = float(row["price"])
-                    gst_percent = float(row["gst_percent"] or 0)
-                    tax_percent = float(row["tax_percent"] or 0)
-                    if qty > current_qty:
-                        raise RuntimeError(f"Insufficient stock for {name}. Only {current_qty} units available.")
-
-                    subtotal = qty * unit_price
-                    tax_amount = subtotal * (gst_percent + tax_percent) / 100.0
-                    total_price = subtotal + tax_amount
-                    new_qty = current_qty - qty
-                    grand_total += total_price
-
-                    cur.execute("UPDATE products SET quantity = ? WHERE id = ?", (new_qty, product_id))
-                    cur.execute(
-                        """INSERT INTO sales
-                           (product_name, quantity, sale_date, buyer_name, buyer_mobile,
-                            unit_price, subtotal, gst_percent, tax_percent, tax_amount, total_price, invoice_path)
-                           VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)""",
-                        (
-                            name,
-                            qty,
-                            sale_dt,
-                            buyer_name,
-                            buyer_mobile,
-                            unit_price,
-                            subtotal,
-                            gst_percent,
-                            tax_percent,
-                            tax_amount,
-                            total_price,
-                            None,
-                        ),
-                    )
-                    sale_ids.append(int(cur.lastrowid))
-                    invoice_items.append(
-                        {
-                            "product": name,
-                            "qty": qty,
-                            "unit_price": unit_price,
-                            "gst_percent": gst_percent,
-                            "tax_percent": tax_percent,
-                            "subtotal": subtotal,
-                            "tax_amount": tax_amount,
-                            "total": total_price,
-                        }
-                    )
-
-                conn.commit()
+            sale = checkout(
+                {name: int(item.get("qty", 0) or 0) for name, item in self.cart.items()},
+                buyer_name=buyer_name,
+                buyer_mobile=buyer_mobile,
+                user=self.current_user,
+            )
         except Exception as e:
             messagebox.showerror("Sale failed", str(e))
             return
+        sale_ids = sale.sale_ids
 
         if not sale_ids:
             messagebox.showerror("No items", "Nothing to record.")
             return
 
+        try:
+            # Incremental: only folds in the rows just inserted.
+            get_reorder_engine().refresh()
+        except Exception:
+            pass
+
         invoice_folder = "invoices"
         os.makedirs(invoice_folder, exist_ok=True)
         timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
@@ -626,8 +583,8 @@ class SalesManager(Frame):
             self.invoice_maker.generate_invoice(
                 filepath=invoice_path,
                 invoice_no=str(sale_ids[0]),
-                items=invoice_items,
-                total=grand_total,
+                items=sale.items,
+                total=sale.total,
                 buyer_name=buyer_name,
                 buyer_mobile=buyer_mobile,
             )
@@ -636,12 +593,7 @@ class SalesManager(Frame):
             invoice_path = ""
 
         if invoice_path:
-            with connect() as conn:
-                conn.executemany(
-                    "UPDATE sales SET invoice_path = ? WHERE id = ?",
-                    [(invoice_path, sale_id) for sale_id in sale_ids],
-                )
-                conn.commit()
+            attach_invoice(sale_ids, invoice_path, user=self.current_user)
             self.last_invoice_path = invoice_path
             if self._print_btn is not None:
                 try:
@@ -651,8 +603,12 @@ class SalesManager(Frame):
 
         log_event(
             "sale",
-            f"Recorded invoice: {len(invoice_items)} item(s) (total {grand_total:.2f})",
+            f"Recorded invoice: {len(sale.items)} item(s) (total {sale.total:.2f})",
             self.current_user,
+            entity_type="sale",
+            entity_id=sale_ids[0],
+            # The stock change is logged per product by checkout(); don't count it twice.
+            payload={"sale_ids": sale_ids, "total": round(sale.total, 2), "stock": sale.stock_moves},
         )
         self.clear_form()
         self.load_products()
@@ -0,0 +1,232 @@
+"""
+Checkout and sales reporting without the UI, shared by the Sales and Analytics panels and the
+benchmarks.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from datetime import date, datetime
+
+from .change_journal import commit_journaled, record_rows
+from .database import add_event, connect, publish_events
+from .instrumentation import timed
+from .utils.app_settings import get_setting
+
+PERIOD_KEYS = {
+    "Daily": "DATE(sale_date)",
+    "Weekly": "strftime('%Y-W%W', sale_date)",
+    "Monthly": "strftime('%Y-%m', sale_date)",
+}
+
+
+@dataclass
+class Checkout:
+    sale_ids: list[int]
+    sale_date: str
+    # One dict per line, in the shape `InvoiceGenerator.generate_invoice(items=...)` expects.
+    items: list[dict[str, object]]
+    total: float
+    stock_moves: list[dict[str, int]]
+
+
+@timed("sales.checkout")
+def checkout(
+    cart: dict[str, int],
+    *,
+    buyer_name: str,
+    buyer_mobile: str,
+    user: str | None = None,
+    sale_date: str | None = None,
+) -> Checkout:
+    """
+    Record one invoice: a sale line per product in `cart` ({name: qty}) and the stock taken.
+
+    Each line also logs a "sale" activity event for its product (`entity_type="product"`, negative
+    `qty_delta`), so a product's stock history includes its sales. All lines and events are written
+    in one transaction; a missing product or insufficient stock raises RuntimeError and nothing is
+    recorded.
+    """
+    sale_dt = sale_date or datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+    result = Checkout([], sale_dt, [], 0.0, [])
+    events: list[dict[str, object]] = []
+    with connect() as conn:
+        cur = conn.cursor()
+        for name, qty in cart.items():
+            qty = int(qty or 0)
+            if qty <= 0:
+                continue
+
+            row = cur.execute(
+                "SELECT id, quantity, price, gst_percent, tax_percent FROM products WHERE name = ?",
+                (name,),
+            ).fetchone()
+            if not row:
+                raise RuntimeError(f"Product not found: {name}")
+
+            product_id = int(row["id"])
+            current_qty = int(row["quantity"])
+            unit_price = float(row["price"])
+            gst_percent = float(row["gst_percent"] or 0)
+            tax_percent = float(row["tax_percent"] or 0)
+            if qty > current_qty:
+                raise RuntimeError(f"Insufficient stock for {name}. Only {current_qty} units available.")
+
+            subtotal = qty * unit_price
+            tax_amount = subtotal * (gst_percent + tax_percent) / 100.0
+            total_price = subtotal + tax_amount
+            result.total += total_price
+
+            cur.execute("UPDATE products SET quantity = ? WHERE id = ?", (current_qty - qty, product_id))
+            cur.execute(
+                """INSERT INTO sales
+                   (product_name, quantity, sale_date, buyer_name, buyer_mobile,
+                    unit_price, subtotal, gst_percent, tax_percent, tax_amount, total_price, invoice_path)
+                   VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)""",
+                (
+                    name,
+                    qty,
+                    sale_dt,
+                    buyer_name,
+                    buyer_mobile,
+                    unit_price,
+                    subtotal,
+                    gst_percent,
+                    tax_percent,
+                    tax_amount,
+                    total_price,
+                    None,
+                ),
+            )
+            sale_id = int(cur.lastrowid)
+            result.sale_ids.append(sale_id)
+            events.append(
+                add_event(
+                    conn,
+                    "sale",
+                    f"Sold {qty} x {name} (sale {sale_id})",
+                    user,
+                    entity_type="product",
+                    entity_id=product_id,
+                    qty_delta=-qty,
+                    payload={"sale_id": sale_id},
+                )
+            )
+            result.stock_moves.append({"product_id": product_id, "qty": -qty})
+            result.items.append(
+                {
+                    "product": name,
+                    "qty": qty,
+                    "unit_price": unit_price,
+                    "gst_percent": gst_percent,
+                    "tax_percent": tax_percent,
+                    "subtotal": subtotal,
+                    "tax_amount": tax_amount,
+                    "total": total_price,
+                }
+            )
+
+        seq = record_rows(
+            conn,
+            {"products": [m["product_id"] for m in result.stock_moves], "sales": result.sale_ids},
+            user=user,
+        )
+        commit_journaled(conn, seq)
+        publish_events(conn, events)
+    return result
+
+
+def attach_invoice(sale_ids: list[int], path: str, *, user: str | None = None) -> None:
+    with connect() as conn:
+        conn.executemany("UPDATE sales SET invoice_path = ? WHERE id = ?", [(path, i) for i in sale_ids])
+        commit_journaled(conn, record_rows(conn, {"sales": sale_ids}, user=user))
+
+
+@dataclass
+class SalesSummary:
+    revenue: float = 0.0
+    sales: int = 0
+    items: int = 0
+    tax: float = 0.0
+    low_stock: int = 0
+    # (category, units in stock), largest first.
+    stock_by_category: list[tuple[str, float]] = field(default_factory=list)
+    # (period key, revenue) in period order.
+    trend: list[tuple[str, float]] = field(default_factory=list)
+    # (product, units, revenue) for the 10 best-selling products by revenue.
+    top_products: list[tuple[str, int, float]] = field(default_factory=list)
+
+    @property
+    def avg_sale(self) -> float:
+        return self.revenue / self.sales if self.sales else 0.0
+
+
+def sales_summary(
+    period: str = "Daily",
+    *,
+    date_from: date | None = None,
+    date_to: date | None = None,
+) -> SalesSummary:
+    """KPIs, stock by category, revenue per `period` ("Daily", "Weekly", "Monthly") and top products."""
+    where, params = "", ()
+    if date_from is not None or date_to is not None:
+        lo, hi = sorted((date_from or date_to, date_to or date_from))  # type: ignore[type-var]
+        where = " AND DATE(sale_date) BETWEEN DATE(?) AND DATE(?)"
+        params = (lo.isoformat(), hi.isoformat())
+    key = PERIOD_KEYS.get(period, PERIOD_KEYS["Monthly"])
+    threshold = int(get_setting("inventory_low_stock_threshold", 5) or 5)
+
+    with connect() as conn:
+        stock_data = conn.execute(
+            "SELECT category, SUM(quantity) AS qty FROM products GROUP BY category ORDER BY qty DESC"
+        ).fetchall()
+
+        kpi_row = conn.execute(
+            f"""SELECT
+                    COALESCE(SUM(COALESCE(total_price,0)),0) AS revenue,
+                    COUNT(*) AS sales,
+                    COALESCE(SUM(COALESCE(quantity,0)),0) AS items,
+                    COALESCE(SUM(COALESCE(tax_amount,0)),0) AS tax
+                FROM sales
+                WHERE 1=1 {where}""",
+            params,
+        ).fetchone()
+
+        low_stock = conn.execute(
+            "SELECT COUNT(*) AS c FROM products WHERE COALESCE(quantity,0) <= ?",
+            (threshold,),
+        ).fetchone()
+
+        sales_data = conn.execute(
+            f"""SELECT {key} AS k, COALESCE(SUM(COALESCE(total_price,0)),0) AS v
+                FROM sales
+                WHERE 1=1 {where}
+                GROUP BY {key}
+                ORDER BY {key}""",
+            params,
+        ).fetchall()
+
+        top_products = conn.execute(
+            f"""SELECT product_name,
+                    COALESCE(SUM(COALESCE(quantity,0)),0) AS qty,
+                    COALESCE(SUM(COALESCE(total_price,0)),0) AS revenue
+                FROM sales
+                WHERE 1=1 {where}
+                GROUP BY product_name
+                ORDER BY revenue DESC
+                LIMIT 10""",
+            params,
+        ).fetchall()
+
+    return SalesSummary(
+        revenue=float(kpi_row["revenue"] or 0),
+        sales=int(kpi_row["sales"] or 0),
+        items=int(kpi_row["items"] or 0),
+        tax=float(kpi_row["tax"] or 0),
+        low_stock=int(low_stock["c"] or 0),
+        stock_by_category=[(str(r["category"]), float(r["qty"] or 0)) for r in stock_data],
+        trend=[(str(r["k"]), float(r["v"] or 0)) for r in sales_data],
+        top_products=[
+            (str(r["product_name"] or ""), int(r["qty"] or 0), float(r["revenue"] or 0)) for r in top_products
+        ],
+    )
@@ -0,0 +1,278 @@
+"""
+Staged camera-scan pipeline: capture, decode and preview conversion on separate threads.
+
+    capture thread --> decode slot  --> decode workers (one ScannerEngine each) --> results queue
+                   \\-> preview slot --> preview thread (resize/convert)        --> latest preview
+
+Slots hold only the newest frame. A frame that is replaced before a worker gets to it is
+dropped rather than queued, so decoding always works on what the camera sees now and latency
+does not grow when decoding is slower than capture. The Tk thread only polls `results` and
+`take_preview()`, then builds the PhotoImage, which must happen on the Tk thread.
+"""
+
+from __future__ import annotations
+
+import os
+import queue
+import threading
+import time
+from collections.abc import Callable
+from dataclasses import dataclass
+
+from .scanner_engine import ScannerEngine, ScanResult, equivalent_codes
+
+DECODE_WORKERS = 2
+PREVIEW_INTERVAL_S = 1 / 15
+READ_FAIL_LIMIT = 50
+
+
+class FrameSlot:
+    """Single-item, overwrite-on-put handoff between threads; `take` waits for a newer item."""
+
+    def __init__(self) -> None:
+        self._cond = threading.Condition()
+        self._item: object = None
+        self._seq = 0
+        self._taken = 0
+        self._closed = False
+        self.dropped = 0
+
+    def put(self, item: object) -> int:
+        with self._cond:
+            if self._seq > self._taken:
+                self.dropped += 1
+            self._seq += 1
+            self._item = item
+            self._cond.notify()
+            return self._seq
+
+    def take(self, timeout: float | None = None) -> tuple[int, object] | None:
+        """Newest item not yet taken by anyone, or None on timeout/close."""
+        with self._cond:
+            self._cond.wait_for(lambda: self._closed or self._seq > self._taken, timeout)
+            if self._seq <= self._taken:
+                return None
+            self._taken = self._seq
+            item, self._item = self._item, None
+            return self._seq, item
+
+    def close(self) -> None:
+        with self._cond:
+            self._closed = True
+            self._cond.notify_all()
+
+    @property
+    def closed(self) -> bool:
+        return self._closed
+
+
+@dataclass
+class DecodedFrame:
+    seq: int
+    result: ScanResult
+    latency_ms: float
+
+
+class ScanPipeline:
+    """
+    Run `open_source()` (anything with `read()` -> (ok, frame) and `release()`, e.g. a
+    cv2.VideoCapture) through `workers` decode threads, each with its own `engine_factory()`
+    engine. `preview(frame)` converts frames for display on its own thread.
+    """
+
+    def __init__(
+        self,
+        open_source: Callable[[], object],
+        engine_factory: Callable[[], ScannerEngine],
+        *,
+        workers: int = DECODE_WORKERS,
+        preview: Callable[[object], object] | None = None,
+        preview_interval_s: float = PREVIEW_INTERVAL_S,
+    ) -> None:
+        self.open_source = open_source
+        self.engine_factory = engine_factory
+        self.workers = max(1, min(int(workers), os.cpu_count() or 1))
+        self.preview = preview
+        self.preview_interval_s = preview_interval_s
+        self.results: queue.SimpleQueue[DecodedFrame] = queue.SimpleQueue()
+        self.engines: list[ScannerEngine] = []
+        self.error: str | None = None
+        self.frame_size = ""
+        self.frames = 0
+        self.decoded = 0
+        self._count_lock = threading.Lock()
+        self._stop = threading.Event()
+        self._decode_slot = FrameSlot()
+        self._preview_slot = FrameSlot()
+        self._preview_lock = threading.Lock()
+        self._preview: tuple[int, object] | None = None
+        self._preview_shown = 0
+        self._threads: list[threading.Thread] = []
+        self._started_at = 0.0
+
+    # -- lifecycle -------------------------------------------------------------------------
+
+    def start(self) -> None:
+        """Build the engines and start the threads; ValueError if no decoder is available."""
+        # Engines are built here so a missing decoder surfaces before any thread starts.
+        self.engines = [self.engine_factory() for _ in range(self.workers)]
+        if not self.engines[0].order:
+            raise ValueError("No barcode decoder available.")
+        self._started_at = time.perf_counter()
+        self._spawn(self._capture_loop, "scan-capture")
+        for i, engine in enumerate(self.engines):
+            self._spawn(lambda e=engine: self._decode_loop(e), f"scan-decode-{i}")
+        if self.preview is not None:
+            self._spawn(self._preview_loop, "scan-preview")
+
+    def _spawn(self, target: Callable[[], None], name: str) -> None:
+        t = threading.Thread(target=target, name=name, daemon=True)
+        self._threads.append(t)
+        t.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        self._decode_slot.close()
+        self._preview_slot.close()
+
+    def join(self, timeout: float | None = None) -> None:
+        for t in self._threads:
+            t.join(timeout)
+
+    @property
+    def stopped(self) -> bool:
+        return self._stop.is_set()
+
+    @property
+    def running(self) -> bool:
+        return any(t.is_alive() for t in self._threads)
+
+    # -- threads ---------------------------------------------------------------------------
+
+    def _capture_loop(self) -> None:
+        source = None
+        try:
+            try:
+                source = self.open_source()
+            except Exception as e:
+                self.error = str(e) or "Could not open the frame source."
+                return
+            is_opened = getattr(source, "isOpened", None)
+            if source is None or (is_opened is not None and not is_opened()):
+                self.error = "Could not open the camera."
+                return
+            failures = 0
+            while not self._stop.is_set():
+                ok, frame = source.read()  # type: ignore[union-attr]
+                if not ok or frame is None:
+                    failures += 1
+                    # End of a file source, or a camera that went away.
+                    if failures >= READ_FAIL_LIMIT or not getattr(source, "live", True):
+                        break
+                    time.sleep(0.01)
+                    continue
+                failures = 0
+                self.frames += 1
+                if not self.frame_size:
+                    shape = getattr(frame, "shape", None)
+                    if shape is not None:
+                        self.frame_size = f"{shape[1]}x{shape[0]}"
+                item = (time.perf_counter(), frame)
+                self._decode_slot.put(item)
+                if self.preview is not None:
+                    self._preview_slot.put(item)
+        finally:
+            if source is not None:
+                try:
+                    source.release()  # type: ignore[attr-defined]
+                except Exception:
+                    pass
+            # Let workers finish the frame they hold, then wake them so they exit.
+            self._decode_slot.close()
+            self._preview_slot.close()
+
+    def _decode_loop(self, engine: ScannerEngine) -> None:
+        while not self._stop.is_set():
+            taken = self._decode_slot.take(timeout=0.5)
+            if taken is None:
+                if self._decode_slot.closed:
+                    return
+                continue
+            seq, (captured_at, frame) = taken  # type: ignore[misc]
+            result = engine.decode(frame)
+            with self._count_lock:
+                self.decoded += 1
+            self.results.put(DecodedFrame(seq, result, (time.perf_counter() - captured_at) * 1000))
+
+    def _preview_loop(self) -> None:
+        assert self.preview is not None
+        while not self._stop.is_set():
+            taken = self._preview_slot.take(timeout=0.5)
+            if taken is None:
+                if self._preview_slot.closed:
+                    return
+                continue
+            t0 = time.perf_counter()
+            seq, (_captured_at, frame) = taken  # type: ignore[misc]
+            try:
+                image = self.preview(frame)
+            except Exception:
+                continue
+            with self._preview_lock:
+                self._preview = (seq, image)
+            # Preview at ~15 fps is plenty; the rest of the CPU goes to decoding.
+            self._stop.wait(max(0.0, self.preview_interval_s - (time.perf_counter() - t0)))
+
+    # -- Tk-side polling -------------------------------------------------------------------
+
+    def take_preview(self) -> object | None:
+        """The newest converted preview if it has not been returned before, else None."""
+        with self._preview_lock:
+            if self._preview is None or self._preview[0] <= self._preview_shown:
+                return None
+            self._preview_shown = self._preview[0]
+            return self._preview[1]
+
+    def drain_results(self) -> list[DecodedFrame]:
+        out = []
+        while True:
+            try:
+                out.append(self.results.get_nowait())
+            except queue.Empty:
+                return out
+
+    def stats(self) -> dict[str, object]:
+        elapsed = max(time.perf_counter() - self._started_at, 1e-9) if self._started_at else 0.0
+        timings = self.engines[0].summary() if self.engines else ""
+        return {
+            "frames": self.frames,
+            "decoded": self.decoded,
+            "dropped": self._decode_slot.dropped,
+            "fps": self.frames / elapsed if elapsed else 0.0,
+            "size": self.frame_size,
+            "timings": timings,
+        }
+
+
+class CodeDebouncer:
+    """
+    Decide which reads in a continuous scan are new codes.
+
+    A code counts again only after it has been out of view for `cooldown_s`: a label held in
+    front of the camera is read on many consecutive frames but counted once, while the next
+    item with the same barcode counts as soon as the first one has been moved away. UPC-A and
+    its zero-padded EAN-13 spelling are the same code (decoders disagree on which to report).
+    """
+
+    def __init__(self, cooldown_s: float) -> None:
+        self.cooldown_s = float(cooldown_s)
+        self._last_seen: dict[str, float] = {}
+
+    def accept(self, code: str, now: float | None = None) -> bool:
+        now = time.monotonic() if now is None else now
+        code = min(equivalent_codes(code))
+        last = self._last_seen.get(code)
+        self._last_seen[code] = now
+        if len(self._last_seen) > 256:
+            self._last_seen = {c: t for c, t in self._last_seen.items() if now - t < self.cooldown_s}
+        return last is None or now - last >= self.cooldown_s
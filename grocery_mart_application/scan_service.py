@@ -0,0 +1,242 @@
+"""
+Barcode scan input and stock updates, off the Tk thread.
+
+USB scanners are keyboards ("keyboard wedge"): a scan arrives as a burst of keystrokes a few
+milliseconds apart, usually ended by Enter. `WedgeBuffer` collects keystrokes itself instead of
+reading the entry widget, and tells bursts from human typing by the gaps between keys, so codes
+are complete and in order however fast they arrive.
+
+`ScanWorker` applies scans on one background thread in arrival order. Scans that queue up while
+a batch is being written are applied together in the next batch: one transaction and one
+journal entry per batch, so throughput grows with load instead of falling behind.
+"""
+
+from __future__ import annotations
+
+import queue
+import threading
+from collections.abc import Callable
+from dataclasses import dataclass
+
+from .change_journal import commit_journaled, record_rows
+from .database import connect, log_event
+from .scanner_engine import equivalent_codes
+
+ACTIONS = ("Receive (+)", "Dispatch (-)", "Set Qty")
+TERMINATORS = ("\r", "\n", "\t")
+# Scanners type a character every 1-10 ms; people rarely manage under 60 ms between keys.
+MAX_GAP_MS = 50
+MIN_LENGTH = 3
+MAX_BATCH = 200
+
+
+@dataclass(frozen=True)
+class WedgeCode:
+    code: str
+    # True when every key arrived within the burst gap, i.e. from a scanner, not typed by hand.
+    burst: bool
+
+
+class WedgeBuffer:
+    def __init__(self, *, max_gap_ms: float = MAX_GAP_MS, min_length: int = MIN_LENGTH) -> None:
+        self.max_gap_ms = float(max_gap_ms)
+        self.min_length = int(min_length)
+        self._chars: list[str] = []
+        self._last_ms: float | None = None
+        self._burst = True
+
+    @property
+    def text(self) -> str:
+        return "".join(self._chars)
+
+    def feed(self, char: str, t_ms: float) -> WedgeCode | None:
+        """Add one keystroke (`t_ms`: key timestamp); returns a code when a terminator completes it."""
+        if char in TERMINATORS:
+            return self.complete()
+        if self._last_ms is not None and t_ms - self._last_ms > self.max_gap_ms:
+            self._burst = False
+        self._last_ms = t_ms
+        self._chars.append(char)
+        return None
+
+    def backspace(self) -> None:
+        if self._chars:
+            self._chars.pop()
+        # Only people edit what they typed.
+        self._burst = False
+
+    @property
+    def is_burst(self) -> bool:
+        return self._burst and len(self._chars) >= self.min_length
+
+    def complete(self) -> WedgeCode | None:
+        code = WedgeCode(self.text.strip(), self.is_burst)
+        self.clear()
+        return code if code.code else None
+
+    def flush_idle(self) -> WedgeCode | None:
+        """Complete a scanner burst that ended without a terminator; typed text is left alone."""
+        return self.complete() if self.is_burst else None
+
+    def clear(self) -> None:
+        self._chars.clear()
+        self._last_ms = None
+        self._burst = True
+
+
+@dataclass
+class ScanRequest:
+    barcode: str
+    action: str
+    qty: int
+    # False for scans that must not open dialogs (continuous camera mode).
+    interactive: bool = True
+
+
+@dataclass
+class ScanOutcome:
+    request: ScanRequest
+    status: str  # "ok", "unknown", "rejected" or "error"
+    product_id: int | None = None
+    name: str = ""
+    before: int | None = None
+    after: int | None = None
+    message: str = ""
+
+
+def _new_qty(action: str, qty: int, current: int) -> int:
+    if action == "Set Qty":
+        return qty
+    if action == "Dispatch (-)":
+        return current - qty
+    return current + qty
+
+
+def apply_scans(requests: list[ScanRequest], *, user: str | None = None) -> list[ScanOutcome]:
+    """
+    Apply scan actions in order in one transaction; returns one outcome per request.
+
+    Repeated scans of a product within the batch build on each other (receive 1 + receive 1 =
+    +2). Dispatches below zero are rejected individually; the rest of the batch still applies.
+    """
+    outcomes: list[ScanOutcome] = []
+    changed: dict[int, None] = {}
+    with connect() as conn:
+        stock: dict[int, tuple[str, int]] = {}
+        for req in requests:
+            variants = equivalent_codes(req.barcode)
+            row = conn.execute(
+                f"""SELECT id, name, quantity FROM products WHERE barcode IN ({', '.join('?' * len(variants))})
+                    ORDER BY barcode = ? DESC LIMIT 1""",
+                (*variants, req.barcode),
+            ).fetchone()
+            if row is None:
+                outcomes.append(ScanOutcome(req, "unknown", message=f"Unknown barcode {req.barcode}"))
+                continue
+            product_id = int(row["id"])
+            name, current = stock.get(product_id, (str(row["name"]), int(row["quantity"])))
+            new_qty = _new_qty(req.action, req.qty, current)
+            if new_qty < 0:
+                outcomes.append(
+                    ScanOutcome(
+                        req,
+                        "rejected",
+                        product_id,
+                        name,
+                        current,
+                        current,
+                        f"Cannot dispatch {req.qty}. Current stock for {name} is {current}.",
+                    )
+                )
+                continue
+            conn.execute("UPDATE products SET quantity = ? WHERE id = ?", (new_qty, product_id))
+            stock[product_id] = (name, new_qty)
+            changed[product_id] = None
+            outcomes.append(ScanOutcome(req, "ok", product_id, name, current, new_qty))
+        commit_journaled(conn, record_rows(conn, {"products": list(changed)}, user=user))
+
+    for out in outcomes:
+        if out.status != "ok":
+            continue
+        req = out.request
+        log_event(
+            "product",
+            f"Barcode {req.barcode}: {req.action} {req.qty} on {out.name} (qty {out.before} -> {out.after})",
+            user,
+            entity_type="product",
+            entity_id=out.product_id,
+            qty_delta=int(out.after or 0) - int(out.before or 0),
+            payload={
+                "barcode": req.barcode,
+                "action": req.action,
+                "qty": req.qty,
+                "before": out.before,
+                "after": out.after,
+            },
+        )
+    return outcomes
+
+
+class ScanWorker:
+    """One background thread applying `ScanRequest`s in order; poll `drain()` from the Tk thread."""
+
+    def __init__(
+        self, *, user: str | None = None, apply: Callable[..., list[ScanOutcome]] = apply_scans
+    ) -> None:
+        self.user = user
+        self.apply = apply
+        self.results: queue.SimpleQueue[ScanOutcome] = queue.SimpleQueue()
+        self._inbox: queue.Queue[ScanRequest | None] = queue.Queue()
+        self._thread: threading.Thread | None = None
+        self._pending = 0
+        self._lock = threading.Lock()
+
+    def submit(self, request: ScanRequest) -> None:
+        with self._lock:
+            self._pending += 1
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._run, name="scan-worker", daemon=True)
+                self._thread.start()
+        self._inbox.put(request)
+
+    @property
+    def pending(self) -> int:
+        """Scans submitted whose outcome has not been drained yet."""
+        with self._lock:
+            return self._pending
+
+    def _run(self) -> None:
+        while True:
+            first = self._inbox.get()
+            if first is None:
+                return
+            batch = [first]
+            while len(batch) < MAX_BATCH:
+                try:
+                    nxt = self._inbox.get_nowait()
+                except queue.Empty:
+                    break
+                if nxt is None:
+                    self._inbox.put(None)
+                    break
+                batch.append(nxt)
+            try:
+                outcomes = self.apply(batch, user=self.user)
+            except Exception as e:
+                outcomes = [ScanOutcome(req, "error", message=str(e)) for req in batch]
+            for out in outcomes:
+                self.results.put(out)
+
+    def drain(self) -> list[ScanOutcome]:
+        out = []
+        while True:
+            try:
+                out.append(self.results.get_nowait())
+            except queue.Empty:
+                break
+        with self._lock:
+            self._pending -= len(out)
+        return out
+
+    def stop(self) -> None:
+        self._inbox.put(None)
@@ -0,0 +1,368 @@
+"""
+Offline camera-scanner benchmark: no camera needed, so it runs headless (e.g. in CI).
+
+    python -m grocery_mart_application.scanner_bench                  # synthetic fixtures
+    python -m grocery_mart_application.scanner_bench --source clips/  # recorded images/video
+    python -m grocery_mart_application.scanner_bench --write fixtures/ --json out.json
+
+Synthetic fixtures are EAN-13 and Code128 labels rendered on a camera-sized frame, each under
+several conditions (clean, blur, low contrast, rotation, noise). Every decode chain of the
+scanner engine is run on its own over all frames, then the adaptive engine as the app uses it;
+the report gives decode rate, frames per second and mean/p95 latency per chain and condition.
+
+Recorded fixtures are named `<anything>_<code>.<ext>` so the expected code is known; frames from
+a video need `--expect CODE`.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import random
+import sys
+import time
+from collections.abc import Iterable
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+
+from .scanner_engine import DEFAULT_CHAINS, ScannerEngine, create_engine, equivalent_codes
+
+CONDITIONS = ("clean", "blur", "low_contrast", "rotated", "noise")
+SYMBOLOGIES = ("ean13", "code128")
+FRAME_SIZE = (1280, 720)
+MODULE_PX = 3
+
+# EAN-13: left-hand odd (L) codes; G is R reversed and R is L inverted.
+_EAN_L = (
+    "0001101",
+    "0011001",
+    "0010011",
+    "0111101",
+    "0100011",
+    "0110001",
+    "0101111",
+    "0111011",
+    "0110111",
+    "0001011",
+)
+_EAN_PARITY = (
+    "LLLLLL",
+    "LLGLGG",
+    "LLGGLG",
+    "LLGGGL",
+    "LGLLGG",
+    "LGGLLG",
+    "LGGGLL",
+    "LGLGLG",
+    "LGLGGL",
+    "LGGLGL",
+)
+
+# Code128 symbol values 0-106 as bar/space widths in modules (bar first).
+_CODE128 = (
+    "212222 222122 222221 121223 121322 131222 122213 122312 132212 221213 221312 231212 112232 "
+    "122132 122231 113222 123122 123221 223211 221132 221231 213212 223112 312131 311222 321122 "
+    "321221 312212 322112 322211 212123 212321 232121 111323 131123 131321 112313 132113 132311 "
+    "211313 231113 231311 112133 112331 132131 113123 113321 133121 313121 211331 231131 213113 "
+    "213311 213131 311123 311321 331121 312113 312311 332111 314111 221411 431111 111224 111422 "
+    "121124 121421 141122 141221 112214 112412 122114 122411 142112 142211 241211 221114 413111 "
+    "241112 134111 111242 121142 121241 114212 124112 124211 411212 421112 421211 212141 214121 "
+    "412121 111143 111341 131141 114113 114311 411113 411311 113141 114131 311141 411131 211412 "
+    "211214 211232 2331112"
+).split()
+_CODE128_START_B = 104
+_CODE128_STOP = 106
+
+
+def ean13_check_digit(digits12: str) -> int:
+    total = sum(int(d) * (3 if i % 2 else 1) for i, d in enumerate(digits12))
+    return (10 - total % 10) % 10
+
+
+def ean13_modules(code: str) -> str:
+    """Module string ("1" = bar) for a 12- or 13-digit EAN-13; the check digit is recomputed."""
+    if len(code) not in (12, 13) or not code.isdigit():
+        raise ValueError("EAN-13 needs 12 or 13 digits")
+    digits = code[:12] + str(ean13_check_digit(code[:12]))
+    left = ""
+    for d, parity in zip(digits[1:7], _EAN_PARITY[int(digits[0])], strict=True):
+        l_code = _EAN_L[int(d)]
+        left += l_code if parity == "L" else _invert(l_code)[::-1]
+    right = "".join(_invert(_EAN_L[int(d)]) for d in digits[7:])
+    return "101" + left + "01010" + right + "101"
+
+
+def _invert(bits: str) -> str:
+    return bits.translate(str.maketrans("01", "10"))
+
+
+def code128_modules(text: str) -> str:
+    """Module string for `text` in Code128 set B (printable ASCII)."""
+    values = [_CODE128_START_B]
+    for ch in text:
+        v = ord(ch) - 32
+        if not 0 <= v <= 94:
+            raise ValueError(f"Code128 set B cannot encode {ch!r}")
+        values.append(v)
+    values.append((values[0] + sum(i * v for i, v in enumerate(values[1:], start=1))) % 103)
+    values.append(_CODE128_STOP)
+    out = []
+    for v in values:
+        for i, width in enumerate(_CODE128[v]):
+            out.append(("1" if i % 2 == 0 else "0") * int(width))
+    return "".join(out)
+
+
+def fixture_codes(count: int, *, seed: int = 7) -> list[tuple[str, str]]:
+    """`count` (symbology, code) pairs per symbology, the same for a given seed."""
+    rng = random.Random(seed)
+    out = []
+    for _ in range(count):
+        digits = "".join(rng.choice("0123456789") for _ in range(12))
+        out.append(("ean13", digits + str(ean13_check_digit(digits))))
+        out.append(
+            ("code128", "GM-" + "".join(rng.choice("ABCDEFGHJKLMNPQRSTUVWXYZ0123456789") for _ in range(8)))
+        )
+    return out
+
+
+def render_label(symbology: str, code: str, *, module_px: int = MODULE_PX, height: int = 160):  # type: ignore[no-untyped-def]
+    """Grayscale numpy image of the barcode with quiet zones."""
+    import numpy as np
+
+    modules = ean13_modules(code) if symbology == "ean13" else code128_modules(code)
+    quiet = "0" * 12
+    row = np.array([0 if m == "1" else 255 for m in quiet + modules + quiet], dtype=np.uint8)
+    return np.tile(np.repeat(row, module_px), (height, 1))
+
+
+def render_frame(symbology: str, code: str, condition: str, *, seed: int = 0):  # type: ignore[no-untyped-def]
+    """A BGR frame of FRAME_SIZE with the label centred, degraded by `condition`."""
+    import cv2  # type: ignore
+    import numpy as np
+
+    w, h = FRAME_SIZE
+    frame = np.full((h, w), 190, dtype=np.uint8)
+    label = render_label(symbology, code)
+    lh, lw = label.shape
+    y0, x0 = (h - lh) // 2, (w - lw) // 2
+    frame[y0 : y0 + lh, x0 : x0 + lw] = label
+
+    if condition == "blur":
+        frame = cv2.GaussianBlur(frame, (0, 0), 1.6)
+    elif condition == "low_contrast":
+        frame = (frame.astype(np.float32) * 0.25 + 110).astype(np.uint8)
+    elif condition == "rotated":
+        m = cv2.getRotationMatrix2D((w / 2, h / 2), 12, 1.0)
+        frame = cv2.warpAffine(frame, m, (w, h), borderValue=190)
+    elif condition == "noise":
+        rng = np.random.default_rng(seed)
+        frame = np.clip(frame.astype(np.int16) + rng.normal(0, 18, frame.shape), 0, 255).astype(np.uint8)
+    return cv2.cvtColor(frame, cv2.COLOR_GRAY2BGR)
+
+
+@dataclass
+class Fixture:
+    name: str
+    condition: str
+    expected: str
+    frame: object = field(repr=False)
+
+
+def synthetic_fixtures(
+    count: int = 4, *, seed: int = 7, conditions: Iterable[str] = CONDITIONS
+) -> list[Fixture]:
+    out = []
+    for i, (symbology, code) in enumerate(fixture_codes(count, seed=seed)):
+        for condition in conditions:
+            out.append(
+                Fixture(
+                    f"{symbology}_{condition}_{code}",
+                    condition,
+                    code,
+                    render_frame(symbology, code, condition, seed=i),
+                )
+            )
+    return out
+
+
+def recorded_fixtures(source: str | Path, *, expect: str | None = None) -> list[Fixture]:
+    """Frames from an image folder (expected code from each name) or a video file (`expect`)."""
+    from .frame_sources import ImageDirSource, open_source
+
+    src = open_source(source)
+    out = []
+    try:
+        while True:
+            ok, frame = src.read()
+            if not ok:
+                break
+            if isinstance(src, ImageDirSource) and src.current is not None:
+                stem = src.current.stem
+                head, _, code = stem.rpartition("_")
+                # Synthetic names are <symbology>_<condition>_<code>.
+                condition = head.partition("_")[2] or "recorded"
+                out.append(Fixture(stem, condition, expect or code, frame))
+            else:
+                out.append(Fixture(f"frame{len(out):05d}", "recorded", expect or "", frame))
+    finally:
+        src.release()
+    return out
+
+
+def write_fixtures(fixtures: list[Fixture], folder: str | Path) -> int:
+    import cv2  # type: ignore
+
+    folder = Path(folder)
+    folder.mkdir(parents=True, exist_ok=True)
+    for fx in fixtures:
+        cv2.imwrite(str(folder / f"{fx.name}.png"), fx.frame)
+    return len(fixtures)
+
+
+@dataclass
+class ChainReport:
+    chain: str
+    frames: int
+    decoded: int
+    wrong: int
+    fps: float
+    mean_ms: float
+    p95_ms: float
+    by_condition: dict[str, float]
+
+    @property
+    def decode_rate(self) -> float:
+        return self.decoded / self.frames if self.frames else 0.0
+
+
+def _p95(values: list[float]) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(round(0.95 * (len(ordered) - 1))))]
+
+
+def run_chain(engine: ScannerEngine, fixtures: list[Fixture], *, label: str, repeat: int = 1) -> ChainReport:
+    latencies: list[float] = []
+    decoded = wrong = 0
+    per_condition: dict[str, list[int]] = {}
+    t0 = time.perf_counter()
+    for _ in range(repeat):
+        for fx in fixtures:
+            t = time.perf_counter()
+            result = engine.decode(fx.frame)
+            latencies.append((time.perf_counter() - t) * 1000)
+            hit = bool(fx.expected) and any(c in result.codes for c in equivalent_codes(fx.expected))
+            decoded += hit
+            wrong += bool(result.codes) and not hit
+            counts = per_condition.setdefault(fx.condition, [0, 0])
+            counts[0] += hit
+            counts[1] += 1
+    elapsed = time.perf_counter() - t0
+    n = len(fixtures) * repeat
+    return ChainReport(
+        chain=label,
+        frames=n,
+        decoded=decoded,
+        wrong=wrong,
+        fps=n / elapsed if elapsed else 0.0,
+        mean_ms=sum(latencies) / len(latencies) if latencies else 0.0,
+        p95_ms=_p95(latencies),
+        by_condition={c: hit / total for c, (hit, total) in sorted(per_condition.items())},
+    )
+
+
+def run_benchmark(fixtures: list[Fixture], *, cv2=None, repeat: int = 1) -> list[ChainReport]:  # type: ignore[no-untyped-def]
+    """One report per single decode chain, then one for the adaptive engine ("adaptive")."""
+    if cv2 is None:
+        import cv2  # type: ignore
+    base = create_engine(cv2)
+    reports = []
+    for decoder, stage in DEFAULT_CHAINS:
+        if decoder not in base.decoders:
+            continue
+        single = ScannerEngine(base.stages, base.decoders, ((decoder, stage),))
+        reports.append(run_chain(single, fixtures, label=f"{decoder}:{stage}", repeat=repeat))
+    reports.append(run_chain(create_engine(cv2), fixtures, label="adaptive", repeat=repeat))
+    return reports
+
+
+def format_reports(reports: list[ChainReport]) -> str:
+    conditions = sorted({c for r in reports for c in r.by_condition})
+    header = f"{'chain':<12} {'rate':>6} {'wrong':>5} {'fps':>7} {'mean ms':>8} {'p95 ms':>7}  " + " ".join(
+        f"{c[:8]:>8}" for c in conditions
+    )
+    lines = [header, "-" * len(header)]
+    for r in reports:
+        lines.append(
+            f"{r.chain:<12} {r.decode_rate:>6.0%} {r.wrong:>5} {r.fps:>7.1f} {r.mean_ms:>8.2f} {r.p95_ms:>7.2f}  "
+            + " ".join(f"{r.by_condition.get(c, 0):>8.0%}" for c in conditions)
+        )
+    return "\n".join(lines)
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(
+        prog="scanner_bench", description="Benchmark the camera barcode decoder offline."
+    )
+    parser.add_argument("--source", help="image folder or video file instead of synthetic fixtures")
+    parser.add_argument("--expect", help="expected code for every frame of a video source")
+    parser.add_argument("--count", type=int, default=4, help="synthetic codes per symbology (default 4)")
+    parser.add_argument("--seed", type=int, default=7)
+    parser.add_argument("--repeat", type=int, default=1, help="passes over the fixtures per chain")
+    parser.add_argument("--write", metavar="DIR", help="save the synthetic fixtures as PNGs and exit")
+    parser.add_argument("--json", metavar="FILE", help="also write the results as JSON")
+    parser.add_argument(
+        "--min-rate", type=float, default=0.0, help="exit 1 if the adaptive decode rate is lower"
+    )
+    parser.add_argument(
+        "--max-wrong",
+        type=int,
+        default=0,
+        help="exit 1 if the adaptive chain misreads more frames (default 0)",
+    )
+    args = parser.parse_args(argv)
+
+    try:
+        import cv2  # type: ignore  # noqa: F401
+    except Exception as e:
+        print(f"OpenCV is required: pip install -r requirements-camera.txt ({e})", file=sys.stderr)
+        return 2
+
+    if args.source:
+        fixtures = recorded_fixtures(args.source, expect=args.expect)
+    else:
+        fixtures = synthetic_fixtures(args.count, seed=args.seed)
+    if args.write:
+        print(f"Wrote {write_fixtures(fixtures, args.write)} fixtures to {args.write}")
+        return 0
+    if not fixtures:
+        print("No frames to benchmark.", file=sys.stderr)
+        return 2
+
+    reports = run_benchmark(fixtures, repeat=args.repeat)
+    print(f"{len(fixtures)} frames x {args.repeat}")
+    print(format_reports(reports))
+    if args.json:
+        payload = {
+            "frames": len(fixtures),
+            "repeat": args.repeat,
+            "source": args.source or f"synthetic(count={args.count}, seed={args.seed})",
+            "chains": [{**asdict(r), "decode_rate": r.decode_rate} for r in reports],
+        }
+        Path(args.json).write_text(json.dumps(payload, indent=2), encoding="utf-8")
+    adaptive = reports[-1]
+    if adaptive.decode_rate < args.min_rate:
+        print(
+            f"Adaptive decode rate {adaptive.decode_rate:.0%} is below {args.min_rate:.0%}.", file=sys.stderr
+        )
+        return 1
+    if adaptive.wrong > args.max_wrong:
+        print(f"Adaptive chain misread {adaptive.wrong} frame(s).", file=sys.stderr)
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
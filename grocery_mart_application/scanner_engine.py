@@ -0,0 +1,268 @@
+"""
+Barcode decoding for camera scans, built once per scan session and reused for every frame.
+
+A frame is tried against a list of decode chains, each a preprocessing stage plus a decoder:
+
+    opencv:roi   centre crop, OpenCV BarcodeDetector
+    opencv:gray  crop -> gray -> blur -> equalised, OpenCV
+    zbar:bw      ... -> Otsu threshold, pyzbar
+    zbar:gray    equalised gray, pyzbar
+
+Stages are computed lazily and shared between chains within a frame, and the first chain that
+finds a code wins. The chain that last succeeded is tried first on the next frame, so with a
+given camera, lighting and label the expensive fallbacks stop running. Per-stage timings are
+kept over a rolling window for the preview's debug text and for benchmarks.
+"""
+
+from __future__ import annotations
+
+import threading
+import time
+from collections import deque
+from collections.abc import Callable
+from dataclasses import dataclass, field
+
+# Centre crop as fractions of the frame (x0, y0, x1, y1): cuts noise and decode time.
+ROI = (0.1, 0.2, 0.9, 0.8)
+TIMING_WINDOW = 120
+DEFAULT_CHAINS = (
+    ("opencv", "roi"),
+    ("opencv", "gray"),
+    ("zbar", "bw"),
+    ("zbar", "gray"),
+)
+# Limiting symbologies keeps pyzbar fast and avoids rare decoder assertions from unrelated
+# formats (e.g. PDF417) on noisy frames.
+ZBAR_SYMBOLS = ("EAN13", "EAN8", "UPCA", "UPCE", "CODE128", "CODE39", "CODE93", "I25", "QRCODE")
+# Bars in each symbology OpenCV decodes. Its EAN decoder finds checksum-valid EAN-8/UPC-A codes
+# inside other labels (e.g. a tilted Code128); those show many more bars across the detected box.
+OPENCV_BARS = {"EAN_13": 30, "UPC_A": 30, "EAN_8": 22, "UPC_E": 17}
+# Extra bars tolerated (print defects, noise) before a read is rejected.
+BAR_SLACK = 4
+
+Stage = tuple[str | None, Callable[[object], object]]
+Decoder = Callable[[object], list[str]]
+
+
+@dataclass
+class ScanResult:
+    codes: list[str] = field(default_factory=list)
+    chain: str | None = None
+    # Milliseconds spent per stage/decoder on this frame, in the order they ran.
+    timings: dict[str, float] = field(default_factory=dict)
+
+    @property
+    def code(self) -> str:
+        return self.codes[0] if self.codes else ""
+
+
+def equivalent_codes(code: str) -> list[str]:
+    """
+    `code` plus the other spelling of the same product number.
+
+    A 12-digit UPC-A is an EAN-13 with a leading 0, and decoders differ in which one they report
+    (OpenCV returns "0123..." labels as UPC-A), so lookups should accept both.
+    """
+    code = code.strip()
+    if code.isdigit() and len(code) == 12:
+        return [code, "0" + code]
+    if code.isdigit() and len(code) == 13 and code.startswith("0"):
+        return [code, code[1:]]
+    return [code]
+
+
+class ScannerEngine:
+    """
+    Runs decode chains over frames, most recently successful chain first.
+
+    `stages` maps a name to `(input_stage, fn)`; "frame" is the raw input. `decoders` map a name
+    to a function returning decoded strings. `chains` are `(decoder, stage)` pairs in default
+    order; chains whose decoder is missing are dropped. One engine per thread: detectors are
+    not thread-safe, but `stats()` may be called from any thread.
+    """
+
+    def __init__(
+        self,
+        stages: dict[str, Stage],
+        decoders: dict[str, Decoder],
+        chains: tuple[tuple[str, str], ...] = DEFAULT_CHAINS,
+        *,
+        window: int = TIMING_WINDOW,
+    ) -> None:
+        self.stages = stages
+        self.decoders = decoders
+        self.order = [f"{d}:{s}" for d, s in chains if d in decoders and s in stages]
+        self.hits = {name: 0 for name in self.order}
+        self.frames = 0
+        self._timings: dict[str, deque[float]] = {}
+        self._window = window
+        self._lock = threading.Lock()
+
+    @property
+    def decoder_name(self) -> str:
+        return "+".join(sorted(self.decoders)) or "none"
+
+    def _stage(self, name: str, cache: dict[str, object], timings: dict[str, float]) -> object:
+        if name not in cache:
+            source, fn = self.stages[name]
+            image = self._stage(source, cache, timings) if source else cache["frame"]
+            t0 = time.perf_counter()
+            try:
+                cache[name] = fn(image)
+            except Exception:
+                # A failed preprocessing step just falls back to its input.
+                cache[name] = image
+            timings[name] = (time.perf_counter() - t0) * 1000
+        return cache[name]
+
+    def decode(self, frame: object) -> ScanResult:
+        result = ScanResult()
+        cache: dict[str, object] = {"frame": frame}
+        t_start = time.perf_counter()
+        for chain in list(self.order):
+            decoder, stage = chain.split(":", 1)
+            image = self._stage(stage, cache, result.timings)
+            t0 = time.perf_counter()
+            try:
+                codes = [str(c).strip() for c in self.decoders[decoder](image) or []]
+            except Exception:
+                codes = []
+            result.timings[chain] = (time.perf_counter() - t0) * 1000
+            codes = [c for c in codes if c]
+            if codes:
+                result.codes = list(dict.fromkeys(codes))
+                result.chain = chain
+                break
+        result.timings["total"] = (time.perf_counter() - t_start) * 1000
+
+        with self._lock:
+            self.frames += 1
+            if result.chain is not None:
+                self.hits[result.chain] += 1
+                # Move-to-front: the conditions that just worked are likely to hold next frame.
+                self.order.remove(result.chain)
+                self.order.insert(0, result.chain)
+            for key, ms in result.timings.items():
+                self._timings.setdefault(key, deque(maxlen=self._window)).append(ms)
+        return result
+
+    def stats(self) -> dict[str, float]:
+        """Mean milliseconds per stage/decoder over the rolling window."""
+        with self._lock:
+            return {key: sum(v) / len(v) for key, v in self._timings.items() if v}
+
+    def summary(self) -> str:
+        """One-line timing summary for debug output, e.g. "roi 0.1  opencv:roi 7.9  total 8.2 ms"."""
+        means = self.stats()
+        keys = [k for k in ("roi", "gray", "bw") if k in means] + [c for c in self.order if c in means]
+        parts = [f"{k} {means[k]:.1f}" for k in keys]
+        if "total" in means:
+            parts.append(f"total {means['total']:.1f}")
+        return "  ".join(parts) + " ms" if parts else ""
+
+
+def opencv_stages(cv2, roi: tuple[float, float, float, float] = ROI) -> dict[str, Stage]:  # type: ignore[no-untyped-def]
+    def crop(frame):  # type: ignore[no-untyped-def]
+        h, w = frame.shape[:2]
+        return frame[int(h * roi[1]) : int(h * roi[3]), int(w * roi[0]) : int(w * roi[2])]
+
+    def gray(img):  # type: ignore[no-untyped-def]
+        # Helps 1D barcodes with low contrast.
+        out = cv2.cvtColor(img, cv2.COLOR_BGR2GRAY) if getattr(img, "ndim", 2) == 3 else img
+        out = cv2.GaussianBlur(out, (3, 3), 0)
+        return cv2.equalizeHist(out)
+
+    def bw(img):  # type: ignore[no-untyped-def]
+        _t, out = cv2.threshold(img, 0, 255, cv2.THRESH_BINARY + cv2.THRESH_OTSU)
+        return out
+
+    return {"roi": (None, crop), "gray": ("roi", gray), "bw": ("gray", bw)}
+
+
+def opencv_decoder(cv2) -> Decoder | None:  # type: ignore[no-untyped-def]
+    """OpenCV's BarcodeDetector, constructed once; None if this OpenCV build lacks it."""
+    # OpenCV contrib exposes the barcode API inconsistently across builds.
+    factory = None
+    if hasattr(cv2, "barcode") and hasattr(cv2.barcode, "BarcodeDetector"):
+        factory = cv2.barcode.BarcodeDetector
+    elif hasattr(cv2, "barcode_BarcodeDetector"):
+        factory = cv2.barcode_BarcodeDetector
+    if factory is None:
+        return None
+    try:
+        detector = factory()
+    except Exception:
+        return None
+
+    # OpenCV >= 4.8 returns (info, points, straight) from detectAndDecode; the 4-tuple lives here.
+    detect = getattr(detector, "detectAndDecodeWithType", None) or detector.detectAndDecode
+
+    def decode(img) -> list[str]:  # type: ignore[no-untyped-def]
+        ok, decoded_info, decoded_type, points = detect(img)
+        if not ok or decoded_info is None:
+            return []
+        out = []
+        for i, code in enumerate(decoded_info):
+            if not code:
+                continue
+            expected = OPENCV_BARS.get(str(decoded_type[i])) if decoded_type is not None else None
+            if expected is not None and points is not None and i < len(points):
+                if count_bars(cv2, img, points[i]) > expected + BAR_SLACK:
+                    continue
+            out.append(code)
+        return out
+
+    return decode
+
+
+def count_bars(cv2, img, corners) -> int:  # type: ignore[no-untyped-def]
+    """Dark bars crossed by the long centre line of the quadrilateral `corners` in `img`."""
+    import numpy as np
+
+    gray = cv2.cvtColor(img, cv2.COLOR_BGR2GRAY) if getattr(img, "ndim", 2) == 3 else img
+    p = np.asarray(corners, dtype=np.float64).reshape(-1, 2)
+    if len(p) != 4:
+        return 0
+    # Midpoints of opposite sides; the longer of the two centre lines runs across the bars.
+    lines = [((p[0] + p[1]) / 2, (p[2] + p[3]) / 2), ((p[1] + p[2]) / 2, (p[3] + p[0]) / 2)]
+    start, end = max(lines, key=lambda m: float(np.hypot(*(m[1] - m[0]))))
+    n = max(2, int(np.hypot(*(end - start))) * 2)
+    h, w = gray.shape[:2]
+    xs = np.clip(np.linspace(start[0], end[0], n), 0, w - 1).astype(int)
+    ys = np.clip(np.linspace(start[1], end[1], n), 0, h - 1).astype(int)
+    samples = gray[ys, xs].astype(np.float64)
+    dark = (samples < (samples.min() + samples.max()) / 2).astype(np.int8)
+    return int(np.count_nonzero(np.diff(dark) == 1) + dark[0])
+
+
+def zbar_decoder() -> Decoder | None:
+    """pyzbar limited to ZBAR_SYMBOLS; None if pyzbar (or the ZBar library) is unavailable."""
+    try:
+        from pyzbar.pyzbar import ZBarSymbol  # type: ignore
+        from pyzbar.pyzbar import decode as _decode  # type: ignore
+    except Exception:
+        return None
+    allowed = [getattr(ZBarSymbol, name) for name in ZBAR_SYMBOLS if hasattr(ZBarSymbol, name)]
+
+    def decode(img) -> list[str]:  # type: ignore[no-untyped-def]
+        out = []
+        for c in _decode(img, symbols=allowed) or []:
+            try:
+                out.append(c.data.decode("utf-8"))
+            except Exception:
+                continue
+        return out
+
+    return decode
+
+
+def create_engine(cv2, *, use_zbar: bool = True) -> ScannerEngine:  # type: ignore[no-untyped-def]
+    """Engine with the OpenCV detector and (if installed) pyzbar, both built once."""
+    decoders: dict[str, Decoder] = {}
+    opencv = opencv_decoder(cv2)
+    if opencv is not None:
+        decoders["opencv"] = opencv
+    zbar = zbar_decoder() if use_zbar else None
+    if zbar is not None:
+        decoders["zbar"] = zbar
+    return ScannerEngine(opencv_stages(cv2), decoders)
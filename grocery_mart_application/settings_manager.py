@@ -2,8 +2,6 @@ from __future__ import annotations
 
 import json
 import os
-import shutil
-from datetime import datetime
 from pathlib import Path
 from tkinter import filedialog, messagebox, simpledialog
 
@@ -12,6 +10,8 @@ from ttkbootstrap import Button, Checkbutton, Combobox, Entry, Frame, Label, Str
 
 from .database import DB_PATH, log_event
 from .auth_service import change_password
+from .backup_service import create_backup, restore_backup, rotate_backups
+from .export_service import BackgroundJob
 from .utils.app_settings import get_settings, update_settings
 
 
@@ -35,12 +35,19 @@ class SettingsManager(Frame):
         self.low_stock_var = StringVar(value=str(self._settings.get("inventory_low_stock_threshold", 5)))
         self.scan_action_var = StringVar(value=str(self._settings.get("scan_default_action", "Receive (+)")))
         self.scan_qty_var = StringVar(value=str(self._settings.get("scan_default_qty", 1)))
+        self.lead_time_var = StringVar(value=str(self._settings.get("reorder_lead_time_days", 3)))
+        self.cover_days_var = StringVar(value=str(self._settings.get("reorder_cover_days", 14)))
 
         self.monitor_auto_var = tk.BooleanVar(value=bool(self._settings.get("monitor_auto_refresh", True)))
         interval_ms = int(self._settings.get("monitor_refresh_interval_ms", 2000) or 2000)
         self.monitor_interval_var = StringVar(value=f"{max(1, int(round(interval_ms / 1000)))}s")
 
         self.backup_dir_var = StringVar(value=str(self._settings.get("backup_dir", "")))
+        self.auto_backup_var = StringVar(value=self._auto_backup_label(self._settings.get("auto_backup_interval_hours", 0)))
+        self.backup_keep_var = StringVar(value=str(self._settings.get("auto_backup_keep", 7)))
+        self.backup_compress_var = tk.BooleanVar(value=bool(self._settings.get("auto_backup_compress", True)))
+        self.backup_status_var = StringVar(value="")
+        self._backup_job: BackgroundJob | None = None
 
         self.pack(fill=tk.BOTH, expand=True)
         self._build_ui()
@@ -71,6 +78,18 @@ class SettingsManager(Frame):
             return None
         return v
 
+    AUTO_BACKUP_CHOICES = {"Off": 0, "Every 6 hours": 6, "Daily": 24, "Weekly": 168}
+
+    def _auto_backup_label(self, hours: object) -> str:
+        try:
+            hours = int(float(hours or 0))
+        except (TypeError, ValueError):
+            hours = 0
+        for label, h in self.AUTO_BACKUP_CHOICES.items():
+            if h == hours:
+                return label
+        return "Off"
+
     def _parse_int(self, value: str, *, min_v: int, max_v: int) -> int | None:
         try:
             v = int(str(value).strip())
@@ -170,8 +189,20 @@ class SettingsManager(Frame):
             row=2, column=1, sticky="w", padx=(10, 0), pady=4
         )
 
+        Label(parent, text="Supplier lead time", bootstyle="secondary").grid(row=3, column=0, sticky="w", pady=4)
+        Entry(parent, textvariable=self.lead_time_var, width=10).grid(
+            row=3, column=1, sticky="w", padx=(10, 0), pady=4
+        )
+        Label(parent, text="days", bootstyle="secondary").grid(row=3, column=2, sticky="w", padx=(10, 0), pady=4)
+
+        Label(parent, text="Reorder to cover", bootstyle="secondary").grid(row=4, column=0, sticky="w", pady=4)
+        Entry(parent, textvariable=self.cover_days_var, width=10).grid(
+            row=4, column=1, sticky="w", padx=(10, 0), pady=4
+        )
+        Label(parent, text="days of sales", bootstyle="secondary").grid(row=4, column=2, sticky="w", padx=(10, 0), pady=4)
+
         Button(parent, text="Save inventory preferences", bootstyle="primary-outline", command=self.save_preferences).grid(
-            row=3, column=0, columnspan=3, sticky="ew", pady=(10, 0)
+            row=5, column=0, columnspan=3, sticky="ew", pady=(10, 0)
         )
 
     def _build_security(self, parent: tk.Misc) -> None:
@@ -209,14 +240,31 @@ class SettingsManager(Frame):
             row=2, column=2, sticky="e", padx=(10, 0), pady=4
         )
 
-        Button(parent, text="Backup now", bootstyle="success", command=self.backup_db).grid(
-            row=3, column=0, columnspan=3, sticky="ew", pady=(10, 4)
-        )
-        Button(parent, text="Restore from file…", bootstyle="warning-outline", command=self.restore_db).grid(
-            row=4, column=0, columnspan=3, sticky="ew", pady=4
+        Label(parent, text="Automatic backups", bootstyle="secondary").grid(row=3, column=0, sticky="w", pady=4)
+        auto_row = Frame(parent)
+        auto_row.grid(row=3, column=1, columnspan=2, sticky="w", padx=(10, 0), pady=4)
+        Combobox(
+            auto_row,
+            textvariable=self.auto_backup_var,
+            values=list(self.AUTO_BACKUP_CHOICES),
+            state="readonly",
+            width=14,
+        ).pack(side=tk.LEFT)
+        Label(auto_row, text="Keep", bootstyle="secondary").pack(side=tk.LEFT, padx=(10, 4))
+        Entry(auto_row, textvariable=self.backup_keep_var, width=5).pack(side=tk.LEFT)
+        Checkbutton(auto_row, text="Compress (.gz)", variable=self.backup_compress_var).pack(side=tk.LEFT, padx=(10, 0))
+
+        self.backup_btn = Button(parent, text="Backup now", bootstyle="success", command=self.backup_db)
+        self.backup_btn.grid(row=4, column=0, columnspan=3, sticky="ew", pady=(10, 4))
+        self.restore_btn = Button(
+            parent, text="Restore from file…", bootstyle="warning-outline", command=self.restore_db
         )
+        self.restore_btn.grid(row=5, column=0, columnspan=3, sticky="ew", pady=4)
         Button(parent, text="Open data folder", bootstyle="info-outline", command=self.open_data_folder).grid(
-            row=5, column=0, columnspan=3, sticky="ew", pady=4
+            row=6, column=0, columnspan=3, sticky="ew", pady=4
+        )
+        Label(parent, textvariable=self.backup_status_var, bootstyle="secondary").grid(
+            row=7, column=0, columnspan=3, sticky="w", pady=(4, 0)
         )
 
     def apply_theme(self):
@@ -265,6 +313,12 @@ class SettingsManager(Frame):
             messagebox.showerror("Inventory", "Scan default qty must be a positive integer.")
             return
 
+        lead_time = self._parse_int(self.lead_time_var.get(), min_v=0, max_v=365)
+        cover_days = self._parse_int(self.cover_days_var.get(), min_v=1, max_v=365)
+        if lead_time is None or cover_days is None:
+            messagebox.showerror("Inventory", "Lead time and cover days must be whole days (up to 365).")
+            return
+
         interval_ms = self._parse_int(self.monitor_interval_var.get().replace("s", ""), min_v=1, max_v=60)
         if interval_ms is None:
             messagebox.showerror("Monitor", "Refresh interval must be one of 1s/2s/5s/10s.")
@@ -275,15 +329,25 @@ class SettingsManager(Frame):
             messagebox.showerror("Backup folder", "Backup folder does not exist.")
             return
 
+        backup_keep = self._parse_int(self.backup_keep_var.get(), min_v=1, max_v=1000)
+        if backup_keep is None:
+            messagebox.showerror("Backup", "Number of backups to keep must be between 1 and 1000.")
+            return
+
         update_settings(
             {
                 "accent": self.accent_var.get(),
                 "inventory_low_stock_threshold": threshold,
                 "scan_default_action": self.scan_action_var.get(),
                 "scan_default_qty": qty,
+                "reorder_lead_time_days": lead_time,
+                "reorder_cover_days": cover_days,
                 "monitor_auto_refresh": bool(self.monitor_auto_var.get()),
                 "monitor_refresh_interval_ms": int(interval_ms * 1000),
                 "backup_dir": backup_dir,
+                "auto_backup_interval_hours": self.AUTO_BACKUP_CHOICES.get(self.auto_backup_var.get(), 0),
+                "auto_backup_keep": backup_keep,
+                "auto_backup_compress": bool(self.backup_compress_var.get()),
             }
         )
         log_event("settings", "Updated preferences", self.current_user)
@@ -317,6 +381,13 @@ class SettingsManager(Frame):
                 "monitor_auto_refresh": True,
                 "monitor_refresh_interval_ms": 2000,
                 "backup_dir": "",
+                "auto_backup_interval_hours": 0,
+                "auto_backup_keep": 7,
+                "auto_backup_compress": True,
+                "reorder_lookback_days": 30,
+                "reorder_lead_time_days": 3,
+                "reorder_safety_days": 2,
+                "reorder_cover_days": 14,
             }
         )
         self._settings = get_settings()
@@ -326,10 +397,15 @@ class SettingsManager(Frame):
         self.low_stock_var.set(str(self._settings.get("inventory_low_stock_threshold", 5)))
         self.scan_action_var.set(str(self._settings.get("scan_default_action", "Receive (+)")))
         self.scan_qty_var.set(str(self._settings.get("scan_default_qty", 1)))
+        self.lead_time_var.set(str(self._settings.get("reorder_lead_time_days", 3)))
+        self.cover_days_var.set(str(self._settings.get("reorder_cover_days", 14)))
         self.monitor_auto_var.set(bool(self._settings.get("monitor_auto_refresh", True)))
         interval_ms = int(self._settings.get("monitor_refresh_interval_ms", 2000) or 2000)
         self.monitor_interval_var.set(f"{max(1, int(round(interval_ms / 1000)))}s")
         self.backup_dir_var.set(str(self._settings.get("backup_dir", "")))
+        self.auto_backup_var.set(self._auto_backup_label(self._settings.get("auto_backup_interval_hours", 0)))
+        self.backup_keep_var.set(str(self._settings.get("auto_backup_keep", 7)))
+        self.backup_compress_var.set(bool(self._settings.get("auto_backup_compress", True)))
 
         try:
             top = self.winfo_toplevel()
@@ -353,38 +429,84 @@ class SettingsManager(Frame):
         except Exception as e:
             messagebox.showerror("Open", str(e))
 
+    def _set_backup_busy(self, busy: bool) -> None:
+        for btn in (self.backup_btn, self.restore_btn):
+            try:
+                btn.configure(state="disabled" if busy else "normal")
+            except Exception:
+                pass
+
+    def _show_backup_progress(self, verb: str):  # type: ignore[no-untyped-def]
+        def on_progress(done: int, total: int) -> None:
+            if total:
+                self.backup_status_var.set(f"{verb}… {done * 100 // total}%")
+
+        return on_progress
+
     def backup_db(self):
-        try:
-            backup_dir = str(self.backup_dir_var.get()).strip()
-            folder = Path(backup_dir) if backup_dir else DB_PATH.parent
-            folder.mkdir(parents=True, exist_ok=True)
-            ts = datetime.now().strftime("%Y%m%d_%H%M%S")
-            dst = folder / f"{DB_PATH.stem}_backup_{ts}{DB_PATH.suffix}"
-            shutil.copy(DB_PATH, dst)
+        if self._backup_job is not None and not self._backup_job.done:
+            return
+        backup_dir = str(self.backup_dir_var.get()).strip()
+        folder = Path(backup_dir) if backup_dir else DB_PATH.parent
+        compress = bool(self.backup_compress_var.get())
+        keep = self._parse_int(self.backup_keep_var.get(), min_v=1, max_v=1000)
+
+        def work(progress, cancel):  # type: ignore[no-untyped-def]
+            dst = create_backup(folder, compress=compress, progress=progress, cancel=cancel)
+            if keep:
+                rotate_backups(folder, keep=keep)
+            return dst
+
+        def on_done(job: BackgroundJob) -> None:
+            self._set_backup_busy(False)
+            if job.error is not None:
+                self.backup_status_var.set("Backup failed.")
+                messagebox.showerror("Backup", str(job.error))
+                return
+            dst = job.result
             update_settings({"backup_dir": str(folder)})
-            log_event("backup", f"Database backup created: {dst.name}", self.current_user)
+            log_event("backup", f"Database backup created: {dst.name}", self.current_user, payload={"path": str(dst)})
+            self.backup_status_var.set(f"Backup created: {dst.name}")
             messagebox.showinfo("Backup", f"Backup created:\n{dst}")
-        except Exception as e:
-            messagebox.showerror("Backup", str(e))
+
+        self._set_backup_busy(True)
+        self.backup_status_var.set("Backing up…")
+        self._backup_job = BackgroundJob(work).start()
+        self._backup_job.watch(self, on_progress=self._show_backup_progress("Backing up"), on_done=on_done)
 
     def restore_db(self):
+        if self._backup_job is not None and not self._backup_job.done:
+            return
         backup_dir = str(self.backup_dir_var.get()).strip()
         initial = Path(backup_dir) if backup_dir else DB_PATH.parent
         path = filedialog.askopenfilename(
             title="Select backup file",
             initialdir=str(initial),
-            filetypes=[("SQLite DB", f"*{DB_PATH.suffix}"), ("All files", "*.*")],
+            filetypes=[("SQLite DB", f"*{DB_PATH.suffix} *{DB_PATH.suffix}.gz"), ("All files", "*.*")],
         )
         if not path:
             return
-        try:
-            if not messagebox.askyesno(
-                "Restore",
-                "Restore database from the selected backup?\n\nThe app should be restarted after restore.",
-            ):
+        if not messagebox.askyesno(
+            "Restore",
+            "Restore database from the selected backup?\n\n"
+            "The backup is verified first and the current database is kept as a pre-restore copy. "
+            "The app should be restarted after restore.",
+        ):
+            return
+
+        def on_done(job: BackgroundJob) -> None:
+            self._set_backup_busy(False)
+            if job.error is not None:
+                self.backup_status_var.set("Restore failed; the current database was not changed.")
+                messagebox.showerror("Restore", str(job.error))
                 return
-            shutil.copy(Path(path), DB_PATH)
-            log_event("backup", f"Database restored from {Path(path).name}", self.current_user)
-            messagebox.showinfo("Restore", "Database restored. Restart the app to apply.")
-        except Exception as e:
-            messagebox.showerror("Restore", str(e))
+            log_event("backup", f"Database restored from {Path(path).name}", self.current_user, payload={"path": path})
+            self.backup_status_var.set(f"Restored from {Path(path).name}")
+            messagebox.showinfo(
+                "Restore", f"Database restored. Restart the app to apply.\n\nPrevious database saved as:\n{job.result}"
+            )
+
+        self._set_backup_busy(True)
+        self.backup_status_var.set("Verifying backup…")
+        self._backup_job = BackgroundJob(lambda progress, cancel: restore_backup(path, progress=progress)).start()
+        self._backup_job.watch(self, on_progress=self._show_backup_progress("Restoring"), on_done=on_done)
@@ -0,0 +1,262 @@
+"""
+Slow-query log: statements slower than `slow_query_threshold_ms` are saved to the `slow_queries`
+table with their parameters and `EXPLAIN QUERY PLAN`, so a missing or unused index shows up as a
+`SCAN <table>` line next to the query that paid for it.
+
+`database.TimedCursor` times every statement and calls `observe()` for the slow ones. The plan
+and the insert happen on one background thread with its own connection, so the statement's
+connection and transaction are never touched and the caller does not wait; a slow statement costs
+one queue put. Plans are cached per statement text for `PLAN_CACHE_S`, so a hot slow query is not
+explained on every call. The table keeps the newest `slow_query_max_rows` rows.
+
+`report()` groups the log by statement (count, average/max time, latest plan) for the
+Performance window and `grocery-mart slow-queries`.
+"""
+
+from __future__ import annotations
+
+import json
+import queue
+import sqlite3
+import threading
+import time
+from dataclasses import dataclass
+from pathlib import Path
+
+from .utils.app_settings import get_setting
+
+DEFAULT_THRESHOLD_MS = 100
+DEFAULT_MAX_ROWS = 5000
+PLAN_CACHE_S = 60.0
+# Longest parameter value kept (longer text/blobs are cut).
+MAX_PARAM_CHARS = 200
+# Statement kinds EXPLAIN QUERY PLAN says something useful about.
+EXPLAINED = ("select", "insert", "update", "delete", "replace", "with")
+
+
+def threshold_ms() -> float:
+    """0 or less turns the log off."""
+    try:
+        return float(get_setting("slow_query_threshold_ms", DEFAULT_THRESHOLD_MS))
+    except (TypeError, ValueError):
+        return float(DEFAULT_THRESHOLD_MS)
+
+
+def _max_rows() -> int:
+    try:
+        return max(1, int(get_setting("slow_query_max_rows", DEFAULT_MAX_ROWS)))
+    except (TypeError, ValueError):
+        return DEFAULT_MAX_ROWS
+
+
+def _clip(value: object) -> object:
+    if isinstance(value, (bytes, bytearray, memoryview)):
+        return f"<{len(value)} bytes>"
+    if isinstance(value, str) and len(value) > MAX_PARAM_CHARS:
+        return value[:MAX_PARAM_CHARS] + "..."
+    return value
+
+
+def _params_json(params: object) -> str | None:
+    if not params:
+        return None
+    if isinstance(params, dict):
+        data: object = {k: _clip(v) for k, v in params.items()}
+    else:
+        data = [_clip(v) for v in params]  # type: ignore[union-attr]
+    return json.dumps(data, default=str)
+
+
+def is_full_scan(plan: str | None) -> bool:
+    """True when the plan reads a whole table ("SCAN products"), as opposed to an index lookup."""
+    for line in (plan or "").splitlines():
+        detail = line.strip()
+        if detail.startswith("SCAN ") and " USING " not in detail and "CONSTANT ROW" not in detail:
+            return True
+    return False
+
+
+@dataclass
+class _Entry:
+    path: Path
+    created: float
+    seconds: float
+    kind: str
+    sql: str
+    params: object
+    rows: int | None
+
+
+class SlowQueryLog:
+    def __init__(self) -> None:
+        self._queue: queue.Queue[_Entry] = queue.Queue(maxsize=1000)
+        self._thread: threading.Thread | None = None
+        self._lock = threading.Lock()
+        self._plans: dict[tuple[Path, str], tuple[float, str | None]] = {}
+
+    def observe(
+        self,
+        path: Path,
+        sql: str,
+        params: object,
+        seconds: float,
+        *,
+        kind: str = "execute",
+        rows: int | None = None,
+    ) -> None:
+        if "slow_queries" in sql:
+            # The log's own maintenance and report queries.
+            return
+        entry = _Entry(Path(path), time.time(), seconds, kind, sql, params, rows)
+        try:
+            self._queue.put_nowait(entry)
+        except queue.Full:
+            # The writer is behind (e.g. the DB is locked by a long import); drop rather than block.
+            return
+        self._ensure_thread()
+
+    def flush(self) -> None:
+        """Wait until every observed statement is written (tests, shutdown)."""
+        self._queue.join()
+
+    def _ensure_thread(self) -> None:
+        if self._thread is not None:
+            return
+        with self._lock:
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="slow-query-log", daemon=True)
+                self._thread.start()
+
+    def _run(self) -> None:
+        while True:
+            entry = self._queue.get()
+            try:
+                self._write(entry)
+            except Exception:
+                # The log must never take the app down; this entry is lost.
+                pass
+            finally:
+                self._queue.task_done()
+
+    def _plan(self, conn: sqlite3.Connection, entry: _Entry) -> str | None:
+        words = entry.sql.split(None, 1)
+        if not words or words[0].lower() not in EXPLAINED:
+            return None
+        key = (entry.path, entry.sql)
+        cached = self._plans.get(key)
+        if cached is not None and entry.created - cached[0] < PLAN_CACHE_S:
+            return cached[1]
+        params = entry.params
+        try:
+            rows = conn.execute(f"EXPLAIN QUERY PLAN {entry.sql}", params or ()).fetchall()
+            plan = "\n".join(str(r[3]) for r in rows)
+        except sqlite3.Error as e:
+            plan = f"(no plan: {e})"
+        if len(self._plans) > 256:
+            self._plans.clear()
+        self._plans[key] = (entry.created, plan)
+        return plan
+
+    def _write(self, entry: _Entry) -> None:
+        # A plain connection: statements run here are not timed or logged themselves.
+        conn = sqlite3.connect(entry.path, timeout=30)
+        try:
+            plan = self._plan(conn, entry)
+            conn.execute(
+                """INSERT INTO slow_queries
+                   (created_at, duration_ms, kind, sql, params, rows, plan, full_scan)
+                   VALUES (?, ?, ?, ?, ?, ?, ?, ?)""",
+                (
+                    time.strftime("%Y-%m-%d %H:%M:%S", time.gmtime(entry.created)),
+                    round(entry.seconds * 1000, 3),
+                    entry.kind,
+                    entry.sql.strip(),
+                    _params_json(entry.params),
+                    entry.rows,
+                    plan,
+                    int(is_full_scan(plan)),
+                ),
+            )
+            conn.execute(
+                "DELETE FROM slow_queries WHERE id <= (SELECT MAX(id) FROM slow_queries) - ?",
+                (_max_rows(),),
+            )
+            conn.commit()
+        finally:
+            conn.close()
+
+
+_log = SlowQueryLog()
+
+
+def observe(
+    path: Path, sql: str, params: object, seconds: float, *, kind: str = "execute", rows: int | None = None
+) -> None:
+    _log.observe(path, sql, params, seconds, kind=kind, rows=rows)
+
+
+def flush() -> None:
+    _log.flush()
+
+
+@dataclass
+class SlowQuery:
+    sql: str
+    count: int
+    avg_ms: float
+    max_ms: float
+    last_seen: str
+    # From the most recent occurrence.
+    plan: str | None
+    full_scan: bool
+    # Of the slowest occurrence.
+    params: str | None
+
+
+def report(*, limit: int = 50, since: str | None = None) -> list[SlowQuery]:
+    """Slow statements grouped by text, most total time first. `since` is "YYYY-MM-DD[ HH:MM:SS]" UTC."""
+    from .database import connect
+
+    where, params = "", []
+    if since:
+        where, params = "WHERE created_at >= ?", [since]
+    with connect() as conn:
+        rows = conn.execute(
+            f"""SELECT sql, COUNT(*) AS n, AVG(duration_ms) AS avg_ms, MAX(duration_ms) AS max_ms,
+                       MAX(created_at) AS last_seen, SUM(duration_ms) AS total_ms
+                FROM slow_queries {where}
+                GROUP BY sql
+                ORDER BY total_ms DESC
+                LIMIT ?""",
+            [*params, int(limit)],
+        ).fetchall()
+        out = []
+        for r in rows:
+            latest = conn.execute(
+                "SELECT plan, full_scan FROM slow_queries WHERE sql = ? ORDER BY id DESC LIMIT 1", (r["sql"],)
+            ).fetchone()
+            slowest = conn.execute(
+                "SELECT params FROM slow_queries WHERE sql = ? ORDER BY duration_ms DESC LIMIT 1", (r["sql"],)
+            ).fetchone()
+            out.append(
+                SlowQuery(
+                    sql=str(r["sql"]),
+                    count=int(r["n"]),
+                    avg_ms=float(r["avg_ms"] or 0),
+                    max_ms=float(r["max_ms"] or 0),
+                    last_seen=str(r["last_seen"] or ""),
+                    plan=latest["plan"],
+                    full_scan=bool(latest["full_scan"]),
+                    params=slowest["params"],
+                )
+            )
+    return out
+
+
+def clear() -> int:
+    from .database import connect
+
+    with connect() as conn:
+        n = conn.execute("DELETE FROM slow_queries").rowcount
+        conn.commit()
+    return int(n)
@@ -0,0 +1,42 @@
+from __future__ import annotations
+
+import os
+import sys
+import time
+
+# Imported first thing by main.py, so this is close to interpreter start.
+_T0 = time.perf_counter()
+_marks: list[tuple[str, float]] = []
+
+ENV_FLAG = "GROCERY_MART_STARTUP_TIMING"
+HEAVY_MODULES = ("matplotlib", "pandas", "numpy", "cv2", "pyzbar", "PIL", "openpyxl", "fpdf")
+
+
+def enabled() -> bool:
+    return os.environ.get(ENV_FLAG, "").strip().lower() in ("1", "true", "yes", "on")
+
+
+def mark(label: str) -> None:
+    _marks.append((label, time.perf_counter()))
+
+
+def report() -> str:
+    lines = ["Startup timing (ms since launch / since previous step):"]
+    prev = _T0
+    for label, t in _marks:
+        lines.append(f"  {(t - _T0) * 1000:8.1f}  {(t - prev) * 1000:+8.1f}  {label}")
+        prev = t
+    loaded = [m for m in HEAVY_MODULES if m in sys.modules]
+    lines.append(f"  heavy modules loaded: {', '.join(loaded) if loaded else 'none'}")
+    return "\n".join(lines)
+
+
+def emit() -> None:
+    """Print the report to stderr when GROCERY_MART_STARTUP_TIMING=1."""
+    if enabled():
+        print(report(), file=sys.stderr, flush=True)
+
+
+def timed_first_use(label: str, seconds: float) -> None:
+    if enabled():
+        print(f"  {seconds * 1000:8.1f} ms  {label}", file=sys.stderr, flush=True)
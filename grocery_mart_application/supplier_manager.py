@@ -5,7 +5,8 @@ from tkinter import messagebox
 
 from ttkbootstrap import Button, Entry, Frame, Label, Scrollbar, StringVar, Treeview
 
-from .database import connect, log_event
+from .database import activity_watermark, connect, log_event
+from .reorder_service import get_reorder_engine
 
 
 class SupplierManager(Frame):
@@ -20,8 +21,18 @@ class SupplierManager(Frame):
 
         self.create_form()
         self.create_table()
+        self.suggestions = PurchaseSuggestionsView(self)
+        self.suggestions.pack(fill=tk.BOTH, expand=True, padx=10, pady=(0, 10))
+        self._activity_mark = activity_watermark()
         self.load_suppliers()
 
+    def on_show(self) -> None:
+        mark = activity_watermark()
+        if mark != self._activity_mark:
+            self._activity_mark = mark
+            self.load_suppliers()
+            self.suggestions.refresh()
+
     def create_form(self):
         Label(self, text="Supplier Manager", font=("Helvetica", 20, "bold")).pack(pady=(10, 10))
 
@@ -47,7 +58,7 @@ class SupplierManager(Frame):
         table_frame = tk.Frame(self)
         table_frame.pack(fill=tk.BOTH, expand=True, padx=10, pady=10)
 
-        self.tree = Treeview(table_frame, columns=("id", "name", "contact"), show="headings", height=12)
+        self.tree = Treeview(table_frame, columns=("id", "name", "contact"), show="headings", height=8)
         for col, text, width in [
             ("id", "ID", 80),
             ("name", "Name", 220),
@@ -87,10 +98,14 @@ class SupplierManager(Frame):
             return
         try:
             with connect() as conn:
-                conn.execute("INSERT INTO suppliers (name, contact) VALUES (?, ?)", (name, contact or None))
+                cur = conn.execute("INSERT INTO suppliers (name, contact) VALUES (?, ?)", (name, contact or None))
+                supplier_id = int(cur.lastrowid)
                 conn.commit()
-            log_event("supplier", f"Added supplier: {name}", self.current_user)
+            log_event(
+                "supplier", f"Added supplier: {name}", self.current_user, entity_type="supplier", entity_id=supplier_id
+            )
             self.load_suppliers()
+            self.suggestions.refresh()
             self.clear()
             messagebox.showinfo("Saved", "Supplier added.")
         except Exception as e:
@@ -112,8 +127,15 @@ class SupplierManager(Frame):
                     (name, contact or None, self.selected_id),
                 )
                 conn.commit()
-            log_event("supplier", f"Updated supplier: {name} (ID {self.selected_id})", self.current_user)
+            log_event(
+                "supplier",
+                f"Updated supplier: {name} (ID {self.selected_id})",
+                self.current_user,
+                entity_type="supplier",
+                entity_id=int(self.selected_id),
+            )
             self.load_suppliers()
+            self.suggestions.refresh()
             self.clear()
             messagebox.showinfo("Updated", "Supplier updated.")
         except Exception as e:
@@ -134,8 +156,11 @@ class SupplierManager(Frame):
                 "supplier",
                 f"Deleted supplier: {(row['name'] if row else 'ID')} {self.selected_id}",
                 self.current_user,
+                entity_type="supplier",
+                entity_id=int(self.selected_id),
             )
             self.load_suppliers()
+            self.suggestions.refresh()
             self.clear()
             messagebox.showinfo("Deleted", "Supplier deleted.")
         except Exception as e:
@@ -146,3 +171,71 @@ class SupplierManager(Frame):
         self.name_var.set("")
         self.contact_var.set("")
 
+
+
+class PurchaseSuggestionsView(Frame):
+    """Suggested purchase orders grouped by supplier (see `reorder_service`)."""
+
+    def __init__(self, master):
+        super().__init__(master, padding=0)
+        self.status = StringVar(value="")
+
+        box = tk.LabelFrame(self, text="Purchase Suggestions", padx=10, pady=8)
+        box.pack(fill=tk.BOTH, expand=True)
+
+        top = tk.Frame(box)
+        top.pack(fill=tk.X, pady=(0, 6))
+        Label(top, textvariable=self.status, bootstyle="secondary").pack(side=tk.LEFT)
+        Button(top, text="Refresh", bootstyle="primary-outline", command=self.refresh).pack(side=tk.RIGHT)
+
+        table_frame = tk.Frame(box)
+        table_frame.pack(fill=tk.BOTH, expand=True)
+        self.tree = Treeview(
+            table_frame,
+            columns=("on_hand", "velocity", "reorder_point", "suggested"),
+            show="tree headings",
+            height=8,
+        )
+        self.tree.heading("#0", text="Supplier / Product")
+        self.tree.column("#0", anchor="w", width=260)
+        for col, text, width in [
+            ("on_hand", "On Hand", 90),
+            ("velocity", "Sold / Day", 100),
+            ("reorder_point", "Reorder Point", 110),
+            ("suggested", "Suggested Qty", 110),
+        ]:
+            self.tree.heading(col, text=text)
+            self.tree.column(col, anchor="center", width=width)
+        self.tree.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
+
+        scroll = Scrollbar(table_frame, command=self.tree.yview)
+        scroll.pack(side=tk.RIGHT, fill=tk.Y)
+        self.tree.configure(yscrollcommand=scroll.set)
+
+        self.refresh()
+
+    def refresh(self) -> None:
+        self.tree.delete(*self.tree.get_children())
+        try:
+            grouped = get_reorder_engine().suggestions_by_supplier()
+        except Exception as e:
+            self.status.set(f"Could not compute suggestions: {e}")
+            return
+
+        lines = 0
+        for supplier, items in grouped.items():
+            total = sum(s.suggested_qty for s in items)
+            parent = self.tree.insert("", tk.END, text=supplier, values=("", "", "", total), open=True)
+            for s in items:
+                self.tree.insert(
+                    parent,
+                    tk.END,
+                    text=s.name,
+                    values=(s.on_hand, f"{s.daily_velocity:.2f}", s.reorder_point, s.suggested_qty),
+                )
+                lines += 1
+
+        if lines:
+            self.status.set(f"{lines} product(s) to reorder from {len(grouped)} supplier(s).")
+        else:
+            self.status.set("Stock covers expected demand. Nothing to reorder.")
@@ -6,7 +6,8 @@ from pathlib import Path
 
 from ttkbootstrap import Button, Entry, Frame, Label, StringVar
 
-from .auth_service import AuthUser, verify_credentials
+from .auth_service import AuthUser, verify_credentials_async, when_done
+from .background_renderer import LOGIN_STYLE, CanvasBackground, renderer_for
 
 
 LOGO_PATH = Path(__file__).resolve().parent / "logo" / "login_page_logo.png"
@@ -14,6 +15,13 @@ APP_BG_PATH = Path(__file__).resolve().parent / "logo" / "background_image.png"
 LOGIN_BG_PATH = Path(__file__).resolve().parent / "Gemini_Generated_Image_m87t1hm87t1hm87t.png"
 
 
+def _background_source() -> Path | None:
+    for path in (APP_BG_PATH, LOGIN_BG_PATH):
+        if path.exists():
+            return path
+    return None
+
+
 class LoginPage(Frame):
     def __init__(self, master, on_login_success):
         # Keep padding on the card, not the page, so the background can fill the window.
@@ -25,13 +33,11 @@ class LoginPage(Frame):
         self._error_label: Label | None = None
         self._return_binding = None
         self._bg_canvas: tk.Canvas | None = None
-        self._bg_photo = None
+        self._background: CanvasBackground | None = None
         self._logo_photo = None
         self._bg_after_id: str | None = None
-        self._bg_src = None
-        self._bg_image_id: int | None = None
-        self._bg_last_size: tuple[int, int] | None = None
-        self._bg_overlay_cache: dict[tuple[int, int], object] = {}
+        self._login_btn: Button | None = None
+        self._checking = False
         self.build_ui()
 
     def build_ui(self) -> None:
@@ -42,13 +48,10 @@ class LoginPage(Frame):
                 pass
 
         # Background canvas (image + dark overlay)
-        self._bg_last_size = None
-        self._bg_overlay_cache.clear()
         self._bg_canvas = tk.Canvas(self, highlightthickness=0, bd=0)
-        self._bg_canvas.configure(bg="#061423")
         # Use `place` to guarantee true edge-to-edge background (avoids any pack/padding quirks).
         self._bg_canvas.place(x=0, y=0, relwidth=1.0, relheight=1.0)
-        self._bg_image_id = self._bg_canvas.create_image(0, 0, anchor="nw")
+        self._background = CanvasBackground(self._bg_canvas, renderer_for(_background_source(), LOGIN_STYLE))
 
         # Center login card
         # Slight padding wrapper to mimic a "glass" card with border.
@@ -136,6 +139,7 @@ class LoginPage(Frame):
 
         btn = Button(pad, text="LOGIN", bootstyle="primary", command=self.check_login)
         btn.pack(fill=tk.X, ipady=6, pady=(10, 10))
+        self._login_btn = btn
 
         tk.Label(
             pad,
@@ -148,7 +152,6 @@ class LoginPage(Frame):
         user_entry.focus_set()
 
         # Background rendering
-        self._load_background_source()
         self._bg_canvas.bind("<Configure>", self._on_bg_configure)
         self._render_background()
 
@@ -179,17 +182,6 @@ class LoginPage(Frame):
         except Exception:
             self._logo_photo = None
 
-    def _load_background_source(self) -> None:
-        try:
-            from PIL import Image  # type: ignore
-
-            if APP_BG_PATH.exists():
-                self._bg_src = Image.open(APP_BG_PATH).convert("RGB")
-            elif LOGIN_BG_PATH.exists():
-                self._bg_src = Image.open(LOGIN_BG_PATH).convert("RGB")
-        except Exception:
-            self._bg_src = None
-
     def _on_bg_configure(self, _e=None) -> None:
         if self._bg_after_id is not None:
             try:
@@ -197,86 +189,11 @@ class LoginPage(Frame):
             except Exception:
                 pass
             self._bg_after_id = None
-        self._bg_after_id = self.after(110, self._render_background)
-
-    def _get_bg_overlay(self, size: tuple[int, int]):
-        cached = self._bg_overlay_cache.get(size)
-        if cached is not None:
-            return cached
-
-        try:
-            from PIL import Image  # type: ignore
-
-            w, h = size
-            # Base dark overlay + subtle vertical gradient to mimic a modern "hero" login.
-            base = Image.new("RGBA", (w, h), (6, 20, 35, 165))
-            mask = Image.new("L", (1, h))
-            for y in range(h):
-                # Slightly darker towards the bottom.
-                mask.putpixel((0, y), int(55 * (y / max(1, h - 1))))
-            mask = mask.resize((w, h))
-            grad = Image.new("RGBA", (w, h), (0, 0, 0, 0))
-            grad.putalpha(mask)
-            overlay = Image.alpha_composite(base, grad)
-        except Exception:
-            overlay = None
-
-        self._bg_overlay_cache[size] = overlay
-        # Keep cache small (login page only needs the last few sizes).
-        if len(self._bg_overlay_cache) > 6:
-            try:
-                self._bg_overlay_cache.pop(next(iter(self._bg_overlay_cache)))
-            except Exception:
-                pass
-        return overlay
+        self._bg_after_id = self.after(30, self._render_background)
 
     def _render_background(self) -> None:
-        if self._bg_canvas is None:
-            return
-        w = max(1, int(self._bg_canvas.winfo_width()))
-        h = max(1, int(self._bg_canvas.winfo_height()))
-
-        if self._bg_last_size == (w, h):
-            return
-        self._bg_last_size = (w, h)
-
-        try:
-            from PIL import Image, ImageEnhance, ImageFilter, ImageTk  # type: ignore
-
-            if self._bg_src is None:
-                img = Image.new("RGB", (w, h), (6, 20, 35))
-            else:
-                # cover-fit
-                src = self._bg_src
-                scale = max(w / src.width, h / src.height)
-                nw, nh = int(src.width * scale), int(src.height * scale)
-                # Bilinear is noticeably faster and good enough for a blurred background.
-                img = src.resize((nw, nh), Image.Resampling.BILINEAR)
-                left = (nw - w) // 2
-                top = (nh - h) // 2
-                img = img.crop((left, top, left + w, top + h))
-
-                # Speed: blur on a smaller image, then scale back up.
-                sw, sh = max(1, w // 3), max(1, h // 3)
-                small = img.resize((sw, sh), Image.Resampling.BILINEAR)
-                small = small.filter(ImageFilter.GaussianBlur(radius=4))
-                img = small.resize((w, h), Image.Resampling.LANCZOS)
-                img = ImageEnhance.Brightness(img).enhance(0.72)
-                img = ImageEnhance.Contrast(img).enhance(1.05)
-
-            img_rgba = img.convert("RGBA")
-            overlay = self._get_bg_overlay((w, h))
-            if overlay is not None:
-                img_rgba = Image.alpha_composite(img_rgba, overlay)
-
-            self._bg_photo = ImageTk.PhotoImage(img_rgba)
-            if self._bg_image_id is None:
-                self._bg_image_id = self._bg_canvas.create_image(0, 0, anchor="nw", image=self._bg_photo)
-            else:
-                self._bg_canvas.itemconfigure(self._bg_image_id, image=self._bg_photo)
-        except Exception:
-            # Fallback to solid color if PIL is missing
-            self._bg_canvas.configure(bg="#061423")
+        if self._background is not None:
+            self._background.refresh()
 
     def _unbind_return(self) -> None:
         try:
@@ -295,14 +212,37 @@ class LoginPage(Frame):
         except Exception:
             pass
 
+    def _set_checking(self, checking: bool) -> None:
+        self._checking = checking
+        if self._login_btn is None:
+            return
+        try:
+            self._login_btn.configure(
+                state="disabled" if checking else "normal", text="SIGNING IN…" if checking else "LOGIN"
+            )
+        except Exception:
+            pass
+
     def check_login(self):
+        if self._checking:
+            return
         username = self.username.get().strip()
         password = self.password.get()
         if not username or not password:
             self._set_error("Enter username and password.")
             return
 
-        user: AuthUser | None = verify_credentials(username, password)
+        # The password hash takes a noticeable fraction of a second; keep the window responsive.
+        self._set_checking(True)
+        when_done(self, verify_credentials_async(username, password), lambda f: self._on_checked(f, username, password))
+
+    def _on_checked(self, future, username: str, password: str) -> None:  # type: ignore[no-untyped-def]
+        self._set_checking(False)
+        try:
+            user: AuthUser | None = future.result()
+        except Exception as e:
+            self._set_error(f"Login failed: {e}")
+            return
         if not user:
             self._set_error("Invalid credentials.")
             return
@@ -1,6 +1,9 @@
 from __future__ import annotations
 
+import atexit
 import json
+import os
+import threading
 from pathlib import Path
 from typing import Any
 
@@ -14,39 +17,187 @@ DEFAULTS: dict[str, Any] = {
     "inventory_low_stock_threshold": 5,
     "scan_default_action": "Receive (+)",
     "scan_default_qty": 1,
+    "scan_camera_continuous": False,
+    "scan_camera_cooldown_s": 2.0,
+    "scan_camera_source": "",
+    "scan_wedge_max_gap_ms": 50,
+    "scan_wedge_idle_ms": 150,
     "monitor_auto_refresh": True,
     "monitor_refresh_interval_ms": 2000,
     "backup_dir": "",
+    "auto_backup_interval_hours": 0,
+    "auto_backup_keep": 7,
+    "auto_backup_compress": True,
+    "journal_fsync": False,
+    "auth_session_minutes": 15,
+    "password_algorithm": "scrypt",
+    "password_scrypt_n": 32768,
+    "password_scrypt_r": 8,
+    "password_scrypt_p": 1,
+    "password_pbkdf2_iterations": 210000,
+    "reorder_lookback_days": 30,
+    "reorder_lead_time_days": 3,
+    "reorder_safety_days": 2,
+    "reorder_cover_days": 14,
+    "panel_cache_size": 4,
+    "activity_retention_days": 365,
+    "activity_max_rows": 200000,
+    "activity_archive_dir": "",
+    "slow_query_threshold_ms": 100,
+    "slow_query_max_rows": 5000,
 }
 
+# How often the watcher thread checks the file for edits made outside the app.
+WATCH_INTERVAL_S = 2.0
+# Writes within this window are coalesced into one file write.
+WRITE_DEBOUNCE_S = 0.5
+
+
+def _source_path() -> Path:
+    return SETTINGS_PATH if SETTINGS_PATH.exists() else DEFAULT_SETTINGS_PATH
+
+
+def _mtime_ns(path: Path) -> int | None:
+    try:
+        return path.stat().st_mtime_ns
+    except OSError:
+        return None
+
 
 def load_settings() -> dict[str, Any]:
+    """Read the settings file from disk (no defaults, no cache)."""
     try:
-        path = SETTINGS_PATH if SETTINGS_PATH.exists() else DEFAULT_SETTINGS_PATH
-        raw = path.read_text(encoding="utf-8")
+        raw = _source_path().read_text(encoding="utf-8")
         data = json.loads(raw)
         return data if isinstance(data, dict) else {}
     except Exception:
         return {}
 
 
+class SettingsStore:
+    """
+    In-memory settings with write-behind persistence.
+
+    The file is parsed once; reads are dict lookups. A daemon thread stats the file every
+    `WATCH_INTERVAL_S` and reloads it if it was edited externally. Updates apply in memory at once
+    and are written `WRITE_DEBOUNCE_S` later in a single atomic write (temp file + `os.replace`),
+    so bursts of updates cost one write. Pending writes are flushed at interpreter exit.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.RLock()
+        self._data: dict[str, Any] | None = None
+        self._pending: dict[str, Any] = {}
+        self._path: Path | None = None
+        self._mtime: int | None = None
+        self._timer: threading.Timer | None = None
+        self._watcher: threading.Thread | None = None
+        self._stop = threading.Event()
+
+    def _load_locked(self) -> dict[str, Any]:
+        path = _source_path()
+        mtime = _mtime_ns(path)
+        data = DEFAULTS.copy()
+        data.update(load_settings())
+        # Keep updates that have not reached the disk yet.
+        data.update(self._pending)
+        self._data, self._path, self._mtime = data, path, mtime
+        return data
+
+    def _ensure_loaded(self) -> dict[str, Any]:
+        data = self._data
+        if data is not None:
+            return data
+        with self._lock:
+            if self._data is None:
+                self._load_locked()
+                self._start_watcher()
+            return self._data  # type: ignore[return-value]
+
+    def get(self, key: str, default: Any = None) -> Any:
+        return self._ensure_loaded().get(key, default)
+
+    def snapshot(self) -> dict[str, Any]:
+        return dict(self._ensure_loaded())
+
+    def update(self, patch: dict[str, Any]) -> dict[str, Any]:
+        with self._lock:
+            data = dict(self._ensure_loaded())
+            data.update(patch)
+            # Swap in a new dict so readers never see a half-applied patch.
+            self._data = data
+            self._pending.update(patch)
+            self._schedule_flush()
+            return dict(data)
+
+    def reload(self) -> dict[str, Any]:
+        with self._lock:
+            return dict(self._load_locked())
+
+    def _schedule_flush(self) -> None:
+        if self._timer is not None:
+            self._timer.cancel()
+        self._timer = threading.Timer(WRITE_DEBOUNCE_S, self.flush)
+        self._timer.daemon = True
+        self._timer.start()
+
+    def flush(self) -> None:
+        with self._lock:
+            if self._timer is not None:
+                self._timer.cancel()
+                self._timer = None
+            if not self._pending or self._data is None:
+                return
+            SETTINGS_PATH.parent.mkdir(parents=True, exist_ok=True)
+            tmp = SETTINGS_PATH.with_name(SETTINGS_PATH.name + ".tmp")
+            tmp.write_text(json.dumps(self._data, indent=4), encoding="utf-8")
+            os.replace(tmp, SETTINGS_PATH)
+            self._pending.clear()
+            # Remember our own write so the watcher doesn't reload it.
+            self._path, self._mtime = SETTINGS_PATH, _mtime_ns(SETTINGS_PATH)
+
+    def _start_watcher(self) -> None:
+        if self._watcher is not None:
+            return
+        self._watcher = threading.Thread(target=self._watch, name="settings-watcher", daemon=True)
+        self._watcher.start()
+
+    def _watch(self) -> None:
+        while not self._stop.wait(WATCH_INTERVAL_S):
+            path = _source_path()
+            mtime = _mtime_ns(path)
+            if path != self._path or mtime != self._mtime:
+                with self._lock:
+                    self._load_locked()
+
+    def close(self) -> None:
+        self._stop.set()
+        try:
+            self.flush()
+        except Exception:
+            pass
+
+
+_store = SettingsStore()
+atexit.register(_store.close)
+
+
 def get_settings() -> dict[str, Any]:
-    data = DEFAULTS.copy()
-    data.update(load_settings())
-    return data
+    return _store.snapshot()
 
 
 def get_setting(key: str, default: Any = None) -> Any:
-    data = get_settings()
-    if key in data:
-        return data[key]
-    return default
+    return _store.get(key, default)
 
 
 def update_settings(patch: dict[str, Any]) -> dict[str, Any]:
-    data = get_settings()
-    data.update(patch)
-    SETTINGS_PATH.parent.mkdir(parents=True, exist_ok=True)
-    SETTINGS_PATH.write_text(json.dumps(data, indent=4), encoding="utf-8")
-    return data
+    return _store.update(patch)
+
+
+def flush_settings() -> None:
+    """Write pending updates now instead of after the debounce delay."""
+    _store.flush()
+
 
+def reload_settings() -> dict[str, Any]:
+    return _store.reload()
@@ -1,18 +1,38 @@
 from __future__ import annotations
 
 import argparse
+import sys
 from datetime import datetime, timedelta
 from pathlib import Path
 
-from auth_service import ensure_default_admin
-from grocery_mart_application.database import DB_PATH, connect, setup_database
+# Run from a checkout without installing the package.
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from grocery_mart_application import database
+from grocery_mart_application.auth_service import ensure_default_admin
+from grocery_mart_application.database import connect, setup_database
+from grocery_mart_application.demo_data import generate
 
 
 def _maybe_reset_db(reset: bool) -> None:
     if not reset:
         return
-    if DB_PATH.exists():
-        DB_PATH.unlink()
+    if database.DB_PATH.exists():
+        database.DB_PATH.unlink()
+
+
+def seed_synthetic(
+    products: int, sales: int, *, seed: int = 0, reset: bool = False, relaxed: bool | None = None
+) -> None:
+    """Populate the database with a seeded synthetic dataset of any size (see `demo_data`)."""
+    _maybe_reset_db(reset=reset)
+    setup_database()
+    ensure_default_admin()
+    counts = generate(products=products, sales=sales, seed=seed, relaxed=relaxed)
+    print(
+        f"Seeded {counts.products} products, {counts.suppliers} suppliers, {counts.sales} sales in "
+        f"{counts.invoices} invoices and {counts.events} activity events into: {database.DB_PATH}"
+    )
 
 
 def seed_demo(reset: bool = False) -> None:
@@ -89,7 +109,7 @@ def seed_demo(reset: bool = False) -> None:
         )
 
         conn.commit()
-        print(f"Demo data seeded into: {Path(DB_PATH).resolve()}")
+        print(f"Demo data seeded into: {Path(database.DB_PATH).resolve()}")
 
 
 def main() -> int:
@@ -99,8 +119,20 @@ def main() -> int:
         action="store_true",
         help="Delete the existing DB file and recreate it before inserting demo data.",
     )
+    parser.add_argument("--db", help="Database file (default: $GROCERY_MART_DB_PATH or ./grocery_inventory.db)")
+    parser.add_argument("--products", type=int, help="Generate this many synthetic products instead of the demo set")
+    parser.add_argument("--sales", type=int, help="Synthetic sale lines to generate (default: same as --products)")
+    parser.add_argument("--seed", type=int, default=0, help="Random seed for synthetic data (default 0)")
     args = parser.parse_args()
-    seed_demo(reset=bool(args.reset))
+    if args.db:
+        database.DB_PATH = Path(args.db).expanduser().resolve()
+    if args.products is not None:
+        sales = args.sales if args.sales is not None else args.products
+        seed_synthetic(
+            args.products, sales, seed=args.seed, reset=bool(args.reset), relaxed=True if args.db else None
+        )
+    else:
+        seed_demo(reset=bool(args.reset))
     return 0
 
 
@@ -0,0 +1,13 @@
+from __future__ import annotations
+
+import pytest
+
+
+@pytest.fixture
+def tmp_db(tmp_path, monkeypatch):
+    from grocery_mart_application import database
+
+    path = tmp_path / "grocery_inventory.db"
+    monkeypatch.setattr(database, "DB_PATH", path)
+    database.setup_database()
+    return path
@@ -0,0 +1,32 @@
+from __future__ import annotations
+
+import json
+
+
+def test_settings_cached_and_written_once(tmp_path, monkeypatch):
+    from grocery_mart_application.utils import app_settings
+
+    path = tmp_path / "styles" / "app_settings.json"
+    path.parent.mkdir()
+    path.write_text(json.dumps({"backup_dir": "X"}), encoding="utf-8")
+    monkeypatch.setattr(app_settings, "SETTINGS_PATH", path)
+    store = app_settings.SettingsStore()
+    monkeypatch.setattr(app_settings, "_store", store)
+
+    assert app_settings.get_setting("backup_dir") == "X"
+    assert app_settings.get_setting("panel_cache_size") == 4
+
+    reads = []
+    monkeypatch.setattr(app_settings, "load_settings", lambda: reads.append(1) or {})
+    for i in range(50):
+        app_settings.update_settings({"monitor_refresh_interval_ms": 1000 + i})
+        assert app_settings.get_setting("monitor_refresh_interval_ms") == 1000 + i
+    assert reads == []
+    # Debounced: nothing written yet, then one flush with the final value.
+    assert json.loads(path.read_text(encoding="utf-8")) == {"backup_dir": "X"}
+    app_settings.flush_settings()
+    saved = json.loads(path.read_text(encoding="utf-8"))
+    assert saved["monitor_refresh_interval_ms"] == 1049
+    assert saved["backup_dir"] == "X"
+    assert not list(path.parent.glob("*.tmp"))
+    store.close()
@@ -0,0 +1,106 @@
+from __future__ import annotations
+
+
+def test_async_login_and_session_cache(tmp_db, monkeypatch):
+    from grocery_mart_application import auth_service
+
+    auth_service.end_session()
+    calls = {"kdf": 0, "setup": 0}
+    real_hash = auth_service._hash_password
+    real_setup = auth_service.setup_database
+
+    def counting_hash(password, salt, hasher=None):  # type: ignore[no-untyped-def]
+        calls["kdf"] += 1
+        return real_hash(password, salt, hasher)
+
+    def counting_setup():  # type: ignore[no-untyped-def]
+        calls["setup"] += 1
+        real_setup()
+
+    monkeypatch.setattr(auth_service, "_hash_password", counting_hash)
+    monkeypatch.setattr(auth_service, "setup_database", counting_setup)
+
+    user = auth_service.verify_credentials_async("admin", "admin").result(timeout=30)
+    assert user is not None and user.username == "admin"
+    after_login = calls["kdf"]
+
+    # Re-unlock inside the session window: no KDF, no bootstrap.
+    assert auth_service.verify_cached("admin", "admin") == user
+    assert auth_service.verify_credentials("admin", "admin") == user
+    assert auth_service.verify_cached("admin", "wrong") is None
+    assert calls["kdf"] == after_login
+    assert calls["setup"] == 1
+
+    auth_service.change_password("admin", "s3cret")
+    assert auth_service.verify_cached("admin", "admin") is None
+    assert auth_service.verify_credentials("admin", "admin") is None
+    assert auth_service.verify_credentials("admin", "s3cret") is not None
+    assert calls["setup"] == 1
+    auth_service.end_session()
+
+
+def test_legacy_hash_is_upgraded_on_login(tmp_db, monkeypatch):
+    import hashlib
+
+    from grocery_mart_application import auth_service
+    from grocery_mart_application.database import connect
+
+    auth_service.end_session()
+    auth_service.ensure_default_admin()
+    salt = b"0123456789abcdef"
+    legacy = hashlib.pbkdf2_hmac("sha256", b"till-pass", salt, auth_service.PBKDF2_ITERS)
+    with connect() as conn:
+        conn.execute(
+            "INSERT INTO users (username, password_hash, salt, role) VALUES ('clerk', ?, ?, 'staff')",
+            (legacy, salt),
+        )
+        conn.commit()
+
+    assert auth_service.verify_credentials("clerk", "wrong") is None
+    assert auth_service.verify_credentials("clerk", "till-pass") is not None
+    with connect() as conn:
+        row = conn.execute("SELECT password_hash, hash_scheme FROM users WHERE username = 'clerk'").fetchone()
+    assert row["hash_scheme"] == auth_service.scheme_of(auth_service.current_hasher())
+    assert row["hash_scheme"].startswith("scrypt$")
+    assert row["password_hash"] != legacy
+
+    # Operators can move to another scheme/cost; the next sign-in rehashes again.
+    auth_service.end_session()
+    monkeypatch.setattr(auth_service, "current_hasher", lambda: auth_service.Pbkdf2Hasher(1000))
+    assert auth_service.verify_credentials("clerk", "till-pass") is not None
+    with connect() as conn:
+        scheme = conn.execute("SELECT hash_scheme FROM users WHERE username = 'clerk'").fetchone()[0]
+    assert scheme == "pbkdf2_sha256$i=1000"
+    auth_service.end_session()
+
+
+def test_unknown_hash_schemes_are_refused_and_logged(tmp_db, monkeypatch):
+    import pytest
+
+    from grocery_mart_application import auth_service
+    from grocery_mart_application.database import connect, query_events
+    from grocery_mart_application.utils import app_settings
+
+    auth_service.end_session()
+    auth_service.ensure_default_admin()
+    with connect() as conn:
+        conn.execute(
+            "INSERT INTO users (username, password_hash, salt, hash_scheme, role) "
+            "VALUES ('clerk', x'00', x'00', 'argon2id$m=65536', 'staff')"
+        )
+        conn.commit()
+    assert auth_service.verify_credentials("clerk", "till-pass") is None
+    assert "argon2id" in query_events(event_type="auth", limit=1)[0]["message"]
+
+    real_get = app_settings.get_setting
+    monkeypatch.setattr(
+        app_settings,
+        "get_setting",
+        lambda key, default=None: "scrpyt" if key == "password_algorithm" else real_get(key, default),
+    )
+    with pytest.raises(ValueError, match="scrpyt"):
+        auth_service.current_hasher()
+    # Signing in still works with the stored hash; the failed upgrade is logged.
+    assert auth_service.verify_credentials("admin", "admin") is not None
+    assert "scrpyt" in query_events(event_type="auth", limit=1)[0]["message"]
+    auth_service.end_session()
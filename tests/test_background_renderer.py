@@ -0,0 +1,43 @@
+from __future__ import annotations
+
+import pytest
+
+
+def test_bucket_rounds_up_to_cover_the_window():
+    from grocery_mart_application.background_renderer import BUCKET_PX, bucket
+
+    assert bucket((1, 1)) == (BUCKET_PX, BUCKET_PX)
+    assert bucket((BUCKET_PX, BUCKET_PX + 1)) == (BUCKET_PX, 2 * BUCKET_PX)
+
+
+def test_renderer_caches_buckets_and_persists_the_blurred_base(tmp_path):
+    Image = pytest.importorskip("PIL.Image")
+    from grocery_mart_application.background_renderer import (
+        LOGIN_STYLE,
+        BackgroundRenderer,
+        bucket,
+    )
+
+    src = tmp_path / "bg.png"
+    Image.new("RGB", (1200, 800), (200, 120, 40)).save(src)
+    cache = tmp_path / "cache"
+
+    renderer = BackgroundRenderer(src, LOGIN_STYLE, cache_dir=cache)
+    img = renderer.render_async((1000, 700)).result(timeout=10)
+    assert img.size == bucket((1000, 700)) and img.mode == "RGB"
+    assert renderer.base_path().exists() and not renderer.base_from_disk
+    # Any size inside the bucket is a cache hit; the nearest cached size stands in for others.
+    assert renderer.cached((990, 650)) is img
+    assert renderer.cached((1400, 900)) is None
+    assert renderer.nearest((1400, 900)) == (bucket((1000, 700)), img)
+    # The overlay darkens the image, more at the bottom.
+    top, bottom = img.getpixel((10, 5)), img.getpixel((10, img.height - 5))
+    assert top[0] < 200 and bottom[0] < top[0]
+
+    restarted = BackgroundRenderer(src, LOGIN_STYLE, cache_dir=cache)
+    again = restarted.render((1000, 700))
+    assert restarted.base_from_disk
+    assert again.getpixel((10, 5)) == pytest.approx(top, abs=2)
+
+    missing = BackgroundRenderer(None, LOGIN_STYLE, cache_dir=cache)
+    assert missing.render((100, 100)).size == bucket((100, 100))
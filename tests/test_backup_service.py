@@ -0,0 +1,104 @@
+from __future__ import annotations
+
+import pytest
+
+
+def _product_count() -> int:
+    from grocery_mart_application.database import connect
+
+    with connect() as conn:
+        return int(conn.execute("SELECT COUNT(*) FROM products").fetchone()[0])
+
+
+def _add_product(name: str) -> None:
+    from grocery_mart_application.database import connect
+
+    with connect() as conn:
+        conn.execute(
+            "INSERT INTO products (name, category, unit, price, quantity) VALUES (?, 'Dairy', 'pc', 1.0, 1)",
+            (name,),
+        )
+        conn.commit()
+
+
+@pytest.mark.parametrize("compress", [False, True])
+def test_backup_restore_round_trip(tmp_db, tmp_path, compress):
+    from grocery_mart_application.backup_service import check_integrity, create_backup, restore_backup
+
+    _add_product("Milk")
+    steps: list[tuple[int, int]] = []
+    backup = create_backup(
+        tmp_path / "bk", compress=compress, progress=lambda done, total: steps.append((done, total))
+    )
+    assert backup.name.endswith(".db.gz" if compress else ".db")
+    assert steps and steps[-1][0] == steps[-1][1]
+
+    _add_product("Bread")
+    assert _product_count() == 2
+
+    safety = restore_backup(backup)
+    assert _product_count() == 1
+    assert check_integrity(safety) == "ok"
+    assert not list(tmp_db.parent.glob("*.restore"))
+
+
+def test_restore_rejects_corrupt_backup(tmp_db, tmp_path):
+    from grocery_mart_application.backup_service import BackupError, restore_backup
+
+    _add_product("Milk")
+    bad = tmp_path / "grocery_inventory_backup_bad.db"
+    bad.write_bytes(b"SQLite format 3\x00" + b"\x00" * 200)
+
+    with pytest.raises(BackupError):
+        restore_backup(bad)
+    assert _product_count() == 1
+
+
+def test_rotate_keeps_newest(tmp_db, tmp_path):
+    import os
+
+    from grocery_mart_application.backup_service import list_backups, rotate_backups
+
+    folder = tmp_path / "bk"
+    folder.mkdir()
+    for i in range(5):
+        p = folder / f"grocery_inventory_backup_2026010{i}_000000.db"
+        p.write_bytes(b"x")
+        os.utime(p, (1_000_000 + i, 1_000_000 + i))
+
+    removed = rotate_backups(folder, keep=2)
+    assert len(removed) == 3
+    assert [p.name for p in list_backups(folder)] == [
+        "grocery_inventory_backup_20260104_000000.db",
+        "grocery_inventory_backup_20260103_000000.db",
+    ]
+
+
+def test_backups_in_the_same_second_get_distinct_names(tmp_db, tmp_path, monkeypatch):
+    from datetime import datetime
+
+    from grocery_mart_application import backup_service
+
+    class FrozenClock(datetime):
+        @classmethod
+        def now(cls, tz=None):  # type: ignore[no-untyped-def]
+            return datetime(2026, 5, 1, 14, 30, 12)
+
+    monkeypatch.setattr(backup_service, "datetime", FrozenClock)
+    _add_product("Milk")
+    first = backup_service.create_backup(tmp_path / "bk")
+    _add_product("Bread")
+    second = backup_service.create_backup(tmp_path / "bk")
+    assert (first.name, second.name) == (
+        "grocery_inventory_backup_20260501_143012.db",
+        "grocery_inventory_backup_20260501_143012-2.db",
+    )
+    assert len(backup_service.list_backups(tmp_path / "bk")) == 2
+    assert not list((tmp_path / "bk").glob("*.part"))
+
+    safety = [backup_service.restore_backup(first), backup_service.restore_backup(second)]
+    assert [p.name for p in safety] == [
+        "grocery_inventory_pre_restore_20260501_143012.db",
+        "grocery_inventory_pre_restore_20260501_143012-2.db",
+    ]
+    assert _product_count() == 2
@@ -0,0 +1,169 @@
+from __future__ import annotations
+
+import time
+from datetime import datetime
+
+
+def _insert_product(conn, name: str, qty: int) -> int:  # type: ignore[no-untyped-def]
+    cur = conn.execute(
+        "INSERT INTO products (name, category, unit, price, quantity) VALUES (?, 'Dairy', 'pc', 2.5, ?)",
+        (name, qty),
+    )
+    return int(cur.lastrowid)
+
+
+def test_recover_replays_journal_up_to_target(tmp_db, tmp_path):
+    from grocery_mart_application.backup_service import create_backup
+    from grocery_mart_application.change_journal import (
+        commit_journaled,
+        iter_entries,
+        record_delete,
+        record_rows,
+        recover,
+    )
+    from grocery_mart_application.database import connect
+
+    with connect() as conn:
+        milk = _insert_product(conn, "Milk", 10)
+        commit_journaled(conn, record_rows(conn, {"products": [milk]}))
+    backup = create_backup(tmp_path / "bk")
+
+    with connect() as conn:
+        bread = _insert_product(conn, "Bread", 5)
+        conn.execute("UPDATE products SET quantity = 7 WHERE id = ?", (milk,))
+        cur = conn.execute("INSERT INTO sales (product_name, quantity) VALUES ('Milk', 3)")
+        commit_journaled(conn, record_rows(conn, {"products": [bread, milk], "sales": [int(cur.lastrowid)]}))
+    time.sleep(0.01)
+    cutoff = datetime.now()
+    time.sleep(0.01)
+    with connect() as conn:
+        conn.execute("DELETE FROM products WHERE id = ?", (bread,))
+        commit_journaled(conn, record_delete("products", [bread]))
+
+    seqs = [int(e["seq"]) for e in iter_entries()]
+    assert seqs == sorted(seqs) and len(set(seqs)) == len(seqs)
+
+    result = recover(cutoff, backup=backup, out=tmp_path / "recovered.db")
+    # The Milk entry ahead of the backup's checkpoint is replayed again, harmlessly.
+    assert result.applied == 2
+
+    import sqlite3
+
+    conn = sqlite3.connect(result.path)
+    try:
+        products = dict(conn.execute("SELECT name, quantity FROM products").fetchall())
+        sales = conn.execute("SELECT COUNT(*) FROM sales").fetchone()[0]
+    finally:
+        conn.close()
+    assert products == {"Milk": 7, "Bread": 5}
+    assert sales == 1
+
+    # Recovering to now also applies the delete.
+    latest = recover(datetime.now(), backup=backup, out=tmp_path / "latest.db")
+    conn = sqlite3.connect(latest.path)
+    try:
+        assert [r[0] for r in conn.execute("SELECT name FROM products")] == ["Milk"]
+    finally:
+        conn.close()
+
+
+def test_recover_reports_barcode_conflicts_and_skips_aborted_entries(tmp_db, tmp_path):
+    import sqlite3
+
+    from grocery_mart_application.backup_service import create_backup
+    from grocery_mart_application.change_journal import get_journal, recover
+    from grocery_mart_application.database import connect
+
+    with connect() as conn:
+        milk = _insert_product(conn, "Milk", 10)
+        bread = _insert_product(conn, "Bread", 5)
+        conn.execute("UPDATE products SET barcode = '111' WHERE id = ?", (bread,))
+        conn.commit()
+    backup = create_backup(tmp_path / "bk")
+
+    def image(product_id: int, **row: object) -> dict[str, object]:
+        row = {"id": product_id, "name": "Milk", "category": "Dairy", "unit": "pc", "price": 2.5, **row}
+        return {"table": "products", "op": "upsert", "row": row}
+
+    journal = get_journal()
+    journal.append([image(milk, quantity=4)])
+    # Bread still holds this barcode in the backup: the change must not delete it.
+    journal.append([image(milk, quantity=4, barcode="111")])
+    rolled_back = journal.append([image(milk, quantity=99)])
+    journal.append([], aborted=rolled_back)
+
+    result = recover(datetime.now(), backup=backup, out=tmp_path / "recovered.db")
+    assert len(result.conflicts) == 1 and f"products id {milk}" in result.conflicts[0]
+
+    conn = sqlite3.connect(result.path)
+    try:
+        rows = conn.execute("SELECT name, quantity, barcode FROM products ORDER BY id").fetchall()
+    finally:
+        conn.close()
+    assert rows == [("Milk", 4, None), ("Bread", 5, "111")]
+
+
+def test_recover_replays_an_entry_committed_after_the_backup_snapshot(tmp_db, tmp_path):
+    import sqlite3
+
+    from grocery_mart_application.backup_service import create_backup
+    from grocery_mart_application.change_journal import commit_journaled, record_rows, recover
+    from grocery_mart_application.database import connect
+
+    create_backup(tmp_path / "bk")
+    with connect() as conn:
+        milk = _insert_product(conn, "Milk", 10)
+        seq = record_rows(conn, {"products": [milk]})
+        # Journaled but not yet committed when the next backup checkpoints and copies the pages.
+        backup = create_backup(tmp_path / "bk")
+        commit_journaled(conn, seq)
+
+    conn = sqlite3.connect(backup)
+    try:
+        assert conn.execute("SELECT COUNT(*) FROM products").fetchone()[0] == 0
+    finally:
+        conn.close()
+
+    result = recover(datetime.now(), backup=backup, out=tmp_path / "recovered.db")
+    conn = sqlite3.connect(result.path)
+    try:
+        assert conn.execute("SELECT name, quantity FROM products").fetchall() == [("Milk", 10)]
+    finally:
+        conn.close()
+    assert result.conflicts == []
+
+
+def test_journal_failure_keeps_the_change_uncommitted(tmp_db, monkeypatch):
+    import pytest
+
+    from grocery_mart_application import change_journal
+    from grocery_mart_application.database import connect
+
+    def fail(*args, **kwargs):  # type: ignore[no-untyped-def]
+        raise OSError("disk full")
+
+    monkeypatch.setattr(change_journal.ChangeJournal, "append", fail)
+    with connect() as conn:
+        milk = _insert_product(conn, "Milk", 10)
+        with pytest.raises(change_journal.JournalError, match="disk full"):
+            change_journal.commit_journaled(conn, change_journal.record_rows(conn, {"products": [milk]}))
+    with connect() as conn:
+        assert conn.execute("SELECT COUNT(*) FROM products").fetchone()[0] == 0
+
+
+def test_separate_journal_writers_never_share_a_seq(tmp_path):
+    import threading
+
+    from grocery_mart_application.change_journal import ChangeJournal, iter_entries
+
+    # One instance per "process" (GUI, CLI job, ...): only the file lock keeps their numbering apart.
+    writers = [ChangeJournal(tmp_path) for _ in range(4)]
+    threads = [threading.Thread(target=lambda w=w: [w.append([]) for _ in range(100)]) for w in writers]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    for w in writers:
+        w.close()
+
+    assert sorted(int(e["seq"]) for e in iter_entries(tmp_path)) == list(range(1, 401))
@@ -0,0 +1,37 @@
+from __future__ import annotations
+
+import json
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+
+
+def test_cli_runs_headless(tmp_path):
+    env = {**os.environ, "GROCERY_MART_DB_PATH": str(tmp_path / "cli.db"), "PYTHONPATH": str(ROOT)}
+    code = (
+        "import sys, json\n"
+        "from grocery_mart_application.main import main\n"
+        "rc = main(['stats', '--json'])\n"
+        "heavy = sorted(m for m in ('tkinter', 'ttkbootstrap', 'matplotlib', 'PIL') if m in sys.modules)\n"
+        "print(json.dumps({'rc': rc, 'heavy': heavy}))\n"
+    )
+    out = subprocess.run(
+        [sys.executable, "-c", code], env=env, cwd=tmp_path, capture_output=True, text=True, check=True
+    )
+    *stats_lines, last = out.stdout.strip().splitlines()
+
+    assert json.loads(last) == {"rc": 0, "heavy": []}
+    assert json.loads("\n".join(stats_lines))["products"] == 0
+
+
+def test_cli_export_and_backup(tmp_db, tmp_path, capsys):
+    from grocery_mart_application.cli import main
+
+    assert main(["--db", str(tmp_db), "export", "suppliers", str(tmp_path / "s.csv")]) == 0
+    assert (tmp_path / "s.csv").read_text(encoding="utf-8").startswith("id,name,contact")
+    assert main(["--db", str(tmp_db), "backup", "--dir", str(tmp_path / "bk")]) == 0
+    assert len(list((tmp_path / "bk").glob("*_backup_*.db"))) == 1
+    assert main(["--db", str(tmp_db), "reindex"]) == 0
@@ -0,0 +1,88 @@
+from __future__ import annotations
+
+
+def _insert_sales(rows: list[tuple[str, int, float, str]]) -> None:
+    from grocery_mart_application.database import connect
+
+    with connect() as conn:
+        conn.executemany(
+            "INSERT INTO sales (product_name, quantity, total_price, sale_date) VALUES (?, ?, ?, ?)",
+            rows,
+        )
+        conn.commit()
+
+
+def test_ndjson_partitioned_incremental_round_trip(tmp_db, tmp_path):
+    from grocery_mart_application.change_journal import iter_entries
+    from grocery_mart_application.columnar_export import (
+        export_sales_columnar,
+        import_sales_columnar,
+        read_manifest,
+    )
+    from grocery_mart_application.database import connect
+
+    _insert_sales(
+        [
+            ("Milk", 2, 60.0, "2026-01-05 10:00:00"),
+            ("Bread", 1, 40.0, "2026-01-20 11:30:00"),
+            ("Eggs", 12, 84.0, "2026-02-02 09:15:00"),
+        ]
+    )
+    dest = tmp_path / "sales_ds"
+
+    assert export_sales_columnar(dest, fmt="ndjson") == 3
+    assert sorted(p.parent.name for p in dest.rglob("*.ndjson.gz")) == [
+        "sale_month=2026-01",
+        "sale_month=2026-02",
+    ]
+    assert read_manifest(dest)["last_sale_id"] == 3
+
+    # Nothing new: no new part files, watermark unchanged.
+    assert export_sales_columnar(dest, fmt="ndjson") == 0
+    _insert_sales([("Rice", 5, 300.0, "2026-02-10 18:00:00")])
+    assert export_sales_columnar(dest, fmt="ndjson") == 1
+    assert len(list(dest.rglob("*.ndjson.gz"))) == 3
+    assert not list(dest.rglob("*.part"))
+
+    with connect() as conn:
+        conn.execute("DELETE FROM sales WHERE id IN (2, 4)")
+        conn.commit()
+    assert import_sales_columnar(dest) == 2
+    assert import_sales_columnar(dest) == 0
+    imported = [
+        sorted(c["row"]["id"] for c in e["changes"])
+        for e in iter_entries()
+        if e["changes"] and "aborted" not in e
+    ]
+    assert imported == [[2, 4]]
+    with connect() as conn:
+        row = conn.execute("SELECT product_name, quantity, sale_date FROM sales WHERE id = 4").fetchone()
+    assert tuple(row) == ("Rice", 5, "2026-02-10 18:00:00")
+
+
+def test_full_export_replaces_the_dataset_and_incremental_keeps_its_layout(tmp_db, tmp_path):
+    import pytest
+
+    from grocery_mart_application.columnar_export import export_sales_columnar, read_manifest
+
+    _insert_sales(
+        [
+            ("Milk", 2, 60.0, "2026-01-05 10:00:00"),
+            ("Eggs", 12, 84.0, "2026-02-02 09:15:00"),
+        ]
+    )
+    dest = tmp_path / "sales_ds"
+    assert export_sales_columnar(dest, fmt="ndjson") == 2
+    _insert_sales([("Rice", 5, 300.0, "2026-02-10 18:00:00")])
+
+    with pytest.raises(ValueError, match="full export"):
+        export_sales_columnar(dest, fmt="ndjson", partition="day")
+    assert read_manifest(dest)["last_sale_id"] == 2
+
+    assert export_sales_columnar(dest, fmt="ndjson", partition="none", incremental=False) == 3
+    manifest = read_manifest(dest)
+    assert (manifest["partition"], manifest["files"]) == ("none", ["part-0000000001.ndjson.gz"])
+    assert sorted(p.relative_to(dest).as_posix() for p in dest.rglob("*")) == [
+        "_manifest.json",
+        "part-0000000001.ndjson.gz",
+    ]
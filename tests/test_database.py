@@ -0,0 +1,49 @@
+from __future__ import annotations
+
+
+def test_log_event_publishes_to_subscribers(tmp_db):
+    from grocery_mart_application import database
+
+    received: list[dict[str, object]] = []
+    unsubscribe = database.subscribe_events(received.append)
+    try:
+        database.log_event("sale", "Sold 2 x Milk", "admin")
+    finally:
+        unsubscribe()
+    database.log_event("sale", "not delivered", "admin")
+
+    assert len(received) == 1
+    row = received[0]
+    assert row["event_type"] == "sale"
+    assert row["username"] == "admin"
+    assert row["id"] == database.activity_watermark() - 1
+    assert row["created_at"]
+
+
+def test_structured_events_are_queryable(tmp_db):
+    from grocery_mart_application import database
+
+    database.log_event(
+        "product", "Added product: Milk", "admin", entity_type="product", entity_id=7, qty_delta=12
+    )
+    database.log_event(
+        "product",
+        "Barcode 890: Dispatch (-) 2 on Milk (qty 12 -> 10)",
+        "admin",
+        entity_type="product",
+        entity_id=7,
+        qty_delta=-2,
+        payload={"barcode": "890", "before": 12, "after": 10},
+    )
+    database.log_event(
+        "product", "Added product: Bread", "admin", entity_type="product", entity_id=8, qty_delta=5
+    )
+    database.log_event("export", "Products exported to p.csv", "admin", payload={"path": "p.csv"})
+
+    milk = database.query_events(entity_type="product", entity_id=7)
+    assert [e["qty_delta"] for e in milk] == [-2, 12]
+    assert milk[0]["payload"] == {"barcode": "890", "before": 12, "after": 10}
+
+    exports = database.query_events(event_type="export", since="2000-01-01")
+    assert [e["message"] for e in exports] == ["Products exported to p.csv"]
+    assert database.query_events(event_type="export", until="2000-01-01") == []
@@ -0,0 +1,94 @@
+from __future__ import annotations
+
+import json
+from datetime import datetime
+
+
+def test_generate_is_deterministic(tmp_path):
+    from grocery_mart_application import database
+    from grocery_mart_application.demo_data import generate
+    from grocery_mart_application.perf_bench import use_database
+
+    end = datetime(2026, 6, 1)
+    dumps = []
+    for name in ("a.db", "b.db"):
+        with use_database(tmp_path / name):
+            database.setup_database()
+            counts = generate(products=50, sales=120, seed=3, end=end)
+            with database.connect() as conn:
+                dumps.append([tuple(r) for r in conn.execute("SELECT * FROM sales ORDER BY id")])
+    assert (counts.products, counts.sales) == (50, 120)
+    assert dumps[0] == dumps[1]
+
+
+def test_generated_history_is_consistent(tmp_db, capsys):
+    from grocery_mart_application import database
+    from grocery_mart_application.cli import main
+    from grocery_mart_application.scanner_bench import ean13_check_digit
+
+    with database.connect() as conn:
+        indexes = {r[0] for r in conn.execute("SELECT name FROM sqlite_master WHERE type = 'index'")}
+
+    assert main(["--db", str(tmp_db), "seed", "--products", "200", "--sales", "1k", "--days", "60"]) == 0
+    printed = dict(kv.split("=") for kv in capsys.readouterr().out.split())
+    assert (printed["products"], printed["sales"]) == ("200", "1000")
+    assert 1000 / 8 <= int(printed["invoices"]) < 1000
+
+    with database.connect() as conn:
+        # The bulk load drops and rebuilds the indexes.
+        assert {r[0] for r in conn.execute("SELECT name FROM sqlite_master WHERE type = 'index'")} == indexes
+        assert conn.execute("PRAGMA integrity_check").fetchone()[0] == "ok"
+
+        barcodes = [r[0] for r in conn.execute("SELECT barcode FROM products")]
+        assert len(set(barcodes)) == 200
+        assert all(ean13_check_digit(b[:12]) == int(b[12]) for b in barcodes)
+
+        # Every sale line belongs to exactly one invoice event, and the event total adds up.
+        events = conn.execute("SELECT payload FROM activity_log WHERE entity_type = 'sale'").fetchall()
+        assert len(events) == int(printed["invoices"])
+        lines = [i for e in events for i in json.loads(e[0])["sale_ids"]]
+        assert sorted(lines) == [r[0] for r in conn.execute("SELECT id FROM sales ORDER BY id")]
+        payload = json.loads(events[0][0])
+        marks = ", ".join("?" * len(payload["sale_ids"]))
+        rows = conn.execute(
+            f"SELECT DISTINCT sale_date, buyer_name FROM sales WHERE id IN ({marks})", payload["sale_ids"]
+        ).fetchall()
+        assert len(rows) == 1
+        total = conn.execute(f"SELECT SUM(total_price) FROM sales WHERE id IN ({marks})", payload["sale_ids"])
+        assert abs(total.fetchone()[0] - payload["total"]) < 0.01
+
+        # Like checkout, each line is also a stock event on its product.
+        moves = conn.execute("""SELECT SUM(-a.qty_delta), SUM(s.quantity) FROM activity_log a
+               JOIN sales s ON s.id = json_extract(a.payload, '$.sale_id')
+               WHERE a.event_type = 'sale' AND a.entity_type = 'product'""").fetchone()
+        assert moves[0] == moves[1] == conn.execute("SELECT SUM(quantity) FROM sales").fetchone()[0]
+
+        first, last = conn.execute("SELECT MIN(sale_date), MAX(sale_date) FROM sales").fetchone()
+        assert "07:00:00" <= first[11:] and last[11:] < "22:00:00"
+        assert conn.execute("SELECT COUNT(*) FROM activity_log WHERE event_type = 'auth'").fetchone()[0] > 0
+
+    # Seeding again tops the database up instead of clashing with existing ids or names.
+    assert main(["--db", str(tmp_db), "seed", "--products", "10", "--no-activity"]) == 0
+    with database.connect() as conn:
+        names = conn.execute("SELECT COUNT(*), COUNT(DISTINCT name) FROM products").fetchone()
+        assert tuple(names) == (210, 210)
+
+
+def test_bulk_load_keeps_crash_safety_on_a_populated_database(tmp_db):
+    from grocery_mart_application import database
+    from grocery_mart_application.demo_data import _BulkLoad
+
+    def pragmas(relaxed):  # type: ignore[no-untyped-def]
+        with database.connect() as conn:
+            with _BulkLoad(conn, 100, relaxed=relaxed) as load:
+                return load.relaxed, conn.execute("PRAGMA synchronous").fetchone()[0]
+
+    normal = pragmas(False)[1]
+    assert pragmas(None) == (True, 0)
+    with database.connect() as conn:
+        conn.execute(
+            "INSERT INTO products (name, category, unit, price, quantity) VALUES ('Milk', 'Dairy', 'pc', 2, 1)"
+        )
+        conn.commit()
+    assert pragmas(None) == (False, normal)
+    assert pragmas(True) == (True, 0)
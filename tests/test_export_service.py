@@ -0,0 +1,54 @@
+from __future__ import annotations
+
+import csv
+from threading import Event
+
+import pytest
+
+
+def _seed_sales(n: int) -> None:
+    from grocery_mart_application.database import connect
+
+    with connect() as conn:
+        conn.executemany(
+            "INSERT INTO sales (product_name, quantity, total_price) VALUES (?, ?, ?)",
+            [(f"P{i}", i, i * 1.5) for i in range(n)],
+        )
+        conn.commit()
+
+
+def test_stream_csv_in_chunks(tmp_db, tmp_path):
+    from grocery_mart_application.export_service import stream_query_to_file
+
+    _seed_sales(250)
+    seen: list[tuple[int, int]] = []
+    out = tmp_path / "sales.csv"
+    written = stream_query_to_file(
+        "SELECT id, product_name, quantity FROM sales ORDER BY id",
+        path=out,
+        chunk_size=100,
+        progress=lambda w, t: seen.append((w, t)),
+    )
+
+    assert written == 250
+    assert seen == [(0, 250), (100, 250), (200, 250), (250, 250)]
+    with open(out, newline="", encoding="utf-8") as f:
+        rows = list(csv.reader(f))
+    assert rows[0] == ["id", "product_name", "quantity"]
+    assert len(rows) == 251
+
+
+def test_cancel_leaves_no_partial_file(tmp_db, tmp_path):
+    from grocery_mart_application.export_service import ExportCancelled, stream_query_to_file
+
+    _seed_sales(50)
+    cancel = Event()
+    out = tmp_path / "sales.csv"
+
+    def progress(written: int, _total: int) -> None:
+        if written:
+            cancel.set()
+
+    with pytest.raises(ExportCancelled):
+        stream_query_to_file("SELECT * FROM sales", path=out, chunk_size=10, progress=progress, cancel=cancel)
+    assert list(tmp_path.glob("sales.csv*")) == []
@@ -0,0 +1,31 @@
+from __future__ import annotations
+
+import pytest
+
+
+def _clock_timers(root) -> list[str]:
+    ids = root.tk.splitlist(root.tk.call("after", "info"))
+    return [i for i in ids if "update_time" in str(root.tk.splitlist(root.tk.call("after", "info", i))[0])]
+
+
+def test_reselecting_home_keeps_one_clock_timer(tmp_db):
+    pytest.importorskip("ttkbootstrap")
+    import tkinter as tk
+
+    try:
+        root = tk.Tk()
+    except tk.TclError:
+        pytest.skip("no display")
+    try:
+        from grocery_mart_application.home_panel import HomePanel
+
+        panel = HomePanel(root)
+        for _ in range(3):
+            # Dashboard.load_panel calls on_show again when the active page is re-selected.
+            panel.on_show()
+        assert len(_clock_timers(root)) == 1
+
+        panel.on_hide()
+        assert _clock_timers(root) == []
+    finally:
+        root.destroy()
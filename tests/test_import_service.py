@@ -0,0 +1,95 @@
+from __future__ import annotations
+
+
+def test_import_catalog_upserts_and_reports_errors(tmp_db, tmp_path):
+    from grocery_mart_application.database import connect
+    from grocery_mart_application.import_service import import_catalog
+
+    with connect() as conn:
+        conn.execute("""INSERT INTO products (name, barcode, category, unit, price, gst_percent, quantity)
+               VALUES ('Milk 1L', '8900000000011', 'Dairy', 'pcs', 50, 5, 10)""")
+        conn.execute(
+            "INSERT INTO products (name, category, unit, price, quantity) VALUES ('Bread', 'Bakery', 'pcs', 30, 4)"
+        )
+        conn.commit()
+
+    src = tmp_path / "catalog.csv"
+    src.write_text(
+        "Product Name,Barcode,Category,Unit,Price,Qty,GST,Supplier\n"
+        "Milk (1 L),8900000000011,Dairy,pcs,52,20,,Fresh Farms\n"  # barcode match, GST kept
+        "Bread,,Bakery,pcs,32,8,0,\n"  # name match
+        "Eggs,8900000000028,Dairy,dozen,70,5,0,Fresh Farms\n"  # new
+        "Rice,,Grains,kg,abc,5,0,\n"  # bad price
+        "Sugar,,Grains,kg,45,,0,\n"  # missing quantity
+        "Eggs,8900000000028,Dairy,dozen,72,6,0,Fresh Farms\n",  # duplicate, last wins
+        encoding="utf-8",
+    )
+
+    result = import_catalog(src, chunk_size=2)
+
+    assert (result.rows, result.inserted, result.updated, result.duplicates) == (6, 1, 2, 1)
+    assert result.suppliers_created == 1
+    assert [e.row for e in result.errors] == [5, 6]
+    with connect() as conn:
+        rows = {
+            r["barcode"] or r["name"]: tuple(r)
+            for r in conn.execute("SELECT name, barcode, price, quantity, gst_percent FROM products")
+        }
+    assert rows["8900000000011"] == ("Milk (1 L)", "8900000000011", 52.0, 20, 5.0)
+    assert rows["Bread"] == ("Bread", None, 32.0, 8, 0.0)
+    assert rows["8900000000028"] == ("Eggs", "8900000000028", 72.0, 6, 0.0)
+
+
+def test_import_catalog_reports_barcode_clashes(tmp_db, tmp_path):
+    from grocery_mart_application.database import connect
+    from grocery_mart_application.import_service import import_catalog
+
+    with connect() as conn:
+        conn.execute(
+            "INSERT INTO products (name, category, unit, price, quantity) VALUES ('Bread', 'Bakery', 'pcs', 30, 4)"
+        )
+        conn.execute("""INSERT INTO products (name, barcode, category, unit, price, quantity)
+               VALUES ('Jam', '777', 'Spreads', 'pcs', 90, 3)""")
+        conn.commit()
+
+    src = tmp_path / "catalog.csv"
+    src.write_text(
+        "name,barcode,category,unit,price,quantity\n"
+        "Bread,999,Bakery,pcs,32,8\n"  # existing product by name, barcode also on row 3
+        "Cake,999,Bakery,pcs,250,2\n"  # new product, same barcode
+        "Butter,555,Dairy,pcs,55,6\n",  # fine
+        encoding="utf-8",
+    )
+
+    result = import_catalog(src)
+
+    assert (result.inserted, result.updated) == (1, 0)
+    assert [(e.row, e.barcode) for e in result.errors] == [(2, "999"), (3, "999")]
+    assert "row(s) 3" in result.errors[0].message
+    with connect() as conn:
+        rows = {
+            r["name"]: (r["barcode"], r["price"])
+            for r in conn.execute("SELECT name, barcode, price FROM products")
+        }
+    assert rows == {"Bread": (None, 30.0), "Jam": ("777", 90.0), "Butter": ("555", 55.0)}
+
+
+def test_reimporting_a_catalog_updates_instead_of_clashing(tmp_db, tmp_path):
+    from grocery_mart_application.database import connect
+    from grocery_mart_application.import_service import import_catalog
+
+    src = tmp_path / "catalog.csv"
+    src.write_text(
+        "name,barcode,category,unit,price,quantity\n"
+        + "".join(f"Item {i},89000000{i:05d},Misc,pcs,{10 + i},5\n" for i in range(50))
+        + "Loose Rice,,Grains,kg,60,9\n",
+        encoding="utf-8",
+    )
+
+    first = import_catalog(src)
+    second = import_catalog(src)
+
+    assert (first.inserted, first.updated, first.errors) == (51, 0, [])
+    assert (second.inserted, second.updated, second.errors) == (0, 51, [])
+    with connect() as conn:
+        assert conn.execute("SELECT COUNT(*) FROM products").fetchone()[0] == 51
@@ -0,0 +1,71 @@
+from __future__ import annotations
+
+import pstats
+
+import pytest
+
+
+def test_timers_feed_rolling_percentiles():
+    from grocery_mart_application import instrumentation
+    from grocery_mart_application.instrumentation import RollingHistogram
+
+    hist = RollingHistogram(window=100)
+    for ms in range(1, 201):
+        hist.add(ms / 1000)
+    # Only the newest 100 samples (101..200 ms) count; the lifetime count keeps going.
+    assert hist.count == 200 and len(hist.samples) == 100
+    assert hist.percentile(50) == pytest.approx(0.150)
+    assert hist.percentile(95) == pytest.approx(0.195)
+
+    instrumentation.reset()
+
+    @instrumentation.timed("test.op")
+    def op(fail: bool = False) -> int:
+        if fail:
+            raise ValueError("boom")
+        return 7
+
+    assert op() == 7
+    with pytest.raises(ValueError):
+        op(fail=True)
+    with instrumentation.timer("test.block"):
+        pass
+
+    by_name = {s.name: s for s in instrumentation.stats()}
+    assert by_name["test.op"].count == 2 and by_name["test.block"].count == 1
+    assert by_name["test.op"].p95_ms >= by_name["test.op"].p50_ms >= 0
+
+
+def test_database_calls_are_timed(tmp_db):
+    from grocery_mart_application import database, instrumentation
+
+    instrumentation.reset()
+    with database.connect() as conn:
+        conn.execute("SELECT COUNT(*) FROM products").fetchone()
+        conn.cursor().executemany(
+            "INSERT INTO suppliers (name, contact) VALUES (?, ?)", [("A", ""), ("B", "")]
+        )
+        conn.commit()
+    database.log_event("test", "Timed event")
+
+    counts = {s.name: s.count for s in instrumentation.stats()}
+    assert counts["db.connect"] == 2 and counts["db.log_event"] == 1
+    # The PRAGMA run while opening each connection counts too.
+    assert counts["sql.pragma"] == 2
+    assert counts["sql.select"] >= 1 and counts["sql.insert"] == 2
+
+
+def test_profile_capture_writes_a_prof_file(tmp_path):
+    from grocery_mart_application import instrumentation
+
+    instrumentation.start_profile()
+    with pytest.raises(RuntimeError):
+        instrumentation.start_profile()
+    sum(i * i for i in range(1000))
+    path = instrumentation.stop_profile(tmp_path)
+
+    assert not instrumentation.profiling()
+    assert path.suffix == ".prof" and path.parent == tmp_path
+    assert pstats.Stats(str(path)).total_calls > 0
+    with pytest.raises(RuntimeError):
+        instrumentation.stop_profile(tmp_path)
@@ -0,0 +1,38 @@
+from __future__ import annotations
+
+import json
+
+
+def test_benchmark_runs_headless_and_flags_regressions(tmp_path):
+    from grocery_mart_application.perf_bench import (
+        BENCHMARKS,
+        compare_reports,
+        main,
+        parse_size,
+        size_label,
+    )
+
+    assert parse_size("10k") == 10_000 and parse_size("1M") == 1_000_000 and size_label(100_000) == "100k"
+
+    out = tmp_path / "perf.json"
+    argv = ["--sizes", "300", "--data-dir", str(tmp_path / "data"), "--repeat", "2", "--json", str(out)]
+    assert main(argv) == 0
+    payload = json.loads(out.read_text(encoding="utf-8"))
+    (dataset,) = payload["datasets"]
+    assert dataset["products"] == 300 and dataset["generate_s"] > 0
+    assert [t["name"] for t in dataset["timings"]] == list(BENCHMARKS)
+    assert all(t["runs"] == 2 or t["skipped"] for t in dataset["timings"])
+
+    # A second run reuses the database and compares cleanly against a much slower baseline.
+    for t in dataset["timings"]:
+        t["median_ms"] = t["median_ms"] * 10 + 100
+    (tmp_path / "slow.json").write_text(json.dumps(payload), encoding="utf-8")
+    argv = ["--sizes", "300", "--data-dir", str(tmp_path / "data"), "--only", "search", "--compare"]
+    assert main([*argv, str(tmp_path / "slow.json")]) == 0
+
+    from grocery_mart_application.perf_bench import DatasetReport, Timing
+
+    current = [DatasetReport("300", 300, 300, 0, 0.0, [Timing("search", 1, 50, 50, 50, 50)])]
+    baseline = {"datasets": [{"size": "300", "timings": [{"name": "search", "median_ms": 10.0}]}]}
+    assert len(compare_reports(current, baseline)) == 1
+    assert compare_reports(current, baseline, tolerance=5.0) == []
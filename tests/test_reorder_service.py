@@ -0,0 +1,61 @@
+from __future__ import annotations
+
+from datetime import datetime, timedelta
+
+
+def _seed(conn, *, sales_per_day: int, on_hand: int) -> None:
+    conn.execute("INSERT INTO suppliers (name) VALUES ('Fresh Farms')")
+    conn.execute(
+        "INSERT INTO products (name, category, unit, price, quantity, supplier_id) VALUES ('Dal', 'Pulses', 'kg', 10, ?, 1)",
+        (on_hand,),
+    )
+    now = datetime.now()
+    conn.executemany(
+        "INSERT INTO sales (product_name, quantity, sale_date) VALUES ('Dal', ?, ?)",
+        [(sales_per_day, (now - timedelta(days=i)).strftime("%Y-%m-%d %H:%M:%S")) for i in range(10)],
+    )
+    conn.commit()
+
+
+def test_velocity_drives_reorder_point_and_refresh_is_incremental(tmp_db):
+    from grocery_mart_application.database import connect
+    from grocery_mart_application.reorder_service import ReorderEngine
+
+    with connect() as conn:
+        _seed(conn, sales_per_day=4, on_hand=20)
+
+    engine = ReorderEngine()
+    (s,) = engine.suggestions()
+    assert s.daily_velocity == 4
+    assert s.reorder_point == 4 * (3 + 2)
+    assert s.needs_reorder
+    assert s.suggested_qty == 4 * (3 + 2 + 14) - 20
+
+    with connect() as conn:
+        conn.execute(
+            "INSERT INTO sales (product_name, quantity, sale_date) VALUES ('Dal', 10, ?)",
+            (datetime.now().strftime("%Y-%m-%d %H:%M:%S"),),
+        )
+        conn.commit()
+    engine.refresh()
+    assert engine.velocity("Dal") == 5
+
+    grouped = engine.suggestions_by_supplier()
+    assert list(grouped) == ["Fresh Farms"]
+
+
+def test_shared_engine_follows_the_database_path(tmp_path, monkeypatch):
+    from grocery_mart_application import database
+    from grocery_mart_application.reorder_service import get_reorder_engine
+
+    velocities = []
+    for name, per_day in (("a.db", 4), ("b.db", 1)):
+        monkeypatch.setattr(database, "DB_PATH", tmp_path / name)
+        database.setup_database()
+        with database.connect() as conn:
+            _seed(conn, sales_per_day=per_day, on_hand=20)
+        engine = get_reorder_engine()
+        assert get_reorder_engine() is engine
+        engine.refresh()
+        velocities.append(engine.velocity("Dal"))
+    assert velocities == [4, 1]
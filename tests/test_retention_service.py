@@ -0,0 +1,48 @@
+from __future__ import annotations
+
+
+def _seed(n_old: int, n_new: int) -> None:
+    from grocery_mart_application.database import connect
+
+    with connect() as conn:
+        conn.executemany(
+            "INSERT INTO activity_log (event_type, message, username, created_at) VALUES (?, ?, ?, ?)",
+            [("auth", f"old {i}", "admin", f"2020-0{1 + i % 2}-15 10:00:00") for i in range(n_old)]
+            + [("sale", f"new {i}", "admin", None) for i in range(n_new)],
+        )
+        conn.execute("UPDATE activity_log SET created_at = CURRENT_TIMESTAMP WHERE created_at IS NULL")
+        conn.commit()
+
+
+def test_retention_archives_by_age_and_row_limit(tmp_db, tmp_path):
+    from grocery_mart_application.database import connect
+    from grocery_mart_application.retention_service import apply_retention, iter_archived_events
+
+    _seed(n_old=10, n_new=8)
+    archive = tmp_path / "archive"
+
+    assert apply_retention(days=30, max_rows=5, folder=archive, dry_run=True).archived == 13
+
+    result = apply_retention(days=30, max_rows=5, folder=archive)
+    assert result.archived == 13
+    # Both 2020 months by age, plus the current month for rows over the row limit.
+    assert len(result.files) == 3
+    assert [p.name for p in result.files[:2]] == ["activity-2020-01.ndjson.gz", "activity-2020-02.ndjson.gz"]
+    with connect() as conn:
+        kept = [r[0] for r in conn.execute("SELECT message FROM activity_log ORDER BY id")]
+    assert kept == [f"new {i}" for i in range(3, 8)]
+
+    archived = list(iter_archived_events(archive))
+    assert len(archived) == 13
+    assert len(list(iter_archived_events(archive, month="2020-01"))) == 5
+
+    # Nothing left to move; a second run appends nothing.
+    assert apply_retention(days=30, max_rows=5, folder=archive).archived == 0
+    assert len(list(iter_archived_events(archive))) == 13
+
+
+def test_new_databases_use_incremental_vacuum(tmp_db):
+    from grocery_mart_application.database import connect
+
+    with connect() as conn:
+        assert conn.execute("PRAGMA auto_vacuum").fetchone()[0] == 2
@@ -0,0 +1,79 @@
+from __future__ import annotations
+
+from datetime import date
+
+import pytest
+
+
+def _add_products(rows):  # type: ignore[no-untyped-def]
+    from grocery_mart_application.database import connect
+
+    with connect() as conn:
+        conn.executemany(
+            "INSERT INTO products (name, category, unit, price, quantity, gst_percent, tax_percent) VALUES (?, ?, 'pc', ?, ?, ?, 0)",
+            rows,
+        )
+        conn.commit()
+
+
+def test_checkout_records_every_line_or_none(tmp_db):
+    from grocery_mart_application.database import connect
+    from grocery_mart_application.sales_service import checkout
+
+    _add_products([("Milk", "Dairy", 50.0, 10, 5.0), ("Rice", "Grains", 80.0, 2, 0.0)])
+
+    with pytest.raises(RuntimeError, match="Insufficient stock for Rice"):
+        checkout({"Milk": 1, "Rice": 3}, buyer_name="A", buyer_mobile="9000000000")
+    with connect() as conn:
+        assert conn.execute("SELECT COUNT(*) FROM sales").fetchone()[0] == 0
+        assert conn.execute("SELECT quantity FROM products WHERE name = 'Milk'").fetchone()[0] == 10
+
+    sale = checkout({"Milk": 2, "Rice": 1, "Skipped": 0}, buyer_name="A", buyer_mobile="9000000000")
+    assert len(sale.sale_ids) == 2
+    assert sale.total == pytest.approx(2 * 50 * 1.05 + 80)
+    assert sale.stock_moves[0]["qty"] == -2
+    with connect() as conn:
+        assert [r[0] for r in conn.execute("SELECT quantity FROM products ORDER BY id")] == [8, 1]
+
+
+def test_checkout_logs_a_stock_event_per_product(tmp_db):
+    from grocery_mart_application.database import query_events, subscribe_events
+    from grocery_mart_application.sales_service import checkout
+
+    _add_products([("Milk", "Dairy", 50.0, 10, 0.0), ("Rice", "Grains", 80.0, 2, 0.0)])
+    with pytest.raises(RuntimeError):
+        checkout({"Milk": 1, "Rice": 5}, buyer_name="A", buyer_mobile="9")
+    assert query_events(entity_type="product") == []
+
+    published = []
+    unsubscribe = subscribe_events(published.append)
+    try:
+        sale = checkout({"Milk": 2, "Rice": 1}, buyer_name="A", buyer_mobile="9", user="cashier")
+        checkout({"Milk": 3}, buyer_name="B", buyer_mobile="9")
+    finally:
+        unsubscribe()
+
+    milk_id = sale.stock_moves[0]["product_id"]
+    milk = query_events(entity_type="product", entity_id=milk_id)
+    assert [e["qty_delta"] for e in milk] == [-3, -2]
+    assert milk[1]["payload"] == {"sale_id": sale.sale_ids[0]} and milk[1]["username"] == "cashier"
+    assert len(published) == 3 and all(e["created_at"] for e in published)
+
+
+def test_sales_summary_aggregates_kpis_trend_and_top_products(tmp_db):
+    from grocery_mart_application.sales_service import checkout, sales_summary
+
+    _add_products([("Milk", "Dairy", 50.0, 10, 0.0), ("Rice", "Grains", 80.0, 2, 0.0)])
+    checkout({"Milk": 1}, buyer_name="A", buyer_mobile="9", sale_date="2026-03-01 10:00:00")
+    checkout({"Milk": 1, "Rice": 2}, buyer_name="B", buyer_mobile="9", sale_date="2026-04-02 10:00:00")
+
+    summary = sales_summary("Monthly")
+    assert (summary.sales, summary.items, summary.revenue) == (3, 4, 260.0)
+    assert summary.trend == [("2026-03", 50.0), ("2026-04", 210.0)]
+    assert summary.top_products[0] == ("Rice", 2, 160.0)
+    assert summary.stock_by_category[0] == ("Dairy", 8.0)
+
+    # Reversed bounds are swapped; a single bound means that one day.
+    april = sales_summary("Daily", date_from=date(2026, 4, 30), date_to=date(2026, 4, 1))
+    assert april.trend == [("2026-04-02", 210.0)]
+    assert sales_summary(date_from=date(2026, 3, 1)).revenue == 50.0
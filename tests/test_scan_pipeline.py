@@ -0,0 +1,112 @@
+from __future__ import annotations
+
+import time
+
+
+class _ListSource:
+    """Frames from a list, then end of stream, like a video file."""
+
+    live = False
+
+    def __init__(self, frames: list[str], delay_s: float = 0.0) -> None:
+        self.frames = list(frames)
+        self.delay_s = delay_s
+        self.released = False
+
+    def read(self):  # type: ignore[no-untyped-def]
+        time.sleep(self.delay_s)
+        if not self.frames:
+            return False, None
+        return True, self.frames.pop(0)
+
+    def release(self) -> None:
+        self.released = True
+
+
+def _slow_engine():  # type: ignore[no-untyped-def]
+    from grocery_mart_application.scanner_engine import ScannerEngine
+
+    def decode(img):  # type: ignore[no-untyped-def]
+        time.sleep(0.02)
+        return [img] if str(img).startswith("code") else []
+
+    return ScannerEngine({"roi": (None, lambda img: img)}, {"opencv": decode})
+
+
+def test_frame_slot_keeps_only_the_newest_item():
+    from grocery_mart_application.scan_pipeline import FrameSlot
+
+    slot = FrameSlot()
+    for i in range(5):
+        slot.put(i)
+    assert slot.take(timeout=0) == (5, 4)
+    assert slot.dropped == 4
+    assert slot.take(timeout=0) is None
+    slot.close()
+    assert slot.take() is None
+
+
+def test_pipeline_skips_stale_frames_and_previews_off_thread():
+    from grocery_mart_application.scan_pipeline import ScanPipeline
+
+    frames = [f"blank{i}" for i in range(40)] + ["code-4006381333931"]
+    source = _ListSource(frames, delay_s=0.002)
+    previews: list[str] = []
+    pipeline = ScanPipeline(
+        lambda: source, _slow_engine, workers=2, preview=lambda f: previews.append(f) or f"img:{f}"
+    )
+    pipeline.start()
+    pipeline.join(timeout=5)
+    assert not pipeline.running and source.released
+
+    results = pipeline.drain_results()
+    # Decoding is ~10x slower than capture, so most frames are dropped, never queued...
+    assert pipeline.frames == 41
+    assert pipeline._decode_slot.dropped > 0
+    assert len(results) + pipeline._decode_slot.dropped == 41
+    # ...but the last frame is always decoded.
+    assert [r.result.code for r in results if r.result.code] == ["code-4006381333931"]
+    assert previews and str(pipeline.take_preview()).startswith("img:")
+    assert pipeline.take_preview() is None
+
+
+def test_pipeline_reports_missing_decoder_and_unopened_source():
+    import pytest
+
+    from grocery_mart_application.scan_pipeline import ScanPipeline
+    from grocery_mart_application.scanner_engine import ScannerEngine
+
+    with pytest.raises(ValueError):
+        ScanPipeline(lambda: _ListSource([]), lambda: ScannerEngine({}, {})).start()
+
+    class Closed(_ListSource):
+        def isOpened(self) -> bool:
+            return False
+
+    pipeline = ScanPipeline(lambda: Closed(["code"]), _slow_engine, workers=1)
+    pipeline.start()
+    pipeline.join(timeout=5)
+    assert pipeline.error == "Could not open the camera."
+    assert pipeline.drain_results() == []
+
+
+def test_debouncer_counts_a_held_code_once():
+    from grocery_mart_application.scan_pipeline import CodeDebouncer
+
+    d = CodeDebouncer(cooldown_s=2.0)
+    # Held in view for 5 s (read every 0.1 s), then a second item with the same code after a gap.
+    reads = [d.accept("A", t / 10) for t in range(50)]
+    assert reads.count(True) == 1
+    assert d.accept("B", 5.0) is True
+    assert d.accept("A", 5.05) is False
+    assert d.accept("A", 7.5) is True
+
+
+def test_debouncer_treats_upc_a_and_ean_13_spellings_as_one_code():
+    from grocery_mart_application.scan_pipeline import CodeDebouncer
+
+    d = CodeDebouncer(cooldown_s=2.0)
+    # OpenCV reports the 12-digit UPC-A, pyzbar the zero-padded EAN-13 of the same label.
+    assert d.accept("012345678905", 0.0) is True
+    assert d.accept("0012345678905", 0.1) is False
+    assert d.accept("012345678905", 0.2) is False
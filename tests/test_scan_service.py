@@ -0,0 +1,82 @@
+from __future__ import annotations
+
+import time
+
+
+def _type(buf, text: str, start_ms: float, gap_ms: float):  # type: ignore[no-untyped-def]
+    done = []
+    t = start_ms
+    for ch in text:
+        code = buf.feed(ch, t)
+        if code is not None:
+            done.append(code)
+        t += gap_ms
+    return done, t
+
+
+def test_wedge_buffer_assembles_fast_bursts_in_order():
+    from grocery_mart_application.scan_service import WedgeBuffer
+
+    buf = WedgeBuffer(max_gap_ms=50)
+    codes = [f"{4006381333900 + i}" for i in range(30)]
+    done, t = [], 0.0
+    # 30 scans in one second: 13 digits + Enter at 2 ms per key, back to back.
+    for code in codes:
+        got, t = _type(buf, code + "\r", t, 2.0)
+        done += got
+        t += 5
+    assert [c.code for c in done] == codes
+    assert all(c.burst for c in done)
+
+    # Typed by hand: complete on Enter, but not a burst, and never flushed on idle.
+    got, _ = _type(buf, "12345", 0.0, 180.0)
+    assert got == [] and buf.flush_idle() is None
+    assert buf.feed("\n", 1000.0) == type(done[0])("12345", False)
+
+    # Scanner without an Enter suffix: the idle flush completes it.
+    _type(buf, "8901234567890", 0.0, 3.0)
+    assert buf.flush_idle().code == "8901234567890"
+    assert buf.text == ""
+
+
+def test_scan_worker_applies_scans_in_order_and_batches(tmp_db):
+    from grocery_mart_application.database import connect, query_events
+    from grocery_mart_application.scan_service import ScanRequest, ScanWorker, apply_scans
+
+    with connect() as conn:
+        conn.execute(
+            "INSERT INTO products (name, barcode, category, unit, price, quantity) VALUES ('Milk', '0913909960309', 'Dairy', 'pc', 1.0, 2)"
+        )
+        conn.commit()
+
+    batches: list[int] = []
+
+    def counting_apply(requests, *, user=None):  # type: ignore[no-untyped-def]
+        batches.append(len(requests))
+        return apply_scans(requests, user=user)
+
+    worker = ScanWorker(user="admin", apply=counting_apply)
+    requests = [ScanRequest("0913909960309", "Receive (+)", 1) for _ in range(50)]
+    # UPC-A spelling of the same code, a dispatch too large, and an unknown code.
+    requests += [
+        ScanRequest("913909960309", "Dispatch (-)", 2),
+        ScanRequest("0913909960309", "Dispatch (-)", 500),
+        ScanRequest("nope", "Receive (+)", 1, interactive=False),
+    ]
+    for req in requests:
+        worker.submit(req)
+
+    outcomes = []
+    deadline = time.monotonic() + 10
+    while worker.pending and time.monotonic() < deadline:
+        outcomes += worker.drain()
+        time.sleep(0.01)
+    worker.stop()
+
+    assert [o.request for o in outcomes] == requests
+    assert [o.status for o in outcomes[-3:]] == ["ok", "rejected", "unknown"]
+    assert outcomes[49].after == 52 and outcomes[50].after == 50
+    assert sum(batches) == len(requests)
+    with connect() as conn:
+        assert conn.execute("SELECT quantity FROM products").fetchone()[0] == 50
+    assert len(query_events(entity_type="product")) == 51
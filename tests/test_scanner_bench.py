@@ -0,0 +1,61 @@
+from __future__ import annotations
+
+import pytest
+
+
+def test_barcode_encoders_produce_valid_symbols():
+    from grocery_mart_application.scanner_bench import (
+        code128_modules,
+        ean13_check_digit,
+        ean13_modules,
+        fixture_codes,
+    )
+    from grocery_mart_application.scanner_engine import equivalent_codes
+
+    assert ean13_check_digit("400638133393") == 1
+    modules = ean13_modules("4006381333931")
+    assert len(modules) == 95 and modules.startswith("101") and modules[45:50] == "01010"
+    # Start B + 3 data + checksum = 5 symbols of 11 modules, plus the 13-module stop.
+    assert len(code128_modules("GM1")) == 5 * 11 + 13
+    assert fixture_codes(2) == fixture_codes(2)
+    assert equivalent_codes("0913909960309") == ["0913909960309", "913909960309"]
+    assert equivalent_codes("GM-X") == ["GM-X"]
+
+
+def test_benchmark_runs_headless_on_synthetic_and_recorded_fixtures(tmp_path):
+    pytest.importorskip("cv2")
+    from grocery_mart_application.scanner_bench import (
+        main,
+        recorded_fixtures,
+        run_benchmark,
+        synthetic_fixtures,
+        write_fixtures,
+    )
+
+    fixtures = synthetic_fixtures(1, conditions=("clean", "rotated"))
+    reports = run_benchmark(fixtures)
+    assert reports[-1].chain == "adaptive"
+    assert all(r.frames == 4 and set(r.by_condition) == {"clean", "rotated"} for r in reports)
+    assert reports[-1].decoded >= 1
+
+    assert write_fixtures(fixtures, tmp_path / "fx") == 4
+    # An unreadable image is skipped, not taken for the end of the folder.
+    (tmp_path / "fx" / "aaa_broken_123.png").write_bytes(b"not a png")
+    replayed = recorded_fixtures(tmp_path / "fx")
+    assert sorted((f.condition, f.expected) for f in replayed) == sorted(
+        (f.condition, f.expected) for f in fixtures
+    )
+
+    out = tmp_path / "bench.json"
+    assert main(["--source", str(tmp_path / "fx"), "--json", str(out)]) == 0
+    assert '"adaptive"' in out.read_text(encoding="utf-8")
+
+
+def test_adaptive_chain_does_not_misread_tilted_code128():
+    pytest.importorskip("cv2")
+    from grocery_mart_application.scanner_bench import main, run_benchmark, synthetic_fixtures
+
+    # OpenCV alone finds checksum-valid EAN-8/UPC-A codes in some of these labels.
+    reports = run_benchmark(synthetic_fixtures(4, conditions=("rotated",)))
+    assert reports[-1].wrong == 0
+    assert main(["--count", "1", "--min-rate", "1.01"]) == 1
@@ -0,0 +1,54 @@
+from __future__ import annotations
+
+
+def _engine(calls: list[str]):  # type: ignore[no-untyped-def]
+    from grocery_mart_application.scanner_engine import ScannerEngine
+
+    def stage(name):  # type: ignore[no-untyped-def]
+        def fn(img):  # type: ignore[no-untyped-def]
+            calls.append(name)
+            return f"{img}>{name}"
+
+        return fn
+
+    # Frames are strings naming the decoder that can read them, e.g. "zbar".
+    def decoder(name):  # type: ignore[no-untyped-def]
+        def fn(img):  # type: ignore[no-untyped-def]
+            calls.append(name)
+            return ["4006381333931"] if str(img).startswith(name) else []
+
+        return fn
+
+    stages = {"roi": (None, stage("roi")), "gray": ("roi", stage("gray")), "bw": ("gray", stage("bw"))}
+    return ScannerEngine(stages, {"opencv": decoder("opencv"), "zbar": decoder("zbar")})
+
+
+def test_engine_shares_stages_and_moves_last_hit_first():
+    calls: list[str] = []
+    engine = _engine(calls)
+
+    result = engine.decode("zbar")
+    assert result.code == "4006381333931"
+    assert result.chain == "zbar:bw"
+    # Each stage ran once although two chains used "gray"; decoding stopped at the first hit.
+    assert calls == ["roi", "opencv", "gray", "opencv", "bw", "zbar"]
+    assert set(result.timings) >= {"roi", "gray", "bw", "opencv:roi", "zbar:bw", "total"}
+    assert engine.order[0] == "zbar:bw"
+
+    calls.clear()
+    engine.decode("zbar")
+    assert calls == ["roi", "gray", "bw", "zbar"]
+
+    calls.clear()
+    assert engine.decode("nothing").codes == []
+    assert calls.count("opencv") == 2 and calls.count("zbar") == 2
+    assert engine.hits["zbar:bw"] == 2 and engine.frames == 3
+    assert "total" in engine.summary()
+
+
+def test_engine_drops_chains_without_a_decoder():
+    from grocery_mart_application.scanner_engine import ScannerEngine
+
+    engine = ScannerEngine({"roi": (None, lambda img: img)}, {"zbar": lambda img: ["x"]})
+    assert engine.order == []
+    assert engine.decode("frame").codes == []
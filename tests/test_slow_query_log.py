@@ -0,0 +1,56 @@
+from __future__ import annotations
+
+import json
+
+
+def test_slow_statements_are_logged_with_params_and_plan(tmp_db, monkeypatch, capsys):
+    from grocery_mart_application import database, slow_query_log
+    from grocery_mart_application.cli import main
+
+    monkeypatch.setattr(slow_query_log, "threshold_ms", lambda: 0.0001)
+    with database.connect() as conn:
+        conn.executemany(
+            "INSERT INTO products (name, category, unit, price, quantity) VALUES (?, ?, ?, ?, ?)",
+            [(f"P{i}", "Misc", "pcs", 1.0, i) for i in range(50)],
+        )
+        conn.commit()
+        conn.execute("SELECT * FROM products WHERE quantity > ?", (10,)).fetchall()
+        conn.execute("SELECT * FROM products WHERE name = ?", ("P3",)).fetchall()
+        conn.execute("SELECT * FROM products WHERE name = ?", ("P4",)).fetchall()
+        conn.log_slow = False
+        conn.execute("SELECT COUNT(*) FROM sales").fetchone()
+    slow_query_log.flush()
+
+    by_sql = {r.sql: r for r in slow_query_log.report(limit=100)}
+    assert "SELECT COUNT(*) FROM sales" not in by_sql
+
+    scan = by_sql["SELECT * FROM products WHERE quantity > ?"]
+    assert scan.full_scan and scan.plan == "SCAN products" and json.loads(scan.params) == [10]
+
+    lookup = by_sql["SELECT * FROM products WHERE name = ?"]
+    assert lookup.count == 2 and not lookup.full_scan and "idx_products_name" in lookup.plan
+
+    insert = next(r for sql, r in by_sql.items() if sql.startswith("INSERT INTO products"))
+    with database.connect() as conn:
+        row = conn.execute("SELECT kind, rows FROM slow_queries WHERE sql = ?", (insert.sql,)).fetchone()
+    assert tuple(row) == ("executemany", 50) and json.loads(insert.params) == ["P0", "Misc", "pcs", 1.0, 0]
+
+    # 0 turns the log off, so the CLI's own statements stay out of it.
+    monkeypatch.setattr(slow_query_log, "threshold_ms", lambda: 0.0)
+    assert main(["--db", str(tmp_db), "slow-queries", "--json"]) == 0
+    assert any(r["full_scan"] for r in json.loads(capsys.readouterr().out))
+    assert main(["--db", str(tmp_db), "slow-queries", "--clear"]) == 0
+    assert slow_query_log.report() == []
+
+
+def test_plan_parsing_and_param_clipping():
+    from grocery_mart_application.slow_query_log import MAX_PARAM_CHARS, _params_json, is_full_scan
+
+    assert is_full_scan("SCAN sales\nUSE TEMP B-TREE FOR GROUP BY")
+    assert not is_full_scan("SEARCH sales USING INDEX idx_sales_sale_date (sale_date>? AND sale_date<?)")
+    assert not is_full_scan("SCAN products USING COVERING INDEX idx_products_name")
+    assert not is_full_scan(None)
+
+    clipped = json.loads(_params_json(("x" * 1000, b"\x00" * 10, 3)))
+    assert len(clipped[0]) == MAX_PARAM_CHARS + 3 and clipped[1:] == ["<10 bytes>", 3]
+    assert _params_json(()) is None